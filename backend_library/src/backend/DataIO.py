@@ -1,8 +1,9 @@
 import os
 import shutil
-from typing import Optional
+from typing import BinaryIO, Optional
 
 import numpy as np
+import numpy.lib.format as npy
 import pandas as pd
 from pandas.errors import ParserError, EmptyDataError
 
@@ -154,3 +155,98 @@ class DataIO:
         """
         DataIO.write_csv(running_path, data, add_index_column, has_header)
         shutil.move(running_path, final_path)
+
+    @staticmethod
+    def get_binary_path(path: str) -> str:
+        """
+        :param path: The path of the csv-file of a cleaned dataset
+        :return: The path of the binary copy of the cleaned dataset
+        (see write_binary)
+        """
+        return path + ".npy"
+
+    @staticmethod
+    def write_binary(path: str, dataset: AnnotatedDataset) -> None:
+        """
+        Writes a cleaned dataset to a binary file, that can be read much faster than
+        a csv-file. It consists of three arrays in the .npy format:
+        the data as float32, the row mapping as int32 and the headers. \n
+        Like save_write_csv, the file is written to path.running first.
+        :param path: The path of the file. If it exists already, it is overridden.
+        :param dataset: The dataset, whose data has to be convertible to float32
+        """
+        running_path = path + ".running"
+        with open(running_path, "wb") as f:
+            npy.write_array(f, np.ascontiguousarray(dataset.data, np.float32))
+            npy.write_array(f, np.ascontiguousarray(dataset.row_mapping, np.int32))
+            npy.write_array(f, dataset.headers.astype(str))
+        shutil.move(running_path, path)
+
+    @staticmethod
+    def read_binary_shape(path: str) -> tuple[int, int]:
+        """
+        Reads the shape of the data of a dataset written by write_binary,
+        without reading the data itself
+        :raises ValueError if the file is not a dataset written by write_binary
+        :return: The number of datapoints and dimensions
+        """
+        with open(path, "rb") as f:
+            shape, _ = DataIO.__read_binary_header(f, np.float32, 2)
+        return shape[0], shape[1]
+
+    @staticmethod
+    def read_binary_into(path: str, data: np.ndarray, row_numbers: np.ndarray) \
+            -> None:
+        """
+        Reads the data and row mapping of a dataset written by write_binary
+        into the given arrays, e.g. in shared memory.
+        Row-major arrays are read into directly, without any intermediate copy.
+        :param data: The float32 array to read the data into,
+        which has to have the shape of the data
+        :param row_numbers: The int32 array to read the row mapping into
+        :raises ValueError if the file does not contain a dataset of the same shape
+        """
+        assert data.dtype == np.float32 and row_numbers.dtype == np.int32
+        with open(path, "rb") as f:
+            DataIO.__read_binary_array_into(f, path, data)
+            DataIO.__read_binary_array_into(f, path, row_numbers)
+
+    @staticmethod
+    def __read_binary_array_into(f: BinaryIO, path: str, target: np.ndarray) -> None:
+        shape, fortran_order = DataIO.__read_binary_header(f, target.dtype,
+                                                           len(target.shape))
+        if shape != target.shape or fortran_order:
+            raise ValueError(f"{path} does not contain an array of shape "
+                             f"{target.shape}, but {shape}")
+        if target.flags.c_contiguous:
+            view = memoryview(target).cast("B")
+            while len(view) > 0:
+                # reads of large arrays may be split
+                count = f.readinto(view)
+                if not count:
+                    raise ValueError(f"{path} is truncated")
+                view = view[count:]
+        else:
+            # memmap moves the position of the file
+            offset = f.tell()
+            target[:] = np.memmap(f, target.dtype, "r", offset, shape)
+            f.seek(offset + target.nbytes)
+
+    @staticmethod
+    def __read_binary_header(f: BinaryIO, dtype: np.dtype, dimension_count: int) \
+            -> tuple[tuple[int, ...], bool]:
+        """
+        Reads the header of the next array of a file written by write_binary
+        :return: The shape of the array and whether it is in column-major order
+        """
+        version = npy.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, file_dtype = npy.read_array_header_1_0(f)
+        elif version == (2, 0):
+            shape, fortran_order, file_dtype = npy.read_array_header_2_0(f)
+        else:
+            raise ValueError(f"unsupported .npy version {version}")
+        if file_dtype != dtype or len(shape) != dimension_count:
+            raise ValueError(f"expected an array of {dtype} with {dimension_count} "
+                             f"dimensions, but got {file_dtype} {shape}")
+        return shape, fortran_order
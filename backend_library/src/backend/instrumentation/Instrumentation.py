@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Optional
+
+LabelValues = tuple[tuple[str, str], ...]
+
+
+class Metric:
+    """A metric with a value per combination of label values,
+    exported in the Prometheus text exposition format"""
+
+    def __init__(self, name: str, documentation: str, kind: str):
+        self._name: str = name
+        self._documentation: str = documentation
+        self._kind: str = kind
+        self._lock: threading.Lock = threading.Lock()
+        self._values: dict[LabelValues, float] = dict()
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def get(self, **labels: object) -> float:
+        """Returns the current value for the given label values"""
+        with self._lock:
+            return self._values.get(Metric._to_label_values(labels), 0.0)
+
+    def get_label_values(self) -> list[dict[str, str]]:
+        """Returns the combinations of label values with a value"""
+        with self._lock:
+            return [dict(labels) for labels in sorted(self._values.keys())]
+
+    def clear(self) -> None:
+        """Removes the values of all label values"""
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> list[str]:
+        """Returns the lines describing this metric in the text exposition format"""
+        lines = [f"# HELP {self._name} {Metric._escape(self._documentation, False)}",
+                 f"# TYPE {self._name} {self._kind}"]
+        with self._lock:
+            lines.extend(self._render_samples())
+        return lines
+
+    def _render_samples(self) -> list[str]:
+        return [Metric._sample(self._name, labels, value)
+                for labels, value in sorted(self._values.items())]
+
+    def _add(self, amount: float, labels: dict[str, object]) -> None:
+        key = Metric._to_label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    @staticmethod
+    def _to_label_values(labels: dict[str, object]) -> LabelValues:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    @staticmethod
+    def _escape(value: str, quotes: bool = True) -> str:
+        value = value.replace("\\", "\\\\").replace("\n", "\\n")
+        return value.replace("\"", "\\\"") if quotes else value
+
+    @staticmethod
+    def _sample(name: str, labels: LabelValues, value: float) -> str:
+        label_text = ",".join(f"{k}=\"{Metric._escape(v)}\"" for k, v in labels)
+        if math.isinf(value):
+            value_text = "+Inf" if value > 0 else "-Inf"
+        else:
+            value_text = repr(float(value))
+        return f"{name}{{{label_text}}} {value_text}" if label_text \
+            else f"{name} {value_text}"
+
+
+class Counter(Metric):
+    """A metric that only increases, e.g. the number of aborted Schedulables"""
+
+    def __init__(self, name: str, documentation: str):
+        super().__init__(name, documentation, "counter")
+
+    def inc(self, amount: float = 1, **labels: object) -> None:
+        assert amount >= 0
+        self._add(amount, labels)
+
+
+class Gauge(Metric):
+    """A metric that may increase and decrease, e.g. the number of running workers"""
+
+    def __init__(self, name: str, documentation: str):
+        super().__init__(name, documentation, "gauge")
+
+    def set(self, value: float, **labels: object) -> None:
+        with self._lock:
+            self._values[Metric._to_label_values(labels)] = value
+
+    def inc(self, amount: float = 1, **labels: object) -> None:
+        self._add(amount, labels)
+
+    def dec(self, amount: float = 1, **labels: object) -> None:
+        self._add(-amount, labels)
+
+
+class Histogram(Metric):
+    """A metric counting observations, e.g. durations, in cumulative buckets"""
+    default_buckets: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                                          1, 2.5, 5, 10, 30, 60, 300, 900, 3600)
+
+    def __init__(self, name: str, documentation: str,
+                 buckets: tuple[float, ...] = default_buckets):
+        """
+        :param buckets: The upper bounds of the buckets in ascending order,
+        the bucket +Inf is added implicitly
+        """
+        super().__init__(name, documentation, "histogram")
+        assert list(buckets) == sorted(buckets)
+        self._buckets: tuple[float, ...] = tuple(buckets)
+        self._counts: dict[LabelValues, list[int]] = dict()
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = Metric._to_label_values(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self._buckets) + 1))
+            counts[bisect.bisect_left(self._buckets, value)] += 1
+            self._values[key] = self._values.get(key, 0.0) + value
+
+    @contextmanager
+    def time(self, **labels: object) -> Iterator[None]:
+        """Observes the seconds the with-block takes"""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(time.monotonic() - start, **labels)
+
+    def get_count(self, **labels: object) -> int:
+        """Returns the number of observations for the given label values"""
+        with self._lock:
+            return sum(self._counts.get(Metric._to_label_values(labels), []))
+
+    def get_quantile(self, quantile: float, **labels: object) -> float:
+        """Estimates a quantile of the observations for the given label values,
+        interpolating linearly within the bucket containing it
+        (like histogram_quantile of Prometheus)
+        :param quantile: The quantile, between 0 and 1
+        :return: NaN if there are no observations, the largest bucket bound
+        if the quantile lies within the +Inf bucket"""
+        assert 0 <= quantile <= 1
+        with self._lock:
+            counts = list(self._counts.get(Metric._to_label_values(labels), []))
+        rank = quantile * sum(counts)
+        cumulative = 0
+        for i, count in enumerate(counts):
+            if count > 0 and cumulative + count >= rank:
+                if i == len(self._buckets):
+                    return self._buckets[-1] if len(self._buckets) > 0 else math.nan
+                lower = 0.0 if i == 0 else self._buckets[i - 1]
+                return lower + (self._buckets[i] - lower) * (rank - cumulative) / count
+            cumulative += count
+        return math.nan
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+            self._counts.clear()
+
+    def _render_samples(self) -> list[str]:
+        lines = []
+        for labels, total in sorted(self._values.items()):
+            cumulative = 0
+            counts = self._counts[labels]
+            for bound, count in zip(self._buckets + (math.inf,), counts):
+                cumulative += count
+                le = (("le", "+Inf" if math.isinf(bound) else repr(float(bound))),)
+                lines.append(Metric._sample(f"{self._name}_bucket", labels + le,
+                                            cumulative))
+            lines.append(Metric._sample(f"{self._name}_sum", labels, total))
+            lines.append(Metric._sample(f"{self._name}_count", labels, cumulative))
+        return lines
+
+
+class Instrumentation:
+    """Process-wide registry of the metrics of the backend.
+    Metrics are only recorded in the process updating them,
+    so updates within forked worker processes are lost."""
+    _lock: threading.Lock = threading.Lock()
+    _metrics: dict[str, Metric] = dict()
+
+    @staticmethod
+    def counter(name: str, documentation: str) -> Counter:
+        """Returns the counter with the given name, creating it if required"""
+        return Instrumentation.__register(Counter(name, documentation))
+
+    @staticmethod
+    def gauge(name: str, documentation: str) -> Gauge:
+        """Returns the gauge with the given name, creating it if required"""
+        return Instrumentation.__register(Gauge(name, documentation))
+
+    @staticmethod
+    def histogram(name: str, documentation: str,
+                  buckets: Optional[tuple[float, ...]] = None) -> Histogram:
+        """Returns the histogram with the given name, creating it if required"""
+        return Instrumentation.__register(Histogram(
+            name, documentation,
+            Histogram.default_buckets if buckets is None else buckets))
+
+    @staticmethod
+    def render() -> str:
+        """Returns all metrics in the Prometheus text exposition format"""
+        with Instrumentation._lock:
+            metrics = sorted(Instrumentation._metrics.values(), key=lambda m: m.name)
+        return "".join(line + "\n" for m in metrics for line in m.render())
+
+    @staticmethod
+    def __register(metric: Metric) -> Metric:
+        with Instrumentation._lock:
+            existing = Instrumentation._metrics.setdefault(metric.name, metric)
+        assert type(existing) == type(metric), \
+            f"{metric.name} is already registered as another kind of metric"
+        return existing
@@ -0,0 +1,44 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+
+class MetricAggregator(ABC):
+    """
+    A metric computed online from the result of each ExecutionElement as it finishes,
+    instead of reading all results after the Execution finished. \n
+    Aggregators are registered at the Execution (see Execution.metric_aggregators),
+    which adds the results to them, and written by the metric callback.
+    """
+
+    @abstractmethod
+    def start(self, indices_mapping: list[int]) -> None:
+        """
+        Discards all results added before and starts aggregating the results
+        of an Execution (e.g. again, as the Execution is recovered). \n
+        :param indices_mapping: The indices of the data points of the cleaned dataset
+        used in the Execution
+        :return: None
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def add_result(self, subspace_identifier: str, scores: np.ndarray) -> None:
+        """
+        Adds the result of a successfully finished ExecutionElement.
+        The Execution does not add several results at the same time. \n
+        :param subspace_identifier: The identifier of the subspace of the result
+        :param scores: The outlier score of each data point
+        :return: None
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def write_result(self, metric_result_path: str) -> None:
+        """
+        Writes the metric of the results added so far. \n
+        :param metric_result_path: The path where the metric will store its results to.
+        Has to end with .csv
+        :return: None
+        """
+        raise NotImplementedError
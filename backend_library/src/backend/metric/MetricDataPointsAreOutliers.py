@@ -1,24 +1,31 @@
+from typing import Optional
+
 import numpy as np
 
 from backend.DataIO import DataIO
 from backend.metric.ExecutionElementMetricHelper import \
     ExecutionElementMetricHelper as eem_helper
 from backend.metric.Metric import Metric
+from backend.metric.MetricAggregator import MetricAggregator
 from pandas import DataFrame as df
 
 from backend.task.TaskHelper import TaskHelper
 
 
-class MetricDataPointsAreOutliers(Metric):
+class MetricDataPointsAreOutliers(Metric, MetricAggregator):
 
-    def __init__(self, indices_mapping: list[int]):
+    def __init__(self, indices_mapping: Optional[list[int]] = None):
         """
         :param indices_mapping: The first column of the metric result which shows the
         indices of the data points. \n
         Has to be the same size as each execution element result!
-        (same amount of data points)
+        (same amount of data points) \n
+        Only required by compute_metric, as a MetricAggregator gets them on start
         """
-        self._indices_mapping: list[int] = indices_mapping
+        self._indices_mapping: Optional[list[int]] = indices_mapping
+        self._outlier_counts: Optional[np.ndarray] = None
+        """The amount of results in which each data point is an outlier"""
+        self._result_count: int = 0
 
     def compute_metric(self, metric_result_path: str,
                        algorithm_directory_paths: list[str]) -> None:
@@ -31,33 +38,39 @@ class MetricDataPointsAreOutliers(Metric):
         :return: None
         """
         assert metric_result_path.endswith(".csv")
+        assert self._indices_mapping is not None
+
+        self.start(self._indices_mapping)
+        # Add all ExecutionElement results
+        for identifier, scores in eem_helper. \
+                get_execution_elements_results(algorithm_directory_paths):
+            self.add_result(identifier, scores)
+        self.write_result(metric_result_path)
 
-        # Get all .csv files (ExecutionElement result)
-        execution_result_path: list[str] = eem_helper. \
-            get_execution_elements_result_paths(algorithm_directory_paths)
+    def start(self, indices_mapping: list[int]) -> None:
+        self._indices_mapping = indices_mapping
+        self._outlier_counts = np.zeros(len(indices_mapping), np.int64)
+        self._result_count = 0
 
-        # Fill outlier_data_points with all information
-        # about which datapoint is an outlier
-        # (1 bool array for each ExecutionElement result)
-        outlier_data_points: list[np.ndarray] = list([])
-        for result_path in execution_result_path:
-            outlier_data_points. \
-                append(eem_helper.compute_outlier_data_points(result_path))
+    def add_result(self, subspace_identifier: str, scores: np.ndarray) -> None:
+        assert self._outlier_counts is not None
+        assert scores.shape == self._outlier_counts.shape
+        self._outlier_counts += \
+            eem_helper.compute_outlier_data_points_of_scores(scores)
+        self._result_count += 1
+
+    def write_result(self, metric_result_path: str) -> None:
+        assert metric_result_path.endswith(".csv")
 
         # create Error file and stop computation if no result file exists
-        if len(outlier_data_points) == 0:
+        if self._result_count == 0:
             error_path: str = TaskHelper.convert_to_error_csv_path(metric_result_path)
             eem_helper.write_empty_execution_error_message(error_path)
             return
 
-        # Compute the metric result:
-        data_points_outlier_in_subspace: list[int] = \
-            eem_helper.compute_data_point_outlier_count(outlier_data_points)
-
         # convert into result
-        assert len(self._indices_mapping) == len(data_points_outlier_in_subspace)
         metric_result: np.ndarray = df([self._indices_mapping,
-                                        data_points_outlier_in_subspace]).\
+                                        self._outlier_counts.tolist()]).\
             to_numpy()
 
         # save metric
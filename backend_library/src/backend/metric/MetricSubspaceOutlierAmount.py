@@ -1,17 +1,20 @@
-from pathlib import Path
-
 import numpy as np
 
 from backend.DataIO import DataIO
 from backend.metric.ExecutionElementMetricHelper import \
     ExecutionElementMetricHelper as eem_helper
 from backend.metric.Metric import Metric
+from backend.metric.MetricAggregator import MetricAggregator
 from pandas import DataFrame as df
 
 from backend.task.TaskHelper import TaskHelper
 
 
-class MetricSubspaceOutlierAmount(Metric):
+class MetricSubspaceOutlierAmount(Metric, MetricAggregator):
+
+    def __init__(self):
+        self._subspace_outlier_amounts: dict[str, int] = dict()
+        """The amount of outliers in all results of each subspace"""
 
     @staticmethod
     def compute_metric(metric_result_path: str,
@@ -26,41 +29,36 @@ class MetricSubspaceOutlierAmount(Metric):
         """
         assert metric_result_path.endswith(".csv")
 
-        # Get all .csv files (ExecutionElement result)
-        execution_result_paths: list[str] = eem_helper. \
-            get_execution_elements_result_paths(algorithm_directory_paths)
+        metric = MetricSubspaceOutlierAmount()
+        # Add all ExecutionElement results
+        for identifier, scores in eem_helper. \
+                get_execution_elements_results(algorithm_directory_paths):
+            metric.add_result(identifier, scores)
+        metric.write_result(metric_result_path)
+
+    def start(self, indices_mapping: list[int]) -> None:
+        self._subspace_outlier_amounts = dict()
+
+    def add_result(self, subspace_identifier: str, scores: np.ndarray) -> None:
+        outlier_data_points: np.ndarray = \
+            eem_helper.compute_outlier_data_points_of_scores(scores)
+        self._subspace_outlier_amounts[subspace_identifier] = \
+            self._subspace_outlier_amounts.get(subspace_identifier, 0) \
+            + int(np.count_nonzero(outlier_data_points))
 
-        # Get subspace identifier
-        outlier_data_points_divided_in_subspaces: dict = {}
-        all_subspace_identifier: list[str] = \
-            eem_helper.convert_paths_into_subspace_identifier(execution_result_paths)
+    def write_result(self, metric_result_path: str) -> None:
+        assert metric_result_path.endswith(".csv")
 
-        # create Error file and stop computation if no result file exists
-        if len(all_subspace_identifier) == 0:
+        # create Error file and stop computation if no result exists
+        if len(self._subspace_outlier_amounts) == 0:
             error_path: str = TaskHelper.convert_to_error_csv_path(metric_result_path)
             eem_helper.write_empty_execution_error_message(error_path)
             return
 
-        # Divide outlier_data_points by their subspace identifier
-        for identifier in all_subspace_identifier:
-            for path in execution_result_paths:
-                if Path(path).stem != identifier:
-                    continue
-
-                if (outlier_data_points_divided_in_subspaces.get(identifier)) is None:
-                    outlier_data_points_divided_in_subspaces[identifier] \
-                        = list([eem_helper.compute_outlier_data_points(path)])
-                else:
-                    outlier_data_points_divided_in_subspaces[identifier] \
-                        .append(eem_helper.compute_outlier_data_points(path))
-
-        # compute metric
-        outlier_data_points: list[int] = eem_helper.compute_subspace_outlier_amount(
-            outlier_data_points_divided_in_subspaces)
-
         # convert into result
         metric_result: np.ndarray = df(
-            [all_subspace_identifier, outlier_data_points]).to_numpy().transpose()
+            [list(self._subspace_outlier_amounts.keys()),
+             list(self._subspace_outlier_amounts.values())]).to_numpy().transpose()
 
         # save metric result
         DataIO.save_write_csv(metric_result_path + ".running", metric_result_path,
@@ -0,0 +1,120 @@
+import time
+from collections.abc import Callable
+from logging import info, warning
+from typing import Any, Optional
+
+from backend.scheduler.Schedulable import Schedulable
+from backend.scheduler.UserRoundRobinScheduler import UserRoundRobinScheduler
+
+
+class FairShareScheduler(UserRoundRobinScheduler):
+    """Scheduler that starts the next Schedulable of the user
+    who received the least wall time relative to their weight (weighted fair share),
+    instead of taking turns between users regardless of how long their work runs.
+    Finished Schedulables are charged with the wall time they took,
+    running ones with the time they are running so far.
+    Charged time decays exponentially, so that past usage is forgotten eventually.
+    Within the queue of a user, Schedulables are still ordered by priority."""
+    _weight_refresh_interval: float = 60.0
+    """Seconds after which the weight of a user is requested again"""
+
+    def __init__(self, weight_provider: Optional[Callable[[int], float]] = None,
+                 usage_half_life: float = 3600.0, **kwargs: Any):
+        """
+        :param weight_provider: Returns the weight of a user id, which has to be > 0.
+        A user with twice the weight of another one gets twice their share.
+        It is called when scheduling, so it may be slow but must be thread-safe.
+        All users have a weight of 1 if None
+        :param usage_half_life: The seconds after which charged time counts half
+        :param kwargs: The arguments of UserRoundRobinScheduler
+        """
+        assert usage_half_life > 0
+        # set up before the supervisor threads are started
+        self.__weight_provider: Optional[Callable[[int], float]] = weight_provider
+        self.__weights: dict[int, tuple[float, float]] = dict()
+        """user id -> (weight, time it was requested)"""
+        self.__usage_half_life: float = usage_half_life
+        self.__usage: dict[int, tuple[float, float]] = dict()
+        """user id -> (charged seconds, time they were last updated)"""
+        self.__running_since: dict[Schedulable, float] = dict()
+        super().__init__(**kwargs)
+
+    def schedule(self, to_schedule: Schedulable) -> None:
+        self.__refresh_weight(to_schedule.user_id)
+        super().schedule(to_schedule)
+
+    def log_debug_data(self) -> None:
+        super().log_debug_data()
+        now = time.monotonic()
+        for uid in list(self.__usage.keys()):
+            info(f"user {uid} was charged {self.__get_decayed_usage(uid, now):.1f}s "
+                 f"for finished work, with a weight of {self.__get_weight(uid)}")
+
+    def _get_next_schedulable(self, remote: bool = False) -> Optional[Schedulable]:
+        """Retrieves the next schedulable of the user with the least weighted usage,
+        who has one that may be started, to be run within __empty_queue only
+        :param remote: Whether the schedulable is to be run on a WorkerAgent"""
+        now = time.monotonic()
+        best: Optional[tuple[float, float, int]] = None
+        for uid, sched in self._get_waiting_users():
+            if not self._may_start(sched, remote):
+                continue
+            weight = self.__get_weight(uid)
+            usage, running = self.__get_usage(uid, now)
+            # users with equal usage, e.g. when they just started, take turns
+            key = (usage / weight, running / weight, uid)
+            if best is None or key < best:
+                best = key
+        if best is None:
+            return None
+        return self._pop_schedulable_of_user(best[2])
+
+    def _on_schedulable_started(self, sched: Schedulable) -> None:
+        self.__running_since[sched] = time.monotonic()
+
+    def _on_schedulable_finished(self, sched: Schedulable, seconds: float) -> None:
+        self.__running_since.pop(sched, None)
+        now = time.monotonic()
+        uid = sched.user_id
+        self.__usage[uid] = (self.__get_decayed_usage(uid, now) + seconds, now)
+
+    def __get_decayed_usage(self, user_id: int, now: float) -> float:
+        """The seconds charged to a user for finished Schedulables"""
+        seconds, updated = self.__usage.get(user_id, (0.0, now))
+        return seconds * 0.5 ** ((now - updated) / self.__usage_half_life)
+
+    def __get_usage(self, user_id: int, now: float) -> tuple[float, int]:
+        """:return: The seconds charged to a user including running Schedulables
+        and the number of running Schedulables of the user"""
+        usage = self.__get_decayed_usage(user_id, now)
+        running = 0
+        for sched, since in self.__running_since.items():
+            if sched.user_id == user_id:
+                usage += now - since
+                running += 1
+        return usage, running
+
+    def __get_weight(self, user_id: int) -> float:
+        return self.__weights.get(user_id, (1.0, 0.0))[0]
+
+    def __refresh_weight(self, user_id: int) -> None:
+        """Requests the weight of a user from the weight provider,
+        unless it was requested recently"""
+        if self.__weight_provider is None:
+            return
+        now = time.monotonic()
+        cached = self.__weights.get(user_id)
+        if cached is not None \
+                and now - cached[1] < FairShareScheduler._weight_refresh_interval:
+            return
+        weight = self.__get_weight(user_id)
+        try:
+            provided = float(self.__weight_provider(user_id))
+            if provided > 0:
+                weight = provided
+            else:
+                warning(f"ignoring weight {provided} of user {user_id}, "
+                        f"which is not positive")
+        except Exception as e:
+            warning(f"could not get the weight of user {user_id}: {e!r}")
+        self.__weights[user_id] = (weight, now)
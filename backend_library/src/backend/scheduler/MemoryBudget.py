@@ -0,0 +1,68 @@
+import os
+from typing import Optional
+
+
+class MemoryBudget:
+    """Keeps track of the memory reserved for running Schedulables,
+    see Schedulable.memory_estimate. Not thread-safe."""
+    _cgroup_limit_files: list[str] = ["/sys/fs/cgroup/memory.max",
+                                      "/sys/fs/cgroup/memory/memory.limit_in_bytes"]
+    """Files containing the memory limit of the cgroup of this process,
+    for cgroup v2 and v1 respectively"""
+
+    def __init__(self, limit: Optional[int] = None):
+        """
+        :param limit: The number of bytes that may be reserved at once,
+        None for no limit
+        """
+        assert limit is None or limit > 0
+        self._limit: Optional[int] = limit
+        self._used: int = 0
+
+    @property
+    def limit(self) -> Optional[int]:
+        return self._limit
+
+    @property
+    def used(self) -> int:
+        """The number of bytes currently reserved"""
+        return self._used
+
+    def fits(self, amount: int) -> bool:
+        """Whether amount bytes can be reserved without exceeding the limit.
+        Anything fits whilst nothing is reserved,
+        so that Schedulables estimated to exceed the whole limit still run eventually
+        """
+        return self._limit is None or self._used == 0 \
+            or self._used + amount <= self._limit
+
+    def reserve(self, amount: int) -> None:
+        """Reserves amount bytes, even if they do not fit"""
+        assert amount >= 0
+        self._used += amount
+
+    def release(self, amount: int) -> None:
+        """Releases amount bytes reserved earlier"""
+        assert 0 <= amount <= self._used
+        self._used -= amount
+
+    @staticmethod
+    def get_memory_limit(fraction: float = 1.0) -> int:
+        """Determines the memory available to this process,
+        which is the memory limit of its cgroup (e.g. of a container) if it has one
+        and otherwise the physical memory
+        :param fraction: The fraction of the available memory to return
+        :return: The available memory in bytes"""
+        assert 0 < fraction <= 1
+        limit = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+        for path in MemoryBudget._cgroup_limit_files:
+            try:
+                with open(path) as f:
+                    content = f.read().strip()
+            except OSError:
+                continue
+            # "max" (v2) or a huge number (v1) if the cgroup is unlimited
+            if content.isdigit():
+                limit = min(limit, int(content))
+            break
+        return int(limit * fraction)
@@ -0,0 +1,162 @@
+import functools
+import pickle
+from logging import debug, exception
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+from typing import Optional, Union
+
+from backend.scheduler.Schedulable import Schedulable
+from backend.scheduler.WorkerLimits import WorkerLimits
+from backend.scheduler.WorkerZygote import WorkerZygote, ZygoteChild
+
+
+class PooledWorker:
+    """A long-lived worker process executing the do_work function of Schedulables
+    sent to it over a pipe, instead of forking a new process for every Schedulable.
+    The process is replaced after a configurable number of Schedulables
+    and whenever it died (e.g. because it was killed by an abort)."""
+    _liveness_interval: float = 0.5
+    """Seconds between checks whether the worker process is still alive"""
+
+    def __init__(self, max_tasks: Optional[int] = None,
+                 zygote: Optional[WorkerZygote] = None,
+                 limits: WorkerLimits = WorkerLimits()):
+        """
+        :param max_tasks: The number of Schedulables after which the worker process
+        is replaced by a fresh one, None to never replace it
+        :param zygote: The zygote to fork worker processes from,
+        None (or a zygote that stopped running) to fork them from this process
+        :param limits: The limits the worker processes apply when they start
+        """
+        assert max_tasks is None or max_tasks > 0
+        self._max_tasks: Optional[int] = max_tasks
+        self._zygote: Optional[WorkerZygote] = zygote
+        self._limits: WorkerLimits = limits
+        self._task_count: int = 0
+        self._process: Optional[Union[Process, ZygoteChild]] = None
+        self._connection: Optional[Connection] = None
+
+    def _start(self) -> None:
+        """Starts a new worker process"""
+        self._task_count = 0
+        target = functools.partial(PooledWorker._worker_main, limits=self._limits)
+        forked = None if self._zygote is None else self._zygote.fork(target)
+        if forked is not None:
+            self._connection, self._process = forked
+            debug(f"forked pooled worker on PID {self._process.pid} from zygote")
+            return
+        main_end, worker_end = Pipe()
+        self._process = Process(target=target, args=(worker_end,), daemon=True)
+        self._process.start()
+        worker_end.close()
+        self._connection = main_end
+        debug(f"started pooled worker on PID {self._process.pid}")
+
+    def prepare(self) -> None:
+        """Starts (or replaces) the worker process if required,
+        so that submit usually does not have to"""
+        if self._process is None or not self._process.is_alive() \
+                or (self._max_tasks is not None
+                    and self._task_count >= self._max_tasks):
+            self.stop()
+            self._start()
+
+    @staticmethod
+    def serialize(sched: Schedulable) -> Optional[bytes]:
+        """Pickles a Schedulable to be sent to a worker process using send
+        :return: None if the Schedulable could not be pickled"""
+        assert sched.worker_pool_compatible
+        try:
+            return pickle.dumps(sched)
+        except (pickle.PicklingError, TypeError, AttributeError, RuntimeError):
+            return None
+
+    def send(self, data: bytes) -> None:
+        """Sends a Schedulable serialized by serialize to the worker process,
+        which starts its do_work. Does not start the worker process,
+        if it is not running (anymore) wait_for_result reports that instead.
+        prepare has to be called before."""
+        assert self._connection is not None, "call prepare first"
+        self._task_count += 1
+        try:
+            self._connection.send_bytes(data)
+        except OSError:
+            # the worker died in between, wait_for_result will report it
+            pass
+
+    def submit(self, sched: Schedulable) -> bool:
+        """Sends a Schedulable to the worker process, which starts its do_work.
+        Starts (or replaces) the worker process if required.
+        :return: False if the Schedulable could not be pickled,
+        in that case nothing was sent"""
+        data = PooledWorker.serialize(sched)
+        if data is None:
+            return False
+        self.prepare()
+        self.send(data)
+        return True
+
+    def wait_for_result(self) -> int:
+        """Waits for the Schedulable submitted last to finish
+        :return: the status code returned by do_work,
+        or the exit code of the worker process if it died whilst running it"""
+        # EOF on the pipe is not a reliable sign of the worker dying,
+        # as processes forked concurrently by other threads may inherit its end
+        try:
+            while not self._connection.poll(PooledWorker._liveness_interval):
+                if not self._process.is_alive() and not self._connection.poll():
+                    raise EOFError
+            return self._connection.recv()
+        except (EOFError, OSError):
+            self._process.join()
+            exitcode = self._process.exitcode
+            self.stop()
+            return exitcode
+
+    def stop(self) -> None:
+        """Stops the worker process, if running"""
+        if self._process is None:
+            return
+        if self._process.is_alive():
+            try:
+                self._connection.send_bytes(pickle.dumps(None))
+            except OSError:
+                pass
+            self._process.join(1)
+            if self._process.is_alive():
+                self._process.kill()
+                self._process.join()
+        self._connection.close()
+        self._process = None
+        self._connection = None
+
+    def kill(self) -> None:
+        """Kills the worker process, aborting the Schedulable it runs"""
+        if self._process is not None:
+            self._process.kill()
+
+    def is_alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    @property
+    def pid(self) -> Optional[int]:
+        """The PID of the current worker process"""
+        return None if self._process is None else self._process.pid
+
+    @staticmethod
+    def _worker_main(connection: Connection,
+                     limits: WorkerLimits = WorkerLimits()) -> None:
+        """main method executed by worker processes,
+        runs Schedulables until receiving None"""
+        # No coverage of this method is recorded as extra processes are not recorded
+        limits.apply()
+        while True:
+            sched: Optional[Schedulable] = pickle.loads(connection.recv_bytes())
+            if sched is None:
+                return
+            try:
+                r = sched.do_work()
+            except Exception as e:
+                exception(f"{sched} raised {e} in pooled worker")
+                r = 1
+            connection.send(0 if r is None else r)
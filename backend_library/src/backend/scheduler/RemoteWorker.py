@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import socket
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Mapping
+from logging import debug, info, warning
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Connection, Listener
+
+
+class RemoteJob(ABC):
+    """The computation of a Schedulable sent to a WorkerAgent on another host.
+    It is pickled, so its class has to be importable by the agent"""
+
+    @property
+    @abstractmethod
+    def resources(self) -> list[str]:
+        """The keys of the resources (e.g. datasets) the job requires.
+        The agent requests the resources it did not cache yet from the scheduler,
+        so resources with the same key must have the same contents"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def run(self, resources: Mapping[str, bytes], work_dir: str) -> object:
+        """Runs the job on the agent, in a process of its own
+        :param resources: The contents of the resources by their key
+        :param work_dir: A directory of the agent the job may store files in,
+        which is kept between jobs
+        :return: The picklable result sent back to the scheduler"""
+        raise NotImplementedError
+
+
+class RemoteWorker:
+    """Connection to a WorkerAgent that runs a single RemoteJob at a time.
+    Agents with several slots open a connection for each of them."""
+    liveness_interval: float = 5.0
+    """Seconds between checks whether an idle agent is still connected"""
+
+    def __init__(self, connection: Connection, name: str):
+        self._connection: Connection = connection
+        self._name: str = name
+        self._closed: bool = False
+
+    @property
+    def pid(self) -> str:
+        """Identifies the agent in logs"""
+        return self._name
+
+    def is_alive(self) -> bool:
+        return not self._closed
+
+    def check_connection(self) -> bool:
+        """Checks whether the agent is still connected,
+        to be called by the thread running jobs whilst no job runs
+        :return: False if the agent disconnected"""
+        try:
+            # idle agents do not send anything, unless they disconnect
+            if not self._closed and self._connection.poll():
+                self.stop()
+        except OSError:
+            self.stop()
+        return not self._closed
+
+    def run(self, job: RemoteJob,
+            resources: Mapping[str, Callable[[], bytes]]) -> object:
+        """Runs a job on the agent and waits for its result,
+        serving the resources the agent requests in the meantime
+        :param resources: Functions returning the contents of the resources
+        of the job by their key, called only if the agent requests them
+        :raises ConnectionError if the connection to the agent was lost,
+        e.g. as the agent stopped or the worker was killed
+        :raises RuntimeError if the job raised an error on the agent
+        :return: The result of the job"""
+        try:
+            self._connection.send(("run", job))
+            while True:
+                message = self._connection.recv()
+                if message[0] == "fetch":
+                    debug(f"sending {message[1]} to {self._name}")
+                    self._connection.send_bytes(resources[message[1]]())
+                elif message[0] == "ok":
+                    return message[1]
+                else:
+                    raise RuntimeError(message[1])
+        except (EOFError, OSError) as e:
+            self.stop()
+            raise ConnectionError(f"lost the connection to {self._name}") from e
+
+    def kill(self) -> None:
+        """Disconnects from the agent, which aborts the job it runs,
+        can be called from any thread"""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            # closing the connection does not wake a thread waiting in run
+            with socket.fromfd(self._connection.fileno(), socket.AF_INET,
+                               socket.SOCK_STREAM) as s:
+                s.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def stop(self) -> None:
+        """Disconnects from the agent"""
+        self.kill()
+        self._connection.close()
+
+    def __str__(self) -> str:
+        return f"remote worker {self._name}"
+
+
+class RemoteWorkerServer:
+    """Accepts the connections of WorkerAgents over TCP
+    and hands a RemoteWorker to the scheduler for each of them"""
+
+    def __init__(self, address: tuple[str, int], authkey: bytes,
+                 on_connected: Callable[[RemoteWorker], None]):
+        """
+        :param address: The host and port to listen on, port 0 for any free port
+        :param authkey: The key the agents have to authenticate with
+        :param on_connected: Called with every RemoteWorker that connected,
+        from the thread accepting connections
+        """
+        self._listener: Listener = Listener(address, "AF_INET", authkey=authkey)
+        self._on_connected: Callable[[RemoteWorker], None] = on_connected
+        self._stopped: bool = False
+        self._thread: threading.Thread = threading.Thread(
+            target=self.__serve_forever, daemon=True)
+        self._thread.start()
+        info(f"waiting for worker agents on {self.address}")
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """The address the server listens on"""
+        return self._listener.address
+
+    def stop(self) -> None:
+        """Stops accepting agents, agents that are connected already stay connected"""
+        if self._stopped:
+            return
+        self._stopped = True
+        host, port = self.address
+        # wake the accepting thread, an unauthenticated connection is rejected by it
+        try:
+            with socket.create_connection(
+                    ("127.0.0.1" if host == "0.0.0.0" else host, port), 1):
+                pass
+        except OSError:
+            pass
+        self._thread.join(10)
+        self._listener.close()
+
+    def __serve_forever(self) -> None:
+        while not self._stopped:
+            try:
+                connection = self._listener.accept()
+            except (AuthenticationError, EOFError, OSError) as e:
+                if not self._stopped:
+                    warning(f"rejected a worker agent: {e!r}")
+                continue
+            if self._stopped:
+                connection.close()
+                return
+            try:
+                message = connection.recv()
+                assert message[0] == "hello"
+            except (AssertionError, EOFError, OSError):
+                connection.close()
+                continue
+            worker = RemoteWorker(connection, message[1])
+            info(f"{worker} connected")
+            self._on_connected(worker)
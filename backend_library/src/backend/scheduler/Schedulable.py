@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 from typing import Optional
 
+from backend.scheduler.RemoteWorker import RemoteWorker
+
 
 class Schedulable(ABC):
     """
@@ -31,6 +33,47 @@ class Schedulable(ABC):
         """The priority of this Schedulable, between 0 and 100 (both inclusive)"""
         raise NotImplementedError
 
+    @property
+    def worker_pool_compatible(self) -> bool:
+        """Whether do_work may be executed by a long-lived worker process
+        instead of a process forked just for this Schedulable.
+        If True, the Schedulable must be picklable,
+        where pickling only has to preserve the state do_work depends on."""
+        return False
+
+    @property
+    def remote_compatible(self) -> bool:
+        """Whether do_remote_work may be executed instead of do_work,
+        to compute the result on a WorkerAgent on another host"""
+        return False
+
+    @property
+    def memory_estimate(self) -> int:
+        """The estimated number of bytes of memory needed whilst running this
+        Schedulable, including shared memory allocated by run_before_on_main,
+        0 if unknown or negligible.
+        Schedulers may wait with starting it until that much memory is available.
+        The memory estimate of a Schedulable must not change after scheduling."""
+        return 0
+
+    @property
+    def timeout(self) -> Optional[float]:
+        """The number of seconds do_work may run (wall-clock time),
+        None for no limit. If do_work exceeds it, the process or worker running it
+        is killed and on_timeout is executed instead.
+        Read when do_work is about to be started, so it may change whilst waiting,
+        do_work is not started at all if it is not positive anymore."""
+        return None
+
+    def on_timeout(self) -> int:
+        """
+        Executed on the main Process after do_work was killed or not started,
+        as it exceeded the timeout. run_later_on_main is executed afterwards.
+        May be executed on an extra thread of the main Process.
+        :return: The statuscode provided to the run_later_on_main function
+        """
+        return 1
+
     def run_before_on_main(self) -> None:
         """
         Is executed before the do_work function on the main Process.
@@ -53,6 +96,18 @@ class Schedulable(ABC):
         """
         raise NotImplementedError
 
+    def do_remote_work(self, worker: RemoteWorker) -> Optional[int]:
+        """
+        Does the same as do_work, but runs the computation on a WorkerAgent
+        using worker.run. Executed on an extra thread of the main process instead of
+        do_work, only if remote_compatible.
+        Aborts disconnect the worker, making worker.run raise a ConnectionError.
+        :raises ConnectionError if the connection to the worker was lost,
+        the Schedulable is run by do_work instead then, unless it was aborted
+        :return: Optionally an integer status provided to the run_later_on_main function
+        """
+        raise NotImplementedError
+
     def run_later_on_main(self, statuscode: Optional[int]) -> None:
         """
         Executed after do_work finished on the main Process.
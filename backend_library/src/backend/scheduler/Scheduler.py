@@ -4,6 +4,7 @@ from abc import ABC, abstractmethod
 from collections.abc import Callable
 from typing import Optional
 
+from backend.instrumentation.Instrumentation import Instrumentation
 from backend.scheduler.Schedulable import Schedulable
 
 
@@ -72,6 +73,19 @@ class Scheduler(ABC):
         false if that feature is not supported """
         raise NotImplementedError
 
+    def preload(self, func: Callable[..., object], *args: object) -> None:
+        """Hints that Schedulables scheduled later on will require
+        the side effects of func(*args), e.g. imported modules.
+        Schedulers may execute it in advance for processes they start later on.
+        :param func: A function picklable by reference, e.g. a module level function
+        :param args: Picklable arguments of func"""
+        return None
+
+    def render_metrics(self) -> str:
+        """Returns the metrics of the scheduler and the work it ran
+        in the Prometheus text exposition format"""
+        return Instrumentation.render()
+
     def log_debug_data(self) -> None:
         """Logs data implementation optional"""
         return None
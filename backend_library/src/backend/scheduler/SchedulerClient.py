@@ -0,0 +1,105 @@
+import threading
+import time
+from collections.abc import Callable
+from logging import warning
+from multiprocessing.connection import Client, Connection
+from typing import Optional
+
+from backend.scheduler.Schedulable import Schedulable
+from backend.scheduler.Scheduler import Scheduler
+
+
+class SchedulerClient(Scheduler):
+    """Scheduler forwarding all calls to a SchedulerDaemon running in another process.
+    Schedulables are pickled, so they are executed on copies of them,
+    and their callbacks are executed in the process of the daemon.
+    Shutting down the client only disconnects it,
+    the daemon keeps running the Schedulables scheduled through it."""
+    _connect_timeout: float = 10.0
+    """Seconds to wait for the daemon to accept connections, e.g. whilst it starts"""
+    _retry_interval: float = 0.1
+
+    def __init__(self, address: str, authkey: bytes):
+        """
+        :param address: The path of the Unix socket the daemon listens on
+        :param authkey: The key to authenticate with at the daemon
+        """
+        super().__init__()
+        self.__address: str = address
+        self.__authkey: bytes = authkey
+        self.__lock: threading.Lock = threading.Lock()
+        self.__connection: Optional[Connection] = None
+
+    def schedule(self, to_schedule: Schedulable) -> None:
+        self.__request("schedule", to_schedule)
+
+    def abort_by_task(self, task_id: int) -> None:
+        self.__request("abort_by_task", task_id)
+
+    def abort_by_user(self, user_id: int) -> None:
+        self.__request("abort_by_user", user_id)
+
+    def hard_shutdown(self) -> None:
+        self.__disconnect()
+
+    def graceful_shutdown(self,
+                          on_shutdown_completed: Optional[Callable[[], None]] = None) \
+            -> None:
+        self.__disconnect()
+        if on_shutdown_completed is not None:
+            on_shutdown_completed()
+
+    def is_shutting_down(self) -> bool:
+        return self.__request("is_shutting_down")
+
+    def preload(self, func: Callable[..., object], *args: object) -> None:
+        self.__request("preload", func, *args)
+
+    def log_debug_data(self) -> None:
+        """Makes the daemon log its debug data"""
+        self.__request("log_debug_data")
+
+    def render_metrics(self) -> str:
+        """Returns the metrics of the daemon, which runs the Schedulables"""
+        return self.__request("render_metrics")
+
+    def __request(self, command: str, *args: object) -> object:
+        """Executes a method of the scheduler in the daemon,
+        reconnecting once if the connection was lost, e.g. as the daemon restarted
+        :raises ConnectionError if the daemon can not be reached
+        :return: The value returned by the method"""
+        with self.__lock:
+            for attempt in range(2):
+                if self.__connection is None:
+                    self.__connection = self.__connect()
+                try:
+                    self.__connection.send((command, *args))
+                    status, value = self.__connection.recv()
+                    break
+                except (EOFError, OSError) as e:
+                    self.__connection.close()
+                    self.__connection = None
+                    if attempt == 1:
+                        raise ConnectionError("lost connection to scheduler daemon") \
+                            from e
+                    warning(f"lost connection to scheduler daemon: {e!r}, reconnecting")
+        if status == "error":
+            raise value
+        return value
+
+    def __connect(self) -> Connection:
+        deadline = time.monotonic() + SchedulerClient._connect_timeout
+        while True:
+            try:
+                return Client(self.__address, "AF_UNIX", authkey=self.__authkey)
+            except (FileNotFoundError, ConnectionRefusedError) as e:
+                if time.monotonic() >= deadline:
+                    raise ConnectionError(f"scheduler daemon is not listening on "
+                                          f"{self.__address}") from e
+                time.sleep(SchedulerClient._retry_interval)
+
+    def __disconnect(self) -> None:
+        with self.__lock:
+            if self.__connection is not None:
+                self.__connection.close()
+                self.__connection = None
@@ -0,0 +1,115 @@
+import os
+import socket
+import stat
+import threading
+from logging import debug, warning
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Connection, Listener
+
+from backend.scheduler.Scheduler import Scheduler
+
+
+class SchedulerDaemon:
+    """Serves a Scheduler to other processes over a Unix socket,
+    so that several processes (e.g. all webserver workers) share a single scheduler.
+    Other processes access it through a SchedulerClient."""
+    _commands: frozenset[str] = frozenset({
+        "schedule", "abort_by_task", "abort_by_user", "is_shutting_down",
+        "log_debug_data", "preload", "render_metrics"})
+    """The methods of the Scheduler that may be called by clients"""
+
+    def __init__(self, scheduler: Scheduler, address: str, authkey: bytes):
+        """
+        :param scheduler: The scheduler executing the requests of clients
+        :param address: The path of the Unix socket to listen on,
+        a stale socket left behind by a crashed daemon is replaced
+        :param authkey: The key clients have to authenticate with
+        :raises RuntimeError if another daemon is already listening on address
+        """
+        self.__scheduler: Scheduler = scheduler
+        self.__address: str = address
+        SchedulerDaemon.__remove_stale_socket(address)
+        self.__listener: Listener = Listener(address, "AF_UNIX", authkey=authkey)
+        os.chmod(address, stat.S_IRUSR | stat.S_IWUSR)
+        self.__stopped: bool = False
+
+    @property
+    def address(self) -> str:
+        return self.__address
+
+    def serve_forever(self) -> None:
+        """Accepts clients until stop is called, serving each one in its own thread"""
+        try:
+            while not self.__stopped:
+                try:
+                    connection = self.__listener.accept()
+                except (AuthenticationError, OSError, EOFError) as e:
+                    if not self.__stopped:
+                        warning(f"scheduler daemon rejected a client: {e!r}")
+                    continue
+                if self.__stopped:
+                    connection.close()
+                    break
+                threading.Thread(target=self.__serve, args=(connection,),
+                                 name="scheduler client", daemon=True).start()
+        finally:
+            self.__listener.close()
+
+    def stop(self) -> None:
+        """Makes serve_forever return, may be called from a signal handler.
+        The scheduler itself is not shut down"""
+        self.__stopped = True
+        # wake up the accepting thread without waiting for the handshake
+        with socket.socket(socket.AF_UNIX) as wakeup:
+            try:
+                wakeup.connect(self.__address)
+            except OSError:
+                pass
+
+    def __serve(self, connection: Connection) -> None:
+        """Answers the requests of a single client until it disconnects"""
+        with connection:
+            while True:
+                try:
+                    request = connection.recv()
+                except (EOFError, OSError):
+                    return
+                except Exception as e:
+                    # the request could not be unpickled
+                    SchedulerDaemon.__reply(connection, ("error", e))
+                    continue
+                SchedulerDaemon.__reply(connection, self.__execute(request))
+
+    def __execute(self, request: tuple) -> tuple[str, object]:
+        """Executes a request of a client on the scheduler
+        :return: ("ok", return value) or ("error", raised exception)"""
+        command, args = request[0], request[1:]
+        if command not in SchedulerDaemon._commands:
+            return "error", ValueError(f"unknown scheduler command {command!r}")
+        debug(f"scheduler daemon executes {command}")
+        try:
+            return "ok", getattr(self.__scheduler, command)(*args)
+        except Exception as e:
+            return "error", e
+
+    @staticmethod
+    def __reply(connection: Connection, reply: tuple[str, object]) -> None:
+        try:
+            connection.send(reply)
+        except OSError:
+            pass
+        except Exception as e:
+            # the exception raised by the scheduler could not be pickled
+            connection.send(("error", RuntimeError(repr(e))))
+
+    @staticmethod
+    def __remove_stale_socket(address: str) -> None:
+        if not os.path.exists(address):
+            return
+        with socket.socket(socket.AF_UNIX) as probe:
+            try:
+                probe.connect(address)
+            except OSError:
+                os.unlink(address)
+                return
+        raise RuntimeError(f"a scheduler daemon is already listening on {address}")
@@ -1,27 +1,116 @@
+from __future__ import annotations
+
 import heapq
 import itertools
 import multiprocessing
+import os
 import sys
 import threading
-from collections import OrderedDict
-from collections.abc import Callable
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable, Iterable, Iterator
 from dataclasses import dataclass, field
 from datetime import datetime
-from logging import info, debug, critical
+from logging import info, debug, critical, warning, exception
 from multiprocessing import Condition, Process, synchronize
+from multiprocessing.connection import wait
 from threading import Thread
-from typing import Optional
+from typing import Optional, Union
 
+from backend.instrumentation.Instrumentation import Instrumentation
+from backend.scheduler.MemoryBudget import MemoryBudget
+from backend.scheduler.PooledWorker import PooledWorker
+from backend.scheduler.RemoteWorker import RemoteWorker, RemoteWorkerServer
 from backend.scheduler.Schedulable import Schedulable
 from backend.scheduler.Scheduler import Scheduler
+from backend.scheduler.WorkerLimits import WorkerLimits
+from backend.scheduler.WorkerZygote import WorkerZygote
+
+_queue_depth = Instrumentation.gauge(
+    "sop_scheduler_queue_depth", "Schedulables waiting in the queue of each user")
+_running_workers = Instrumentation.gauge(
+    "sop_scheduler_running_workers", "Schedulables that are currently running")
+_memory_reserved = Instrumentation.gauge(
+    "sop_scheduler_memory_reserved_bytes",
+    "Memory estimates of the running Schedulables in bytes")
+_wait_seconds = Instrumentation.histogram(
+    "sop_scheduler_wait_seconds",
+    "Seconds Schedulables waited in their queue until they were started")
+_wait_quantiles = Instrumentation.gauge(
+    "sop_scheduler_wait_seconds_quantile",
+    "Estimated quantiles of the seconds Schedulables waited in their queue")
+_oldest_wait = Instrumentation.gauge(
+    "sop_scheduler_oldest_wait_seconds",
+    "Seconds the longest waiting Schedulable of each user is waiting so far")
+_run_seconds = Instrumentation.histogram(
+    "sop_scheduler_run_seconds",
+    "Seconds from starting a Schedulable until it finished or was aborted")
+_aborts = Instrumentation.counter(
+    "sop_scheduler_aborts_total", "Schedulables aborted whilst waiting or running")
+_errors = Instrumentation.counter(
+    "sop_scheduler_errors_total", "Schedulables that finished with an error status")
+_timeouts = Instrumentation.counter(
+    "sop_scheduler_timeouts_total", "Schedulables that exceeded their timeout")
 
 
 class UserRoundRobinScheduler(Scheduler):
     """Scheduler that schedules round-robin by user id
-    with priorities within the user queues,
-    supports abort_by_user, abort_by_task and graceful_shutdown"""
+    with priorities within the user queues, which optionally grow whilst waiting,
+    supports abort_by_user, abort_by_task and graceful_shutdown.
+    Kills the workers of Schedulables exceeding their timeout.
+    Supervises the worker processes either with a thread for each of them
+    or with a single event loop thread waiting for all of them at once.
+    Optionally only starts Schedulables whilst their total memory estimate
+    stays within a limit, Schedulables exceeding it wait in their queue"""
 
-    def __init__(self):
+    def __init__(self, use_worker_pool: bool = False,
+                 worker_max_tasks: Optional[int] = None,
+                 use_zygote: bool = False,
+                 zygote_preload_modules: Iterable[str] = (),
+                 memory_limit: Optional[int] = None,
+                 worker_count: Optional[int] = None,
+                 worker_threads: Optional[int] = None,
+                 pin_workers: bool = False,
+                 remote_worker_address: Optional[tuple[str, int]] = None,
+                 remote_worker_authkey: Optional[bytes] = None,
+                 event_loop: bool = False,
+                 priority_aging: float = 0.0):
+        """
+        :param use_worker_pool: Whether every supervisor thread keeps a long-lived
+        worker process to run worker pool compatible Schedulables,
+        instead of forking a new process for each of them
+        :param worker_max_tasks: The number of Schedulables after which
+        a long-lived worker process is replaced, None to never replace them
+        :param use_zygote: Whether the long-lived worker processes are forked
+        from a zygote process importing expensive modules once for all of them.
+        Only used together with the worker pool, Schedulables that are not
+        worker pool compatible are still forked from this process,
+        as they depend on its state
+        :param zygote_preload_modules: The names of the modules the zygote imports
+        :param memory_limit: The number of bytes the memory estimates of all running
+        Schedulables may add up to, None for no limit.
+        Schedulables with a priority of 100 are started regardless of it
+        :param worker_count: The number of supervisor threads, i.e. the number of
+        Schedulables running at once, None for the number of CPUs available
+        (taking the CPU quota of a container into account)
+        :param worker_threads: The number of threads the numerical libraries
+        (BLAS, OpenMP, torch) may use in each worker process, None for no limit
+        :param pin_workers: Whether the worker processes of each supervisor thread
+        are restricted to their own CPU, so that they do not compete for CPUs
+        :param remote_worker_address: The host and port to accept WorkerAgents on,
+        which run remote compatible Schedulables on other hosts in addition to the
+        supervisor threads of this process, None to not accept any
+        :param remote_worker_authkey: The key WorkerAgents authenticate with
+        :param event_loop: Whether a single thread starts and supervises all
+        worker processes of this host, instead of a supervisor thread for each of them,
+        which scales to many more workers. The worker pool is not used then,
+        and run_before_on_main, run_later_on_main and on_timeout of all Schedulables
+        run one after another on that thread
+        :param priority_aging: The priority a Schedulable gains per second it waits,
+        so that Schedulables of lower priority are not starved by a steady stream of
+        Schedulables of higher priority of the same user. Only affects the order
+        within the queue of a user, 0 to strictly prefer higher priorities
+        """
         super().__init__()
         UserRoundRobinScheduler.__start_by_fork()
         try:
@@ -48,18 +137,56 @@ class UserRoundRobinScheduler(Scheduler):
             # Running on an interpreter without shitty resource tracker
             # => nothing to worry about
             pass
+        if event_loop and use_worker_pool:
+            warning("the worker pool is not used by the event loop, ignoring it")
+            use_worker_pool = False
+        self.__use_worker_pool: bool = use_worker_pool
+        self.__worker_max_tasks: Optional[int] = worker_max_tasks
+        if use_zygote and not use_worker_pool:
+            warning("the worker zygote is only used with the worker pool, ignoring it")
+        self.__zygote: Optional[WorkerZygote] = \
+            WorkerZygote(zygote_preload_modules) \
+            if use_worker_pool and use_zygote else None
         self.__shutdown_ongoing: bool = False
         self.__on_shutdown_completed: Optional[Callable[[], None]] = None
         self.__empty_queue: synchronize.Condition = Condition()
         self.__threads: set[Thread] = set()
+        # the queues of the users with waiting Schedulables in the order they are
+        # served, the Schedulable on top of each queue is never cancelled
         self.__user_queues: OrderedDict[int, list[PrioritizedSchedulable]] \
             = OrderedDict()
-        self.__next_queue: int = -1
-        self.__running: dict[Schedulable, tuple[Process, bool]] = dict()
+        # task id -> sequence number -> waiting Schedulable of that task
+        self.__task_index: dict[int, dict[int, PrioritizedSchedulable]] = dict()
+        self.__sequence: Iterator[int] = itertools.count()
+        assert priority_aging >= 0
+        self.__priority_aging: float = priority_aging
+        self.__running: dict[Schedulable, tuple[Union[Process, PooledWorker,
+                                                      RemoteWorker], bool]] = dict()
+        self.__timed_out: set[Schedulable] = set()
+        """The running Schedulables that were killed as they exceeded their timeout"""
+        self.__deadlines: dict[Schedulable, float] = dict()
+        """The time.monotonic() at which running Schedulables exceed their timeout"""
+        self.__immediate: deque[Schedulable] = deque()
+        """Schedulables with a priority of 100 the event loop did not start yet"""
+        self.__wakeup: Optional[tuple[int, int]] = None
+        """The pipe interrupting the event loop, None if it is not used"""
+        self.__memory: MemoryBudget = MemoryBudget(memory_limit)
+        assert worker_count is None or worker_count > 0
+        self.__worker_count: Optional[int] = worker_count
+        self.__worker_threads: Optional[int] = worker_threads
+        self.__pin_workers: bool = pin_workers
         count = self._get_targeted_worker_count()
         debug(f"starting urrs with {count} workers")
-        for i in range(count):
-            self.__make_worker_thread()
+        if event_loop:
+            self.__make_event_loop_thread(count)
+        else:
+            for i in range(count):
+                self.__make_worker_thread(i)
+        self.__remote_workers: Optional[RemoteWorkerServer] = None
+        if remote_worker_address is not None:
+            assert remote_worker_authkey is not None
+            self.__remote_workers = RemoteWorkerServer(
+                remote_worker_address, remote_worker_authkey, self.__add_remote_worker)
 
     @staticmethod
     def __start_by_fork():
@@ -71,44 +198,123 @@ class UserRoundRobinScheduler(Scheduler):
         assert multiprocessing.get_start_method(True) == "fork", \
             "apparently the setting the start method of processes was not possible"
 
-    def __make_worker_thread(self):
-        """Creates a new supervisor thread"""
+    def __make_worker_thread(self, index: int):
+        """Creates a new supervisor thread
+        :param index: The number of the supervisor thread, which decides its CPU"""
         t = Thread(
             target=UserRoundRobinScheduler.__thread_main,
-            args=(self,), daemon=True)
+            args=(self, self.__get_worker_limits(index)), daemon=True)
+        self.__threads.add(t)
+        t.start()
+
+    def __make_event_loop_thread(self, slot_count: int) -> None:
+        """Creates the thread running the event loop
+        :param slot_count: The number of worker processes it runs at once"""
+        self.__wakeup = os.pipe()
+        for fd in self.__wakeup:
+            os.set_blocking(fd, False)
+        t = Thread(target=UserRoundRobinScheduler.__event_loop_main,
+                   args=(self, slot_count), daemon=True)
         self.__threads.add(t)
         t.start()
 
+    def __wake(self) -> None:
+        """Interrupts the event loop waiting for worker processes, if it is used,
+        to be run within __empty_queue only"""
+        if self.__wakeup is None:
+            return
+        try:
+            os.write(self.__wakeup[1], b"\0")
+        except BlockingIOError:
+            # the event loop did not read the previous wake-ups yet
+            pass
+
+    def __add_remote_worker(self, worker: RemoteWorker) -> None:
+        """Creates a new supervisor thread running Schedulables on a WorkerAgent"""
+        with self.__empty_queue:
+            if self.__shutdown_ongoing:
+                worker.stop()
+                return
+            t = Thread(
+                target=UserRoundRobinScheduler.__remote_thread_main,
+                args=(self, worker), daemon=True)
+            self.__threads.add(t)
+            t.start()
+
+    @property
+    def remote_worker_address(self) -> Optional[tuple[str, int]]:
+        """The address WorkerAgents connect to, None if they are not accepted"""
+        return None if self.__remote_workers is None \
+            else self.__remote_workers.address
+
     def abort_by_task(self, task_id: int) -> None:
-        self.__abort(lambda x: x.task_id == task_id)
+        with self.__empty_queue:
+            entries = self.__task_index.pop(task_id, dict())
+            # leave tombstones in the queues instead of searching them
+            user_ids = set()
+            for entry in entries.values():
+                entry.cancelled = True
+                entry.schedulable.run_later_on_main(None)
+                _aborts.inc(schedulable=type(entry.schedulable).__name__)
+                user_ids.add(entry.user_id)
+            for uid in user_ids:
+                self.__drop_cancelled(uid)
+            self.__abort_running(lambda x: x.task_id == task_id)
 
     def abort_by_user(self, user_id: int) -> None:
-        self.__abort(lambda x: x.user_id == user_id)
+        with self.__empty_queue:
+            self.__cancel_queue(user_id)
+            self.__abort_running(lambda x: x.user_id == user_id)
+
+    def preload(self, func: Callable[..., object], *args: object) -> None:
+        if self.__zygote is not None:
+            self.__zygote.preload(func, *args)
 
     def log_debug_data(self):
         info(f"[{datetime.now()}] Printing currently registered tasks:")
         with self.__empty_queue:
+            info(f"{self.__memory.used} bytes of memory are reserved, "
+                 f"the limit is {self.__memory.limit}")
             for running in self.__running.items():
                 info(f"{running[0]} is registered as running on PID {running[1][0].pid}"
                      f" is alive returns {running[1][0].is_alive()}")
             for q in self.__user_queues.values():
                 for ps in q:
-                    info(f"{ps.schedulable} is waiting in queue")
+                    if not ps.cancelled:
+                        info(f"{ps.schedulable} is waiting in queue")
+
+    def render_metrics(self) -> str:
+        now = time.monotonic()
+        with self.__empty_queue:
+            _queue_depth.clear()
+            _oldest_wait.clear()
+            for uid, q in self.__user_queues.items():
+                waiting = [ps.enqueued for ps in q if not ps.cancelled]
+                _queue_depth.set(len(waiting), user=uid)
+                if len(waiting) > 0:
+                    _oldest_wait.set(now - min(waiting), user=uid)
+            _running_workers.set(len(self.__running))
+            _memory_reserved.set(self.__memory.used)
+        _wait_quantiles.clear()
+        for labels in _wait_seconds.get_label_values():
+            for quantile in (0.5, 0.9, 0.99):
+                _wait_quantiles.set(_wait_seconds.get_quantile(quantile, **labels),
+                                    quantile=quantile, **labels)
+        return super().render_metrics()
 
-    def __abort(self, selector: Callable[[Schedulable], bool]):
-        """Aborts all Tasks matching the selector provided"""
+    def __cancel_queue(self, user_id: int) -> None:
+        """Aborts all waiting Schedulables of a user, to be run within __empty_queue"""
+        for entry in self.__user_queues.pop(user_id, []):
+            if not entry.cancelled:
+                self.__unindex(entry)
+                entry.schedulable.run_later_on_main(None)
+                _aborts.inc(schedulable=type(entry.schedulable).__name__)
+
+    def __abort_running(self, selector: Callable[[Schedulable], bool]):
+        """Aborts all running Schedulables matching the selector provided,
+        there are at most as many as there are supervisor threads
+        and Schedulables with a priority of 100"""
         with self.__empty_queue:
-            for _, q in self.__user_queues.items():
-                i = 0
-                while i < len(q):
-                    if selector(q[i].schedulable):
-                        # there is no way to delete nicely from python heapqs
-                        q[i].schedulable.run_later_on_main(None)
-                        q[i] = q[-1]
-                        q.pop()
-                        heapq.heapify(q)
-                    else:
-                        i = i + 1
             for k, v in self.__running.items():
                 if selector(k) and not v[1]:
                     self.__running[k] = (v[0], True)
@@ -118,13 +324,40 @@ class UserRoundRobinScheduler(Scheduler):
                         # Has just stopped, ignore
                         pass
 
+    def __unindex(self, entry: PrioritizedSchedulable) -> None:
+        """Removes a waiting Schedulable from the task index"""
+        task_entries = self.__task_index[entry.task_id]
+        del task_entries[entry.sequence]
+        if len(task_entries) == 0:
+            del self.__task_index[entry.task_id]
+
+    def __drop_cancelled(self, user_id: int) -> None:
+        """Removes the cancelled Schedulables from the top of the queue of a user
+        and retires the queue once it is empty"""
+        q = self.__user_queues.get(user_id)
+        if q is None:
+            return
+        while len(q) > 0 and q[0].cancelled:
+            heapq.heappop(q)
+        if len(q) == 0:
+            del self.__user_queues[user_id]
+
     def hard_shutdown(self) -> None:
         critical("hard shutdown of urrs requested")
         with self.__empty_queue:
             self.__on_shutdown_completed = None
             self.__shutdown_ongoing = True
-            self.__abort(lambda _: True)
+            for uid in list(self.__user_queues.keys()):
+                self.__cancel_queue(uid)
+            while len(self.__immediate) > 0:
+                self.__immediate.popleft().run_later_on_main(None)
+            self.__abort_running(lambda _: True)
             self.__empty_queue.notify_all()
+            self.__wake()
+        if self.__zygote is not None:
+            self.__zygote.stop()
+        if self.__remote_workers is not None:
+            self.__remote_workers.stop()
 
     def graceful_shutdown(self,
                           on_shutdown_completed: Optional[Callable] = None) -> None:
@@ -132,7 +365,12 @@ class UserRoundRobinScheduler(Scheduler):
             self.__shutdown_ongoing = True
             self.__on_shutdown_completed = on_shutdown_completed
             self.__user_queues = OrderedDict()
+            self.__task_index = dict()
+            self.__immediate.clear()
             self.__empty_queue.notify_all()
+            self.__wake()
+        if self.__remote_workers is not None:
+            self.__remote_workers.stop()
 
     def is_shutting_down(self) -> bool:
         return self.__shutdown_ongoing
@@ -144,6 +382,11 @@ class UserRoundRobinScheduler(Scheduler):
         assert tid >= -1
         priority = to_schedule.priority
         assert 0 <= priority <= 100
+        if priority == 100 and self.__wakeup is not None:
+            with self.__empty_queue:
+                self.__immediate.append(to_schedule)
+                self.__wake()
+            return
         if priority == 100:
             t = Thread(
                 target=UserRoundRobinScheduler._run_single,
@@ -153,107 +396,486 @@ class UserRoundRobinScheduler(Scheduler):
             return
         with self.__empty_queue:
             if uid not in self.__user_queues:
-                self.__next_queue = len(self.__user_queues)
                 self.__user_queues[uid] = []
-            prioritized_schedulable = PrioritizedSchedulable(to_schedule, priority)
-            heapq.heappush(self.__user_queues[uid], prioritized_schedulable)
+                # a user who was not waiting is served next
+                self.__user_queues.move_to_end(uid, False)
+            entry = PrioritizedSchedulable(to_schedule, priority, next(self.__sequence),
+                                           self.__priority_aging)
+            heapq.heappush(self.__user_queues[uid], entry)
+            self.__task_index.setdefault(tid, dict())[entry.sequence] = entry
             self.__empty_queue.notify()
+            self.__wake()
+
+    def __get_worker_limits(self, index: Optional[int]) -> WorkerLimits:
+        """Returns the limits of the worker processes of a supervisor thread
+        :param index: The number of the supervisor thread,
+        None for threads running a single Schedulable, which are not pinned"""
+        cpus = None
+        if self.__pin_workers and index is not None:
+            available = WorkerLimits.get_available_cpus()
+            cpus = [available[index % len(available)]]
+        return WorkerLimits(self.__worker_threads, cpus)
 
     def _run_single(self, sched: Schedulable):
-        self._run_schedulable(lambda: sched)
+        self._run_schedulable(lambda: sched, limits=self.__get_worker_limits(None))
         self.__threads.discard(threading.current_thread())
 
-    def __process_main(self, sched: Schedulable):
+    def __process_main(self, sched: Schedulable, limits: WorkerLimits):
         """main method executed by worker processes,
          just runs a schedulable and dies with it's statuscode"""
         # No coverage of this method is recorded as extra processes are not recorded,
         # and an extra unittest of this method is not possible,
         # as it would also exit the unittest process
 
+        limits.apply()
         r = sched.do_work()
         sys.exit(0 if r is None else r)
 
-    def __thread_main(self) -> None:
+    def __thread_main(self, limits: WorkerLimits) -> None:
         """main method executed by supervisor threads,
-        starts worker processes when schedulables are available"""
+        starts worker processes when schedulables are available
+        :param limits: The limits of the worker processes started by this thread"""
+        worker = PooledWorker(self.__worker_max_tasks, self.__zygote, limits) \
+            if self.__use_worker_pool else None
         while not self.__shutdown_ongoing:
-            if self._run_schedulable(self._get_next_schedulable):
+            if self._run_schedulable(self._get_next_schedulable, worker, limits):
+                break
+        if worker is not None:
+            worker.stop()
+        self.__handle_shutdown()
+
+    def __remote_thread_main(self, worker: RemoteWorker) -> None:
+        """main method executed by supervisor threads of WorkerAgents,
+        runs remote compatible schedulables until the agent disconnects"""
+        limits = self.__get_worker_limits(None)
+        while not self.__shutdown_ongoing and worker.is_alive():
+            if self._run_schedulable(lambda: self._get_next_schedulable(True),
+                                     worker, limits):
+                break
+        worker.stop()
+        if self.__shutdown_ongoing:
+            self.__handle_shutdown()
+        else:
+            with self.__empty_queue:
+                self.__threads.discard(threading.current_thread())
+
+    def __event_loop_main(self, slot_count: int) -> None:
+        """main method executed by the event loop thread,
+        starts worker processes whilst Schedulables are available and slots are free
+        and waits for all of them at once
+        :param slot_count: The number of worker processes to run at once,
+        not counting the ones of Schedulables with a priority of 100"""
+        free_slots = list(reversed(range(slot_count)))
+        running: dict[int, SupervisedProcess] = dict()
+        """The started worker processes by their sentinel"""
+        while True:
+            while self.__start_supervised(free_slots, running):
+                pass
+            if self.__shutdown_ongoing and len(running) == 0:
                 break
+            timeout = self.__expire_supervised(running)
+            for ready in wait([self.__wakeup[0], *running.keys()], timeout):
+                if ready == self.__wakeup[0]:
+                    os.read(self.__wakeup[0], 4096)
+                else:
+                    self.__finish_supervised(running.pop(ready), free_slots)
+        with self.__empty_queue:
+            for fd in self.__wakeup:
+                os.close(fd)
+            self.__wakeup = None
         self.__handle_shutdown()
 
+    def __start_supervised(self, free_slots: list[int],
+                           running: dict[int, SupervisedProcess]) -> bool:
+        """Starts the worker process of the next Schedulable for the event loop,
+        if there is one that may be started
+        :param free_slots: The slots without a running worker process
+        :param running: The started worker processes by their sentinel
+        :return: False if no Schedulable was selected"""
+        with self.__empty_queue:
+            if self.__shutdown_ongoing:
+                return False
+            slot = None
+            if len(self.__immediate) > 0:
+                next_sched = self.__immediate.popleft()
+            elif len(free_slots) > 0:
+                next_sched = self._get_next_schedulable()
+                if next_sched is None:
+                    return False
+                slot = free_slots.pop()
+            else:
+                return False
+            limits = self.__get_worker_limits(slot)
+            p, memory_estimate = self.__reserve(next_sched, None, limits)
+        entry = SupervisedProcess(next_sched, p, slot, memory_estimate,
+                                  time.monotonic())
+        debug(f"preparing to run {next_sched} (prio: {next_sched.priority})")
+        next_sched.run_before_on_main()
+        with self.__empty_queue:
+            started = self.__start_selected(next_sched, p)
+        if started and next_sched not in self.__timed_out:
+            running[p.sentinel] = entry
+        elif started:
+            self.__finish_supervised(entry, free_slots)
+        else:
+            self.__release(next_sched, memory_estimate, entry.start)
+            if slot is not None:
+                free_slots.append(slot)
+        return True
+
+    def __expire_supervised(self, running: dict[int, SupervisedProcess]) \
+            -> Optional[float]:
+        """Kills the worker processes supervised by the event loop
+        whose Schedulables exceeded their timeout
+        :return: The seconds until the next timeout expires, None if there is none"""
+        now = time.monotonic()
+        remaining = None
+        for entry in running.values():
+            deadline = self.__deadlines.get(entry.schedulable)
+            if deadline is None:
+                continue
+            if deadline <= now:
+                self.__on_timeout(entry.schedulable)
+            elif remaining is None or deadline - now < remaining:
+                remaining = deadline - now
+        return remaining
+
+    def __finish_supervised(self, entry: SupervisedProcess,
+                            free_slots: list[int]) -> None:
+        """Reports the outcome of a Schedulable started by the event loop
+        and frees its slot"""
+        exitcode = None
+        # the process was not started if the timeout expired whilst waiting
+        if entry.process.pid is not None:
+            entry.process.join()
+            exitcode = entry.process.exitcode
+        self.__finish_selected(entry.schedulable, exitcode)
+        self.__release(entry.schedulable, entry.memory_estimate, entry.start)
+        if entry.slot is not None:
+            free_slots.append(entry.slot)
+
     def __handle_shutdown(self) -> None:
         """Handles a graceful shutdown when detected"""
         if self.__on_shutdown_completed is not None:
             with self.__empty_queue:
                 self.__threads.discard(threading.current_thread())
                 if len(self.__threads) == 0:
+                    if self.__zygote is not None:
+                        self.__zygote.stop()
                     self.__on_shutdown_completed()
 
-    def _get_next_schedulable(self) -> Optional[Schedulable]:
-        """Retrieves the next schedulable to run, to be run within __empty_queue only"""
-        if self.__next_queue == -1:
-            return None
-        queues_after_current = \
-            itertools.islice(self.__user_queues.items(), self.__next_queue, None)
-        queues_before_current = \
-            itertools.islice(self.__user_queues.items(), self.__next_queue)
-        ordered_queues = itertools.chain(queues_after_current, queues_before_current)
-        for k, v in ordered_queues:
-            self.__next_queue = self.__next_queue + 1
-            if len(v) > 0:
-                self.__next_queue = self.__next_queue % len(self.__user_queues)
-                return heapq.heappop(v).schedulable
+    def _get_next_schedulable(self, remote: bool = False) -> Optional[Schedulable]:
+        """Retrieves the next schedulable to run, to be run within __empty_queue only.
+        Skips users whose next schedulable may not be started, see _may_start
+        :param remote: Whether the schedulable is to be run on a WorkerAgent"""
+        for uid, q in self.__user_queues.items():
+            if self._may_start(q[0].schedulable, remote):
+                # the user is served again after all others
+                sched = self._pop_schedulable_of_user(uid)
+                if uid in self.__user_queues:
+                    self.__user_queues.move_to_end(uid)
+                return sched
+        return None
+
+    def _get_waiting_users(self) -> list[tuple[int, Schedulable]]:
+        """Returns the users with waiting Schedulables together with the Schedulable
+        that is next in their queue, to be run within __empty_queue only"""
+        return [(uid, q[0].schedulable) for uid, q in self.__user_queues.items()]
+
+    def _pop_schedulable_of_user(self, user_id: int) -> Schedulable:
+        """Removes the next Schedulable from the queue of a user and returns it,
+        to be run within __empty_queue only"""
+        entry = heapq.heappop(self.__user_queues[user_id])
+        self.__unindex(entry)
+        self.__drop_cancelled(user_id)
+        _wait_seconds.observe(time.monotonic() - entry.enqueued,
+                              schedulable=type(entry.schedulable).__name__)
+        return entry.schedulable
+
+    def _may_start(self, sched: Schedulable, remote: bool) -> bool:
+        """Whether sched may be started, to be run within __empty_queue only.
+        Remote compatible Schedulables may always be started on a WorkerAgent,
+        as they do not use the memory of this host,
+        all other Schedulables have to fit into the memory limit
+        :param remote: Whether sched is to be run on a WorkerAgent"""
+        return sched.remote_compatible if remote else self._fits_memory_limit(sched)
+
+    def _fits_memory_limit(self, sched: Schedulable) -> bool:
+        """Whether sched may be started without exceeding the memory limit,
+        to be run within __empty_queue only"""
+        return self.__memory.fits(sched.memory_estimate)
+
+    def _on_schedulable_started(self, sched: Schedulable) -> None:
+        """Called within __empty_queue when sched was selected to be run"""
+        return None
+
+    def _on_schedulable_finished(self, sched: Schedulable, seconds: float) -> None:
+        """Called within __empty_queue when sched finished or was aborted
+        :param seconds: The wall time since sched was selected to be run"""
         return None
 
     def _get_targeted_worker_count(self) -> int:
         """Calculates the number of worker threads to use"""
-        return multiprocessing.cpu_count()
+        if self.__worker_count is not None:
+            return self.__worker_count
+        return WorkerLimits.get_cpu_count()
 
-    def _run_schedulable(self, sched_src: Callable[[], Schedulable]) -> bool:
+    def __make_process(self, sched: Schedulable, limits: WorkerLimits) -> Process:
+        """Creates (but does not start) a process running the given Schedulable"""
+        return Process(target=UserRoundRobinScheduler.__process_main,
+                       args=(self, sched, limits), daemon=True)
+
+    def _run_schedulable(self, sched_src: Callable[[], Schedulable],
+                         worker: Union[PooledWorker, RemoteWorker, None] = None,
+                         limits: WorkerLimits = WorkerLimits()) -> bool:
+        """Runs the next Schedulable provided by sched_src,
+        waiting for one to become available if required.
+        :param worker: The long-lived worker process of the calling supervisor thread,
+        if the worker pool is used, or the WorkerAgent it runs Schedulables on
+        :param limits: The limits of the worker process started for the Schedulable
+        :return: True if the calling thread should stop because of a shutdown"""
         with self.__empty_queue:
             next_sched = sched_src()
             if self.__shutdown_ongoing:
                 self.__handle_shutdown()
                 return True
+            remote = isinstance(worker, RemoteWorker)
             while next_sched is None:
-                self.__empty_queue.wait()
-                next_sched = self._get_next_schedulable()
+                if remote:
+                    # notices agents disconnecting whilst there is nothing to do
+                    self.__empty_queue.wait(RemoteWorker.liveness_interval)
+                    if not worker.check_connection():
+                        return False
+                else:
+                    self.__empty_queue.wait()
+                next_sched = sched_src()
                 if self.__shutdown_ongoing:
                     self.__handle_shutdown()
                     return True
-            p = Process(target=UserRoundRobinScheduler.__process_main,
-                        args=(self, next_sched,), daemon=True)
-            self.__running[next_sched] = (p, False)
+            p, memory_estimate = self.__reserve(next_sched, worker, limits)
+        start = time.monotonic()
+        try:
+            return self.__run_selected(next_sched, p, limits)
+        finally:
+            self.__release(next_sched, memory_estimate, start)
+
+    def __reserve(self, next_sched: Schedulable,
+                  worker: Union[PooledWorker, RemoteWorker, None],
+                  limits: WorkerLimits) \
+            -> tuple[Union[Process, PooledWorker, RemoteWorker], int]:
+        """Registers a selected Schedulable as running and reserves its memory,
+        to be run within __empty_queue only
+        :param worker: The worker it is to be run on, see _run_schedulable
+        :return: The worker or process to run it on and the reserved bytes"""
+        remote = isinstance(worker, RemoteWorker)
+        pooled = isinstance(worker, PooledWorker) and next_sched.worker_pool_compatible
+        p = worker if pooled or remote else self.__make_process(next_sched, limits)
+        self.__running[next_sched] = (p, False)
+        # Schedulables run by WorkerAgents do not use the memory of this host
+        memory_estimate = 0 if remote else next_sched.memory_estimate
+        self.__memory.reserve(memory_estimate)
+        self._on_schedulable_started(next_sched)
+        return p, memory_estimate
+
+    def __release(self, sched: Schedulable, memory_estimate: int,
+                  start: float) -> None:
+        """Releases the memory reserved by __reserve once sched finished
+        :param start: The time.monotonic() at which it was selected"""
+        seconds = time.monotonic() - start
+        _run_seconds.observe(seconds, schedulable=type(sched).__name__)
+        with self.__empty_queue:
+            self._on_schedulable_finished(sched, seconds)
+            if memory_estimate > 0:
+                self.__memory.release(memory_estimate)
+                # the memory might be sufficient for more than one Schedulable
+                self.__empty_queue.notify_all()
+
+    def __run_selected(self, next_sched: Schedulable,
+                       p: Union[Process, PooledWorker, RemoteWorker],
+                       limits: WorkerLimits) -> bool:
+        """Runs a Schedulable selected by _run_schedulable
+        :param p: The long-lived worker process or the WorkerAgent to run it on,
+        otherwise the process created for it
+        :param limits: The limits of a process created for it, if it is not pooled
+        :return: True if the calling thread should stop because of a shutdown"""
         debug(f"preparing to run {next_sched} (prio: {next_sched.priority})")
         next_sched.run_before_on_main()
+        data = None
+        if isinstance(p, PooledWorker):
+            # pickle outside the lock, as it might take a while
+            data = PooledWorker.serialize(next_sched)
+            if data is None:
+                debug(f"{next_sched} could not be pickled, forking instead")
+                p = self.__make_process(next_sched, limits)
+            else:
+                p.prepare()
         with self.__empty_queue:
-            if self.__shutdown_ongoing:
-                next_sched.run_later_on_main(None)
-                self.__handle_shutdown()
-                return True
-            if self.__running[next_sched][1]:
-                next_sched.run_later_on_main(None)
+            if not self.__start_selected(next_sched, p):
+                if self.__shutdown_ongoing:
+                    self.__handle_shutdown()
+                    return True
                 return False
-            info(f"{next_sched} will now be started")
+        exitcode = None
+        if next_sched not in self.__timed_out:
+            exitcode = self.__wait_with_timeout(next_sched, p, data, limits)
+        self.__finish_selected(next_sched, exitcode)
+        return False
+
+    def __start_selected(self, next_sched: Schedulable,
+                         p: Union[Process, PooledWorker, RemoteWorker]) -> bool:
+        """Starts the process created for a prepared Schedulable,
+        or marks it as timed out if its timeout expired whilst it was waiting,
+        to be run within __empty_queue only
+        :return: False if it was neither started nor timed out,
+        as it was aborted or a shutdown is ongoing"""
+        if self.__shutdown_ongoing or self.__running[next_sched][1]:
+            next_sched.run_later_on_main(None)
+            if not self.__shutdown_ongoing:
+                _aborts.inc(schedulable=type(next_sched).__name__)
+            self.__running.pop(next_sched)
+            return False
+        timeout = next_sched.timeout
+        if timeout is not None and timeout <= 0:
+            # the timeout expired whilst it was waiting
+            self.__timed_out.add(next_sched)
+            return True
+        info(f"{next_sched} will now be started")
+        self.__running[next_sched] = (p, False)
+        if timeout is not None:
+            self.__deadlines[next_sched] = time.monotonic() + timeout
+        if isinstance(p, Process):
             p.start()
-        p.join()
+        return True
+
+    def __finish_selected(self, next_sched: Schedulable,
+                          exitcode: Optional[int]) -> None:
+        """Reports the outcome of a Schedulable started by __start_selected
+        :param exitcode: The exit code of its worker"""
         debug(f"running cleanup for {next_sched}")
         if self.__running[next_sched][1]:
             with self.__empty_queue:
                 next_sched.run_later_on_main(None)
+            _aborts.inc(schedulable=type(next_sched).__name__)
+        elif next_sched in self.__timed_out:
+            warning(f"{next_sched} exceeded its timeout")
+            _timeouts.inc(schedulable=type(next_sched).__name__)
+            _errors.inc(schedulable=type(next_sched).__name__)
+            next_sched.run_later_on_main(next_sched.on_timeout())
         else:
-            next_sched.run_later_on_main(p.exitcode)
-        self.__running.pop(next_sched)
+            if exitcode != 0:
+                _errors.inc(schedulable=type(next_sched).__name__)
+            next_sched.run_later_on_main(exitcode)
+        with self.__empty_queue:
+            self.__running.pop(next_sched)
+            self.__timed_out.discard(next_sched)
+            self.__deadlines.pop(next_sched, None)
         debug(f"done with {next_sched}")
-        return False
+
+    def __wait_with_timeout(self, next_sched: Schedulable,
+                            p: Union[Process, PooledWorker, RemoteWorker],
+                            data: Optional[bytes],
+                            limits: WorkerLimits) -> Optional[int]:
+        """Waits for the exit code of a started Schedulable,
+        killing its worker once the timeout expired"""
+        timer = None
+        deadline = self.__deadlines.get(next_sched)
+        if deadline is not None:
+            timer = threading.Timer(max(0.0, deadline - time.monotonic()),
+                                    self.__on_timeout, (next_sched,))
+            timer.daemon = True
+            timer.start()
+        try:
+            return self.__wait_for_exitcode(next_sched, p, data, limits)
+        finally:
+            if timer is not None:
+                timer.cancel()
+
+    def __on_timeout(self, sched: Schedulable) -> None:
+        """Kills the worker running a Schedulable that exceeded its timeout,
+        executed by the timer started with it or the event loop"""
+        with self.__empty_queue:
+            self.__deadlines.pop(sched, None)
+            running = self.__running.get(sched)
+            if running is None or running[1] or sched in self.__timed_out:
+                return
+            self.__timed_out.add(sched)
+            try:
+                running[0].kill()
+            except AttributeError:
+                # Has just stopped, ignore
+                pass
+
+    def __wait_for_exitcode(self, next_sched: Schedulable,
+                            p: Union[Process, PooledWorker, RemoteWorker],
+                            data: Optional[bytes], limits: WorkerLimits) \
+            -> Optional[int]:
+        """Waits for a Schedulable started by __run_selected to finish
+        :param data: The serialized Schedulable, if it runs in a pooled worker
+        :return: The statuscode of the Schedulable"""
+        if isinstance(p, PooledWorker):
+            # an abort from now on kills the worker, which wait_for_result reports,
+            # as send does not replace a dead worker
+            p.send(data)
+            return p.wait_for_result()
+        if isinstance(p, RemoteWorker):
+            try:
+                r = next_sched.do_remote_work(p)
+                return 0 if r is None else r
+            except ConnectionError as e:
+                with self.__empty_queue:
+                    if self.__running[next_sched][1] or next_sched in self.__timed_out:
+                        return None
+                    warning(f"{e}, running {next_sched} on this host instead")
+                    p = self.__make_process(next_sched, limits)
+                    self.__running[next_sched] = (p, False)
+                    p.start()
+            except Exception as e:
+                exception(f"{next_sched} raised {e} whilst running on {p}")
+                return 1
+        p.join()
+        return p.exitcode
 
 
 @dataclass(order=True)
 class PrioritizedSchedulable:
-    """dataclass for ordering schedulables by priority"""
-    priority: int
+    """dataclass for ordering schedulables by priority,
+    schedulables of the same priority are ordered by when they were scheduled"""
+    priority: float
+    """The negated priority, reduced by the aging the schedulable would have gained
+    if it had been waiting since the start of time.monotonic(), so that the
+    order of schedulables aging alike does not change whilst they are waiting"""
+    sequence: int
     schedulable: Schedulable = field(compare=False)
+    user_id: int = field(compare=False)
+    task_id: int = field(compare=False)
+    cancelled: bool = field(compare=False)
+    """Whether the schedulable was aborted whilst still in its queue"""
+    enqueued: float = field(compare=False)
+    """The time.monotonic() at which the schedulable was scheduled"""
 
-    def __init__(self, sched: Schedulable, prio: int):
-        self.priority = -prio
+    def __init__(self, sched: Schedulable, prio: int, sequence: int = 0,
+                 aging: float = 0.0):
+        """
+        :param aging: The priority the schedulable gains per second it waits
+        """
+        self.enqueued = time.monotonic()
+        self.priority = aging * self.enqueued - prio
+        self.sequence = sequence
         self.schedulable = sched
+        self.user_id = sched.user_id
+        self.task_id = sched.task_id
+        self.cancelled = False
+
+
+@dataclass
+class SupervisedProcess:
+    """dataclass for a worker process started by the event loop
+    and the Schedulable it runs"""
+    schedulable: Schedulable
+    process: Process
+    slot: Optional[int]
+    """The slot of the process, None for Schedulables with a priority of 100"""
+    memory_estimate: int
+    """The bytes reserved for the Schedulable"""
+    start: float
+    """The time.monotonic() at which the Schedulable was selected"""
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import socket
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from logging import debug, info, warning
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, wait
+
+from backend.scheduler.RemoteWorker import RemoteJob
+from backend.scheduler.WorkerLimits import WorkerLimits
+
+
+class WorkerAgent:
+    """Runs RemoteJobs of a scheduler on another host.
+    Connects to the RemoteWorkerServer of the scheduler once for every slot,
+    every slot runs one job at a time in a process forked for it.
+    The resources of jobs are requested from the scheduler once
+    and cached for later jobs, until the cache exceeds its size."""
+    _reconnect_interval: float = 5.0
+    """Seconds to wait before connecting again after the connection was lost"""
+
+    def __init__(self, address: tuple[str, int], authkey: bytes, work_dir: str,
+                 slots: int = 1, cache_size: int = 1 << 30,
+                 limits: WorkerLimits = WorkerLimits()):
+        """
+        :param address: The host and port of the RemoteWorkerServer
+        :param authkey: The key to authenticate with
+        :param work_dir: The directory the jobs may store files in
+        :param slots: The number of jobs to run at once
+        :param cache_size: The number of bytes of resources kept for later jobs
+        :param limits: The limits the processes running the jobs apply
+        """
+        assert slots > 0
+        assert cache_size >= 0
+        self._address: tuple[str, int] = address
+        self._authkey: bytes = authkey
+        self._work_dir: str = work_dir
+        self._slots: int = slots
+        self._cache_size: int = cache_size
+        self._limits: WorkerLimits = limits
+        self._stopped: threading.Event = threading.Event()
+        self._lock: threading.Condition = threading.Condition()
+        self._cache: OrderedDict[str, bytes] = OrderedDict()
+        """Resources by their key, in the order they were used"""
+        self._cached_bytes: int = 0
+        self._fetching: set[str] = set()
+        """The keys of the resources currently requested by a slot"""
+        self._connections: set[Connection] = set()
+
+    def serve_forever(self) -> None:
+        """Runs jobs until stop is called"""
+        os.makedirs(self._work_dir, exist_ok=True)
+        threads = [threading.Thread(target=self.__slot_main, args=(i,), daemon=True)
+                   for i in range(self._slots)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    def stop(self) -> None:
+        """Disconnects all slots, aborting the jobs they run.
+        Safe to call from a signal handler"""
+        self._stopped.set()
+        for connection in list(self._connections):
+            try:
+                with socket.fromfd(connection.fileno(), socket.AF_INET,
+                                   socket.SOCK_STREAM) as s:
+                    s.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def __slot_main(self, index: int) -> None:
+        """main method of the threads running the slots,
+        connects to the scheduler until the agent is stopped"""
+        name = f"{socket.gethostname()}:{os.getpid()}/{index}"
+        while not self._stopped.is_set():
+            try:
+                connection = Client(self._address, "AF_INET", authkey=self._authkey)
+            except (AuthenticationError, OSError) as e:
+                warning(f"worker agent slot {name} could not connect "
+                        f"to {self._address}: {e!r}")
+                self._stopped.wait(WorkerAgent._reconnect_interval)
+                continue
+            self._connections.add(connection)
+            try:
+                if self._stopped.is_set():
+                    return
+                connection.send(("hello", name))
+                info(f"worker agent slot {name} connected to {self._address}")
+                self.__serve(connection)
+            except (EOFError, OSError):
+                info(f"worker agent slot {name} lost the connection")
+            finally:
+                self._connections.discard(connection)
+                connection.close()
+
+    def __serve(self, connection: Connection) -> None:
+        """Runs the jobs received over a connection
+        :raises EOFError or OSError once the connection is lost"""
+        while True:
+            command, job = connection.recv()
+            assert command == "run"
+            resources = {key: self.__get_resource(connection, key)
+                         for key in job.resources}
+            connection.send(self.__run_job(connection, job, resources))
+
+    def __get_resource(self, connection: Connection, key: str) -> bytes:
+        """Returns a resource from the cache,
+        requesting it from the scheduler if it was not cached"""
+        with self._lock:
+            # another slot might be requesting the same resource
+            self._lock.wait_for(lambda: key not in self._fetching)
+            data = self._cache.get(key)
+            if data is not None:
+                self._cache.move_to_end(key)
+                return data
+            self._fetching.add(key)
+        data = None
+        try:
+            debug(f"worker agent requests {key}")
+            connection.send(("fetch", key))
+            data = connection.recv_bytes()
+        finally:
+            with self._lock:
+                self._fetching.discard(key)
+                if data is not None:
+                    self.__cache(key, data)
+                self._lock.notify_all()
+        return data
+
+    def __cache(self, key: str, data: bytes) -> None:
+        """Caches a resource, evicting the least recently used ones if required,
+        to be run within _lock only"""
+        self._cache[key] = data
+        self._cached_bytes += len(data)
+        while self._cached_bytes > self._cache_size and len(self._cache) > 0:
+            _, evicted = self._cache.popitem(False)
+            self._cached_bytes -= len(evicted)
+
+    def __run_job(self, connection: Connection, job: RemoteJob,
+                  resources: Mapping[str, bytes]) -> tuple[str, object]:
+        """Runs a job in a process of its own, killing it if the scheduler disconnects
+        :raises EOFError if the scheduler disconnected"""
+        result_end, job_end = multiprocessing.Pipe(False)
+        p = multiprocessing.get_context("fork").Process(
+            target=WorkerAgent._job_main,
+            args=(job, resources, self._work_dir, self._limits, job_end), daemon=True)
+        p.start()
+        job_end.close()
+        try:
+            # the scheduler only sends something once the result arrived,
+            # so the connection becoming readable means that it was closed
+            if result_end not in wait([result_end, connection]):
+                p.kill()
+                raise EOFError("the scheduler disconnected")
+            try:
+                result = result_end.recv()
+            except EOFError:
+                p.join()
+                result = ("error", f"the job process died with exit code {p.exitcode}")
+        finally:
+            p.join()
+            result_end.close()
+        return result
+
+    @staticmethod
+    def _job_main(job: RemoteJob, resources: Mapping[str, bytes], work_dir: str,
+                  limits: WorkerLimits, result_connection: Connection) -> None:
+        """main method executed by the processes running jobs"""
+        # No coverage of this method is recorded as extra processes are not recorded
+        limits.apply()
+        try:
+            result = ("ok", job.run(resources, work_dir))
+        except Exception as e:
+            result = ("error", str(e))
+        result_connection.send(result)
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import math
+import os
+import sys
+from collections.abc import Iterable
+from logging import warning
+from typing import Optional
+
+
+class WorkerLimits:
+    """Limits of the CPU resources a worker process may use,
+    applied by the worker process itself when it starts"""
+    _cgroup_v2_file: str = "/sys/fs/cgroup/cpu.max"
+    """File containing the CPU quota and period of the cgroup of this process"""
+    _cgroup_v1_files: tuple[str, str] = ("/sys/fs/cgroup/cpu/cpu.cfs_quota_us",
+                                         "/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+    """Files containing the CPU quota and period for cgroup v1"""
+    _thread_variables: tuple[str, ...] = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS",
+                                          "MKL_NUM_THREADS", "VECLIB_MAXIMUM_THREADS",
+                                          "NUMEXPR_NUM_THREADS")
+    """Environment variables limiting the thread pools of numerical libraries"""
+
+    def __init__(self, threads: Optional[int] = None,
+                 cpus: Optional[Iterable[int]] = None):
+        """
+        :param threads: The number of threads the thread pools of numerical libraries
+        (BLAS, OpenMP, torch) may use in a worker process, None for no limit
+        :param cpus: The CPUs the worker process may run on, None for no restriction
+        """
+        assert threads is None or threads > 0
+        self._threads: Optional[int] = threads
+        self._cpus: Optional[frozenset[int]] = None if cpus is None else frozenset(cpus)
+        assert self._cpus is None or len(self._cpus) > 0
+
+    @property
+    def threads(self) -> Optional[int]:
+        return self._threads
+
+    @property
+    def cpus(self) -> Optional[frozenset[int]]:
+        return self._cpus
+
+    def apply(self) -> None:
+        """Applies the limits to the calling process, to be called by worker processes.
+        Thread pools that were already started (e.g. as numpy was imported before
+        forking) are resized as well, as far as the library supports that"""
+        if self._cpus is not None:
+            try:
+                os.sched_setaffinity(0, self._cpus)
+            except (AttributeError, OSError) as e:
+                warning(f"could not restrict the worker to the CPUs {self._cpus}: {e}")
+        if self._threads is None:
+            return
+        for variable in WorkerLimits._thread_variables:
+            os.environ[variable] = str(self._threads)
+        # only resize libraries that were imported, as importing them takes a while
+        if "numpy" in sys.modules or "sklearn" in sys.modules:
+            import threadpoolctl
+            threadpoolctl.threadpool_limits(self._threads)
+        torch = sys.modules.get("torch")
+        if torch is not None:
+            torch.set_num_threads(self._threads)
+
+    @staticmethod
+    def get_available_cpus() -> list[int]:
+        """Returns the CPUs this process may run on"""
+        try:
+            return sorted(os.sched_getaffinity(0))
+        except AttributeError:
+            return list(range(os.cpu_count() or 1))
+
+    @staticmethod
+    def get_cpu_count() -> int:
+        """Determines the number of CPUs available to this process,
+        which is the number of CPUs it may run on,
+        limited by the CPU quota of its cgroup (e.g. of a container) if it has one"""
+        count = len(WorkerLimits.get_available_cpus())
+        quota = WorkerLimits.__get_cgroup_quota()
+        if quota is not None:
+            count = min(count, math.ceil(quota))
+        return max(1, count)
+
+    @staticmethod
+    def __get_cgroup_quota() -> Optional[float]:
+        """:return: The number of CPUs the cgroup of this process may use,
+        None if it is unlimited"""
+        try:
+            with open(WorkerLimits._cgroup_v2_file) as f:
+                # "max 100000" if the cgroup is unlimited
+                quota, period = f.read().split()
+        except (OSError, ValueError):
+            try:
+                quota, period = (WorkerLimits.__read(path)
+                                 for path in WorkerLimits._cgroup_v1_files)
+            except OSError:
+                return None
+        # "-1" (v1) if the cgroup is unlimited
+        if not quota.isdigit() or not period.isdigit() or int(period) == 0:
+            return None
+        return int(quota) / int(period)
+
+    @staticmethod
+    def __read(path: str) -> str:
+        with open(path) as f:
+            return f.read().strip()
@@ -0,0 +1,247 @@
+import gc
+import importlib
+import os
+import pickle
+import select
+import signal
+import socket
+import threading
+import time
+from collections.abc import Callable, Iterable
+from logging import debug, warning
+from multiprocessing import Process
+from multiprocessing.connection import Connection
+from typing import Optional
+
+
+class ZygoteChild:
+    """Handle of a process forked by a WorkerZygote,
+    offering the parts of the multiprocessing.Process interface used by the scheduler.
+    As the process is a child of the zygote and not of the calling process,
+    its exit status can not be observed."""
+    _poll_interval: float = 0.05
+    """Seconds between checks whether the process has died whilst joining"""
+
+    def __init__(self, pid: int):
+        self._pid: int = pid
+        self._killed: bool = False
+
+    @property
+    def pid(self) -> int:
+        return self._pid
+
+    def is_alive(self) -> bool:
+        # the zygote ignores SIGCHLD, so its children are reaped as soon as they die
+        try:
+            os.kill(self._pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            # the PID was reused by a process of another user
+            return False
+        return True
+
+    def kill(self) -> None:
+        self._killed = True
+        try:
+            os.kill(self._pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.is_alive():
+            if deadline is not None and time.monotonic() >= deadline:
+                return
+            time.sleep(ZygoteChild._poll_interval)
+
+    @property
+    def exitcode(self) -> Optional[int]:
+        """None whilst running, -SIGKILL if killed using kill, otherwise 1,
+        as the real exit status is only known to the zygote"""
+        if self.is_alive():
+            return None
+        return -signal.SIGKILL if self._killed else 1
+
+
+class WorkerZygote:
+    """A process that imports expensive modules once and then forks
+    worker processes on request, so that workers start with a warm import cache.
+    After the initial imports the garbage collector is frozen,
+    keeping the memory pages shared with the workers untouched by it."""
+    _max_message_size: int = 1 << 16
+    """Maximum size of a pickled command sent to the zygote"""
+    _fork_timeout: float = 10.0
+    """Seconds to wait for a process forked by the zygote to report back,
+    after which the zygote is considered stuck and is stopped"""
+
+    def __init__(self, preload_modules: Iterable[str] = ()):
+        """
+        :param preload_modules: The names of the modules to import in the zygote
+        before forking any worker, modules that can not be imported are skipped
+        """
+        self.__lock: threading.Lock = threading.Lock()
+        main_end, zygote_end = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        self.__process: Process = Process(
+            target=WorkerZygote._zygote_main,
+            args=(zygote_end, list(preload_modules)), daemon=True)
+        self.__process.start()
+        zygote_end.close()
+        self.__control: Optional[socket.socket] = main_end
+        self.__ready: bool = False
+        debug(f"started worker zygote on PID {self.__process.pid}")
+
+    @property
+    def pid(self) -> int:
+        """The PID of the zygote process"""
+        return self.__process.pid
+
+    def is_alive(self) -> bool:
+        return self.__control is not None and self.__process.is_alive()
+
+    def preload(self, func: Callable[..., object], *args: object) -> None:
+        """Makes the zygote execute func(*args), e.g. to set up static configuration,
+        so that workers forked later on start with the resulting state.
+        Errors are logged by the zygote and otherwise ignored.
+        As the zygote executes commands one at a time, func must be trusted and quick,
+        e.g. importing user provided modules here would let them stall the zygote.
+        :param func: A function picklable by reference, e.g. a module level function
+        :param args: Picklable arguments of func"""
+        self.__send(("preload", func, args))
+
+    def fork(self, target: Callable[[Connection], None]) \
+            -> Optional[tuple[Connection, ZygoteChild]]:
+        """Forks a new process from the zygote, that runs target
+        with a connection to the calling process and exits afterwards.
+        :param target: A function picklable by reference
+        :return: The connection to the forked process and a handle of it,
+        None if the zygote is not running (anymore) or still preloading modules"""
+        if not self.is_ready():
+            return None
+        main_end, child_end = socket.socketpair()
+        try:
+            if not self.__send(("fork", target), child_end.fileno()):
+                main_end.close()
+                return None
+        finally:
+            child_end.close()
+        connection = Connection(main_end.detach())
+        try:
+            if not connection.poll(WorkerZygote._fork_timeout):
+                warning(f"worker zygote did not fork within "
+                        f"{WorkerZygote._fork_timeout}s, stopping it")
+                self.stop()
+                raise EOFError
+            pid: int = connection.recv()
+        except (EOFError, OSError):
+            connection.close()
+            return None
+        return connection, ZygoteChild(pid)
+
+    def stop(self) -> None:
+        """Stops the zygote, processes already forked from it keep running"""
+        with self.__lock:
+            if self.__control is None:
+                return
+            self.__control.close()
+            self.__control = None
+        self.__process.join(1)
+        if self.__process.is_alive():
+            self.__process.kill()
+            self.__process.join()
+
+    def is_ready(self, timeout: float = 0) -> bool:
+        """Checks whether the zygote finished preloading modules and forks on request
+        :param timeout: Seconds to wait for the zygote to become ready"""
+        with self.__lock:
+            if self.__ready or self.__control is None:
+                return self.__ready
+            if select.select([self.__control], [], [], timeout)[0]:
+                try:
+                    # an empty message means that the zygote died
+                    self.__ready = self.__control.recv(1) != b""
+                except OSError:
+                    pass
+            return self.__ready
+
+    def __send(self, command: tuple, fd: Optional[int] = None) -> bool:
+        """Sends a command and optionally a file descriptor to the zygote
+        :return: False if the zygote is not running"""
+        data = pickle.dumps(command)
+        assert len(data) <= WorkerZygote._max_message_size
+        with self.__lock:
+            if self.__control is None:
+                return False
+            try:
+                socket.send_fds(self.__control, [data], [] if fd is None else [fd])
+            except OSError:
+                warning("worker zygote is not running anymore")
+                return False
+        return True
+
+    @staticmethod
+    def _zygote_main(control: socket.socket, preload_modules: list[str]) -> None:
+        """main method executed by the zygote process,
+        executes commands until the control socket is closed"""
+        # No coverage of this method is recorded as extra processes are not recorded
+
+        # reap forked workers automatically, as nobody waits for them
+        signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+        for module in preload_modules:
+            WorkerZygote.__run_preload(importlib.import_module, (module,))
+        gc.collect()
+        gc.freeze()
+        control.send(b"r")
+        while True:
+            try:
+                data, fds, _, _ = socket.recv_fds(
+                    control, WorkerZygote._max_message_size, 1)
+            except OSError:
+                return
+            if not data:
+                return
+            WorkerZygote.__run_command(control, pickle.loads(data), fds)
+
+    @staticmethod
+    def __run_command(control: socket.socket, command: tuple, fds: list[int]) -> None:
+        """Executes a command received by the zygote, to be executed on the zygote only
+        :param fds: The file descriptors received with the command,
+        they are closed afterwards"""
+        try:
+            if command[0] == "fork":
+                WorkerZygote.__fork_child(control, fds[0], command[1])
+            elif command[0] == "preload":
+                WorkerZygote.__run_preload(command[1], command[2])
+                # only moves the objects created since the last call
+                gc.freeze()
+        finally:
+            for fd in fds:
+                os.close(fd)
+
+    @staticmethod
+    def __run_preload(func: Callable[..., object], args: tuple) -> None:
+        """Executes func(*args), logging instead of raising errors,
+        to be executed on the zygote only"""
+        try:
+            func(*args)
+        except (Exception, SystemExit) as e:
+            # a module exiting the interpreter on import must not stop the zygote
+            debug(f"worker zygote could not preload {func.__name__}{args}: {e!r}")
+
+    @staticmethod
+    def __fork_child(control: socket.socket, fd: int,
+                     target: Callable[[Connection], None]) -> None:
+        """Forks a process running target, to be executed on the zygote only"""
+        if os.fork() != 0:
+            return
+        exitcode = 1
+        try:
+            control.close()
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            connection = Connection(fd)
+            connection.send(os.getpid())
+            target(connection)
+            exitcode = 0
+        finally:
+            # never return into the command loop of the zygote
+            os._exit(exitcode)
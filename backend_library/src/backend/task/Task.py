@@ -36,3 +36,10 @@ class Task(ABC):
         :return: None
         """
         raise NotImplementedError
+
+    @property
+    def task_id(self) -> int:
+        """
+        :return: The ID of the task.
+        """
+        return self._task_id
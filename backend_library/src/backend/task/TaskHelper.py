@@ -1,11 +1,11 @@
 import os
 import shutil
-import zipfile
 import zlib
 
 import numpy as np
 
 from backend.DataIO import DataIO
+from backend.task.ZipWriter import ZipWriter
 
 
 class TaskHelper:
@@ -48,7 +48,8 @@ class TaskHelper:
 
     @staticmethod
     def zip_dir(dir_path: str, zip_path_running: str, zip_path_final: str,
-                compression_level: int = zlib.Z_DEFAULT_COMPRESSION) -> None:
+                compression_level: int = zlib.Z_DEFAULT_COMPRESSION,
+                threads: int = 1) -> None:
         """
         Zips the specified directory and saves the created zip-file
         at the specified (final) location.
@@ -59,7 +60,7 @@ class TaskHelper:
         file can be spotted, e.g. after a server crash. For this to work,
         both paths have to be located in the same file system.
         No files are deleted. The files are compressed when added to the zip archive
-        (with the zlib module).
+        (with the zlib module, see ZipWriter).
         If the ZIP-file is larger than 4 GiB,
         than a ZIP-file with the ZIP64 extension is created automatically.
 
@@ -74,9 +75,10 @@ class TaskHelper:
         after the creation. The file must not exist.
         Should be on same file system as zip_path_running.
         :param compression_level: The level of compression.
-        Values from 0 to 9 are accepted.
+        Values from 0 to 9 are accepted, with 0 the files are stored uncompressed.
         Standard is the standard value of the zlib module, which offers a compromise in
         speed and compression.
+        :param threads: The number of threads compressing the files
         """
         assert (0 <= compression_level <= 9) or (
             compression_level == zlib.Z_DEFAULT_COMPRESSION)
@@ -85,18 +87,8 @@ class TaskHelper:
         assert os.path.isdir(dir_path)
 
         # use package os, as shutil.make_archive() is not thread-safe
-        zipfile_handle: zipfile.ZipFile = zipfile.ZipFile(
-            zip_path_running, mode="x", compression=zipfile.ZIP_DEFLATED,
-            allowZip64=True, compresslevel=compression_level)
-
-        # add all files
-        for root, dirs, files in os.walk(dir_path):
-            for file in files:
-                zipfile_handle.write(os.path.join(root, file),
-                                     os.path.relpath(os.path.join(root, file),
-                                                     os.path.join(dir_path, '..')))
-
-        zipfile_handle.close()
+        with ZipWriter(zip_path_running, compression_level, threads) as zip_writer:
+            zip_writer.write_dir(dir_path)
 
         # is an atomic operation, *if* both paths are on the same file system
         shutil.move(zip_path_running, zip_path_final)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import pickle
+import sqlite3
+from contextlib import closing
+from logging import debug, warning
+
+from backend.task.Task import Task
+
+
+class TaskJournal:
+    """
+    Persists the Tasks that were scheduled and did not finish yet
+    in a sqlite database, so that they can be scheduled again after the process
+    running the scheduler restarted (e.g. after a deploy or a crash). \n
+    Tasks are stored as they were before they were scheduled.
+    As Executions and DatasetCleanings skip the results they already computed,
+    scheduling a Task again only computes what was still missing.
+    May be used by several processes at once.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: The path of the sqlite database, which is created if missing
+        """
+        self._path: str = path
+        with closing(self.__connect()) as connection, connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS tasks ("
+                               "kind TEXT NOT NULL, task_id INTEGER NOT NULL, "
+                               "task BLOB NOT NULL, PRIMARY KEY (kind, task_id))")
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def record(self, task: Task) -> None:
+        """
+        Stores a Task, replacing a Task of the same type with the same ID. \n
+        To be called before the Task is scheduled.
+        :param task: The Task to store, which has to be picklable
+        :return: None
+        """
+        data = pickle.dumps(task)
+        with closing(self.__connect()) as connection, connection:
+            # a replaced Task is removed first, so that it is moved to the end
+            connection.execute("DELETE FROM tasks WHERE kind = ? AND task_id = ?",
+                               (TaskJournal.__kind(type(task)), task.task_id))
+            connection.execute("INSERT INTO tasks VALUES (?, ?, ?)",
+                               (TaskJournal.__kind(type(task)), task.task_id, data))
+        debug(f"journaled {type(task).__name__} {task.task_id}")
+
+    def remove(self, task_type: type[Task], task_id: int) -> None:
+        """
+        Removes a Task, e.g. as it finished or was aborted.
+        Does nothing if the Task is not stored.
+        :param task_type: The type of the Task
+        :param task_id: The ID of the Task
+        :return: None
+        """
+        self.__delete(TaskJournal.__kind(task_type), task_id)
+
+    def get_task_ids(self, task_type: type[Task]) -> set[int]:
+        """
+        :param task_type: The type of the Tasks
+        :return: The IDs of the stored Tasks of the given type
+        """
+        with closing(self.__connect()) as connection:
+            rows = connection.execute("SELECT task_id FROM tasks WHERE kind = ?",
+                                      (TaskJournal.__kind(task_type),)).fetchall()
+        return {task_id for task_id, in rows}
+
+    def load(self) -> list[Task]:
+        """
+        Loads the stored Tasks in the order they were recorded.
+        Tasks that can not be loaded anymore (e.g. as their classes changed)
+        are removed.
+        :return: The stored Tasks that could be loaded
+        """
+        with closing(self.__connect()) as connection:
+            rows = connection.execute("SELECT kind, task_id, task FROM tasks "
+                                      "ORDER BY rowid").fetchall()
+        tasks: list[Task] = list()
+        for kind, task_id, data in rows:
+            try:
+                tasks.append(pickle.loads(data))
+            except Exception as e:
+                warning(f"could not load the journaled task {kind} {task_id}: {e!r}")
+                self.__delete(kind, task_id)
+        return tasks
+
+    def __delete(self, kind: str, task_id: int) -> None:
+        with closing(self.__connect()) as connection, connection:
+            connection.execute("DELETE FROM tasks WHERE kind = ? AND task_id = ?",
+                               (kind, task_id))
+
+    def __connect(self) -> sqlite3.Connection:
+        # a connection per call, as the journal is used by several threads
+        return sqlite3.connect(self._path, timeout=30)
+
+    @staticmethod
+    def __kind(task_type: type[Task]) -> str:
+        return f"{task_type.__module__}.{task_type.__qualname__}"
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import os
+import time
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import TracebackType
+from typing import Optional
+
+
+class ZipWriter:
+    """
+    Writes a zip-file, compressing its members with DEFLATE on several threads
+    (zlib releases the GIL while compressing), or storing them uncompressed. \n
+    The members are compressed in parallel, but written in the order they were added,
+    a few at a time, so that only the members being compressed are kept in memory.
+    If the zip-file is larger than 4 GiB, the ZIP64 extension is used automatically.
+    """
+
+    def __init__(self, path: str,
+                 compression_level: int = zlib.Z_DEFAULT_COMPRESSION,
+                 threads: int = 1):
+        """
+        :param path: The path of the zip-file. The file must not exist.
+        :param compression_level: The DEFLATE level from 1 to 9,
+        or the standard value of the zlib module.
+        With 0 the members are stored without compression.
+        :param threads: The number of threads compressing the members.
+        Has to be at least 1.
+        """
+        assert (0 <= compression_level <= 9) or (
+            compression_level == zlib.Z_DEFAULT_COMPRESSION)
+        assert threads >= 1
+        assert not os.path.isfile(path)
+
+        self._compression_level: int = compression_level
+        self._zip: zipfile.ZipFile = zipfile.ZipFile(
+            path, mode="x", allowZip64=True,
+            compression=zipfile.ZIP_STORED if compression_level == 0
+            else zipfile.ZIP_DEFLATED,
+            compresslevel=None if compression_level == 0 else compression_level)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if threads > 1 and compression_level != 0:
+            self._executor = ThreadPoolExecutor(threads)
+        self._max_pending: int = 2 * threads
+        self._pending: deque[tuple[zipfile.ZipInfo, Future]] = deque()
+
+    def __enter__(self) -> ZipWriter:
+        return self
+
+    def __exit__(self, exc_type: Optional[type[BaseException]],
+                 exc_value: Optional[BaseException],
+                 traceback: Optional[TracebackType]) -> None:
+        if exc_type is not None:
+            # only the members written so far end up in the zip-file
+            self._pending.clear()
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+        self.close()
+
+    def write_file(self, path: str, arcname: str) -> None:
+        """
+        Adds a file to the zip-file.
+        :param path: The path of the file
+        :param arcname: The name of the member in the zip-file
+        """
+        if self._executor is None:
+            self._zip.write(path, arcname)
+            return
+        zinfo = zipfile.ZipInfo.from_file(path, arcname)
+        self.__add_pending(zinfo, self._executor.submit(
+            ZipWriter.__read_and_compress, path, self._compression_level))
+
+    def write_bytes(self, data: bytes, arcname: str) -> None:
+        """
+        Adds a member with the given content to the zip-file,
+        without writing it to the disk first.
+        :param data: The content of the member
+        :param arcname: The name of the member in the zip-file
+        """
+        if self._executor is None:
+            self._zip.writestr(arcname, data)
+            return
+        zinfo = zipfile.ZipInfo(arcname, time.localtime(time.time())[:6])
+        zinfo.external_attr = 0o600 << 16
+        self.__add_pending(zinfo, self._executor.submit(
+            ZipWriter.__compress, data, self._compression_level))
+
+    def write_dir(self, dir_path: str, excluded_paths: frozenset[str] = frozenset()) \
+            -> None:
+        """
+        Adds all files of a directory (recursively) to the zip-file.
+        The names of the members start with the name of the directory.
+        :param dir_path: The path of the directory. The directory must exist.
+        :param excluded_paths: The paths of the files that are not added
+        """
+        assert os.path.isdir(dir_path)
+        for root, dirs, files in os.walk(dir_path):
+            for file in files:
+                path = os.path.join(root, file)
+                if path not in excluded_paths:
+                    self.write_file(path, ZipWriter.get_arcname(dir_path, path))
+
+    @staticmethod
+    def get_arcname(dir_path: str, path: str) -> str:
+        """
+        :return: The name of the member of the file at path when dir_path is zipped
+        """
+        return os.path.relpath(path, os.path.join(dir_path, '..'))
+
+    def close(self) -> None:
+        """
+        Writes the remaining members and the central directory of the zip-file.
+        """
+        while len(self._pending) > 0:
+            self.__write_next_pending()
+        if self._executor is not None:
+            self._executor.shutdown()
+        self._zip.close()
+
+    def __add_pending(self, zinfo: zipfile.ZipInfo, future: Future) -> None:
+        self._pending.append((zinfo, future))
+        while len(self._pending) > self._max_pending:
+            self.__write_next_pending()
+
+    def __write_next_pending(self) -> None:
+        """
+        Writes the member added first, once it was compressed,
+        like zipfile does for members it compresses itself
+        """
+        zinfo, future = self._pending.popleft()
+        crc, file_size, compressed = future.result()
+        zinfo.compress_type = zipfile.ZIP_DEFLATED
+        zinfo.flag_bits = 0
+        zinfo.CRC = crc
+        zinfo.file_size = file_size
+        zinfo.compress_size = len(compressed)
+        if not zinfo.external_attr:
+            zinfo.external_attr = 0o600 << 16
+
+        fp = self._zip.fp
+        fp.seek(self._zip.start_dir)
+        zinfo.header_offset = fp.tell()
+        fp.write(zinfo.FileHeader())
+        fp.write(compressed)
+        self._zip.start_dir = fp.tell()
+        self._zip.filelist.append(zinfo)
+        self._zip.NameToInfo[zinfo.filename] = zinfo
+
+    @staticmethod
+    def __read_and_compress(path: str, compression_level: int) \
+            -> tuple[int, int, bytes]:
+        with open(path, "rb") as f:
+            return ZipWriter.__compress(f.read(), compression_level)
+
+    @staticmethod
+    def __compress(data: bytes, compression_level: int) -> tuple[int, int, bytes]:
+        """
+        :return: The CRC-32 and the size of the data and the raw DEFLATE stream of it
+        """
+        compressor = zlib.compressobj(compression_level, zlib.DEFLATED, -15)
+        return zlib.crc32(data), len(data), \
+            compressor.compress(data) + compressor.flush()
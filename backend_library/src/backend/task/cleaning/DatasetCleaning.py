@@ -146,6 +146,10 @@ class DatasetCleaning(Task, Schedulable, ABC):
                                          1.0)
             return
 
+        # store a binary copy for executions first, as the csv-file marks
+        # the cleaning as finished
+        DataIO.write_binary(DataIO.get_binary_path(self._cleaned_dataset_path),
+                            cleaning_pipeline_result)
         # store cleaned dataset in path
         data = cleaning_pipeline_result.to_single_array()
         DataIO.save_write_csv(self._running_dataset_cleaning_path,
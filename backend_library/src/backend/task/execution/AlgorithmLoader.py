@@ -13,6 +13,7 @@ from pyod.models.base import BaseDetector
 class AlgorithmLoader:
     """helper class for runtime-loading pyod BaseDetectors"""
     _root_dir: Optional[str] = None
+    _worker_pool_dirs: list[pathlib.Path] = []
 
     @staticmethod
     def set_algorithm_root_dir(directory: str) -> None:
@@ -26,6 +27,31 @@ class AlgorithmLoader:
             directory = directory[:-1]
         AlgorithmLoader._root_dir = directory
 
+    @staticmethod
+    def get_algorithm_root_dir() -> Optional[str]:
+        """Gets the root directory of the AlgorithmLoader, None if not set yet"""
+        return AlgorithmLoader._root_dir
+
+    @staticmethod
+    def set_worker_pool_algorithm_dirs(directories: list[str]) -> None:
+        """
+        Sets the directories containing the algorithms that may run in long-lived
+        worker processes, shared by tasks of different users.
+        Other algorithms run in a process of their own, so that state they leave
+        behind (module globals, monkey-patches, ...) can not affect other tasks.
+        :param directories: paths of the directories, e.g. of library algorithms
+        """
+        AlgorithmLoader._worker_pool_dirs = \
+            [pathlib.Path(directory).resolve() for directory in directories]
+
+    @staticmethod
+    def may_run_in_worker_pool(path: str) -> bool:
+        """Checks whether the algorithm under the given path
+        is contained in one of the directories set by set_worker_pool_algorithm_dirs"""
+        path_obj: pathlib.Path = pathlib.Path(path).resolve()
+        return any(path_obj.is_relative_to(directory)
+                   for directory in AlgorithmLoader._worker_pool_dirs)
+
     @staticmethod
     def _ensure_root_dir_in_path() -> None:
         """adds the _root_dir to sys.path, if missing"""
@@ -0,0 +1,63 @@
+from collections.abc import Callable
+from typing import Optional
+
+from backend.scheduler.Schedulable import Schedulable
+
+
+class MetricComputation(Schedulable):
+    """
+    Computes the metrics of an Execution after all of its ExecutionElements finished,
+    instead of the last ExecutionElement computing them before it is done.
+    """
+    def __init__(self, user_id: int, task_id: int,
+                 compute_metrics: Callable[[], None],
+                 on_finished: Callable[[Optional[int]], None]):
+        """
+        :param user_id: The ID of the user belonging to the Execution.
+        Has to be greater than or equal to -1.
+        :param task_id: The ID of the task. Has to be greater than or equal to -1.
+        :param compute_metrics: Computes and stores the metrics of the Execution,
+        executed by do_work
+        :param on_finished: Reports the Execution that the metrics were computed,
+        with the statuscode of do_work, which is None if it was aborted
+        """
+        assert user_id >= -1
+        assert task_id >= -1
+
+        self._user_id: int = user_id
+        self._task_id: int = task_id
+        self._compute_metrics: Callable[[], None] = compute_metrics
+        self._on_finished: Callable[[Optional[int]], None] = on_finished
+
+    @property
+    def user_id(self) -> int:
+        """
+        :return: The ID of the user belonging to this MetricComputation
+        (of the Execution).
+        """
+        return self._user_id
+
+    @property
+    def task_id(self) -> int:
+        """
+        :return: The ID of the task.
+        """
+        return self._task_id
+
+    @property
+    def priority(self) -> int:
+        """
+        :return: The priority for the Scheduler.
+        """
+        return 50
+
+    def do_work(self) -> int:
+        """
+        Computes the metrics, raising the exceptions of the computation.
+        :return: 0
+        """
+        self._compute_metrics()
+        return 0
+
+    def run_later_on_main(self, statuscode: Optional[int]) -> None:
+        self._on_finished(statuscode)
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from collections.abc import Iterator
+from logging import debug, warning
+
+import numpy as np
+import numpy.lib.format as npy
+import pandas as pd
+
+from backend.DataIO import DataIO
+
+
+class ResultStore:
+    """
+    Stores the results of all ExecutionElements of one algorithm of an Execution
+    in its directory: \n
+    scores.npy contains a memory-mappable matrix of the outlier scores,
+    with a row for each subspace and a column for each datapoint. \n
+    finished.npy contains a byte for each subspace, which is set once its row
+    was written. \n
+    subspaces.json contains the identifiers of the subspaces, in the order of the rows.
+    \n
+    The row numbers of the datapoints are shared by all algorithms of the Execution,
+    see write_row_numbers. The rows are written in place, by ExecutionElements
+    from whatever process they run in, or at once (see SharedResultMatrix).
+    """
+    scores_file_name: str = "scores.npy"
+    finished_file_name: str = "finished.npy"
+    subspaces_file_name: str = "subspaces.json"
+    row_numbers_file_name: str = "row_numbers.npy"
+    """The name of the file containing the row numbers, in the Execution directory"""
+
+    def __init__(self, directory: str):
+        """
+        :param directory: The directory of the algorithm in the Execution directory
+        """
+        self._directory: str = directory
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @property
+    def exists(self) -> bool:
+        """
+        :return: Whether the store was created, the subspace index is written last
+        """
+        return os.path.isfile(self.__path(ResultStore.subspaces_file_name))
+
+    def create(self, subspace_identifiers: list[str], datapoint_count: int) -> None:
+        """
+        Creates the files of the store, unless they exist for the same subspaces
+        and datapoints already (e.g. as the Execution is recovered). \n
+        The csv-files of ExecutionElement results in the directory,
+        e.g. of Executions started before results were stored this way,
+        are moved into the store.
+        :param subspace_identifiers: The identifiers of the subspaces of the Execution
+        :param datapoint_count: The number of datapoints of the dataset
+        """
+        assert len(subspace_identifiers) > 0 and datapoint_count > 0
+        if not self.__matches(subspace_identifiers, datapoint_count):
+            self.delete()
+            npy.open_memmap(self.__path(ResultStore.scores_file_name), "w+",
+                            np.float64, (len(subspace_identifiers), datapoint_count))
+            npy.open_memmap(self.__path(ResultStore.finished_file_name), "w+",
+                            np.uint8, (len(subspace_identifiers),))
+            running_path = self.__path(ResultStore.subspaces_file_name) + ".running"
+            with open(running_path, "w") as f:
+                json.dump(subspace_identifiers, f)
+            shutil.move(running_path, self.__path(ResultStore.subspaces_file_name))
+            debug(f"created the result store in {self._directory}")
+        self.__import_csv_results(subspace_identifiers)
+
+    def __matches(self, subspace_identifiers: list[str], datapoint_count: int) \
+            -> bool:
+        """
+        :return: Whether the existing store contains the given subspaces and datapoints
+        """
+        if not self.exists:
+            return False
+        try:
+            scores = np.load(self.__path(ResultStore.scores_file_name), "r")
+            finished = np.load(self.__path(ResultStore.finished_file_name), "r")
+            shapes_match = scores.shape == (len(subspace_identifiers),
+                                            datapoint_count) \
+                and finished.shape == (len(subspace_identifiers),)
+            del scores, finished
+        except (OSError, ValueError):
+            return False
+        return shapes_match and self.get_subspace_identifiers() == subspace_identifiers
+
+    def __import_csv_results(self, subspace_identifiers: list[str]) -> None:
+        """Moves the csv-files of ExecutionElement results into the store"""
+        for index, identifier in enumerate(subspace_identifiers):
+            path = os.path.join(self._directory, identifier + ".csv")
+            if not os.path.isfile(path):
+                continue
+            try:
+                scores = DataIO.read_uncleaned_csv(path, None)[:, 1].astype(np.float64)
+                self.write(index, scores)
+            except Exception as e:
+                warning(f"could not import the result {path}: {e!r}")
+                continue
+            os.remove(path)
+
+    def write(self, index: int, scores: np.ndarray) -> None:
+        """
+        Writes the outlier scores of a subspace and marks them as finished. \n
+        :param index: The index of the subspace in the subspace index
+        :param scores: The outlier score of each datapoint
+        :raises ValueError if there is not a score for each datapoint
+        """
+        self.write_many(np.array([index]), np.expand_dims(scores, 0))
+
+    def write_many(self, indices: np.ndarray, scores: np.ndarray) -> None:
+        """
+        Writes the outlier scores of several subspaces at once
+        and marks them as finished. \n
+        :param indices: The indices of the subspaces in the subspace index
+        :param scores: The outlier scores of each subspace, in the order of indices
+        :raises ValueError if there is not a score for each datapoint
+        """
+        matrix = npy.open_memmap(self.__path(ResultStore.scores_file_name), "r+")
+        if scores.shape[1:] != matrix.shape[1:]:
+            raise ValueError(f"The algorithm returned {scores.shape[1:]} scores "
+                             f"instead of one for each of the {matrix.shape[1]} "
+                             f"datapoints")
+        matrix[indices] = scores
+        matrix.flush()
+        del matrix
+        # only marked as finished once the scores were written
+        finished = npy.open_memmap(self.__path(ResultStore.finished_file_name), "r+")
+        finished[indices] = 1
+        finished.flush()
+        del finished
+
+    def is_finished(self, index: int) -> bool:
+        """
+        :param index: The index of the subspace in the subspace index
+        :return: Whether the scores of the subspace were written
+        """
+        if not self.exists:
+            return False
+        finished = np.load(self.__path(ResultStore.finished_file_name), "r")
+        is_finished = bool(finished[index])
+        del finished
+        return is_finished
+
+    def read(self, index: int) -> np.ndarray:
+        """
+        :param index: The index of the subspace in the subspace index
+        :return: A copy of the outlier scores of the subspace
+        """
+        scores = np.load(self.__path(ResultStore.scores_file_name), "r")
+        row = np.array(scores[index])
+        del scores
+        return row
+
+    def get_subspace_identifiers(self) -> list[str]:
+        """
+        :return: The identifiers of the subspaces, in the order of the rows
+        """
+        with open(self.__path(ResultStore.subspaces_file_name)) as f:
+            return json.load(f)
+
+    def get_finished_results(self) -> Iterator[tuple[str, np.ndarray]]:
+        """
+        :return: The identifier and the outlier scores of each finished subspace,
+        the scores are read-only views of the memory-mapped matrix
+        """
+        scores = np.load(self.__path(ResultStore.scores_file_name), "r")
+        finished = np.load(self.__path(ResultStore.finished_file_name))
+        for index, identifier in enumerate(self.get_subspace_identifiers()):
+            if finished[index]:
+                yield identifier, scores[index]
+
+    def get_csv_results(self, row_numbers: np.ndarray) -> Iterator[tuple[str, bytes]]:
+        """
+        :param row_numbers: The row numbers of the datapoints
+        :return: The path of the csv-file of each finished subspace in the directory
+        and its content, the row number and the outlier score of each datapoint,
+        like ExecutionElements without a ResultStore write it
+        """
+        rows = np.expand_dims(row_numbers.astype(object), 1)
+        for identifier, scores in self.get_finished_results():
+            data = np.concatenate((rows, np.expand_dims(scores.astype(object), 1)), 1)
+            yield os.path.join(self._directory, identifier + ".csv"), \
+                pd.DataFrame(data).to_csv(index=False, header=False).encode()
+
+    def export_csv(self, row_numbers: np.ndarray) -> None:
+        """
+        Writes the csv-file of each finished subspace into the directory
+        (see get_csv_results). \n
+        :param row_numbers: The row numbers of the datapoints
+        """
+        for path, content in self.get_csv_results(row_numbers):
+            with open(path + ".running", "wb") as f:
+                f.write(content)
+            shutil.move(path + ".running", path)
+
+    def delete(self) -> None:
+        """
+        Deletes the files of the store, the subspace index first
+        """
+        for path in self.get_file_paths():
+            if os.path.isfile(path):
+                os.remove(path)
+
+    def get_file_paths(self) -> list[str]:
+        """
+        :return: The paths of the files of the store, the subspace index first
+        """
+        return [self.__path(name) for name in [ResultStore.subspaces_file_name,
+                                               ResultStore.scores_file_name,
+                                               ResultStore.finished_file_name]]
+
+    @staticmethod
+    def write_row_numbers(execution_directory: str, row_numbers: np.ndarray) -> None:
+        """
+        Writes the row numbers of the datapoints shared by the ResultStores
+        of an Execution
+        :param execution_directory: The directory of the Execution
+        :param row_numbers: The row number of each datapoint
+        """
+        path = ResultStore.get_row_numbers_path(execution_directory)
+        with open(path + ".running", "wb") as f:
+            np.save(f, row_numbers.astype(np.int32))
+        shutil.move(path + ".running", path)
+
+    @staticmethod
+    def get_row_numbers_path(execution_directory: str) -> str:
+        return os.path.join(execution_directory, ResultStore.row_numbers_file_name)
+
+    def __path(self, name: str) -> str:
+        return os.path.join(self._directory, name)
@@ -1,9 +1,16 @@
 import os
+import shutil
+import zlib
 from collections.abc import Callable
+from typing import Optional
+
+import numpy as np
 
 from backend.scheduler.Schedulable import Schedulable
 from backend.task.TaskState import TaskState
 from backend.task.TaskHelper import TaskHelper
+from backend.task.ZipWriter import ZipWriter
+from backend.task.execution.ResultStore import ResultStore
 
 
 class ResultZipper(Schedulable):
@@ -12,7 +19,10 @@ class ResultZipper(Schedulable):
     """
     def __init__(self, user_id: int, task_id: int, error_occurred: bool,
                  task_progress_callback: Callable[[int, TaskState, float], None],
-                 dir_path: str, zip_path_running: str, zip_path_final: str):
+                 dir_path: str, zip_path_running: str, zip_path_final: str,
+                 csv_export_result_stores: Optional[list[ResultStore]] = None,
+                 compression_level: int = zlib.Z_DEFAULT_COMPRESSION,
+                 threads: int = 1):
 
         """
         :param user_id: The ID of the user belonging to the Execution.
@@ -29,11 +39,20 @@ class ResultZipper(Schedulable):
         :param zip_path_final: The absolute path to the directory where the result of
         the zipping will be located after the zipping is completed.
         Any existing file will be deleted and overwritten.
+        :param csv_export_result_stores: The ResultStores in the directory,
+        that are replaced by a csv-file for each of their results in the zip-file.
+        The row numbers shared by them are left out then as well
+        :param compression_level: The level of compression from 0 to 9
+        (see TaskHelper.zip_dir), 0 stores the files uncompressed
+        :param threads: The number of threads compressing the files
         """
 
         assert user_id >= -1
         assert task_id >= -1
         assert os.path.isdir(dir_path)
+        assert (0 <= compression_level <= 9) or (
+            compression_level == zlib.Z_DEFAULT_COMPRESSION)
+        assert threads >= 1
 
         self._user_id: int = user_id
         self._task_id: int = task_id
@@ -42,6 +61,10 @@ class ResultZipper(Schedulable):
         self._dir_path: str = dir_path
         self._zip_path_running: str = zip_path_running
         self._zip_path_final: str = zip_path_final
+        self._csv_export_result_stores: list[ResultStore] = \
+            list(csv_export_result_stores or [])
+        self._compression_level: int = compression_level
+        self._threads: int = threads
 
     @property
     def user_id(self) -> int:
@@ -89,9 +112,12 @@ class ResultZipper(Schedulable):
             if os.path.isfile(file):
                 os.remove(file)
 
-        TaskHelper.zip_dir(zip_path_running=self._zip_path_running,
-                           zip_path_final=self._zip_path_final,
-                           dir_path=self._dir_path)
+        with ZipWriter(self._zip_path_running, self._compression_level,
+                       self._threads) as zip_writer:
+            excluded_paths = self.__write_result_stores(zip_writer)
+            zip_writer.write_dir(self._dir_path, excluded_paths)
+        # is an atomic operation, *if* both paths are on the same file system
+        shutil.move(self._zip_path_running, self._zip_path_final)
         TaskHelper.del_dir(self._dir_path)
 
         if self._error_occurred:
@@ -99,3 +125,25 @@ class ResultZipper(Schedulable):
                                          TaskState.FINISHED_WITH_ERROR, 1)
         else:
             self._task_progress_callback(self._task_id, TaskState.FINISHED, 1)
+
+    def __write_result_stores(self, zip_writer: ZipWriter) -> frozenset[str]:
+        """
+        Writes a csv-file for each result of the ResultStores into the zip-file,
+        straight from the stores without writing the csv-files to the disk.
+        :return: The paths of the files of the stores and of the row numbers,
+        which are left out of the zip-file
+        """
+        if len(self._csv_export_result_stores) == 0:
+            return frozenset()
+        row_numbers_path = ResultStore.get_row_numbers_path(self._dir_path)
+        excluded_paths = {row_numbers_path}
+        result_stores = [store for store in self._csv_export_result_stores
+                         if store.exists]
+        if len(result_stores) > 0:
+            row_numbers = np.load(row_numbers_path)
+            for store in result_stores:
+                for path, content in store.get_csv_results(row_numbers):
+                    zip_writer.write_bytes(
+                        content, ZipWriter.get_arcname(self._dir_path, path))
+                excluded_paths.update(store.get_file_paths())
+        return frozenset(excluded_paths)
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Mapping
+
+import numpy as np
+
+from backend.scheduler.RemoteWorker import RemoteJob
+from backend.task.execution.AlgorithmLoader import AlgorithmLoader
+
+
+class AlgorithmJob(RemoteJob):
+    """Computes the outlier scores of an algorithm on a subspace on a WorkerAgent.
+    The algorithm file and the subspace data are resources,
+    so that they are only sent once to every agent."""
+
+    def __init__(self, algorithm_key: str, algorithm_file_name: str,
+                 hyper_parameter: dict[str, object], subspace_key: str,
+                 subspace_shape: tuple[int, int], subspace_dtype: np.dtype):
+        """
+        :param algorithm_key: The key of the contents of the algorithm file,
+        which has to change whenever the contents change
+        :param algorithm_file_name: The name of the algorithm file,
+        which is the name of the algorithm class
+        :param hyper_parameter: The parameters to instantiate the algorithm with
+        :param subspace_key: The key of the data of the subspace
+        :param subspace_shape: The number of datapoints and dimensions of the subspace
+        :param subspace_dtype: The dtype of the subspace data
+        """
+        self._algorithm_key: str = algorithm_key
+        self._algorithm_file_name: str = algorithm_file_name
+        self._hyper_parameter: dict[str, object] = hyper_parameter
+        self._subspace_key: str = subspace_key
+        self._subspace_shape: tuple[int, int] = subspace_shape
+        self._subspace_dtype: np.dtype = subspace_dtype
+
+    @property
+    def resources(self) -> list[str]:
+        return [self._algorithm_key, self._subspace_key]
+
+    def run(self, resources: Mapping[str, bytes], work_dir: str) -> np.ndarray:
+        # the module name of an algorithm is derived from its directory,
+        # so store every version of an algorithm in a directory of its own
+        directory = os.path.join(
+            work_dir, "algorithm_" + AlgorithmJob.__to_identifier(self._algorithm_key))
+        path = os.path.join(directory, self._algorithm_file_name)
+        if not os.path.isfile(path):
+            os.makedirs(directory, exist_ok=True)
+            with open(path + ".running", "wb") as f:
+                f.write(resources[self._algorithm_key])
+            os.replace(path + ".running", path)
+        AlgorithmLoader.set_algorithm_root_dir(work_dir)
+        # algorithms may write into their input, so do not hand them the cached data
+        subspace = np.frombuffer(resources[self._subspace_key], self._subspace_dtype) \
+            .reshape(self._subspace_shape).copy()
+        return AlgorithmJob.compute_scores(path, self._hyper_parameter, subspace)
+
+    @staticmethod
+    def compute_scores(path: str, hyper_parameter: dict[str, object],
+                       data: np.ndarray) -> np.ndarray:
+        """Fits the algorithm under the given path on data
+        :return: The decision scores of the algorithm for the datapoints of data"""
+        algo = AlgorithmLoader.get_algorithm_object(path, hyper_parameter)
+        algo.fit(data, None)
+        results: np.ndarray = algo.decision_scores_
+        assert results.size == (data.shape[0]), \
+            "The result provided by the algorithm is not of the shape expected"
+        assert results.dtype.kind in ['f', 'i', 'u'], \
+            "The result of the algorithm is not of a number type"
+        assert not np.all(np.isnan(results)), \
+            "The algorithm only returned NaN values"
+        return results
+
+    @staticmethod
+    def __to_identifier(key: str) -> str:
+        return "".join(c if c.isalnum() else "_" for c in key)
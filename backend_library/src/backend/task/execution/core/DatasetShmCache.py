@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import atexit
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from logging import debug
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional
+
+from backend.instrumentation.Instrumentation import Instrumentation
+
+shared_memory_bytes = Instrumentation.gauge(
+    "sop_shared_memory_bytes",
+    "Bytes of shared memory currently allocated by executions")
+_cache_hits = Instrumentation.counter(
+    "sop_dataset_cache_hits_total",
+    "Executions that used a dataset loaded into shared memory by another execution")
+_idle_bytes = Instrumentation.gauge(
+    "sop_dataset_cache_idle_bytes",
+    "Bytes of shared memory of cached datasets no execution uses")
+
+
+class DatasetShmCache:
+    """
+    Process-wide cache of the shared memory segments containing the cleaned
+    datasets of executions (and their row numbers), so that executions on the same
+    dataset share a single segment and only the first of them parses the dataset. \n
+    Segments are reference counted. Segments no execution uses anymore are kept
+    up to a memory limit, evicting the least recently used ones first.
+    Only to be used on the main process.
+    """
+    _lock: threading.Lock = threading.Lock()
+    _memory_limit: int = 0
+    _entries: dict[str, CachedDataset] = dict()
+    """The acquired and idle entries by the name of their dataset segment"""
+    _by_key: dict[str, str] = dict()
+    """The names of the dataset segments that can be shared by their key"""
+    _idle: OrderedDict[str, None] = OrderedDict()
+    """The names of the dataset segments no execution uses, least recently used first"""
+    _idle_size: int = 0
+    _registered_cleanup: bool = False
+
+    @staticmethod
+    def set_memory_limit(memory_limit: int) -> None:
+        """
+        Sets the bytes of shared memory the datasets no execution uses may occupy,
+        evicting datasets exceeding it. 0 to unlink datasets once they are not used
+        """
+        assert memory_limit >= 0
+        with DatasetShmCache._lock:
+            DatasetShmCache._memory_limit = memory_limit
+            evicted = DatasetShmCache.__evict()
+        DatasetShmCache.__unlink(evicted)
+
+    @staticmethod
+    def acquire(key: Optional[str], datapoint_count: int, dimension_count: int) \
+            -> CachedDataset:
+        """
+        Returns the entry of a dataset, creating its shared memory if required.
+        Every call has to be followed by a call to release.
+        :param key: Identifies the contents and the layout of the dataset,
+        None to create an entry that is not shared
+        :param datapoint_count: The number of datapoints of the dataset
+        :param dimension_count: The number of dimensions of the dataset
+        :return: The entry, which has to be filled unless it is filled already
+        """
+        with DatasetShmCache._lock:
+            name = None if key is None else DatasetShmCache._by_key.get(key)
+            if name is not None:
+                entry = DatasetShmCache._entries[name]
+                assert entry.dataset_shape == (datapoint_count, dimension_count)
+                if name in DatasetShmCache._idle:
+                    del DatasetShmCache._idle[name]
+                    DatasetShmCache._idle_size -= entry.size
+                    _idle_bytes.set(DatasetShmCache._idle_size)
+                entry.references += 1
+                _cache_hits.inc()
+                debug(f"shared the dataset shm {name}, "
+                      f"used {entry.references} times now")
+                return entry
+            if not DatasetShmCache._registered_cleanup:
+                atexit.register(DatasetShmCache.clear)
+                DatasetShmCache._registered_cleanup = True
+        entry = CachedDataset(
+            key, (datapoint_count, dimension_count),
+            SharedMemory(None, True, datapoint_count * dimension_count * 4),
+            SharedMemory(None, True, datapoint_count * 4))
+        shared_memory_bytes.inc(entry.dataset_shm.size, kind="dataset")
+        shared_memory_bytes.inc(entry.rownrs_shm.size, kind="row_numbers")
+        with DatasetShmCache._lock:
+            DatasetShmCache._entries[entry.dataset_shm.name] = entry
+            if key is not None:
+                DatasetShmCache._by_key.setdefault(key, entry.dataset_shm.name)
+        return entry
+
+    @staticmethod
+    def mark_filled(name: str) -> None:
+        """
+        Marks an entry as filled with its dataset,
+        so that executions acquiring it later on do not fill it again
+        :param name: The name of the dataset segment of the entry
+        """
+        with DatasetShmCache._lock:
+            entry = DatasetShmCache._entries.get(name)
+            if entry is not None:
+                entry.filled = True
+
+    @staticmethod
+    def release(name: str) -> None:
+        """
+        Releases an entry acquired before. Unused entries are kept
+        if they are filled and fit into the memory limit, and unlinked otherwise.
+        :param name: The name of the dataset segment of the entry
+        """
+        evicted: list[CachedDataset] = list()
+        with DatasetShmCache._lock:
+            entry = DatasetShmCache._entries[name]
+            entry.references -= 1
+            if entry.references > 0:
+                return
+            if entry.filled and DatasetShmCache._by_key.get(entry.key) == name:
+                DatasetShmCache._idle[name] = None
+                DatasetShmCache._idle_size += entry.size
+                _idle_bytes.set(DatasetShmCache._idle_size)
+            else:
+                evicted.append(DatasetShmCache.__remove(name))
+            evicted += DatasetShmCache.__evict()
+        DatasetShmCache.__unlink(evicted)
+
+    @staticmethod
+    def is_filled(key: Optional[str]) -> bool:
+        """
+        :return: Whether acquiring the entry of the key returns a filled entry
+        """
+        with DatasetShmCache._lock:
+            name = None if key is None else DatasetShmCache._by_key.get(key)
+            return name is not None and DatasetShmCache._entries[name].filled
+
+    @staticmethod
+    def clear() -> None:
+        """
+        Unlinks all datasets no execution uses
+        """
+        with DatasetShmCache._lock:
+            evicted = [DatasetShmCache.__remove(name)
+                       for name in list(DatasetShmCache._idle)]
+        DatasetShmCache.__unlink(evicted)
+
+    @staticmethod
+    def __evict() -> list[CachedDataset]:
+        """
+        Removes the least recently used idle entries exceeding the memory limit,
+        to be called with the lock held
+        :return: The removed entries, which have to be unlinked
+        """
+        evicted: list[CachedDataset] = list()
+        while DatasetShmCache._idle_size > DatasetShmCache._memory_limit:
+            name = next(iter(DatasetShmCache._idle))
+            evicted.append(DatasetShmCache.__remove(name))
+        return evicted
+
+    @staticmethod
+    def __remove(name: str) -> CachedDataset:
+        """Removes an entry, to be called with the lock held"""
+        entry = DatasetShmCache._entries.pop(name)
+        if name in DatasetShmCache._idle:
+            del DatasetShmCache._idle[name]
+            DatasetShmCache._idle_size -= entry.size
+        _idle_bytes.set(DatasetShmCache._idle_size)
+        if entry.key is not None and DatasetShmCache._by_key.get(entry.key) == name:
+            del DatasetShmCache._by_key[entry.key]
+        return entry
+
+    @staticmethod
+    def __unlink(entries: list[CachedDataset]) -> None:
+        for entry in entries:
+            debug(f"unlinking the dataset shm {entry.dataset_shm.name}")
+            for shm, kind in [(entry.dataset_shm, "dataset"),
+                              (entry.rownrs_shm, "row_numbers")]:
+                shm.unlink()
+                shm.close()
+                shared_memory_bytes.dec(shm.size, kind=kind)
+
+
+@dataclass
+class CachedDataset:
+    """The shared memory of a dataset in the DatasetShmCache"""
+    key: Optional[str]
+    dataset_shape: tuple[int, int]
+    dataset_shm: SharedMemory
+    """Contains the data of the dataset as float32"""
+    rownrs_shm: SharedMemory
+    """Contains the row numbers of the dataset as int32"""
+    references: int = 1
+    filled: bool = False
+
+    @property
+    def size(self) -> int:
+        return self.dataset_shm.size + self.rownrs_shm.size
@@ -4,27 +4,39 @@ import json
 import multiprocessing
 import os
 import shutil
+import time
+import zlib
 from collections.abc import Callable
-from logging import debug
+from logging import debug, warning
 from typing import Optional, cast
 
 import numpy as np
 
 from backend.DataIO import DataIO
 from backend.JsonSerializable import JsonSerializable
+from backend.instrumentation.Instrumentation import Instrumentation
+from backend.metric.MetricAggregator import MetricAggregator
 from backend.scheduler.Schedulable import Schedulable
 from backend.scheduler.Scheduler import Scheduler
 from backend.task.Task import Task
 from backend.task.TaskHelper import TaskHelper
 from backend.task.TaskState import TaskState
+from backend.task.execution.AlgorithmLoader import AlgorithmLoader
+from backend.task.execution.MetricComputation import MetricComputation
 from backend.task.execution.ParameterizedAlgorithm import ParameterizedAlgorithm
+from backend.task.execution.ResultStore import ResultStore
 from backend.task.execution.ResultZipper import ResultZipper
 from backend.task.execution.core.ExecutionShmContainer import ExecutionShmContainer
 from backend.task.execution.core.ExecutionSubspace import ExecutionSubspace
+from backend.task.execution.core.SharedResultMatrix import SharedResultMatrix
 from backend.task.execution.subspace.Subspace import Subspace
 from backend.task.execution.subspace.SubspaceGenerationDescription import \
     SubspaceGenerationDescription
 
+_progress_callback_seconds = Instrumentation.histogram(
+    "sop_progress_callback_seconds",
+    "Seconds the task progress callback takes, e.g. to update the database")
+
 
 class Execution(JsonSerializable, Task, Schedulable):
     """
@@ -32,6 +44,13 @@ class Execution(JsonSerializable, Task, Schedulable):
         When scheduled by the Scheduler it executes an execution with the
         selected cleaned dataset and algorithms.
     """
+    _export_csv: bool = True
+    _shared_result_limit: int = 0
+    _shared_results: Optional[SharedResultMatrix] = None
+    _metric_aggregators: list[MetricAggregator] = list()
+    _metric_failed: bool = False
+    _zip_compression_level: int = zlib.Z_DEFAULT_COMPRESSION
+    _zip_threads: int = 1
 
     def __init__(self, user_id: int, task_id: int,
                  task_progress_callback: Callable[[int, TaskState, float], None],
@@ -41,7 +60,13 @@ class Execution(JsonSerializable, Task, Schedulable):
                  metric_callback: Callable[[Execution], None],
                  datapoint_count: Optional[int],
                  final_zip_path: str = "", priority: int = 0,
-                 zip_running_path: str = ""):
+                 zip_running_path: str = "",
+                 algorithm_timeout: Optional[float] = None,
+                 timeout: Optional[float] = None, column_major: bool = False,
+                 export_csv: bool = True, shared_result_limit: int = 0,
+                 metric_aggregators: Optional[list[MetricAggregator]] = None,
+                 zip_compression_level: int = zlib.Z_DEFAULT_COMPRESSION,
+                 zip_threads: int = 1):
         """
         :param user_id: The ID of the user belonging to the Execution.
         Has to be at least -1.
@@ -62,14 +87,42 @@ class Execution(JsonSerializable, Task, Schedulable):
         and will generate the subspaces.
         :param algorithms: Contains all algorithms
         that should be processed on the subspaces.
-        :param metric_callback: Called after the Execution-computation is complete.
+        :param metric_callback: Called by a MetricComputation scheduled
+        after the Execution-computation is complete.
         Carries out the metricizes.
         :param datapoint_count: Number of datapoints in the dataset.
         Should be specified to accelerate calculation
+        :param algorithm_timeout: The number of seconds each algorithm may run
+        on a subspace, before it is stopped and fails. None for no limit
+        :param timeout: The number of seconds from the start of the Execution,
+        after which all algorithms that did not finish yet fail. None for no limit
+        :param column_major: Whether to store the dataset in column-major order,
+        so that extracting a subspace copies contiguous blocks of dimensions,
+        and algorithms get a view of the dataset for subspaces of adjacent dimensions
+        :param export_csv: Whether the zipped result contains a csv-file for each
+        ExecutionElement result. Otherwise, it contains the ResultStore of each
+        algorithm, in which the results are stored while the Execution runs
+        :param shared_result_limit: The maximum size in bytes of the
+        SharedResultMatrices of all running Executions together. The
+        ExecutionElements write their results to the matrix instead of the
+        ResultStores, and it is written to the ResultStores at once after all
+        of them finished. Results in it are computed again if the Execution is
+        recovered before. Without room for the matrix, or with 0, the results
+        are written to the ResultStores directly
+        :param metric_aggregators: Metrics which get the result of each
+        ExecutionElement as it finishes, to be written by the metric_callback
+        :param zip_compression_level: The level of compression of the zipped result
+        from 0 to 9, 0 stores the files uncompressed (see TaskHelper.zip_dir)
+        :param zip_threads: The number of threads compressing the zipped result
         """
         assert dataset_path.endswith(".csv")
         assert priority >= 0
         assert priority < 5
+        assert algorithm_timeout is None or algorithm_timeout > 0
+        assert timeout is None or timeout > 0
+        assert (0 <= zip_compression_level <= 9) or (
+            zip_compression_level == zlib.Z_DEFAULT_COMPRESSION)
+        assert zip_threads >= 1
 
         Task.__init__(self, user_id, task_id, task_progress_callback)
         self._priority = priority
@@ -80,6 +133,15 @@ class Execution(JsonSerializable, Task, Schedulable):
         self._subspace_generation: SubspaceGenerationDescription = subspace_generation
         self._algorithms: list[ParameterizedAlgorithm] = list(algorithms)
         self._metric_callback: Callable[[Execution], None] = metric_callback
+        self._algorithm_timeout: Optional[float] = algorithm_timeout
+        self._timeout: Optional[float] = timeout
+        self._deadline: Optional[float] = None
+        self._export_csv: bool = export_csv
+        self._shared_result_limit: int = shared_result_limit
+        self._metric_aggregators: list[MetricAggregator] = \
+            [] if metric_aggregators is None else list(metric_aggregators)
+        self._zip_compression_level: int = zip_compression_level
+        self._zip_threads: int = zip_threads
 
         # on created logic
         self._execution_element_finished_lock = multiprocessing.Lock()
@@ -107,7 +169,8 @@ class Execution(JsonSerializable, Task, Schedulable):
 
         # generate execution_subspaces
         self._execution_subspaces: list[ExecutionSubspace] = list()
-        self._execution_shms: ExecutionShmContainer = ExecutionShmContainer()
+        self._execution_shms: ExecutionShmContainer = \
+            ExecutionShmContainer(column_major)
         self._row_numbers: Optional[np.ndarray] = None
         debug(f"{self} created")
 
@@ -183,14 +246,40 @@ class Execution(JsonSerializable, Task, Schedulable):
         Creates all ExecutionSubspaces that are part of this Execution. \n
         :return: None
         """
-        for subspace in self._subspaces:
+        dataset_key = self.__get_dataset_key()
+        for subspace_index, subspace in enumerate(self._subspaces):
             self._execution_subspaces.append(
                 ExecutionSubspace(self._user_id, self._task_id, self._algorithms,
                                   subspace, self._result_path,
                                   self._execution_shms.dataset_on_main,
                                   self.__on_execution_element_finished,
                                   self._execution_shms.shared_memory_name,
-                                  self._row_numbers))
+                                  self._row_numbers,
+                                  row_numbers_shm_name=self._execution_shms
+                                  .rownrs_shm_name,
+                                  algorithm_timeout=self._algorithm_timeout,
+                                  deadline=self._deadline,
+                                  column_major=self._execution_shms.column_major,
+                                  dataset_key=dataset_key,
+                                  subspace_index=subspace_index,
+                                  shared_results=self._shared_results,
+                                  on_result_callback=self
+                                  .__on_execution_element_result
+                                  if self._metric_aggregators else None))
+
+    def __get_dataset_key(self) -> Optional[str]:
+        """
+        Identifies the contents of the cleaned dataset,
+        so that Executions on it share the shared memory of the dataset
+        and their subspaces. \n
+        :return: The key, None if the dataset can not be identified
+        """
+        try:
+            stat = os.stat(self._dataset_path)
+        except OSError:
+            return None
+        return f"{os.path.realpath(self._dataset_path)}" \
+               f":{stat.st_size}:{stat.st_mtime_ns}"
 
     # schedule
     def schedule(self) -> None:
@@ -202,7 +291,13 @@ class Execution(JsonSerializable, Task, Schedulable):
             self._task_progress_callback(self._task_id, TaskState.FINISHED, 1.0)
             return
 
-        Scheduler.get_instance().schedule(self)
+        scheduler: Scheduler = Scheduler.get_instance()
+        # processes started by the scheduler later on have to be able to load algorithms
+        # the algorithms themselves are not preloaded, as they may be user provided code
+        root_dir: Optional[str] = AlgorithmLoader.get_algorithm_root_dir()
+        if root_dir is not None:
+            scheduler.preload(AlgorithmLoader.set_algorithm_root_dir, root_dir)
+        scheduler.schedule(self)
 
     def __does_zip_exists(self) -> bool:
         """
@@ -233,6 +328,8 @@ class Execution(JsonSerializable, Task, Schedulable):
         return progress
 
     def run_before_on_main(self) -> None:
+        if self._timeout is not None:
+            self._deadline = time.time() + self._timeout
         # generate subspaces
         self._subspaces = self._subspace_generation.generate()
         self._subspaces_count = len(self._subspaces)
@@ -240,15 +337,44 @@ class Execution(JsonSerializable, Task, Schedulable):
             self._algorithms)
 
         if self._datapoint_count is None:
-            self._datapoint_count = DataIO.read_annotated(
-                self._dataset_path, True).data.shape[0]
+            self._datapoint_count = self.__read_datapoint_count()
         ds_dim_count = self._subspaces[0].get_dataset_dimension_count()
-        self._execution_shms.make_shms(self._datapoint_count, ds_dim_count)
+        self._execution_shms.make_shms(self._datapoint_count, ds_dim_count,
+                                       self.__get_dataset_key())
+        # a recovered Execution may refer to the shared memory of its last run
+        self._shared_results = None
+        if self._shared_result_limit > 0:
+            shared_results = SharedResultMatrix(
+                len(self._algorithms), self._subspaces_count, self._datapoint_count)
+            # the matrix is kept until the last ExecutionElement finished,
+            # so the limit applies to those of all Executions together
+            if shared_results.create(self._shared_result_limit):
+                self._shared_results = shared_results
+
+    def __read_datapoint_count(self) -> int:
+        """
+        Reads the number of datapoints of the cleaned dataset,
+        from the header of its binary copy if there is one
+        """
+        try:
+            return DataIO.read_binary_shape(
+                DataIO.get_binary_path(self._dataset_path))[0]
+        except (OSError, ValueError):
+            return DataIO.read_annotated(self._dataset_path, True).data.shape[0]
 
     def __load_dataset(self) -> None:
         """
-        Load the cleaned dataset into shared memory
-        """
+        Load the cleaned dataset into shared memory, directly from its binary copy
+        if there is one and from the csv-file otherwise
+        """
+        binary_path = DataIO.get_binary_path(self._dataset_path)
+        if os.path.isfile(binary_path):
+            try:
+                self._execution_shms.store_dataset_from_binary(binary_path)
+                debug(f"Loaded dataset for {self} from {binary_path}")
+                return
+            except (OSError, ValueError) as e:
+                warning(f"could not load {binary_path}, reading the csv-file: {e!r}")
         dataset = DataIO.read_annotated(self._dataset_path, True)
         assert dataset.data.shape[0] == self._datapoint_count
         assert dataset.data.shape[1] == self._subspaces[0].get_dataset_dimension_count()
@@ -278,47 +404,178 @@ class Execution(JsonSerializable, Task, Schedulable):
             with self._execution_element_finished_lock:
                 self._finished_execution_element_count += 1
                 self.__run_progress_callback()
-                if self._finished_execution_element_count == \
-                        self._total_execution_element_count:
-                    self._execution_shms.unload_dataset()
-                    self._metric_callback(self)
-                    self._metric_finished = True
-                    self.__run_progress_callback()
-                    self.__schedule_result_zipping()
+                all_finished: bool = self._finished_execution_element_count == \
+                    self._total_execution_element_count
+            # only the last ExecutionElement gets here, and the metrics are computed
+            # without blocking the others
+            if all_finished:
+                self.__store_shared_results()
+                self._execution_shms.unload_dataset()
+                self.__schedule_metric_computation()
         else:
             self._execution_shms.unload_dataset(True)
+            self.__unload_shared_results()
+
+    def __on_execution_element_result(self, algorithm_index: int,
+                                      subspace_index: int) -> None:
+        """
+        The Execution gets notified by the corresponding ExecutionSubspace
+        when an ExecutionElement finished successfully by calling this method,
+        and adds its result to the metric aggregators. \n
+        :param algorithm_index: The index of the algorithm of the ExecutionElement
+        :param subspace_index: The index of the subspace of the ExecutionElement
+        :return: None
+        """
+        if self._shared_results is not None \
+                and self._shared_results.is_finished(algorithm_index, subspace_index):
+            scores = self._shared_results.read(algorithm_index, subspace_index)
+        else:
+            result_store = ResultStore(self.algorithm_directory_paths[algorithm_index])
+            if not result_store.is_finished(subspace_index):
+                return
+            scores = result_store.read(subspace_index)
+        identifier = self._subspaces[subspace_index].get_subspace_identifier()
+        # ExecutionElements finish on several threads, and the metric aggregators
+        # update their state in place
+        with self._execution_element_finished_lock:
+            for metric_aggregator in self._metric_aggregators:
+                metric_aggregator.add_result(identifier, scores)
+
+    def __store_shared_results(self) -> None:
+        """
+        Writes the results in the SharedResultMatrix to the ResultStores
+        and unloads it
+        """
+        if self._shared_results is None:
+            return
+        for algorithm_index, path in enumerate(self.algorithm_directory_paths):
+            result_store = ResultStore(path)
+            if not result_store.exists:
+                warning(f"{self} could not store the results in {path}, "
+                        f"as the result store is missing")
+                continue
+            indices, scores = self._shared_results.get_finished_results(
+                algorithm_index)
+            result_store.write_many(indices, scores)
+        self.__unload_shared_results()
+
+    def __unload_shared_results(self) -> None:
+        if self._shared_results is not None:
+            self._shared_results.unlink()
+            self._shared_results = None
+
+    def __schedule_metric_computation(self) -> None:
+        """
+        Create and schedule the MetricComputation of the Execution into the Scheduler,
+        which schedules the ResultZipping once it finished. \n
+        :return: None
+        """
+        metric_computation: MetricComputation = MetricComputation(
+            self._user_id, self._task_id, lambda: self._metric_callback(self),
+            self.__on_metric_computation_finished)
+        scheduler: Scheduler = Scheduler.get_instance()
+        scheduler.schedule(metric_computation)
+
+    def __on_metric_computation_finished(self, statuscode: Optional[int]) -> None:
+        """
+        The Execution gets notified by its MetricComputation when it finished
+        by calling this method. \n
+        :param statuscode: The statuscode of the MetricComputation,
+        None if it was aborted
+        :return: None
+        """
+        if statuscode is None:
+            return
+        if statuscode != 0:
+            warning(f"{self} could not compute its metrics")
+            self._metric_failed = True
+        self._metric_finished = True
+        self.__run_progress_callback()
+        self.__schedule_result_zipping()
 
     def __run_progress_callback(self):
         """Executes the task progress callback with the appropriate parameters"""
-        state = TaskState.RUNNING_WITH_ERROR if self._has_failed_element else \
-            TaskState.RUNNING
-        self._task_progress_callback(self.task_id, state, self.__compute_progress())
+        state = TaskState.RUNNING_WITH_ERROR \
+            if self._has_failed_element or self._metric_failed else TaskState.RUNNING
+        with _progress_callback_seconds.time(task="Execution"):
+            self._task_progress_callback(self.task_id, state,
+                                         self.__compute_progress())
 
     def __schedule_result_zipping(self) -> None:
         """
         Create and schedule the ResultZipping of the Execution into the Scheduler. \n
         :return: None
         """
+        result_stores: list[ResultStore] = list()
+        if self._export_csv:
+            result_stores = [ResultStore(path)
+                             for path in self.algorithm_directory_paths]
         result_zipper: ResultZipper = ResultZipper(self._user_id, self._task_id,
-                                                   self._has_failed_element,
+                                                   self._has_failed_element
+                                                   or self._metric_failed,
                                                    self._task_progress_callback,
                                                    self._result_path,
                                                    self._zip_running_path,
-                                                   self._final_zip_path)
+                                                   self._final_zip_path,
+                                                   result_stores,
+                                                   self._zip_compression_level,
+                                                   self._zip_threads)
         scheduler: Scheduler = Scheduler.get_instance()
         scheduler.schedule(result_zipper)
 
     def run_later_on_main(self, statuscode: Optional[int]):
-        self._row_numbers = self._execution_shms.copy_rns_back()
+        self._row_numbers = self._execution_shms.copy_rns()
         if statuscode is None:
             self._execution_shms.unload_dataset(True)
+            self.__unload_shared_results()
         else:
+            if statuscode == 0 and not self._execution_shms.dataset_loaded:
+                self._execution_shms.mark_dataset_loaded()
+            ResultStore.write_row_numbers(self._result_path, self._row_numbers)
+            # the results of a recovered Execution are added again
+            for metric_aggregator in self._metric_aggregators:
+                metric_aggregator.start(self.dataset_indices)
             self.__generate_execution_subspaces()
             for ess in self._execution_subspaces:
                 Scheduler.get_instance().schedule(ess)
 
     def do_work(self) -> None:
-        self.__load_dataset()
+        # another execution on the same dataset may have loaded it already
+        if not self._execution_shms.dataset_loaded:
+            self.__load_dataset()
+        self.__create_result_stores()
+
+    def __create_result_stores(self) -> None:
+        """
+        Creates the ResultStores of the algorithms,
+        keeping the results of an earlier run of this Execution
+        """
+        subspace_identifiers = [subspace.get_subspace_identifier()
+                                for subspace in self._subspaces]
+        for path in self.algorithm_directory_paths:
+            ResultStore(path).create(subspace_identifiers, self._datapoint_count)
+
+    def __getstate__(self) -> dict[str, object]:
+        # the lock only synchronizes the ExecutionElements of this process,
+        # so a copy in another process (e.g. a scheduler daemon) gets its own
+        state = self.__dict__.copy()
+        del state["_execution_element_finished_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, object]) -> None:
+        self.__dict__.update(state)
+        self._execution_element_finished_lock = multiprocessing.Lock()
+
+    @property
+    def memory_estimate(self) -> int:
+        # parsing the dataset creates a few arrays at most as large as the csv file,
+        # one of them in shared memory
+        if self._execution_shms.is_dataset_cached(self.__get_dataset_key()):
+            return 0
+        try:
+            return 2 * os.path.getsize(self._dataset_path)
+        except OSError:
+            return 0
 
     @property
     def user_id(self) -> int:
@@ -340,6 +597,14 @@ class Execution(JsonSerializable, Task, Schedulable):
         """
         return self._algorithms
 
+    @property
+    def metric_aggregators(self) -> list[MetricAggregator]:
+        """
+        :return: The metrics which get the result of each ExecutionElement
+        as it finishes
+        """
+        return self._metric_aggregators
+
     @property
     def algorithm_directory_paths(self) -> list[str]:
         """
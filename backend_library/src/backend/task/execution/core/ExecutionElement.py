@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import hashlib
 import os
+import time
 from collections.abc import Callable
 from logging import debug, info, warning
 from multiprocessing.shared_memory import SharedMemory
@@ -9,10 +11,14 @@ from typing import Optional
 import numpy as np
 
 from backend.DataIO import DataIO
+from backend.scheduler.RemoteWorker import RemoteWorker
 from backend.scheduler.Schedulable import Schedulable
 from backend.task.TaskHelper import TaskHelper
 from backend.task.execution.AlgorithmLoader import AlgorithmLoader
 from backend.task.execution.ParameterizedAlgorithm import ParameterizedAlgorithm
+from backend.task.execution.ResultStore import ResultStore
+from backend.task.execution.core.AlgorithmJob import AlgorithmJob
+from backend.task.execution.core.SharedResultMatrix import SharedResultMatrix
 from backend.task.execution.subspace.Subspace import Subspace
 
 
@@ -21,20 +27,31 @@ class ExecutionElement(Schedulable):
     Is the smallest unit of an Execution.
     Consists of the computation of one algorithm on exactly one subspace.
     """
+    _algorithm_memory_factor: int = 4
+    """The estimated memory used by an algorithm,
+    as multiple of the size of its subspace converted to float64"""
 
     def __init__(self, user_id: int, task_id: int, subspace: Subspace,
                  algorithm: ParameterizedAlgorithm, result_path: str,
                  subspace_dtype: np.dtype, ss_shm_name: str,
                  execution_element_is_finished: Callable[[bool, bool], None],
-                 datapoint_count: int, row_numbers: np.ndarray, priority: int = 10):
+                 datapoint_count: int, row_numbers: np.ndarray, priority: int = 10,
+                 row_numbers_shm_name: Optional[str] = None,
+                 timeout: Optional[float] = None, deadline: Optional[float] = None,
+                 ss_shm_offset: Optional[int] = None, column_major: bool = False,
+                 result_store: Optional[ResultStore] = None,
+                 subspace_index: Optional[int] = None,
+                 shared_results: Optional[SharedResultMatrix] = None,
+                 algorithm_index: Optional[int] = None):
         """
         :param user_id: The ID of the user belonging to this ExecutionElement.
         Has to be at least -1.
         :param task_id: The ID of this task. Has to be at least -1.
         :param subspace: The subspace on which the algorithm should compute its result.
         :param algorithm: The algorithm that should be computed on the subspace.
-        :param result_path: The directory where the result-csv-file
-        of the ExecutionElement-computation will be stored.
+        :param result_path: The path of the result-csv-file
+        of the ExecutionElement-computation, unless a result_store is given.
+        Errors are stored at its error path in any case.
         :param subspace_dtype: The dtype of the values that are stored in the dataset
         for processing.
         :param ss_shm_name: The name of the shared memory containing the subspace data
@@ -42,7 +59,27 @@ class ExecutionElement(Schedulable):
         that it finished its execution.
         :param row_numbers: the row numbers of the dataset,
         see AnnotatedDataset.row_mapping
+        :param row_numbers_shm_name: the name of the shared memory segment containing
+        row_numbers as int32, if existing.
+        If given, the row numbers are read from it instead of being pickled
+        :param timeout: The number of seconds the algorithm may run,
+        None for no limit
+        :param deadline: The time.time() by which the algorithm has to be finished,
+        e.g. as the whole Execution has to be finished by then, None for no deadline
+        :param ss_shm_offset: The offset in bytes of the subspace data in the shared
+        memory, if the subspace is a view of the dataset instead of a copy of it.
+        Views are read-only, as they are shared by other subspaces
+        :param column_major: Whether the subspace data is stored in column-major order
+        :param result_store: The ResultStore of the algorithm to write the result to,
+        instead of writing a csv-file to result_path
+        :param subspace_index: The index of the subspace in the result_store
+        :param shared_results: The SharedResultMatrix of the Execution to write
+        the result to, which the Execution writes to the result_store later on
+        :param algorithm_index: The index of the algorithm in the shared_results
         """
+        assert (result_store is None) == (subspace_index is None)
+        assert (shared_results is None) == (algorithm_index is None)
+        assert shared_results is None or result_store is not None
         assert priority <= 100
         assert priority >= 10
 
@@ -53,7 +90,8 @@ class ExecutionElement(Schedulable):
         self._task_id: int = task_id
         self._priority: int = priority
 
-        self._row_numbers = row_numbers
+        self._row_numbers: Optional[np.ndarray] = row_numbers
+        self._row_numbers_shm_name: Optional[str] = row_numbers_shm_name
         self._datapoint_count = datapoint_count
         self._subspace: Subspace = subspace
         self._algorithm: ParameterizedAlgorithm = algorithm
@@ -62,7 +100,15 @@ class ExecutionElement(Schedulable):
         self._subspace_dtype: np.dtype = subspace_dtype
 
         self._ss_shm_name: str = ss_shm_name
+        self._ss_shm_offset: Optional[int] = ss_shm_offset
+        self._column_major: bool = column_major
+        self._result_store: Optional[ResultStore] = result_store
+        self._subspace_index: Optional[int] = subspace_index
+        self._shared_results: Optional[SharedResultMatrix] = shared_results
+        self._algorithm_index: Optional[int] = algorithm_index
         self._execution_element_is_finished = execution_element_is_finished
+        self._timeout: Optional[float] = timeout
+        self._deadline: Optional[float] = deadline
 
         debug(f"{self} created")
 
@@ -73,6 +119,11 @@ class ExecutionElement(Schedulable):
         -> Used for performance improvement.) \n
         :return: True if the finished result exists. Otherwise, return False.
         """
+        if self._shared_results is not None and self._shared_results.is_finished(
+                self._algorithm_index, self._subspace_index):
+            return True
+        if self._result_store is not None:
+            return self._result_store.is_finished(self._subspace_index)
         return os.path.isfile(self._result_path)
 
     # Schedulable
@@ -97,14 +148,98 @@ class ExecutionElement(Schedulable):
         """
         return self._priority
 
+    @property
+    def worker_pool_compatible(self) -> bool:
+        # algorithms that are not known to be harmless, e.g. user provided ones,
+        # must not share a process with tasks of other users
+        return AlgorithmLoader.may_run_in_worker_pool(self._algorithm.path)
+
+    @property
+    def memory_estimate(self) -> int:
+        # algorithms usually convert the subspace to float64 and copy it a few times,
+        # the memory of algorithms with superlinear space complexity is underestimated
+        float64_size = self._datapoint_count \
+            * self._subspace.get_included_dimension_count() * np.dtype("f8").itemsize
+        return ExecutionElement._algorithm_memory_factor * float64_size
+
+    @property
+    def timeout(self) -> Optional[float]:
+        if self._deadline is None:
+            return self._timeout
+        remaining = self._deadline - time.time()
+        return remaining if self._timeout is None else min(self._timeout, remaining)
+
+    def on_timeout(self) -> int:
+        # the algorithm might have finished just before it was killed
+        if self.finished_result_exists():
+            return 0
+        if self._deadline is not None and time.time() >= self._deadline:
+            error_message = "The execution exceeded its time limit " \
+                            "before the algorithm finished"
+        else:
+            error_message = f"The algorithm exceeded its time limit " \
+                            f"of {self._timeout:g} seconds"
+        warning(f"{self} timed out")
+        TaskHelper.save_error_csv(self._result_path, error_message)
+        return -1
+
+    def __getstate__(self) -> dict[str, object]:
+        # the finished-callback is only needed on the main process
+        # and refers to the whole Execution, which can not be pickled
+        state = self.__dict__.copy()
+        state["_execution_element_is_finished"] = None
+        if self._row_numbers_shm_name is not None:
+            # keeps the pickled state small, as it is sent for every element
+            state["_row_numbers"] = None
+        return state
+
     def do_work(self) -> int:
         # Will compute and store the result of the ExecutionElement.
+        return self.__save_result(lambda: self.__run_algorithm())
+
+    @property
+    def remote_compatible(self) -> bool:
+        return True
+
+    def do_remote_work(self, worker: RemoteWorker) -> int:
+        with open(self._algorithm.path, "rb") as f:
+            algorithm = f.read()
+        algorithm_key = "algorithm:" + hashlib.sha256(algorithm).hexdigest()
+        # all ExecutionElements of an ExecutionSubspace share its shared memory
+        subspace_key = f"subspace:{self._task_id}:{self._ss_shm_name}" \
+                       f":{self._ss_shm_offset}" \
+                       f":{self._subspace.get_included_dimension_count()}"
+        job = AlgorithmJob(algorithm_key, os.path.basename(self._algorithm.path),
+                           self._algorithm.hyper_parameter, subspace_key,
+                           (self._datapoint_count,
+                            self._subspace.get_included_dimension_count()),
+                           self._subspace_dtype)
+        resources = {algorithm_key: lambda: algorithm,
+                     subspace_key: self.__read_subspace}
+        return self.__save_result(lambda: worker.run(job, resources))
+
+    def __save_result(self, compute: Callable[[], np.ndarray]) -> int:
+        """Computes the result of the ExecutionElement and stores it,
+        or the error that occurred instead
+        :param compute: Computes the result of the algorithm
+        :raises ConnectionError if the result of a remote worker could not be received
+        :return: The statuscode of the ExecutionElement"""
         try:
-            run_algo_result: np.ndarray = self.__run_algorithm()
-            result_to_save: np.ndarray = self.__convert_result_to_csv(run_algo_result)
-            DataIO.save_write_csv(self._result_path + ".running", self._result_path,
-                                  result_to_save, add_index_column=False)
+            run_algo_result: np.ndarray = compute()
+            if self._shared_results is not None:
+                self._shared_results.write(self._algorithm_index, self._subspace_index,
+                                           run_algo_result)
+            elif self._result_store is not None:
+                self._result_store.write(self._subspace_index, run_algo_result)
+            else:
+                result_to_save: np.ndarray = \
+                    self.__convert_result_to_csv(run_algo_result)
+                DataIO.save_write_csv(self._result_path + ".running",
+                                      self._result_path, result_to_save,
+                                      add_index_column=False)
             info(f"{self} has successfully written the algorithm results to the file")
+        except ConnectionError:
+            raise
         except Exception as e:
             error_message = str(e)
             warning(f"{self} errored with {e}")
@@ -123,25 +258,42 @@ class ExecutionElement(Schedulable):
         :return: Returns the result of the algorithm on the subspace.
         """
         ss_shm = SharedMemory(self._ss_shm_name)
+        ss_arr = self.__get_subspace_array(ss_shm)
+        try:
+            debug(f"{self} will now call the fit function on the algorithm "
+                  f"with {self._ss_shm_name} as data source")
+            results = AlgorithmJob.compute_scores(
+                self._algorithm.path, self._algorithm.hyper_parameter, ss_arr)
+            info(f"{self} has successfully executed the algorithm")
+        finally:
+            # pooled worker processes are long-lived, so the mapping is closed
+            # even if the algorithm failed
+            del ss_arr
+            ss_shm.close()
+        return results
+
+    def __read_subspace(self) -> bytes:
+        """
+        :return: A copy of the subspace data in the shared memory
+        """
+        ss_shm = SharedMemory(self._ss_shm_name)
+        # the agent expects row-major data
+        data = self.__get_subspace_array(ss_shm).tobytes(order="C")
+        ss_shm.close()
+        return data
+
+    def __get_subspace_array(self, ss_shm: SharedMemory) -> np.ndarray:
+        """
+        :return: The subspace data in the shared memory
+        """
         ss_dim_count = self._subspace.get_included_dimension_count()
         ss_arr = np.ndarray((self._datapoint_count, ss_dim_count),
-                            dtype=self._subspace_dtype, buffer=ss_shm.buf)
-        algo = AlgorithmLoader.get_algorithm_object(self._algorithm.path,
-                                                    self._algorithm.hyper_parameter)
-        debug(f"{self} will now call the fit function on the algorithm "
-              f"with {self._ss_shm_name} as data source")
-        algo.fit(ss_arr, None)
-        debug(f"{self} will now load the decision_scores_ of the algorithm")
-        results: np.ndarray = algo.decision_scores_
-        info(f"{self} has successfully executed the algorithm")
-        ss_shm.close()
-        assert results.size == (ss_arr.shape[0]),\
-            "The result provided by the algorithm is not of the shape expected"
-        assert results.dtype.kind in ['f', 'i', 'u'],\
-            "The result of the algorithm is not of a number type"
-        assert not np.all(np.isnan(results)),\
-            "The algorithm only returned NaN values"
-        return results
+                            dtype=self._subspace_dtype, buffer=ss_shm.buf,
+                            offset=self._ss_shm_offset or 0,
+                            order="F" if self._column_major else "C")
+        if self._ss_shm_offset is not None:
+            ss_arr.flags.writeable = False
+        return ss_arr
 
     def __convert_result_to_csv(self, run_algo_result: np.ndarray) -> np.ndarray:
         """
@@ -149,12 +301,25 @@ class ExecutionElement(Schedulable):
         :param run_algo_result: The unchanged result of the algorithm.
         :return: The result-csv-file of this ExecutionElement.
         """
-        rows = np.expand_dims(self._row_numbers.astype(object), 1)
+        rows = np.expand_dims(self.__get_row_numbers().astype(object), 1)
 
         data = np.expand_dims(run_algo_result.astype(object), 1)
         rows_data = np.concatenate((rows, data), 1)
         return rows_data
 
+    def __get_row_numbers(self) -> np.ndarray:
+        """
+        :return: The row numbers of the dataset,
+        read from the shared memory if they were not pickled.
+        """
+        if self._row_numbers is not None:
+            return self._row_numbers
+        rownrs_shm = SharedMemory(self._row_numbers_shm_name)
+        row_numbers = np.copy(np.ndarray([self._datapoint_count], np.int32,
+                                         rownrs_shm.buf))
+        rownrs_shm.close()
+        return row_numbers
+
     def run_later_on_main(self, statuscode: Optional[int]) -> None:
         self._execution_element_is_finished(statuscode != 0, statuscode is None)
 
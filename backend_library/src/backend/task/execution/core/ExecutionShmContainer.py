@@ -6,10 +6,14 @@ from typing import Optional
 import numpy as np
 
 from backend.AnnotatedDataset import AnnotatedDataset
+from backend.DataIO import DataIO
+from backend.task.execution.core.DatasetShmCache import DatasetShmCache
 
 
 class ExecutionShmContainer:
     """Manages the shared memory of an execution"""
+    _column_major: bool = False
+
     # shared memory
     _shared_memory_name: Optional[str] = None
     _shared_memory_on_main: Optional[SharedMemory] = None
@@ -19,53 +23,74 @@ class ExecutionShmContainer:
     _rownrs_shm_on_main: Optional[SharedMemory] = None
     _rownrs_on_main: Optional[np.ndarray] = None
 
-    def make_shms(self, datapoint_count: int, ds_dim_count: int):
-        """Creates the shared memory objects"""
-        entry_count = datapoint_count * ds_dim_count
-        dtype = np.dtype('f4')
-        size = entry_count * dtype.itemsize
-        self._shared_memory_on_main = SharedMemory(None, True, size)
+    _dataset_loaded: bool = False
+
+    def __init__(self, column_major: bool = False):
+        """
+        :param column_major: Whether to store the dataset in column-major (Fortran)
+        order, so that the dimensions of a subspace are contiguous blocks of it
+        """
+        self._column_major: bool = column_major
+
+    def make_shms(self, datapoint_count: int, ds_dim_count: int,
+                  dataset_key: Optional[str] = None) -> None:
+        """Creates the shared memory objects, or attaches to the ones of another
+        execution on the same dataset (see DatasetShmCache)
+        :param dataset_key: Identifies the contents of the dataset,
+        None to not share the shared memory"""
+        entry = DatasetShmCache.acquire(self.__get_cache_key(dataset_key),
+                                        datapoint_count, ds_dim_count)
+        self._dataset_loaded = entry.filled
+        self._shared_memory_on_main = entry.dataset_shm
         self._shared_memory_name = self._shared_memory_on_main.name
         self._dataset_on_main = np.ndarray((datapoint_count, ds_dim_count),
                                            buffer=self._shared_memory_on_main.buf,
-                                           dtype=dtype)
-        self._rownrs_shm_on_main = SharedMemory(None, True, datapoint_count * 4)
+                                           dtype=np.dtype('f4'), order=self.__order)
+        self._rownrs_shm_on_main = entry.rownrs_shm
         self._rownrs_shm_name = self._rownrs_shm_on_main.name
         self._rownrs_on_main = np.ndarray([datapoint_count],
                                           buffer=self._rownrs_shm_on_main.buf,
                                           dtype=np.int32)
 
-    def copy_rns_back(self) -> np.ndarray:
-        """Copies the row numbers out of the shared memory and returns it"""
-        result = np.copy(self._rownrs_on_main)
-        self.unload_rownrs()
-        return result
+    def is_dataset_cached(self, dataset_key: Optional[str]) -> bool:
+        """Checks whether make_shms would attach to shared memory
+        that contains the dataset already"""
+        return DatasetShmCache.is_filled(self.__get_cache_key(dataset_key))
 
-    def unload_rownrs(self):
-        if self._rownrs_shm_name is not None:
-            self._rownrs_shm_on_main.close()
-            self._rownrs_shm_on_main.unlink()
-            self._rownrs_shm_name = None
-            self._rownrs_on_main = None
-            self._rownrs_shm_on_main = None
+    def mark_dataset_loaded(self) -> None:
+        """Marks the dataset as stored in the shared memory,
+        so that other executions on the same dataset do not store it again"""
+        DatasetShmCache.mark_filled(self._shared_memory_name)
+        self._dataset_loaded = True
+
+    def copy_rns(self) -> np.ndarray:
+        """Copies the row numbers out of the shared memory and returns it,
+        the shared memory stays loaded until the dataset is unloaded"""
+        return np.copy(self._rownrs_on_main)
 
     def unload_dataset(self, ignore_if_done: bool = False) -> None:
         """
-        Unloads the cleaned dataset from shared_memory. \n
+        Unloads the cleaned dataset and its row numbers from shared_memory.
+        They are only unlinked once no other execution uses them
+        and the DatasetShmCache does not keep them. \n
         :return: None
         """
         assert ignore_if_done or self._shared_memory_name is not None, \
             "If there is no shared memory currently loaded it can not be unloaded"
         if self._shared_memory_name is not None:
-            self._shared_memory_on_main.unlink()
-            self._shared_memory_on_main.close()
+            DatasetShmCache.release(self._shared_memory_name)
             self._shared_memory_name = None
-        self.unload_rownrs()
+            self._shared_memory_on_main = None
+            self._dataset_on_main = None
+            self._rownrs_shm_name = None
+            self._rownrs_shm_on_main = None
+            self._rownrs_on_main = None
 
     def store_dataset(self, dataset: AnnotatedDataset):
         """Stores a dataset in the shared memory"""
         shm = shared_memory.SharedMemory(self._shared_memory_name, False)
-        ndarray = np.ndarray(dataset.data.shape, dataset.data.dtype, shm.buf)
+        ndarray = np.ndarray(dataset.data.shape, dataset.data.dtype, shm.buf,
+                             order=self.__order)
         shared_data = ndarray
         rownrs_shm = shared_memory.SharedMemory(self._rownrs_shm_name, False)
         rownrs_shared_data = np.ndarray([dataset.data.shape[0]], np.int32,
@@ -76,11 +101,54 @@ class ExecutionShmContainer:
             shm.close()
             rownrs_shm.close()
 
+    def store_dataset_from_binary(self, path: str) -> None:
+        """Reads a dataset written by DataIO.write_binary into the shared memory,
+        directly unless the dataset is stored in column-major order
+        :raises ValueError if the file does not contain a dataset of the size of
+        the shared memory"""
+        shm = shared_memory.SharedMemory(self._shared_memory_name, False)
+        rownrs_shm = shared_memory.SharedMemory(self._rownrs_shm_name, False)
+        datapoint_count = rownrs_shm.size // 4
+        shared_data = np.ndarray((datapoint_count, shm.size // 4 // datapoint_count),
+                                 np.float32, shm.buf, order=self.__order)
+        rownrs_shared_data = np.ndarray([datapoint_count], np.int32, rownrs_shm.buf)
+        try:
+            DataIO.read_binary_into(path, shared_data, rownrs_shared_data)
+        finally:
+            del shared_data, rownrs_shared_data
+            if type(multiprocessing.current_process()) == multiprocessing.Process:
+                shm.close()
+                rownrs_shm.close()
+
+    @property
+    def column_major(self) -> bool:
+        """Whether the dataset is stored in column-major (Fortran) order"""
+        return self._column_major
+
+    @property
+    def dataset_loaded(self) -> bool:
+        """Whether the dataset is stored in the shared memory already,
+        e.g. by another execution on the same dataset"""
+        return self._dataset_loaded
+
+    @property
+    def __order(self) -> str:
+        return "F" if self._column_major else "C"
+
+    def __get_cache_key(self, dataset_key: Optional[str]) -> Optional[str]:
+        # the layout of the dataset is part of its key
+        return None if dataset_key is None else f"{dataset_key}:{self.__order}"
+
     @property
     def shared_memory_name(self) -> Optional[str]:
         """Name of the shm containing the datasets data section"""
         return self._shared_memory_name
 
+    @property
+    def rownrs_shm_name(self) -> Optional[str]:
+        """Name of the shm containing the row numbers of the dataset as int32"""
+        return self._rownrs_shm_name
+
     @property
     def dataset_on_main(self) -> Optional[np.ndarray]:
         """Returns an np.array of the dataset,
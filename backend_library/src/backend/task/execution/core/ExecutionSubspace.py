@@ -4,6 +4,7 @@ import logging
 import multiprocessing
 import os
 from collections.abc import Callable
+from functools import partial
 from logging import debug
 from multiprocessing.shared_memory import SharedMemory
 from typing import Optional
@@ -13,7 +14,10 @@ import numpy as np
 from backend.scheduler.Schedulable import Schedulable
 from backend.scheduler.Scheduler import Scheduler
 from backend.task.execution.ParameterizedAlgorithm import ParameterizedAlgorithm
+from backend.task.execution.ResultStore import ResultStore
 from backend.task.execution.core.ExecutionElement import ExecutionElement
+from backend.task.execution.core.SharedResultMatrix import SharedResultMatrix
+from backend.task.execution.core.SubspaceShmRegistry import SubspaceShmRegistry
 from backend.task.execution.subspace.Subspace import Subspace
 
 
@@ -27,7 +31,14 @@ class ExecutionSubspace(Schedulable):
                  algorithms: list[ParameterizedAlgorithm], subspace: Subspace,
                  result_path: str, ds_on_main: np.ndarray,
                  on_execution_element_finished_callback: Callable[[bool, bool], None],
-                 ds_shm_name: str, row_numbers: np.ndarray, priority: int = 5):
+                 ds_shm_name: str, row_numbers: np.ndarray, priority: int = 5,
+                 row_numbers_shm_name: Optional[str] = None,
+                 algorithm_timeout: Optional[float] = None,
+                 deadline: Optional[float] = None, column_major: bool = False,
+                 dataset_key: Optional[str] = None,
+                 subspace_index: Optional[int] = None,
+                 shared_results: Optional[SharedResultMatrix] = None,
+                 on_result_callback: Optional[Callable[[int, int], None]] = None):
         """
         :param ds_shm_name: name of the shared emory segment containing the full dataset
         :param user_id: The ID of the user belonging to the ExecutionSubspace.
@@ -45,7 +56,30 @@ class ExecutionSubspace(Schedulable):
         :param ds_shm_name: the name of the shared memory segment containing the dataset
         :param row_numbers: the row numbers of the dataset,
         see AnnotatedDataset.row_mapping
+        :param row_numbers_shm_name: the name of the shared memory segment containing
+        row_numbers as int32, if existing.
+        It has to stay loaded until all ExecutionElements finished
+        :param algorithm_timeout: The number of seconds each algorithm may run,
+        None for no limit
+        :param deadline: The time.time() by which all algorithms have to be finished,
+        None for no deadline
+        :param column_major: Whether the dataset is stored in column-major order.
+        The algorithms then get column-major subspaces, and a view of the dataset
+        instead of a copy if the dimensions of the subspace are adjacent
+        :param dataset_key: Identifies the contents of the dataset, so that
+        ExecutionSubspaces of the same subspace of the same dataset share their
+        shared memory (see SubspaceShmRegistry). None to not share it
+        :param subspace_index: The index of the subspace in the ResultStores
+        of the algorithms, which the ExecutionElements write their results to.
+        None to write a csv-file for each result instead
+        :param shared_results: The SharedResultMatrix of the Execution,
+        which the ExecutionElements write their results to instead of the ResultStores
+        :param on_result_callback: Reports the Execution the index of the algorithm
+        and of the subspace of each ExecutionElement that finished successfully,
+        before reporting that it finished. Requires the subspace_index
         """
+        assert shared_results is None or subspace_index is not None
+        assert on_result_callback is None or subspace_index is not None
         assert priority < 10
         assert priority >= 5
 
@@ -64,6 +98,20 @@ class ExecutionSubspace(Schedulable):
             on_execution_element_finished_callback
         self._priority = priority
         self._row_numbers = row_numbers
+        self._row_numbers_shm_name: Optional[str] = row_numbers_shm_name
+        self._algorithm_timeout: Optional[float] = algorithm_timeout
+        self._deadline: Optional[float] = deadline
+        self._column_major: bool = column_major
+        self._subspace_index: Optional[int] = subspace_index
+        self._shared_results: Optional[SharedResultMatrix] = shared_results
+        self._on_result_callback: Optional[Callable[[int, int], None]] = \
+            on_result_callback
+        self._dataset_key: Optional[str] = None if dataset_key is None \
+            else f"{dataset_key}:{'F' if column_major else 'C'}"
+        # the subspace of a column-major dataset is a contiguous part of it,
+        # if its dimensions are adjacent
+        self._column_range: Optional[tuple[int, int]] = \
+            subspace.get_column_range() if column_major else None
 
         # further private variables
         self._finished_execution_element_count: int = 0
@@ -73,6 +121,9 @@ class ExecutionSubspace(Schedulable):
         # shared memory
         self._subspace_shared_memory_name: Optional[str] = None
         self._subspace_shared_memory_on_main: Optional[SharedMemory] = None
+        # whether the subspace was loaded into the shared memory already,
+        # e.g. by the ExecutionSubspace of another execution
+        self._subspace_loaded: bool = False
 
         # lock for multiprocessing
         self._cache_subset_lock = multiprocessing.Lock()
@@ -86,17 +137,32 @@ class ExecutionSubspace(Schedulable):
         :param algorithms: All algorithms that are selected for the Execution.
         :return: None
         """
-        for algorithm in algorithms:
+        ss_shm_name = self._subspace_shared_memory_name
+        ss_shm_offset: Optional[int] = None
+        if self._column_range is not None:
+            ss_shm_name = self._ds_shm_name
+            ss_shm_offset = self._column_range[0] * self._ds_on_main.shape[0] \
+                * self._ds_on_main.dtype.itemsize
+        for algorithm_index, algorithm in enumerate(algorithms):
+            algorithm_directory: str = os.path.join(
+                self._result_path, algorithm.directory_name_in_execution)
             result_path: str = os.path.join(
-                os.path.join(self._result_path,
-                             algorithm.directory_name_in_execution),
-                self._subspace.get_subspace_identifier() + ".csv")
+                algorithm_directory, self._subspace.get_subspace_identifier() + ".csv")
+            result_store: Optional[ResultStore] = None \
+                if self._subspace_index is None else ResultStore(algorithm_directory)
 
             self._execution_elements.append(ExecutionElement(
                 self._user_id, self._task_id, self._subspace, algorithm, result_path,
-                self._ds_on_main.dtype, self._subspace_shared_memory_name,
-                self.__execution_element_is_finished, self._ds_on_main.shape[0],
-                self._row_numbers))
+                self._ds_on_main.dtype, ss_shm_name,
+                partial(self.__execution_element_is_finished,
+                        algorithm_index=algorithm_index), self._ds_on_main.shape[0],
+                self._row_numbers, row_numbers_shm_name=self._row_numbers_shm_name,
+                timeout=self._algorithm_timeout, deadline=self._deadline,
+                ss_shm_offset=ss_shm_offset, column_major=self._column_major,
+                result_store=result_store, subspace_index=self._subspace_index,
+                shared_results=self._shared_results,
+                algorithm_index=None if self._shared_results is None
+                else algorithm_index))
 
     def __schedule_execution_elements(self) -> None:
         """
@@ -104,12 +170,12 @@ class ExecutionSubspace(Schedulable):
         :return: None
         """
         scheduler: Scheduler = Scheduler.get_instance()
-        for execution_element in self._execution_elements:
+        for algorithm_index, execution_element in enumerate(self._execution_elements):
             if execution_element.finished_result_exists():
                 logging.debug("ExecutionElement at path: " +
                               str(execution_element._result_path) +
                               " was skipped because it was already finished")
-                self.__execution_element_is_finished(False, False)
+                self.__execution_element_is_finished(False, False, algorithm_index)
             else:
                 scheduler.schedule(execution_element)
 
@@ -121,14 +187,17 @@ class ExecutionSubspace(Schedulable):
         ds_shm: SharedMemory = SharedMemory(self._ds_shm_name)
         ds_dim_cnt: int = self._subspace.get_dataset_dimension_count()
         ds_arr = np.ndarray((self._ds_on_main.shape[0], ds_dim_cnt),
-                            dtype=self._ds_on_main.dtype, buffer=ds_shm.buf)
+                            dtype=self._ds_on_main.dtype, buffer=ds_shm.buf,
+                            order="F" if self._column_major else "C")
         ss_shm = SharedMemory(self._subspace_shared_memory_name, False)
         self._subspace.make_subspace_array(ds_arr, ss_shm)
         debug(f"{self} loaded subspace from dataset {ds_shm.name} to {ss_shm.name}")
         return ss_shm
 
     def __execution_element_is_finished(self, error_occurred: bool,
-                                        aborted: bool = False) -> None:
+                                        aborted: bool = False,
+                                        algorithm_index: Optional[int] = None) \
+            -> None:
         """
         The ExecutionSubspace gets notified by an ExecutionElement
         when it finishes by calling this method. \n
@@ -137,8 +206,12 @@ class ExecutionSubspace(Schedulable):
         Is otherwise False.
         :param aborted: Whether an element finished by abortion.
         All calls within this Execution with aborted set, must be executed sequentially
+        :param algorithm_index: The index of the algorithm of the ExecutionElement
         :return: None
         """
+        if not error_occurred and not aborted and algorithm_index is not None \
+                and self._on_result_callback is not None:
+            self._on_result_callback(algorithm_index, self._subspace_index)
         if not aborted:
             assert self._finished_execution_element_count < \
                    self._total_execution_element_count, \
@@ -146,21 +219,21 @@ class ExecutionSubspace(Schedulable):
             self._finished_execution_element_count += 1
             if self._finished_execution_element_count >= \
                     self._total_execution_element_count:
-                self.__unload_subspace_shared_memory()
+                self.__unload_subspace_shared_memory(self._column_range is not None)
         else:
             self.__unload_subspace_shared_memory(True)
         self._on_execution_element_finished_callback(error_occurred, aborted)
 
     def __unload_subspace_shared_memory(self, ignore_if_done: bool = False) -> None:
         """
-        Unlinks the dataset from the subspace from shared_memory. \n
+        Releases the shared memory of the subspace, which is unlinked
+        once no ExecutionSubspace of another execution uses it anymore. \n
         Not thread-safe.
         :return: None
         """
         assert ignore_if_done or self._subspace_shared_memory_name is not None
         if self._subspace_shared_memory_name is not None:
-            self._subspace_shared_memory_on_main.unlink()
-            self._subspace_shared_memory_on_main.close()
+            SubspaceShmRegistry.release(self._subspace_shared_memory_name)
             self._subspace_shared_memory_name = None
             self._subspace_shared_memory_on_main = None
 
@@ -169,12 +242,18 @@ class ExecutionSubspace(Schedulable):
             self.__unload_subspace_shared_memory(True)
             self._on_execution_element_finished_callback(False, True)
         else:
+            if statuscode == 0 and self._subspace_shared_memory_name is not None:
+                SubspaceShmRegistry.mark_filled(self._subspace_shared_memory_name)
             self.__generate_execution_elements(self._algorithms)
             self.__schedule_execution_elements()
 
     def run_before_on_main(self) -> None:
+        if self._column_range is not None:
+            # the ExecutionElements use the shared memory of the dataset
+            return
         size = self._subspace.get_size_of_subspace_buffer(self._ds_on_main)
-        self._subspace_shared_memory_on_main = SharedMemory(None, True, size)
+        self._subspace_shared_memory_on_main, self._subspace_loaded = \
+            SubspaceShmRegistry.acquire(self._dataset_key, self._subspace, size)
         self._subspace_shared_memory_name = self._subspace_shared_memory_on_main.name
 
     @property
@@ -189,8 +268,38 @@ class ExecutionSubspace(Schedulable):
     def priority(self) -> int:
         return self._priority
 
+    @property
+    def worker_pool_compatible(self) -> bool:
+        return True
+
+    @property
+    def memory_estimate(self) -> int:
+        # the subspace is copied into shared memory without intermediate copies
+        if self._column_range is not None \
+                or SubspaceShmRegistry.is_shared(self._dataset_key, self._subspace):
+            return 0
+        return self._subspace.get_size_of_subspace_buffer(self._ds_on_main)
+
+    def __getstate__(self) -> dict[str, object]:
+        # do_work only needs the shape and dtype of the dataset,
+        # so replace it by an empty array of the same dtype and number of rows
+        # and leave out everything that refers to the main process
+        state = self.__dict__.copy()
+        state["_ds_on_main"] = np.empty((self._ds_on_main.shape[0], 0),
+                                        self._ds_on_main.dtype)
+        state["_on_execution_element_finished_callback"] = None
+        state["_on_result_callback"] = None
+        state["_row_numbers"] = None
+        state["_execution_elements"] = list()
+        state["_subspace_shared_memory_on_main"] = None
+        state["_cache_subset_lock"] = None
+        return state
+
     def do_work(self) -> None:
-        self.__load_subspace_from_dataset()
+        # a segment shared with an ExecutionSubspace that did not finish loading it
+        # is loaded again, which only writes the same values
+        if self._column_range is None and not self._subspace_loaded:
+            self.__load_subspace_from_dataset()
 
     def __str__(self) -> str:
         return f"ExecutionSubspace with taskid {self.task_id} and" \
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import threading
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional
+
+import numpy as np
+
+from backend.task.execution.core.DatasetShmCache import shared_memory_bytes
+
+
+class SharedResultMatrix:
+    """
+    The results of all ExecutionElements of an Execution in shared memory:
+    the outlier scores of each algorithm on each subspace for each datapoint,
+    followed by a byte for each algorithm and subspace,
+    which is set once the scores were written. \n
+    ExecutionElements write their scores into it from whatever process they run in,
+    so that the Execution stores all of them in its ResultStores at once,
+    instead of every ExecutionElement writing to the files on its own. \n
+    The matrices of all Executions share a memory limit, as each of them
+    is kept until the last ExecutionElement of its Execution finished.
+    """
+    _lock: threading.Lock = threading.Lock()
+    _total_size: int = 0
+    """The size of the shared memory of all matrices created on the main process"""
+
+    def __init__(self, algorithm_count: int, subspace_count: int,
+                 datapoint_count: int):
+        """
+        :param algorithm_count: The number of algorithms of the Execution
+        :param subspace_count: The number of subspaces of the Execution
+        :param datapoint_count: The number of datapoints of the dataset
+        """
+        self._shape: tuple[int, int, int] = \
+            (algorithm_count, subspace_count, datapoint_count)
+        self._name: Optional[str] = None
+        self._shm_on_main: Optional[SharedMemory] = None
+
+    @staticmethod
+    def get_size(algorithm_count: int, subspace_count: int,
+                 datapoint_count: int) -> int:
+        """
+        :return: The size of the shared memory of a matrix of the given shape in bytes
+        """
+        return algorithm_count * subspace_count * (datapoint_count * 8 + 1)
+
+    @property
+    def name(self) -> Optional[str]:
+        """The name of the shared memory, None if it is not created"""
+        return self._name
+
+    def create(self, memory_limit: Optional[int] = None) -> bool:
+        """
+        Creates the shared memory, in which no scores are written yet,
+        unless the matrices of all Executions would exceed the memory limit.
+        Only to be called on the main process
+        :param memory_limit: The bytes of shared memory the matrices of all Executions
+        may occupy at once, None for no limit
+        :return: Whether the shared memory was created
+        """
+        assert self._name is None
+        size = SharedResultMatrix.get_size(*self._shape)
+        with SharedResultMatrix._lock:
+            if memory_limit is not None \
+                    and SharedResultMatrix._total_size + size > memory_limit:
+                return False
+            SharedResultMatrix._total_size += size
+        try:
+            self._shm_on_main = SharedMemory(None, True, size)
+        except BaseException:
+            SharedResultMatrix.__release(size)
+            raise
+        self._name = self._shm_on_main.name
+        shared_memory_bytes.inc(self._shm_on_main.size, kind="results")
+        return True
+
+    def unlink(self) -> None:
+        """
+        Unlinks the shared memory. Only to be called on the main process
+        """
+        if self._shm_on_main is not None:
+            self._shm_on_main.unlink()
+            self._shm_on_main.close()
+            shared_memory_bytes.dec(self._shm_on_main.size, kind="results")
+            self._shm_on_main = None
+            SharedResultMatrix.__release(SharedResultMatrix.get_size(*self._shape))
+
+    @staticmethod
+    def get_total_size() -> int:
+        """
+        :return: The size in bytes of the shared memory of all matrices
+        that are not unlinked yet
+        """
+        with SharedResultMatrix._lock:
+            return SharedResultMatrix._total_size
+
+    @staticmethod
+    def __release(size: int) -> None:
+        with SharedResultMatrix._lock:
+            SharedResultMatrix._total_size -= size
+
+    def write(self, algorithm_index: int, subspace_index: int,
+              scores: np.ndarray) -> None:
+        """
+        Writes the outlier scores of an algorithm on a subspace
+        and marks them as finished
+        :raises ValueError if there is not a score for each datapoint
+        """
+        if scores.shape != self._shape[2:]:
+            raise ValueError(f"The algorithm returned {scores.shape} scores "
+                             f"instead of one for each of the {self._shape[2]} "
+                             f"datapoints")
+        shm = SharedMemory(self._name)
+        matrix, finished = self.__get_arrays(shm)
+        matrix[algorithm_index, subspace_index] = scores
+        finished[algorithm_index, subspace_index] = 1
+        del matrix, finished
+        shm.close()
+
+    def is_finished(self, algorithm_index: int, subspace_index: int) -> bool:
+        """
+        :return: Whether the scores of the algorithm on the subspace were written
+        """
+        shm = SharedMemory(self._name)
+        matrix, finished = self.__get_arrays(shm)
+        is_finished = bool(finished[algorithm_index, subspace_index])
+        del matrix, finished
+        shm.close()
+        return is_finished
+
+    def read(self, algorithm_index: int, subspace_index: int) -> np.ndarray:
+        """
+        Only to be called on the main process
+        :return: A copy of the outlier scores of the algorithm on the subspace
+        """
+        matrix, finished = self.__get_arrays(self._shm_on_main)
+        scores = matrix[algorithm_index, subspace_index].copy()
+        del matrix, finished
+        return scores
+
+    def get_finished_results(self, algorithm_index: int) \
+            -> tuple[np.ndarray, np.ndarray]:
+        """
+        Only to be called on the main process
+        :return: The indices of the subspaces the algorithm finished
+        and a copy of its scores on them
+        """
+        matrix, finished = self.__get_arrays(self._shm_on_main)
+        indices = np.flatnonzero(finished[algorithm_index])
+        return indices, matrix[algorithm_index, indices]
+
+    def __get_arrays(self, shm: SharedMemory) -> tuple[np.ndarray, np.ndarray]:
+        matrix = np.ndarray(self._shape, np.float64, shm.buf)
+        finished = np.ndarray(self._shape[:2], np.uint8, shm.buf, matrix.nbytes)
+        return matrix, finished
+
+    def __getstate__(self) -> dict[str, object]:
+        state = self.__dict__.copy()
+        state["_shm_on_main"] = None
+        return state
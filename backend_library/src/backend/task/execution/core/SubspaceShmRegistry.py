@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from logging import debug
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional
+
+from backend.instrumentation.Instrumentation import Instrumentation
+from backend.task.execution.core.DatasetShmCache import shared_memory_bytes
+from backend.task.execution.subspace.Subspace import Subspace
+
+_shared_subspaces = Instrumentation.counter(
+    "sop_shared_subspaces_total",
+    "ExecutionSubspaces that reused the shared memory of another execution")
+
+
+class SubspaceShmRegistry:
+    """
+    Process-wide registry of the shared memory segments containing subspaces,
+    so that ExecutionSubspaces of the same subspace of the same dataset
+    (e.g. of duplicated executions) share a single segment. \n
+    Segments are reference counted and only unlinked when the last
+    ExecutionSubspace using them released them.
+    Only to be used on the main process.
+    """
+    _lock: threading.Lock = threading.Lock()
+    _segments: dict[str, _Segment] = dict()
+    """The acquired segments by their name"""
+    _shared: dict[tuple[str, bytes], str] = dict()
+    """The names of the segments that can be shared by their dataset key and mask"""
+
+    @staticmethod
+    def acquire(dataset_key: Optional[str], subspace: Subspace, size: int) \
+            -> tuple[SharedMemory, bool]:
+        """
+        Returns the segment of a subspace, creating it if required.
+        Every call has to be followed by a call to release.
+        :param dataset_key: Identifies the contents and the layout of the dataset,
+        None to create a segment that is not shared
+        :param subspace: The subspace the segment contains
+        :param size: The size of the segment in bytes
+        :return: The segment and whether it is filled with the subspace already
+        """
+        key = None if dataset_key is None \
+            else (dataset_key, subspace.mask.tobytes())
+        with SubspaceShmRegistry._lock:
+            name = SubspaceShmRegistry._shared.get(key)
+            if name is not None:
+                segment = SubspaceShmRegistry._segments[name]
+                segment.references += 1
+                _shared_subspaces.inc()
+                debug(f"shared the subspace shm {name}, "
+                      f"used {segment.references} times now")
+                return segment.shm, segment.filled
+            shm = SharedMemory(None, True, size)
+            SubspaceShmRegistry._segments[shm.name] = _Segment(shm, key)
+            if key is not None:
+                SubspaceShmRegistry._shared[key] = shm.name
+        shared_memory_bytes.inc(shm.size, kind="subspace")
+        return shm, False
+
+    @staticmethod
+    def mark_filled(name: str) -> None:
+        """
+        Marks a segment as filled with its subspace,
+        so that ExecutionSubspaces acquiring it later on do not fill it again
+        :param name: The name of the segment
+        """
+        with SubspaceShmRegistry._lock:
+            segment = SubspaceShmRegistry._segments.get(name)
+            if segment is not None:
+                segment.filled = True
+
+    @staticmethod
+    def release(name: str) -> None:
+        """
+        Releases a segment acquired before, unlinking it if it is not used anymore
+        :param name: The name of the segment
+        """
+        with SubspaceShmRegistry._lock:
+            segment = SubspaceShmRegistry._segments[name]
+            segment.references -= 1
+            if segment.references > 0:
+                return
+            del SubspaceShmRegistry._segments[name]
+            if segment.key is not None:
+                del SubspaceShmRegistry._shared[segment.key]
+        segment.shm.unlink()
+        segment.shm.close()
+        shared_memory_bytes.dec(segment.shm.size, kind="subspace")
+
+    @staticmethod
+    def is_shared(dataset_key: Optional[str], subspace: Subspace) -> bool:
+        """
+        :return: Whether acquiring the segment of the subspace would share
+        an existing segment
+        """
+        key = (dataset_key, subspace.mask.tobytes())
+        with SubspaceShmRegistry._lock:
+            return dataset_key is not None and key in SubspaceShmRegistry._shared
+
+
+@dataclass
+class _Segment:
+    shm: SharedMemory
+    key: Optional[tuple[str, bytes]]
+    references: int = 1
+    filled: bool = False
@@ -1,6 +1,7 @@
 import base64
 import math
 from multiprocessing.shared_memory import SharedMemory
+from typing import Optional
 
 import numpy as np
 
@@ -27,6 +28,20 @@ class Subspace:
         make_subspace_array on it """
         return self._mask.size
 
+    def get_column_runs(self) -> list[tuple[int, int]]:
+        """The ranges (start inclusive, stop exclusive) of adjacent dimensions
+        included in the Subspace, in ascending order"""
+        padded = np.concatenate(([False], self._mask, [False]))
+        edges = np.flatnonzero(padded[1:] != padded[:-1])
+        return list(zip(edges[0::2].tolist(), edges[1::2].tolist()))
+
+    def get_column_range(self) -> Optional[tuple[int, int]]:
+        """The range of the included dimensions if they are adjacent,
+        so that the Subspace of a column-major dataset is a contiguous part of it.
+        None otherwise"""
+        runs = self.get_column_runs()
+        return runs[0] if len(runs) == 1 else None
+
     def get_subspace_identifier(self) -> str:
         """
         Determines the subspace-identifier of this Subspace
@@ -46,9 +61,19 @@ class Subspace:
     def make_subspace_array(self, full_dataset: np.ndarray, target_shm: SharedMemory) \
             -> np.ndarray:
         """Builds an ndarray in the specified SharedMemory,
-         containing the Subspace of the dataset"""
+         containing the Subspace of the dataset.
+         The array is column-major if the dataset is, which only copies
+         a contiguous block for each run of adjacent dimensions"""
         shape = (full_dataset.shape[0], self.get_included_dimension_count())
         assert target_shm.size >= self.get_size_of_subspace_buffer(full_dataset)
-        result = np.ndarray(shape, full_dataset.dtype, buffer=target_shm.buf)
-        result[:] = full_dataset[:, self._mask]
+        if not full_dataset.flags.f_contiguous or full_dataset.flags.c_contiguous:
+            result = np.ndarray(shape, full_dataset.dtype, buffer=target_shm.buf)
+            result[:] = full_dataset[:, self._mask]
+            return result
+        result = np.ndarray(shape, full_dataset.dtype, buffer=target_shm.buf,
+                            order="F")
+        position = 0
+        for start, stop in self.get_column_runs():
+            result[:, position:position + stop - start] = full_dataset[:, start:stop]
+            position += stop - start
         return result
@@ -0,0 +1,17 @@
+from typing import Optional
+
+from backend.scheduler.FairShareScheduler import FairShareScheduler
+from backend.scheduler.Schedulable import Schedulable
+
+
+class FairShareWoWorkers(FairShareScheduler):
+
+    def _get_targeted_worker_count(self) -> int:
+        return 0
+
+    def next_sched(self) -> Optional[Schedulable]:
+        return self._get_next_schedulable()
+
+    def charge(self, sched: Schedulable, seconds: float) -> None:
+        self._on_schedulable_started(sched)
+        self._on_schedulable_finished(sched, seconds)
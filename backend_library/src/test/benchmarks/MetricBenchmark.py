@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from backend.DataIO import DataIO
+from backend.metric.ExecutionElementMetricHelper import ExecutionElementMetricHelper
+from backend.metric.MetricDataPointsAreOutliers import MetricDataPointsAreOutliers
+from backend.metric.MetricSubspaceOutlierAmount import MetricSubspaceOutlierAmount
+from backend.task.execution.ResultStore import ResultStore
+
+
+@dataclass
+class BenchmarkResult:
+    """The metrics computed by an implementation and the seconds it took"""
+    implementation: str
+    seconds: float
+    data_point_outlier_count: list[int]
+    subspace_outlier_amount: dict[str, int]
+
+
+def create_results(directory: str, algorithm_count: int, subspace_count: int,
+                   datapoint_count: int, seed: int) -> list[str]:
+    """
+    Creates the ResultStores of an Execution with random outlier scores,
+    like those of a distance based algorithm (some of them ties)
+    :return: The directories of the algorithms
+    """
+    rng = np.random.default_rng(seed)
+    identifiers = [f"subspace{i}" for i in range(subspace_count)]
+    directories: list[str] = list()
+    for algorithm in range(algorithm_count):
+        path = os.path.join(directory, f"algorithm{algorithm}")
+        os.makedirs(path)
+        store = ResultStore(path)
+        store.create(identifiers, datapoint_count)
+        for index in range(subspace_count):
+            scores = np.round(rng.lognormal(0, 1, datapoint_count), 3)
+            store.write(index, scores)
+        directories.append(path)
+    return directories
+
+
+def legacy_compute_outlier_data_points(scores: np.ndarray,
+                                       quantile: float = 0.99) -> np.ndarray:
+    """ExecutionElementMetricHelper.compute_outlier_data_points_of_scores
+    as it was before it was vectorized, comparing each data point on its own"""
+    scores_df: pd.DataFrame = pd.DataFrame(scores.astype(np.float32))
+    min_outlier_score_to_be_an_outlier: float = scores_df.quantile(quantile).iloc[0]
+    outlier_data_points: list[bool] = list()
+    for i in range(0, len(scores_df[0])):
+        outlier_data_points.append(
+            float(scores_df[0][i]) >= min_outlier_score_to_be_an_outlier)
+    return np.asarray(outlier_data_points)
+
+
+def run_legacy(algorithm_directories: list[str]) -> BenchmarkResult:
+    """Computes both metrics like they were computed before they were vectorized,
+    counting the outliers of each data point and subspace in python loops"""
+    start = time.perf_counter()
+    results = ExecutionElementMetricHelper.get_execution_elements_results(
+        algorithm_directories)
+    outlier_data_points: list[np.ndarray] = list()
+    by_subspace: dict[str, list[np.ndarray]] = dict()
+    for identifier, scores in results:
+        outliers = legacy_compute_outlier_data_points(scores)
+        outlier_data_points.append(outliers)
+        by_subspace.setdefault(identifier, list()).append(outliers)
+
+    data_point_outlier_count = [0] * outlier_data_points[0].shape[0]
+    for outliers in outlier_data_points:
+        for data_point in range(0, outliers.shape[0]):
+            if outliers[data_point]:
+                data_point_outlier_count[data_point] += 1
+    subspace_outlier_amount: dict[str, int] = dict()
+    for identifier, subspace_outliers in by_subspace.items():
+        subspace_outlier_amount[identifier] = 0
+        for outliers in subspace_outliers:
+            for data_point in range(0, outliers.size):
+                if outliers[data_point]:
+                    subspace_outlier_amount[identifier] += 1
+    return BenchmarkResult("legacy", time.perf_counter() - start,
+                           data_point_outlier_count, subspace_outlier_amount)
+
+
+def run_vectorized(algorithm_directories: list[str], datapoint_count: int,
+                   metric_directory: str) -> BenchmarkResult:
+    """Computes both metrics with the metrics of the backend,
+    including writing their results"""
+    data_points_path = os.path.join(metric_directory, "datapoints_metric.csv")
+    subspaces_path = os.path.join(metric_directory, "subspace_outliers.csv")
+    start = time.perf_counter()
+    MetricDataPointsAreOutliers(list(range(datapoint_count))).compute_metric(
+        data_points_path, algorithm_directories)
+    MetricSubspaceOutlierAmount.compute_metric(subspaces_path, algorithm_directories)
+    seconds = time.perf_counter() - start
+    data_points = DataIO.read_uncleaned_csv(data_points_path, None)
+    subspaces = DataIO.read_uncleaned_csv(subspaces_path, None)
+    return BenchmarkResult("vectorized", seconds,
+                           [int(count) for count in data_points[:, 1]],
+                           {str(row[0]): int(row[1]) for row in subspaces})
+
+
+def format_results(results: Sequence[BenchmarkResult]) -> str:
+    """Formats results as a table with a row for every implementation,
+    with the speedup over the slowest one"""
+    slowest = max(r.seconds for r in results)
+    header = ["implementation", "seconds", "speedup"]
+    rows = [[r.implementation, f"{r.seconds:.3f}",
+             f"{slowest / r.seconds:.1f}x" if r.seconds > 0 else "inf"]
+            for r in results]
+    widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+    return "\n".join("  ".join(cell.rjust(w) for cell, w in zip(row, widths))
+                     for row in [header] + rows)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Compares the computation of the metrics of an Execution "
+                    "with random results before and after it was vectorized")
+    parser.add_argument("--algorithms", type=int, default=2)
+    parser.add_argument("--subspaces", type=int, default=100)
+    parser.add_argument("--datapoints", type=int, default=10000)
+    parser.add_argument("--no-legacy", action="store_true",
+                        help="only run the vectorized implementation")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if min(args.algorithms, args.subspaces, args.datapoints) < 1:
+        parser.error("there has to be at least one algorithm, subspace and datapoint")
+    with tempfile.TemporaryDirectory() as directory:
+        algorithm_directories = create_results(directory, args.algorithms,
+                                               args.subspaces, args.datapoints,
+                                               args.seed)
+        results = [run_vectorized(algorithm_directories, args.datapoints, directory)]
+        if not args.no_legacy:
+            results.insert(0, run_legacy(algorithm_directories))
+    print(format_results(results))
+    if any(r.data_point_outlier_count != results[0].data_point_outlier_count
+           or r.subspace_outlier_amount != results[0].subspace_outlier_amount
+           for r in results):
+        sys.exit("the implementations computed different metrics")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
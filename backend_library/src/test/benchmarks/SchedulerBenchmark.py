@@ -0,0 +1,472 @@
+from __future__ import annotations
+
+import argparse
+import heapq
+import importlib
+import itertools
+import math
+import random
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import dataclass, field
+from typing import Optional
+from unittest.mock import patch
+
+from backend.scheduler.FairShareScheduler import FairShareScheduler
+from backend.scheduler.MemoryBudget import MemoryBudget
+from backend.scheduler.Schedulable import Schedulable
+from backend.scheduler.Scheduler import Scheduler
+from backend.scheduler.UserRoundRobinScheduler import UserRoundRobinScheduler
+
+POLICIES: dict[str, type[UserRoundRobinScheduler]] = {
+    "round_robin": UserRoundRobinScheduler,
+    "fair_share": FairShareScheduler,
+}
+"""The policies that can be selected by name, others by module:Class"""
+
+
+class Distribution:
+    """A distribution of non-negative values, e.g. run times, given by a specification
+    like const:5, uniform:1:10, exp:5 (with a mean of 5)
+    or lognormal:1:0.5 (mu and sigma of the underlying normal distribution)"""
+    _parameter_counts: dict[str, int] = {"const": 1, "uniform": 2, "exp": 1,
+                                         "lognormal": 2}
+
+    def __init__(self, spec: str):
+        """
+        :raises ValueError if the specification is invalid
+        """
+        kind, *params = spec.split(":")
+        try:
+            values = [float(p) for p in params]
+        except ValueError:
+            raise ValueError(f"invalid parameters of the distribution {spec}")
+        if Distribution._parameter_counts.get(kind) != len(values):
+            raise ValueError(f"invalid distribution {spec}")
+        if any(v < 0 for v in values) and kind != "lognormal":
+            raise ValueError(f"the distribution {spec} has negative parameters")
+        self._spec: str = spec
+        self._kind: str = kind
+        self._params: list[float] = values
+
+    def sample(self, rng: random.Random) -> float:
+        if self._kind == "const":
+            return self._params[0]
+        if self._kind == "uniform":
+            return rng.uniform(*self._params)
+        if self._kind == "exp":
+            return rng.expovariate(1 / self._params[0]) if self._params[0] > 0 else 0.0
+        return rng.lognormvariate(*self._params)
+
+    def __str__(self) -> str:
+        return self._spec
+
+
+class SyntheticSchedulable(Schedulable):
+    """A Schedulable that only sleeps for its run time,
+    recording when it was started and finished"""
+
+    def __init__(self, uid: int, tid: int, prio: int, arrival: float,
+                 run_time: float, memory: int):
+        """
+        :param arrival: The seconds after the start of the benchmark
+        at which it is scheduled
+        :param run_time: The seconds it runs
+        :param memory: Its memory estimate in bytes
+        """
+        self.uid: int = uid
+        self.tid: int = tid
+        self.prio: int = prio
+        self.arrival: float = arrival
+        self.run_time: float = run_time
+        self.memory: int = memory
+        self.time_scale: float = 1.0
+        """The factor the run time is multiplied with when actually running"""
+        self.clock: Callable[[], float] = time.monotonic
+        """Returns the seconds since the start of the benchmark"""
+        self.start: Optional[float] = None
+        self.finish: Optional[float] = None
+        self.status: Optional[int] = None
+        self.on_finished: Callable[[], None] = lambda: None
+
+    @property
+    def user_id(self) -> int:
+        return self.uid
+
+    @property
+    def task_id(self) -> int:
+        return self.tid
+
+    @property
+    def priority(self) -> int:
+        return self.prio
+
+    @property
+    def memory_estimate(self) -> int:
+        return self.memory
+
+    @property
+    def aborted(self) -> bool:
+        return self.finish is not None and self.status is None
+
+    def run_before_on_main(self) -> None:
+        self.start = self.clock()
+
+    def do_work(self) -> None:
+        time.sleep(self.run_time * self.time_scale)
+
+    def run_later_on_main(self, statuscode: Optional[int]) -> None:
+        self.finish = self.clock()
+        self.status = statuscode
+        self.on_finished()
+
+
+@dataclass
+class Workload:
+    """Describes the synthetic Schedulables a benchmark schedules.
+    Every user submits tasks consisting of several Schedulables,
+    like the subspaces of an execution"""
+    users: int = 10
+    tasks_per_user: int = 5
+    task_size: int = 10
+    """The number of Schedulables of every task"""
+    run_time: Distribution = field(default_factory=lambda: Distribution("exp:10"))
+    """The seconds each Schedulable runs"""
+    memory: Distribution = field(default_factory=lambda: Distribution("const:0"))
+    """The bytes each Schedulable is estimated to need"""
+    priorities: Sequence[int] = (5, 6, 7, 8, 9, 50)
+    """The priorities the Schedulables are given, chosen uniformly"""
+    arrival_rate: float = 0.0
+    """The tasks each user submits per second on average, 0 to submit all at once"""
+    abort_fraction: float = 0.0
+    """The fraction of the tasks aborted at a random time"""
+    shutdown_at: Optional[float] = None
+    """The seconds after which a graceful shutdown is requested, None for none"""
+    seed: int = 0
+
+    def generate(self, workers: int) \
+            -> tuple[list[SyntheticSchedulable], list[tuple[float, int]]]:
+        """Creates the Schedulables of the workload
+        :param workers: The number of Schedulables running at once,
+        tasks are aborted before the makespan estimated from it
+        :return: The Schedulables and the times at which the given tasks are aborted"""
+        assert all(0 <= p < 100 for p in self.priorities)
+        rng = random.Random(self.seed)
+        jobs: list[SyntheticSchedulable] = []
+        task_arrivals: list[float] = []
+        for uid in range(self.users):
+            arrival = 0.0
+            for _ in range(self.tasks_per_user):
+                if self.arrival_rate > 0:
+                    arrival += rng.expovariate(self.arrival_rate)
+                tid = len(task_arrivals)
+                task_arrivals.append(arrival)
+                for _ in range(self.task_size):
+                    jobs.append(SyntheticSchedulable(
+                        uid, tid, rng.choice(self.priorities), arrival,
+                        self.run_time.sample(rng), int(self.memory.sample(rng))))
+        horizon = sum(j.run_time for j in jobs) / workers
+        aborts = [(arrival + rng.uniform(0, horizon), tid)
+                  for tid, arrival in enumerate(task_arrivals)
+                  if rng.random() < self.abort_fraction]
+        return jobs, aborts
+
+
+@dataclass
+class BenchmarkResult:
+    """The measurements of a benchmark run, times in (simulated) seconds"""
+    policy: str
+    completed: int
+    aborted: int
+    dropped: int
+    """The Schedulables never started or aborted, due to a shutdown"""
+    makespan: float
+    """The seconds from the start until the last Schedulable finished"""
+    throughput: float
+    """The completed Schedulables per second of the makespan"""
+    fairness: float
+    """Jain's fairness index of the stretch of the users, i.e. the seconds from
+    scheduling until finishing their Schedulables relative to their run time"""
+    waits: dict[str, float]
+    """Percentiles of the seconds the Schedulables waited until they were started"""
+
+    @staticmethod
+    def evaluate(policy: str, jobs: Sequence[SyntheticSchedulable]) \
+            -> BenchmarkResult:
+        completed = [j for j in jobs if j.finish is not None and not j.aborted]
+        aborted = sum(1 for j in jobs if j.aborted)
+        makespan = max((j.finish for j in jobs if j.finish is not None), default=0.0)
+        stretches = []
+        for uid in sorted({j.uid for j in completed}):
+            own = [j for j in completed if j.uid == uid]
+            run_time = sum(j.run_time for j in own)
+            if run_time > 0:
+                stretches.append(sum(j.finish - j.arrival for j in own) / run_time)
+        waits = sorted(j.start - j.arrival for j in jobs if j.start is not None)
+        return BenchmarkResult(
+            policy, len(completed), aborted, len(jobs) - len(completed) - aborted,
+            makespan, len(completed) / makespan if makespan > 0 else 0.0,
+            jain_index(stretches),
+            {name: percentile(waits, q) for name, q in
+             [("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("max", 1.0)]})
+
+
+def jain_index(values: Sequence[float]) -> float:
+    """Jain's fairness index of the values, 1 if all of them are equal
+    and 1/n if a single one is not 0, NaN without values"""
+    if len(values) == 0 or not any(values):
+        return math.nan
+    return sum(values) ** 2 / (len(values) * sum(v * v for v in values))
+
+
+def percentile(sorted_values: Sequence[float], quantile: float) -> float:
+    """The nearest-rank percentile of sorted values, NaN without values"""
+    if len(sorted_values) == 0:
+        return math.nan
+    rank = max(1, math.ceil(quantile * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class _VirtualClock:
+    """Replaces time.monotonic during a simulation"""
+
+    def __init__(self):
+        self.now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Simulation:
+    """Discrete-event simulation of a scheduler running Schedulables,
+    where the scheduler only selects the Schedulables to start"""
+
+    def __init__(self, scheduler: UserRoundRobinScheduler, clock: _VirtualClock,
+                 workers: int):
+        self._scheduler: UserRoundRobinScheduler = scheduler
+        self._clock: _VirtualClock = clock
+        self._workers: int = workers
+        self._memory: MemoryBudget = \
+            getattr(scheduler, "_UserRoundRobinScheduler__memory")
+        self._running: set[SyntheticSchedulable] = set()
+        self._sequence: Iterator[int] = itertools.count()
+        self._events: list[tuple[float, int, str, object]] = []
+
+    def add_event(self, at: float, kind: str, payload: object = None) -> None:
+        """Adds an event, the kinds are schedule (a Schedulable), abort (a task id),
+        shutdown and finish (a Schedulable)"""
+        heapq.heappush(self._events, (at, next(self._sequence), kind, payload))
+
+    def run(self) -> None:
+        """Handles all events in the order they happen"""
+        while len(self._events) > 0:
+            self._clock.now = self._events[0][0]
+            # handle simultaneous events before starting anything
+            while len(self._events) > 0 and self._events[0][0] == self._clock.now:
+                _, _, kind, payload = heapq.heappop(self._events)
+                self.__handle(kind, payload)
+            while len(self._running) < self._workers \
+                    and not self._scheduler.is_shutting_down() \
+                    and self.__start_next():
+                pass
+
+    def __handle(self, kind: str, payload: object) -> None:
+        if kind == "schedule":
+            self._scheduler.schedule(payload)
+        elif kind == "finish" and payload in self._running:
+            self.__finish(payload, 0)
+        elif kind == "abort":
+            self._scheduler.abort_by_task(payload)
+            for job in [j for j in self._running if j.task_id == payload]:
+                self.__finish(job, None)
+        elif kind == "shutdown":
+            self._scheduler.graceful_shutdown()
+
+    def __start_next(self) -> bool:
+        """Starts the Schedulable selected by the scheduler, if any"""
+        job = self._scheduler._get_next_schedulable()
+        if job is None:
+            return False
+        self._running.add(job)
+        self._memory.reserve(job.memory_estimate)
+        self._scheduler._on_schedulable_started(job)
+        job.run_before_on_main()
+        self.add_event(self._clock.now + job.run_time, "finish", job)
+        return True
+
+    def __finish(self, job: SyntheticSchedulable, status: Optional[int]) -> None:
+        self._running.remove(job)
+        self._memory.release(job.memory_estimate)
+        self._scheduler._on_schedulable_finished(job, self._clock.now - job.start)
+        job.run_later_on_main(status)
+
+
+def simulate(policy: type[UserRoundRobinScheduler], workload: Workload,
+             workers: int, memory_limit: Optional[int] = None,
+             **scheduler_kwargs: object) -> BenchmarkResult:
+    """Simulates running a workload with a policy on a virtual clock,
+    so that long workloads take a fraction of a second.
+    The policy selects the Schedulables to start, its supervisor threads
+    and worker processes are replaced by the simulation.
+    :param workers: The number of Schedulables running at once
+    :param memory_limit: The limit of the memory estimates of the running Schedulables
+    :param scheduler_kwargs: Further arguments of the policy"""
+    jobs, aborts = workload.generate(workers)
+    clock = _VirtualClock()
+    simulated = type(f"Simulated{policy.__name__}", (policy,),
+                     {"_get_targeted_worker_count": lambda self: 0})
+    Scheduler._instance = None
+    with patch("time.monotonic", clock):
+        scheduler: UserRoundRobinScheduler = simulated(memory_limit=memory_limit,
+                                                       **scheduler_kwargs)
+        simulation = _Simulation(scheduler, clock, workers)
+        for job in jobs:
+            job.clock = clock
+            simulation.add_event(job.arrival, "schedule", job)
+        for at, tid in aborts:
+            simulation.add_event(at, "abort", tid)
+        if workload.shutdown_at is not None:
+            simulation.add_event(workload.shutdown_at, "shutdown")
+        simulation.run()
+        scheduler.hard_shutdown()
+    Scheduler._instance = None
+    return BenchmarkResult.evaluate(policy.__name__, jobs)
+
+
+def run_live(policy: type[UserRoundRobinScheduler], workload: Workload,
+             workers: int, memory_limit: Optional[int] = None,
+             time_scale: float = 0.01, **scheduler_kwargs: object) -> BenchmarkResult:
+    """Runs a workload with a policy, using worker processes sleeping for
+    the run times of the Schedulables. Includes the overhead of the scheduler,
+    e.g. forking and supervising processes.
+    :param workers: The number of Schedulables running at once
+    :param memory_limit: The limit of the memory estimates of the running Schedulables
+    :param time_scale: The wall seconds a simulated second takes, all times
+    are reported in simulated seconds nevertheless
+    :param scheduler_kwargs: Further arguments of the policy"""
+    assert time_scale > 0
+    jobs, aborts = workload.generate(workers)
+    lock = threading.Condition()
+    pending = [len(jobs)]
+    shut_down = threading.Event()
+    start = time.monotonic()
+
+    def clock() -> float:
+        return (time.monotonic() - start) / time_scale
+
+    def on_finished() -> None:
+        with lock:
+            pending[0] -= 1
+            lock.notify_all()
+
+    for job in jobs:
+        job.time_scale = time_scale
+        job.clock = clock
+        job.on_finished = on_finished
+    Scheduler._instance = None
+    scheduler = policy(worker_count=workers, memory_limit=memory_limit,
+                       **scheduler_kwargs)
+    actions: list[tuple[float, int, Callable[[], None]]] = \
+        [(job.arrival, i, lambda j=job: scheduler.schedule(j))
+         for i, job in enumerate(jobs)] \
+        + [(at, len(jobs) + i, lambda t=tid: scheduler.abort_by_task(t))
+           for i, (at, tid) in enumerate(aborts)]
+    if workload.shutdown_at is not None:
+        actions.append((workload.shutdown_at, len(actions),
+                        lambda: scheduler.graceful_shutdown(shut_down.set)))
+    try:
+        for at, _, action in sorted(actions):
+            delay = at * time_scale - (time.monotonic() - start)
+            if delay > 0:
+                time.sleep(delay)
+            action()
+        with lock:
+            while pending[0] > 0 and not shut_down.is_set():
+                lock.wait(0.1)
+    finally:
+        scheduler.hard_shutdown()
+        Scheduler._instance = None
+    return BenchmarkResult.evaluate(policy.__name__, jobs)
+
+
+def format_results(results: Sequence[BenchmarkResult]) -> str:
+    """Formats results as a table with a row for every policy"""
+    header = ["policy", "completed", "aborted", "dropped", "makespan", "throughput",
+              "fairness", "wait p50", "wait p90", "wait p99", "wait max"]
+    rows = [[r.policy, str(r.completed), str(r.aborted), str(r.dropped),
+             f"{r.makespan:.1f}", f"{r.throughput:.3f}", f"{r.fairness:.3f}"]
+            + [f"{r.waits[p]:.1f}" for p in ("p50", "p90", "p99", "max")]
+            for r in results]
+    widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+    return "\n".join("  ".join(cell.rjust(w) for cell, w in zip(row, widths))
+                     for row in [header] + rows)
+
+
+def get_policy(name: str) -> type[UserRoundRobinScheduler]:
+    """Returns the policy with the given name from POLICIES
+    or the class given as module:Class, which has to extend UserRoundRobinScheduler
+    :raises ValueError if there is no such policy"""
+    if name in POLICIES:
+        return POLICIES[name]
+    module, _, cls = name.partition(":")
+    try:
+        policy = getattr(importlib.import_module(module), cls)
+    except (ImportError, AttributeError, ValueError):
+        raise ValueError(f"unknown policy {name}")
+    if not (isinstance(policy, type) and issubclass(policy, UserRoundRobinScheduler)):
+        raise ValueError(f"{name} is not a UserRoundRobinScheduler")
+    return policy
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Compares scheduling policies on a synthetic workload, "
+                    "times are given in (simulated) seconds")
+    parser.add_argument("--policies", nargs="+", default=list(POLICIES),
+                        help=f"{', '.join(POLICIES)} or module:Class")
+    parser.add_argument("--live", action="store_true",
+                        help="run worker processes instead of simulating them")
+    parser.add_argument("--time-scale", type=float, default=0.01,
+                        help="the wall seconds a second takes when running live")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--memory-limit", type=int, default=None)
+    parser.add_argument("--priority-aging", type=float, default=0.0)
+    parser.add_argument("--event-loop", action="store_true")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--tasks-per-user", type=int, default=5)
+    parser.add_argument("--task-size", type=int, default=10)
+    parser.add_argument("--run-time", type=Distribution, default=Distribution("exp:10"),
+                        help="e.g. const:5, uniform:1:10, exp:5 or lognormal:1:0.5")
+    parser.add_argument("--memory", type=Distribution, default=Distribution("const:0"))
+    parser.add_argument("--priorities", type=int, nargs="+",
+                        default=[5, 6, 7, 8, 9, 50])
+    parser.add_argument("--arrival-rate", type=float, default=0.0,
+                        help="tasks per second of every user, 0 to submit all at once")
+    parser.add_argument("--abort-fraction", type=float, default=0.0)
+    parser.add_argument("--shutdown-at", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    try:
+        policies = [get_policy(name) for name in args.policies]
+    except ValueError as e:
+        parser.error(str(e))
+    workload = Workload(args.users, args.tasks_per_user, args.task_size, args.run_time,
+                        args.memory, args.priorities, args.arrival_rate,
+                        args.abort_fraction, args.shutdown_at, args.seed)
+    kwargs: dict[str, object] = {"priority_aging": args.priority_aging}
+    results = []
+    for policy in policies:
+        if args.live:
+            results.append(run_live(policy, workload, args.workers, args.memory_limit,
+                                    args.time_scale, event_loop=args.event_loop,
+                                    **kwargs))
+        else:
+            results.append(simulate(policy, workload, args.workers, args.memory_limit,
+                                    **kwargs))
+    print(format_results(results))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
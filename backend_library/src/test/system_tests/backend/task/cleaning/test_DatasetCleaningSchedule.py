@@ -107,18 +107,24 @@ class SystemTestDatasetCleaningRunCleaningPipeline(unittest.TestCase):
             os.remove(self._cleaned_dataset_path1)
         if os.path.isfile(self._cleaned_dataset_path1 + ".error"):
             os.remove(self._cleaned_dataset_path1 + ".error")
+        if os.path.isfile(DataIO.get_binary_path(self._cleaned_dataset_path1)):
+            os.remove(DataIO.get_binary_path(self._cleaned_dataset_path1))
 
         # dataset 2
         if os.path.isfile(self._cleaned_dataset_path2):
             os.remove(self._cleaned_dataset_path2)
         if os.path.isfile(self._cleaned_dataset_path2 + ".error"):
             os.remove(self._cleaned_dataset_path2 + ".error")
+        if os.path.isfile(DataIO.get_binary_path(self._cleaned_dataset_path2)):
+            os.remove(DataIO.get_binary_path(self._cleaned_dataset_path2))
 
         # dataset 3
         if os.path.isfile(self._cleaned_dataset_path3):
             os.remove(self._cleaned_dataset_path3)
         if os.path.isfile(self._cleaned_dataset_path3 + ".error"):
             os.remove(self._cleaned_dataset_path3 + ".error")
+        if os.path.isfile(DataIO.get_binary_path(self._cleaned_dataset_path3)):
+            os.remove(DataIO.get_binary_path(self._cleaned_dataset_path3))
         if os.path.isfile(self._cleaned_dataset_path3 + ".running"):
             os.remove(self._cleaned_dataset_path3 + ".running")
 
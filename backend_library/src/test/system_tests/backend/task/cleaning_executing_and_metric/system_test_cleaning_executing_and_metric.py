@@ -3,6 +3,7 @@ import shutil
 import unittest
 from multiprocessing import Event
 
+from backend.DataIO import DataIO
 from backend.metric.MetricDataPointsAreOutliers import MetricDataPointsAreOutliers
 from backend.metric.MetricSubspaceOutlierAmount import MetricSubspaceOutlierAmount
 from backend.scheduler.Scheduler import Scheduler
@@ -39,7 +40,7 @@ class SystemTest_CleaningExecutingAndMetric(unittest.TestCase):
     def setUp(self) -> None:
         # Scheduler
         Scheduler._instance = None
-        self._rr_scheduler: Scheduler = UserRoundRobinScheduler()
+        self._rr_scheduler: Scheduler = self._make_scheduler()
 
         # Setup Algorithms
         alg_root_directory: str = "../resources/test"
@@ -70,6 +71,13 @@ class SystemTest_CleaningExecutingAndMetric(unittest.TestCase):
                                         self._final_zip_path,
                                         zip_running_path=self._zipped_result_path)
 
+    def tearDown(self) -> None:
+        self._rr_scheduler.hard_shutdown()
+        Scheduler._instance = None
+
+    def _make_scheduler(self) -> Scheduler:
+        return UserRoundRobinScheduler()
+
     def test_cleaning_execution_and_metric(self):
         # Do the DatasetCleaning # # # # # # # # # # # # # # # # # # # # # # # # # # # #
         self.assertFalse(os.path.isfile(self._cleaned_dataset_path))
@@ -78,6 +86,8 @@ class SystemTest_CleaningExecutingAndMetric(unittest.TestCase):
 
         self.assertTrue(self._cleaning_finished.wait(timeout))
         self.assertTrue(os.path.isfile(self._cleaned_dataset_path))
+        self.assertTrue(
+            os.path.isfile(DataIO.get_binary_path(self._cleaned_dataset_path)))
 
         # Do the Execution # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
         self.assertFalse(os.path.isfile(self._zipped_result_path))
@@ -129,6 +139,8 @@ class SystemTest_CleaningExecutingAndMetric(unittest.TestCase):
         # DatasetCleaning
         if os.path.isfile(self._cleaned_dataset_path):
             os.remove(self._cleaned_dataset_path)
+        if os.path.isfile(DataIO.get_binary_path(self._cleaned_dataset_path)):
+            os.remove(DataIO.get_binary_path(self._cleaned_dataset_path))
         # Execution
         if os.path.isdir(self._result_path):
             shutil.rmtree(self._result_path)
@@ -192,5 +204,20 @@ class SystemTest_CleaningExecutingAndMetric(unittest.TestCase):
         self._cleaning_finished: Event = Event()
 
 
+class SystemTest_CleaningExecutingAndMetricPooled(SystemTest_CleaningExecutingAndMetric):
+    """Runs the same test with pooled worker processes forked from a zygote"""
+
+    def setUp(self) -> None:
+        super().setUp()
+        AlgorithmLoader.set_worker_pool_algorithm_dirs(["../resources/test/algorithms"])
+
+    def tearDown(self) -> None:
+        super().tearDown()
+        AlgorithmLoader.set_worker_pool_algorithm_dirs([])
+
+    def _make_scheduler(self) -> Scheduler:
+        return UserRoundRobinScheduler(True, 3, True, ["sklearn", "pyod.models.knn"])
+
+
 if __name__ == '__main__':
     unittest.main()
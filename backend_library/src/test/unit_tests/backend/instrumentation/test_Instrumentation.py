@@ -0,0 +1,80 @@
+import math
+import unittest
+
+from backend.instrumentation.Instrumentation import Instrumentation, Counter, \
+    Gauge, Histogram
+
+
+class UnitTestInstrumentation(unittest.TestCase):
+    def test_counter(self):
+        counter = Counter("test_total", "A counter")
+        counter.inc()
+        counter.inc(2, user=1)
+        counter.inc(user=1)
+        self.assertEqual(1, counter.get())
+        self.assertEqual(3, counter.get(user=1))
+        self.assertRaises(AssertionError, counter.inc, -1)
+        self.assertEqual(["# HELP test_total A counter",
+                          "# TYPE test_total counter",
+                          "test_total 1.0",
+                          "test_total{user=\"1\"} 3.0"], counter.render())
+
+    def test_gauge(self):
+        gauge = Gauge("test_bytes", "A gauge")
+        gauge.set(10, kind="a")
+        gauge.inc(5, kind="a")
+        gauge.dec(12, kind="a")
+        self.assertEqual(3, gauge.get(kind="a"))
+        gauge.clear()
+        self.assertEqual(0, gauge.get(kind="a"))
+        self.assertEqual(["# HELP test_bytes A gauge",
+                          "# TYPE test_bytes gauge"], gauge.render())
+
+    def test_histogram(self):
+        histogram = Histogram("test_seconds", "A histogram", (1, 5))
+        histogram.observe(0.5)
+        histogram.observe(1)
+        histogram.observe(7)
+        with histogram.time():
+            pass
+        self.assertEqual(4, histogram.get_count())
+        lines = histogram.render()
+        self.assertIn("test_seconds_bucket{le=\"1.0\"} 3.0", lines)
+        self.assertIn("test_seconds_bucket{le=\"5.0\"} 3.0", lines)
+        self.assertIn("test_seconds_bucket{le=\"+Inf\"} 4.0", lines)
+        self.assertIn("test_seconds_count 4.0", lines)
+        self.assertTrue(any(line.startswith("test_seconds_sum 8.5")
+                            for line in lines))
+
+    def test_histogram_quantile(self):
+        histogram = Histogram("test_quantile_seconds", "A histogram", (1, 5, 10))
+        self.assertTrue(math.isnan(histogram.get_quantile(0.5)))
+        for value in [0.5, 0.5, 2, 3, 4, 20]:
+            histogram.observe(value, kind="a")
+        # 2 of 6 observations are within [0, 1], 3 within (1, 5]
+        self.assertAlmostEqual(0.3, histogram.get_quantile(0.1, kind="a"))
+        self.assertAlmostEqual(1 + 4 / 3, histogram.get_quantile(0.5, kind="a"))
+        self.assertEqual(10, histogram.get_quantile(0.99, kind="a"))
+        self.assertEqual([{"kind": "a"}], histogram.get_label_values())
+
+    def test_escaping(self):
+        counter = Counter("test_escaped_total", "Line\nbreak")
+        counter.inc(name="a \"quoted\"\\name")
+        self.assertEqual(["# HELP test_escaped_total Line\\nbreak",
+                          "# TYPE test_escaped_total counter",
+                          "test_escaped_total{name=\"a \\\"quoted\\\"\\\\name\"} 1.0"],
+                         counter.render())
+
+    def test_registry(self):
+        counter = Instrumentation.counter("test_registry_total", "A counter")
+        self.assertIs(counter,
+                      Instrumentation.counter("test_registry_total", "A counter"))
+        self.assertRaises(AssertionError, Instrumentation.gauge,
+                          "test_registry_total", "A gauge")
+        counter.inc(3)
+        self.assertIn("# TYPE test_registry_total counter\ntest_registry_total 3.0\n",
+                      Instrumentation.render())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -121,63 +121,6 @@ class UnitTest_ExecutionElementMetricHelper(unittest.TestCase):
 
         self.__clean_existing_files()
 
-    def test_convert_paths_into_subspace_identifier(self):
-        # one element
-        self.assertEqual(list(["first"]), ExecutionElementMetricHelper.
-                         convert_paths_into_subspace_identifier(
-            list([self._csv_paths_in_this_directory[0]])))
-
-        # n elements
-        self.assertEqual(list(["first", "second", "random_name"]),
-                         ExecutionElementMetricHelper.
-                         convert_paths_into_subspace_identifier(
-                             list([self._csv_paths_in_this_directory[0],
-                                   self._csv_paths_in_this_directory[1],
-                                   self._csv_paths_in_this_directory[2]])))
-
-        # empty
-        self.assertEqual(list([""]), ExecutionElementMetricHelper.
-                         convert_paths_into_subspace_identifier(list([""])))
-
-        self.__clean_existing_files()
-
-    def test_compute_data_point_outlier_count(self):
-        _execution_element_outlier_result_dataset1: list[np.ndarray] = list([
-            np.asarray([True, True, True, True, False, False, False, False]),
-            np.asarray([True, True, False, False, False, False, False, False]),
-            np.asarray([True, False, False, False, False, False, False, False]),
-            np.asarray([False, False, False, False, False, False, False, False])])
-        _expected_result1: np.ndarray[int] = np.asarray(list([3, 2, 1, 1, 0, 0, 0, 0]))
-
-        np.testing.assert_array_equal(ExecutionElementMetricHelper.
-        compute_data_point_outlier_count(
-            _execution_element_outlier_result_dataset1),
-            _expected_result1)
-
-    def test_compute_subspace_outlier_amount(self):
-        _execution_element_outlier_result_dataset1: dict[str, list[np.ndarray]] = {
-            "subspace1": list([
-                np.asarray([True, True, True, True, False, False, False, False]),
-                np.asarray([True, True, False, False, False, False, False, False])]),
-            "subspace2": list([
-                np.asarray([True, False, False, False, False, False, False, False]),
-                np.asarray([False, False, False, False, False, False, False, False])]),
-            "AHHHH, everything is an outlier D:": list([
-                np.asarray([True, True, True, True, True, True, True, True]),
-                np.asarray([True, True, True, True, True, True, True, True])]),
-            "Not even one outlier :)": list([
-                np.asarray([False, False, False, False, False, False, False, False]),
-                np.asarray([False, False, False, False, False, False, False, False])])
-        }
-
-        _expected_result1: np.ndarray[int] = np.asarray(
-            list([4 + 2, 1 + 0, 8 + 8, 0 + 0]))
-
-        np.testing.assert_array_equal(ExecutionElementMetricHelper.
-        compute_subspace_outlier_amount(
-            _execution_element_outlier_result_dataset1),
-            _expected_result1)
-
     def test_write_empty_execution_error_message(self):
         self.assertFalse(os.path.isfile(self._error_metric_path))
         ExecutionElementMetricHelper.write_empty_execution_error_message(
@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from backend.DataIO import DataIO
+from backend.metric.MetricDataPointsAreOutliers import MetricDataPointsAreOutliers
+from backend.metric.MetricSubspaceOutlierAmount import MetricSubspaceOutlierAmount
+from backend.task.TaskHelper import TaskHelper
+from backend.task.execution.ResultStore import ResultStore
+
+
+class UnitTestMetricAggregator(unittest.TestCase):
+    _identifiers: list[str] = ["AQ", "Ag", "Aw"]
+    _indices_mapping: list[int] = [0, 2, 3, 5, 8]
+
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        self._algorithm_directories: list[str] = list()
+        self._results: list[tuple[str, np.ndarray]] = list()
+        rng = np.random.default_rng(4)
+        for algorithm in ["algorithm1", "algorithm2"]:
+            directory = os.path.join(self._dir.name, algorithm)
+            os.mkdir(directory)
+            store = ResultStore(directory)
+            store.create(self._identifiers, len(self._indices_mapping))
+            for index in [0, 2]:
+                scores = rng.random(len(self._indices_mapping))
+                store.write(index, scores)
+                self._results.append((self._identifiers[index], scores))
+            self._algorithm_directories.append(directory)
+
+    def tearDown(self) -> None:
+        self._dir.cleanup()
+
+    def __path(self, name: str) -> str:
+        return os.path.join(self._dir.name, name)
+
+    def test_data_points_are_outliers(self):
+        MetricDataPointsAreOutliers(self._indices_mapping).compute_metric(
+            self.__path("computed.csv"), self._algorithm_directories)
+
+        # the results are added in the order the ExecutionElements finish
+        metric = MetricDataPointsAreOutliers()
+        metric.start([0, 1])
+        metric.add_result("AQ", np.zeros(2))
+        metric.start(self._indices_mapping)
+        for identifier, scores in reversed(self._results):
+            metric.add_result(identifier, scores)
+        metric.write_result(self.__path("aggregated.csv"))
+
+        np.testing.assert_array_equal(
+            DataIO.read_uncleaned_csv(self.__path("computed.csv"), None),
+            DataIO.read_uncleaned_csv(self.__path("aggregated.csv"), None))
+
+    def test_subspace_outlier_amount(self):
+        MetricSubspaceOutlierAmount.compute_metric(
+            self.__path("computed.csv"), self._algorithm_directories)
+
+        metric = MetricSubspaceOutlierAmount()
+        metric.start(self._indices_mapping)
+        for identifier, scores in reversed(self._results):
+            metric.add_result(identifier, scores)
+        metric.write_result(self.__path("aggregated.csv"))
+
+        computed = DataIO.read_uncleaned_csv(self.__path("computed.csv"), None)
+        aggregated = DataIO.read_uncleaned_csv(self.__path("aggregated.csv"), None)
+        self.assertEqual(sorted(computed.tolist()), sorted(aggregated.tolist()))
+
+    def test_without_results(self):
+        for metric in [MetricDataPointsAreOutliers(), MetricSubspaceOutlierAmount()]:
+            path = self.__path(f"{type(metric).__name__}.csv")
+            metric.start(self._indices_mapping)
+            metric.write_result(path)
+            self.assertFalse(os.path.isfile(path))
+            self.assertTrue(os.path.isfile(TaskHelper.convert_to_error_csv_path(path)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,11 @@
 import multiprocessing
+import os
+import time
+from collections.abc import Mapping
 from multiprocessing.managers import ValueProxy
 from typing import Optional, Callable
 
+from backend.scheduler.RemoteWorker import RemoteJob, RemoteWorker
 from backend.scheduler.Schedulable import Schedulable
 
 timeout = 60
@@ -55,3 +59,132 @@ class TestSched(Schedulable):
     def run_later_on_main(self, statuscode: Optional[int]) -> None:
         if self.run_after is not None:
             self.run_after(statuscode)
+
+
+class PoolTestSched(Schedulable):
+    """A worker pool compatible Schedulable, which returns the PID of the process
+    that ran do_work (modulo 100, plus 1) after sleeping for a given time"""
+    def __init__(self, uid: int = -1, tid: int = -1, prio: int = 0,
+                 sleep: float = 0,
+                 run_after: Optional[Callable[[Optional[int]], None]] = None):
+        self.uid: int = uid
+        self.tid: int = tid
+        self.prio: int = prio
+        self.sleep: float = sleep
+        self.run_after: Optional[Callable[[Optional[int]], None]] = run_after
+
+    @property
+    def user_id(self) -> int:
+        return self.uid
+
+    @property
+    def task_id(self) -> int:
+        return self.tid
+
+    @property
+    def priority(self) -> int:
+        return self.prio
+
+    @property
+    def worker_pool_compatible(self) -> bool:
+        return True
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["run_after"] = None
+        return state
+
+    def do_work(self) -> int:
+        if self.sleep > 0:
+            time.sleep(self.sleep)
+        return os.getpid() % 100 + 1
+
+    def run_later_on_main(self, statuscode: Optional[int]) -> None:
+        if self.run_after is not None:
+            self.run_after(statuscode)
+
+
+class MemoryTestSched(TestSched):
+    """A TestSched with a memory estimate"""
+    def __init__(self, memory: int, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.memory: int = memory
+
+    @property
+    def memory_estimate(self) -> int:
+        return self.memory
+
+
+class ThreadLimitTestSched(PoolTestSched):
+    """A PoolTestSched returning the thread limit of numerical libraries
+    in the process that ran do_work (0 if there is none)"""
+    def do_work(self) -> int:
+        return int(os.environ.get("OMP_NUM_THREADS", "0"))
+
+
+class TimeoutTestSched(PoolTestSched):
+    """A PoolTestSched with a timeout, which returns 7 once it exceeded it"""
+    def __init__(self, time_limit: float, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.time_limit: float = time_limit
+
+    @property
+    def timeout(self) -> Optional[float]:
+        return self.time_limit
+
+    def on_timeout(self) -> int:
+        return 7
+
+
+class EchoJob(RemoteJob):
+    """A RemoteJob returning its resources and the PID of the process running it,
+    after sleeping for a given time, or raising the given error"""
+    def __init__(self, keys: list[str], sleep: float = 0, error: str = ""):
+        self.keys: list[str] = keys
+        self.sleep: float = sleep
+        self.error: str = error
+
+    @property
+    def resources(self) -> list[str]:
+        return self.keys
+
+    def run(self, resources: Mapping[str, bytes], work_dir: str) -> object:
+        if self.sleep > 0:
+            time.sleep(self.sleep)
+        if self.error:
+            raise ValueError(self.error)
+        return [resources[k] for k in self.keys], os.getpid()
+
+
+class RemoteTestSched(TestSched):
+    """A remote compatible TestSched, that returns 2 if run by a WorkerAgent
+    and 3 if run locally. Its job on the agent sleeps for a given time.
+    Disconnects the agent before running its job if told so.
+    Returns 7 if it exceeded its timeout"""
+    def __init__(self, *args, sleep: float = 0, disconnect: bool = False,
+                 time_limit: Optional[float] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sleep: float = sleep
+        self.disconnect: bool = disconnect
+        self.time_limit: Optional[float] = time_limit
+
+    @property
+    def timeout(self) -> Optional[float]:
+        return self.time_limit
+
+    def on_timeout(self) -> int:
+        return 7
+
+    @property
+    def remote_compatible(self) -> bool:
+        return True
+
+    def do_work(self) -> int:
+        super().do_work()
+        return 3
+
+    def do_remote_work(self, worker: RemoteWorker) -> int:
+        if self.disconnect:
+            worker.stop()
+        worker.run(EchoJob(["key"], self.sleep), {"key": lambda: b"data"})
+        return 2
@@ -0,0 +1 @@
+"""Module only imported by worker zygotes in test_WorkerZygote"""
@@ -0,0 +1,104 @@
+import multiprocessing
+import unittest
+
+from backend.scheduler.FairShareScheduler import FairShareScheduler
+from backend.scheduler.Scheduler import Scheduler
+from test.FairShareWoWorkers import FairShareWoWorkers
+from test.unit_tests.backend.scheduler.SchedulableForTesting import TestSched, \
+    MemoryTestSched
+
+timeout = 60
+
+
+class UnitTestFairShareScheduler(unittest.TestCase):
+    def setUp(self) -> None:
+        Scheduler._instance = None
+
+    def tearDown(self) -> None:
+        Scheduler.get_instance().hard_shutdown()
+        Scheduler._instance = None
+
+    def test_least_usage_first(self):
+        sched = FairShareWoWorkers()
+        self.assertIsNone(sched.next_sched())
+        sched.charge(TestSched(0), 600)
+        sched.charge(TestSched(1), 1)
+        for _ in range(3):
+            sched.schedule(TestSched(0))
+            sched.schedule(TestSched(1))
+        # user 1 is far behind, even after running all of its Schedulables
+        for uid in [1, 1, 1, 0, 0, 0]:
+            s = sched.next_sched()
+            self.assertEqual(uid, s.user_id)
+            sched.charge(s, 1)
+        self.assertIsNone(sched.next_sched())
+
+    def test_priorities_within_user(self):
+        sched = FairShareWoWorkers()
+        a = TestSched(0, 1, 10)
+        b = TestSched(0, 2, 50)
+        sched.schedule(a)
+        sched.schedule(b)
+        self.assertEqual(b, sched.next_sched())
+        self.assertEqual(a, sched.next_sched())
+
+    def test_running_counts(self):
+        sched = FairShareWoWorkers()
+        for uid in [0, 0, 1]:
+            sched.schedule(TestSched(uid))
+        first = sched.next_sched()
+        sched._on_schedulable_started(first)
+        # nobody was charged yet, but the other user is not running anything
+        self.assertNotEqual(first.user_id, sched.next_sched().user_id)
+
+    def test_weights(self):
+        sched = FairShareWoWorkers({0: 1, 1: 4, 2: -1}.get)
+        sched.charge(TestSched(0), 100)
+        sched.charge(TestSched(1), 300)
+        sched.charge(TestSched(2), 50)
+        for uid in [0, 1]:
+            sched.schedule(TestSched(uid))
+        self.assertEqual(1, sched.next_sched().user_id)
+        # invalid weights are ignored
+        sched.schedule(TestSched(2))
+        self.assertEqual(2, sched.next_sched().user_id)
+        self.assertEqual(0, sched.next_sched().user_id)
+
+    def test_weight_provider_error(self):
+        def provider(uid: int) -> float:
+            raise KeyError(uid)
+
+        sched = FairShareWoWorkers(provider)
+        sched.schedule(TestSched(0))
+        self.assertEqual(0, sched.next_sched().user_id)
+
+    def test_decay(self):
+        sched = FairShareWoWorkers(usage_half_life=0.01)
+        sched.charge(TestSched(0), 600)
+        sched.charge(TestSched(1), 1)
+        sched.schedule(TestSched(1, 5))
+        sched.schedule(TestSched(0, 6))
+        # both usages decayed to nearly nothing, so the difference vanished
+        self.assertEqual(1, sched.next_sched().user_id)
+
+    def test_memory_limit(self):
+        sched = FairShareWoWorkers(memory_limit=100)
+        sched.charge(TestSched(1), 600)
+        sched._on_schedulable_started(MemoryTestSched(60, 2))
+        sched._UserRoundRobinScheduler__memory.reserve(60)
+        sched.schedule(MemoryTestSched(60, 0))
+        sched.schedule(MemoryTestSched(40, 1))
+        self.assertEqual(1, sched.next_sched().user_id)
+        self.assertIsNone(sched.next_sched())
+
+    def test_exec(self):
+        fss = FairShareScheduler()
+        finished = multiprocessing.Semaphore(0)
+        for uid in range(3):
+            fss.schedule(TestSched(uid, run_after=lambda s: finished.release()))
+        for _ in range(3):
+            self.assertTrue(finished.acquire(timeout=timeout))
+
+
+if __name__ == '__main__':
+    unittest.main()
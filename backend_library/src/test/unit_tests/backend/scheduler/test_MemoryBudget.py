@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+
+from backend.scheduler.MemoryBudget import MemoryBudget
+
+
+class UnitTestMemoryBudget(unittest.TestCase):
+    def setUp(self) -> None:
+        self._cgroup_limit_files = MemoryBudget._cgroup_limit_files
+        self._dir = tempfile.TemporaryDirectory()
+        self._physical = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+
+    def tearDown(self) -> None:
+        MemoryBudget._cgroup_limit_files = self._cgroup_limit_files
+        self._dir.cleanup()
+
+    def test_reserve(self):
+        budget = MemoryBudget(100)
+        self.assertEqual(100, budget.limit)
+        # anything fits into an empty budget
+        self.assertTrue(budget.fits(1000))
+        budget.reserve(60)
+        self.assertTrue(budget.fits(40))
+        self.assertFalse(budget.fits(41))
+        budget.reserve(60)
+        self.assertEqual(120, budget.used)
+        budget.release(60)
+        self.assertTrue(budget.fits(40))
+        budget.release(60)
+        self.assertEqual(0, budget.used)
+        self.assertRaises(AssertionError, budget.release, 1)
+
+    def test_unlimited(self):
+        budget = MemoryBudget()
+        budget.reserve(1 << 60)
+        self.assertTrue(budget.fits(1 << 60))
+
+    def __set_cgroup_limit(self, *contents: str) -> None:
+        MemoryBudget._cgroup_limit_files = [os.path.join(self._dir.name, "missing")]
+        for i, content in enumerate(contents):
+            path = os.path.join(self._dir.name, str(i))
+            with open(path, "w") as f:
+                f.write(content + "\n")
+            MemoryBudget._cgroup_limit_files.append(path)
+
+    def test_cgroup_limit(self):
+        self.__set_cgroup_limit("1024", "2048")
+        self.assertEqual(1024, MemoryBudget.get_memory_limit())
+        self.assertEqual(512, MemoryBudget.get_memory_limit(0.5))
+
+    def test_cgroup_unlimited(self):
+        self.__set_cgroup_limit("max", "1024")
+        self.assertEqual(self._physical, MemoryBudget.get_memory_limit())
+        self.__set_cgroup_limit(str(self._physical * 2))
+        self.assertEqual(self._physical, MemoryBudget.get_memory_limit())
+
+    def test_no_cgroup(self):
+        self.__set_cgroup_limit()
+        self.assertEqual(self._physical // 4, MemoryBudget.get_memory_limit(0.25))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import unittest
+
+from backend.scheduler.PooledWorker import PooledWorker
+from test.unit_tests.backend.scheduler.SchedulableForTesting import PoolTestSched, \
+    TestSched
+
+
+class UnitTestPooledWorker(unittest.TestCase):
+    def setUp(self) -> None:
+        self._worker = PooledWorker()
+
+    def tearDown(self) -> None:
+        self._worker.stop()
+
+    def test_reuses_process(self):
+        self.assertTrue(self._worker.submit(PoolTestSched()))
+        first = self._worker.wait_for_result()
+        pid = self._worker.pid
+        self.assertTrue(self._worker.submit(PoolTestSched()))
+        self.assertEqual(first, self._worker.wait_for_result())
+        self.assertEqual(pid, self._worker.pid)
+        self.assertEqual(pid % 100 + 1, first)
+        self.assertNotEqual(os.getpid(), pid)
+
+    def test_recycles_after_max_tasks(self):
+        worker = PooledWorker(2)
+        pids = []
+        for _ in range(4):
+            self.assertTrue(worker.submit(PoolTestSched()))
+            worker.wait_for_result()
+            pids.append(worker.pid)
+        worker.stop()
+        self.assertEqual(pids[0], pids[1])
+        self.assertEqual(pids[2], pids[3])
+        self.assertNotEqual(pids[1], pids[2])
+
+    def test_kill(self):
+        self.assertTrue(self._worker.submit(PoolTestSched(sleep=60)))
+        self._worker.kill()
+        self.assertEqual(-9, self._worker.wait_for_result())
+        self.assertFalse(self._worker.is_alive())
+        # the worker is replaced on the next submit
+        self.assertTrue(self._worker.submit(PoolTestSched()))
+        self.assertEqual(self._worker.pid % 100 + 1, self._worker.wait_for_result())
+
+    def test_send_after_kill(self):
+        data = PooledWorker.serialize(PoolTestSched())
+        self.assertIsNotNone(data)
+        self._worker.prepare()
+        self._worker.kill()
+        # an aborted Schedulable must not be run by a replacement worker
+        self._worker.send(data)
+        self.assertEqual(-9, self._worker.wait_for_result())
+        self.assertFalse(self._worker.is_alive())
+
+    def test_unpicklable(self):
+        class Unpicklable(TestSched):
+            @property
+            def worker_pool_compatible(self) -> bool:
+                return True
+        self.assertFalse(self._worker.submit(Unpicklable(run_after=lambda x: None)))
+        self.assertIsNone(self._worker.pid)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import queue
+import tempfile
+import threading
+import unittest
+
+from backend.scheduler.RemoteWorker import RemoteWorker, RemoteWorkerServer
+from backend.scheduler.WorkerAgent import WorkerAgent
+from test.unit_tests.backend.scheduler.SchedulableForTesting import EchoJob
+
+timeout = 60
+_authkey = b"remote worker test"
+
+
+class UnitTestRemoteWorker(unittest.TestCase):
+    def setUp(self) -> None:
+        self._workers: queue.Queue[RemoteWorker] = queue.Queue()
+        self._server = RemoteWorkerServer(("127.0.0.1", 0), _authkey,
+                                          self._workers.put)
+        self._dir = tempfile.TemporaryDirectory()
+        self._agents: list[tuple[WorkerAgent, threading.Thread]] = []
+
+    def tearDown(self) -> None:
+        self._server.stop()
+        for agent, thread in self._agents:
+            agent.stop()
+            thread.join(timeout)
+            self.assertFalse(thread.is_alive())
+        while not self._workers.empty():
+            self._workers.get().stop()
+        self._dir.cleanup()
+
+    def __start_agent(self, slots: int = 1, authkey: bytes = _authkey) -> WorkerAgent:
+        agent = WorkerAgent(self._server.address, authkey, self._dir.name, slots)
+        thread = threading.Thread(target=agent.serve_forever)
+        thread.start()
+        self._agents.append((agent, thread))
+        return agent
+
+    def test_run(self):
+        self.__start_agent(2)
+        first = self._workers.get(timeout=timeout)
+        second = self._workers.get(timeout=timeout)
+        fetched = []
+
+        def fetch() -> bytes:
+            fetched.append(True)
+            return b"data"
+        result, pid = first.run(EchoJob(["key"]), {"key": fetch})
+        self.assertEqual([b"data"], result)
+        self.assertNotEqual(os.getpid(), pid)
+        # the resource is cached by the agent, not by the slot
+        result, _ = second.run(EchoJob(["key"]), {"key": fetch})
+        self.assertEqual([b"data"], result)
+        self.assertEqual(1, len(fetched))
+
+    def test_error(self):
+        self.__start_agent()
+        worker = self._workers.get(timeout=timeout)
+        with self.assertRaisesRegex(RuntimeError, "evil"):
+            worker.run(EchoJob([], error="evil"), {})
+        # the agent keeps running jobs
+        self.assertEqual([], worker.run(EchoJob([]), {})[0])
+        self.assertTrue(worker.check_connection())
+
+    def test_kill(self):
+        self.__start_agent()
+        worker = self._workers.get(timeout=timeout)
+        threading.Timer(0.5, worker.kill).start()
+        self.assertRaises(ConnectionError, worker.run, EchoJob([], 60), {})
+        self.assertFalse(worker.is_alive())
+        # the agent connects again
+        worker = self._workers.get(timeout=timeout)
+        self.assertEqual([], worker.run(EchoJob([]), {})[0])
+
+    def test_agent_stopped(self):
+        agent = self.__start_agent()
+        worker = self._workers.get(timeout=timeout)
+        agent.stop()
+        self._agents[0][1].join(timeout)
+        self.assertRaises(ConnectionError, worker.run, EchoJob([]), {})
+
+    def test_wrong_authkey(self):
+        self.__start_agent(1, b"wrong")
+        self.assertRaises(queue.Empty, self._workers.get, timeout=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
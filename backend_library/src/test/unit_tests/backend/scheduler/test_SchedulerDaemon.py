@@ -0,0 +1,113 @@
+import multiprocessing
+import os
+import tempfile
+import threading
+import unittest
+from multiprocessing import AuthenticationError
+from multiprocessing.managers import ValueProxy
+
+from backend.instrumentation.Instrumentation import Instrumentation
+from backend.scheduler.DebugScheduler import DebugScheduler
+from backend.scheduler.Scheduler import Scheduler
+from backend.scheduler.SchedulerClient import SchedulerClient
+from backend.scheduler.SchedulerDaemon import SchedulerDaemon
+from test.unit_tests.backend.scheduler.SchedulableForTesting import TestSched
+
+_authkey = b"scheduler daemon test"
+
+
+class UnitTestSchedulerDaemon(unittest.TestCase):
+    def setUp(self) -> None:
+        Scheduler._instance = None
+        self._dir = tempfile.TemporaryDirectory()
+        self._address = os.path.join(self._dir.name, "scheduler.sock")
+        # the daemon and the client share this process, so bypass the singleton
+        self._scheduler = DebugScheduler()
+        Scheduler._instance = None
+        self._daemon, self._thread = self.__start_daemon()
+        self._client = SchedulerClient(self._address, _authkey)
+
+    def tearDown(self) -> None:
+        self._client.hard_shutdown()
+        self.__stop_daemon()
+        self._dir.cleanup()
+        Scheduler._instance = None
+
+    def __start_daemon(self) -> tuple[SchedulerDaemon, threading.Thread]:
+        daemon = SchedulerDaemon(self._scheduler, self._address, _authkey)
+        thread = threading.Thread(target=daemon.serve_forever)
+        thread.start()
+        return daemon, thread
+
+    def __stop_daemon(self) -> None:
+        self._daemon.stop()
+        self._thread.join(10)
+        self.assertFalse(self._thread.is_alive())
+
+    def test_schedule(self):
+        self.assertIs(self._client, Scheduler.get_instance())
+        with multiprocessing.Manager() as m:
+            tbc: ValueProxy[bool] = m.Value('b', False)
+            self._client.schedule(TestSched(tbc=tbc))
+            self.assertTrue(tbc.get())
+        self.assertFalse(self._client.is_shutting_down())
+        self.assertIsNone(self._client.log_debug_data())
+        self.assertIsNone(self._client.preload(len, "abc"))
+        Instrumentation.counter("test_daemon_total", "A counter").inc()
+        self.assertIn("test_daemon_total 1.0", self._client.render_metrics())
+
+    def test_errors_are_forwarded(self):
+        self.assertRaises(NotImplementedError, self._client.abort_by_task, 1)
+        self.assertRaises(NotImplementedError, self._client.abort_by_user, 1)
+        # raised whilst pickling, so the connection stays usable
+        self.assertRaises(RuntimeError, self._client.schedule,
+                          TestSched(wait_for=multiprocessing.Lock()))
+        self.assertFalse(self._client.is_shutting_down())
+
+    def test_shutdown_only_disconnects(self):
+        self.assertFalse(self._client.is_shutting_down())
+        self._client.hard_shutdown()
+        called = []
+        self._client.graceful_shutdown(lambda: called.append(True))
+        self.assertEqual([True], called)
+        self.assertTrue(self._thread.is_alive())
+        self.assertFalse(self._client.is_shutting_down())
+
+    def test_daemon_restart(self):
+        self.assertFalse(self._client.is_shutting_down())
+        self.__stop_daemon()
+        self.assertFalse(os.path.exists(self._address))
+        self._daemon, self._thread = self.__start_daemon()
+        self.assertFalse(self._client.is_shutting_down())
+
+    def test_daemon_not_running(self):
+        self.__stop_daemon()
+        timeout = SchedulerClient._connect_timeout
+        SchedulerClient._connect_timeout = 0.2
+        try:
+            self.assertRaises(ConnectionError, self._client.is_shutting_down)
+        finally:
+            SchedulerClient._connect_timeout = timeout
+            self._daemon, self._thread = self.__start_daemon()
+
+    def test_single_daemon(self):
+        self.assertRaises(RuntimeError, SchedulerDaemon,
+                          self._scheduler, self._address, _authkey)
+        self.assertTrue(os.path.exists(self._address))
+
+    def test_stale_socket(self):
+        self.__stop_daemon()
+        with open(self._address, "w"):
+            pass
+        self._daemon, self._thread = self.__start_daemon()
+        self.assertFalse(self._client.is_shutting_down())
+
+    def test_wrong_authkey(self):
+        Scheduler._instance = None
+        client = SchedulerClient(self._address, b"wrong")
+        self.assertRaises(AuthenticationError, client.is_shutting_down)
+        self.assertFalse(self._client.is_shutting_down())
+
+
+if __name__ == '__main__':
+    unittest.main()
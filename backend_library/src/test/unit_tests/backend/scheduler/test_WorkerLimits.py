@@ -0,0 +1,83 @@
+import multiprocessing
+import os
+import tempfile
+import unittest
+from multiprocessing.connection import Connection
+
+from backend.scheduler.WorkerLimits import WorkerLimits
+
+
+def report_limits(limits: WorkerLimits, connection: Connection) -> None:
+    limits.apply()
+    connection.send((os.environ.get("OPENBLAS_NUM_THREADS"),
+                     sorted(os.sched_getaffinity(0))))
+
+
+class UnitTestWorkerLimits(unittest.TestCase):
+    def setUp(self) -> None:
+        self._cgroup_v2_file = WorkerLimits._cgroup_v2_file
+        self._cgroup_v1_files = WorkerLimits._cgroup_v1_files
+        self._dir = tempfile.TemporaryDirectory()
+        self._cpus = len(os.sched_getaffinity(0))
+
+    def tearDown(self) -> None:
+        WorkerLimits._cgroup_v2_file = self._cgroup_v2_file
+        WorkerLimits._cgroup_v1_files = self._cgroup_v1_files
+        self._dir.cleanup()
+
+    def __write(self, name: str, content: str) -> str:
+        path = os.path.join(self._dir.name, name)
+        with open(path, "w") as f:
+            f.write(content + "\n")
+        return path
+
+    def __set_cgroup_v2(self, content: str) -> None:
+        WorkerLimits._cgroup_v2_file = self.__write("cpu.max", content)
+        WorkerLimits._cgroup_v1_files = (os.path.join(self._dir.name, "missing"),) * 2
+
+    def __set_cgroup_v1(self, quota: str, period: str) -> None:
+        WorkerLimits._cgroup_v2_file = os.path.join(self._dir.name, "missing")
+        WorkerLimits._cgroup_v1_files = (self.__write("quota", quota),
+                                         self.__write("period", period))
+
+    def test_cgroup_v2_quota(self):
+        self.__set_cgroup_v2("50000 100000")
+        # fractions of a CPU still need a worker
+        self.assertEqual(1, WorkerLimits.get_cpu_count())
+        self.__set_cgroup_v2(f"{self._cpus * 200000} 100000")
+        self.assertEqual(self._cpus, WorkerLimits.get_cpu_count())
+        self.__set_cgroup_v2("max 100000")
+        self.assertEqual(self._cpus, WorkerLimits.get_cpu_count())
+
+    def test_cgroup_v1_quota(self):
+        self.__set_cgroup_v1("150000", "100000")
+        self.assertEqual(min(2, self._cpus), WorkerLimits.get_cpu_count())
+        self.__set_cgroup_v1("-1", "100000")
+        self.assertEqual(self._cpus, WorkerLimits.get_cpu_count())
+
+    def test_no_cgroup(self):
+        WorkerLimits._cgroup_v2_file = os.path.join(self._dir.name, "missing")
+        WorkerLimits._cgroup_v1_files = (WorkerLimits._cgroup_v2_file,) * 2
+        self.assertEqual(self._cpus, WorkerLimits.get_cpu_count())
+
+    def test_apply(self):
+        cpu = WorkerLimits.get_available_cpus()[-1]
+        main_end, worker_end = multiprocessing.Pipe()
+        p = multiprocessing.Process(target=report_limits,
+                                    args=(WorkerLimits(2, [cpu]), worker_end))
+        p.start()
+        self.assertEqual(("2", [cpu]), main_end.recv())
+        p.join()
+        # the limits only apply to the worker process
+        self.assertEqual(self._cpus, len(os.sched_getaffinity(0)))
+
+    def test_no_limits(self):
+        limits = WorkerLimits()
+        self.assertIsNone(limits.threads)
+        self.assertIsNone(limits.cpus)
+        self.assertRaises(AssertionError, WorkerLimits, 0)
+        self.assertRaises(AssertionError, WorkerLimits, None, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import importlib
+import os
+import sys
+import time
+import unittest
+from multiprocessing.connection import Connection
+
+from backend.scheduler.PooledWorker import PooledWorker
+from backend.scheduler.WorkerZygote import WorkerZygote
+from test.unit_tests.backend.scheduler.SchedulableForTesting import PoolTestSched
+
+_package = "test.unit_tests.backend.scheduler."
+_preloaded = _package + "ZygotePreloadedStub"
+_on_demand = _package + "ZygoteOnDemandStub"
+_exiting = _package + "ZygoteExitingStub"
+
+
+def report_modules(connection: Connection) -> None:
+    connection.send((os.getppid(), _preloaded in sys.modules, _on_demand in sys.modules))
+
+
+def wait_for_eof(connection: Connection) -> None:
+    try:
+        connection.recv()
+    except EOFError:
+        pass
+
+
+class UnitTestWorkerZygote(unittest.TestCase):
+    def setUp(self) -> None:
+        self._zygote = WorkerZygote([_exiting, _preloaded, "not_an_existing_module"])
+        self.assertTrue(self._zygote.is_ready(10))
+
+    def tearDown(self) -> None:
+        self._zygote.stop()
+
+    def test_fork_preloaded(self):
+        forked = self._zygote.fork(report_modules)
+        self.assertIsNotNone(forked)
+        connection, child = forked
+        # importing a module exiting the interpreter did not stop the zygote
+        self.assertEqual((self._zygote.pid, True, False), connection.recv())
+        child.join()
+        self.assertFalse(child.is_alive())
+        self.assertEqual(1, child.exitcode)
+        connection.close()
+        self.assertNotIn(_preloaded, sys.modules)
+
+    def test_preload(self):
+        self._zygote.preload(importlib.import_module, _on_demand)
+        connection, child = self._zygote.fork(report_modules)
+        self.assertEqual((self._zygote.pid, True, True), connection.recv())
+        connection.close()
+        self.assertNotIn(_on_demand, sys.modules)
+
+    def test_kill(self):
+        connection, child = self._zygote.fork(wait_for_eof)
+        self.assertTrue(child.is_alive())
+        self.assertIsNone(child.exitcode)
+        child.kill()
+        child.join()
+        self.assertEqual(-9, child.exitcode)
+        self.assertRaises(EOFError, connection.recv)
+        connection.close()
+
+    def test_stopped(self):
+        self._zygote.stop()
+        self.assertFalse(self._zygote.is_alive())
+        self.assertIsNone(self._zygote.fork(report_modules))
+        self._zygote.preload(importlib.import_module, _on_demand)
+
+    def test_stuck(self):
+        timeout = WorkerZygote._fork_timeout
+        WorkerZygote._fork_timeout = 0.5
+        try:
+            self._zygote.preload(time.sleep, 60)
+            start = time.monotonic()
+            self.assertIsNone(self._zygote.fork(report_modules))
+            self.assertLess(time.monotonic() - start, 10)
+            self.assertFalse(self._zygote.is_alive())
+        finally:
+            WorkerZygote._fork_timeout = timeout
+
+    def test_pooled_worker(self):
+        worker = PooledWorker(zygote=self._zygote)
+        self.assertTrue(worker.submit(PoolTestSched()))
+        self.assertEqual(worker.pid % 100 + 1, worker.wait_for_result())
+        self.assertNotEqual(self._zygote.pid, worker.pid)
+        worker.kill()
+        self.assertEqual(-9, worker.wait_for_result())
+        # falls back to forking from this process once the zygote is gone
+        self._zygote.stop()
+        self.assertTrue(worker.submit(PoolTestSched()))
+        self.assertEqual(worker.pid % 100 + 1, worker.wait_for_result())
+        worker.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
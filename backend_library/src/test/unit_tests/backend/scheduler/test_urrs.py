@@ -1,16 +1,29 @@
 import multiprocessing
+import tempfile
+import threading
+import time
 import unittest
 from multiprocessing import Manager
+from unittest.mock import patch
 
+from backend.instrumentation.Instrumentation import Instrumentation
 from backend.scheduler.Scheduler import Scheduler
 from backend.scheduler.UserRoundRobinScheduler import UserRoundRobinScheduler
+from backend.scheduler.WorkerAgent import WorkerAgent
 from test.UrrsWoWorkers import UrrsWoWorkers
-from test.unit_tests.backend.scheduler.SchedulableForTesting import TestSched
+from test.unit_tests.backend.scheduler.SchedulableForTesting import TestSched, \
+    PoolTestSched, MemoryTestSched, ThreadLimitTestSched, RemoteTestSched, \
+    TimeoutTestSched
 
 timeout = 60
 manager = Manager()
 
 
+class ThreeWorkerUrrs(UserRoundRobinScheduler):
+    def _get_targeted_worker_count(self) -> int:
+        return 3
+
+
 class PriorityTests(unittest.TestCase):
     def setUp(self) -> None:
         Scheduler._instance = None
@@ -35,6 +48,20 @@ class PriorityTests(unittest.TestCase):
         self.assertEqual(b, sched.next_sched())
         self.assertIsNone(sched.next_sched())
 
+    def test_priority_aging(self):
+        # gains a priority of 1 for every 10 seconds waited
+        sched = UrrsWoWorkers(priority_aging=0.1)
+        with patch("time.monotonic", return_value=1000.0):
+            sched.schedule(TestSched(-1, 1, 0))
+        with patch("time.monotonic", return_value=1095.0):
+            sched.schedule(TestSched(-1, 2, 5))
+        with patch("time.monotonic", return_value=1100.0):
+            # task 1 waited for 100 seconds, so it has a priority of 10 by now
+            # and task 2 one of 5.5
+            sched.schedule(TestSched(-1, 3, 11))
+            sched.schedule(TestSched(-1, 4, 9))
+        self.assertEqual([3, 1, 4, 2], [sched.next_sched().task_id for _ in range(4)])
+
     def test_round_robin_scheduling(self):
         sched = UrrsWoWorkers()
 
@@ -44,6 +71,88 @@ class PriorityTests(unittest.TestCase):
         sched.schedule(TestSched(1, -1, 2))
         self.assertNotEqual(sched.next_sched().user_id, sched.next_sched().user_id)
 
+    def test_same_priority_in_order(self):
+        sched = UrrsWoWorkers()
+        scheds = [TestSched(0, i, 2) for i in range(5)]
+        for s in scheds:
+            sched.schedule(s)
+        self.assertEqual(scheds, [sched.next_sched() for _ in scheds])
+
+    def test_new_user_served_next(self):
+        sched = UrrsWoWorkers()
+        for uid in [0, 0, 1, 1]:
+            sched.schedule(TestSched(uid, -1, 2))
+        self.assertEqual(1, sched.next_sched().user_id)
+        sched.schedule(TestSched(2, -1, 2))
+        self.assertEqual([2, 0, 1, 0], [sched.next_sched().user_id for _ in range(4)])
+        # queues of users without waiting Schedulables are retired
+        self.assertEqual([], sched._get_waiting_users())
+
+    def test_abort_queued_by_task(self):
+        sched = UrrsWoWorkers()
+        aborted = []
+        scheds = [TestSched(uid, tid, prio, run_after=aborted.append)
+                  for uid, tid, prio in [(0, 1, 3), (0, 2, 2), (1, 1, 2), (0, 1, 1)]]
+        for s in scheds:
+            sched.schedule(s)
+        sched.abort_by_task(1)
+        self.assertEqual([None] * 3, aborted)
+        self.assertEqual([(0, scheds[1])], sched._get_waiting_users())
+        self.assertEqual(scheds[1], sched.next_sched())
+        self.assertIsNone(sched.next_sched())
+        sched.abort_by_task(1)
+        self.assertEqual(3, len(aborted))
+
+    def test_abort_queued_by_user(self):
+        sched = UrrsWoWorkers()
+        aborted = []
+        for uid, tid in [(0, 1), (1, 2), (0, 3)]:
+            sched.schedule(TestSched(uid, tid, 2, run_after=aborted.append))
+        sched.abort_by_task(3)
+        sched.abort_by_user(0)
+        self.assertEqual([None] * 2, aborted)
+        self.assertEqual(1, sched.next_sched().user_id)
+        self.assertIsNone(sched.next_sched())
+        # the task index no longer refers to the Schedulables of user 0
+        sched.abort_by_task(1)
+        self.assertEqual(2, len(aborted))
+
+    def test_abort_many_queued(self):
+        sched = UrrsWoWorkers()
+        for i in range(50000):
+            sched.schedule(TestSched(0, 1, i % 50))
+        sched.schedule(TestSched(0, 2, 0))
+        start = time.monotonic()
+        sched.abort_by_task(2)
+        self.assertLess(time.monotonic() - start, 0.1)
+        sched.abort_by_task(1)
+        self.assertIsNone(sched.next_sched())
+
+    def test_metrics(self):
+        sched = UrrsWoWorkers()
+        aborts = Instrumentation.counter("sop_scheduler_aborts_total", "")
+        waits = Instrumentation.histogram("sop_scheduler_wait_seconds", "")
+        aborted = aborts.get(schedulable="TestSched")
+        waited = waits.get_count(schedulable="TestSched")
+        for tid in [1, 1, 2]:
+            sched.schedule(TestSched(7, tid))
+        sched.schedule(TestSched(8, 3))
+        metrics = sched.render_metrics()
+        self.assertIn("sop_scheduler_queue_depth{user=\"7\"} 3.0", metrics)
+        self.assertIn("sop_scheduler_queue_depth{user=\"8\"} 1.0", metrics)
+        self.assertIn("sop_scheduler_running_workers 0", metrics)
+        sched.abort_by_task(1)
+        self.assertEqual(aborted + 2, aborts.get(schedulable="TestSched"))
+        self.assertIn("sop_scheduler_queue_depth{user=\"7\"} 1.0",
+                      sched.render_metrics())
+        sched.next_sched()
+        self.assertEqual(waited + 1, waits.get_count(schedulable="TestSched"))
+        metrics = sched.render_metrics()
+        self.assertIn("sop_scheduler_oldest_wait_seconds{user=\"7\"}", metrics)
+        self.assertNotIn("sop_scheduler_oldest_wait_seconds{user=\"8\"}", metrics)
+        self.assertIn("sop_scheduler_wait_seconds_quantile{quantile=\"0.99\","
+                      "schedulable=\"TestSched\"}", metrics)
+
     def tearDown(self) -> None:
         Scheduler.get_instance().hard_shutdown()
         Scheduler._instance = None
@@ -132,6 +241,51 @@ class UnitTestUrrs(unittest.TestCase):
         self.assertTrue(ts_shut.wait(timeout))
         self.assertFalse(tbc.value)
 
+    def test_worker_count(self):
+        urrs = UserRoundRobinScheduler(worker_count=3)
+        self.assertEqual(3, len(urrs._UserRoundRobinScheduler__threads))
+
+    def test_worker_threads(self):
+        urrs = UserRoundRobinScheduler(worker_threads=2, pin_workers=True)
+        results = manager.list()
+        done = multiprocessing.Semaphore(0)
+
+        def run_after(status):
+            results.append(status)
+            done.release()
+        urrs.schedule(ThreadLimitTestSched(run_after=run_after))
+        urrs.schedule(ThreadLimitTestSched(prio=100, run_after=run_after))
+        for _ in range(2):
+            self.assertTrue(done.acquire(timeout=timeout))
+        self.assertEqual([2, 2], list(results))
+
+    def test_timeout(self):
+        urrs = UserRoundRobinScheduler(worker_count=1)
+        results = manager.list()
+        done = multiprocessing.Semaphore(0)
+
+        def run_after(status):
+            results.append(status)
+            done.release()
+        urrs.schedule(TimeoutTestSched(0.5, sleep=60, run_after=run_after))
+        # the worker is freed for the next Schedulable
+        urrs.schedule(PoolTestSched(run_after=run_after))
+        for _ in range(2):
+            self.assertTrue(done.acquire(timeout=timeout))
+        self.assertEqual(7, results[0])
+        self.assertNotIn(results[1], (None, 0, 7))
+        self.assertEqual(1, Instrumentation.counter(
+            "sop_scheduler_timeouts_total", "").get(schedulable="TimeoutTestSched"))
+
+    def test_timeout_expired_before_start(self):
+        urrs = UserRoundRobinScheduler()
+        finished = multiprocessing.Event()
+        start = time.monotonic()
+        urrs.schedule(TimeoutTestSched(0, sleep=60, run_after=lambda s: finished.set()
+                                       if s == 7 else None))
+        self.assertTrue(finished.wait(timeout))
+        self.assertLess(time.monotonic() - start, 30)
+
     def test_shutdown_before_schedule(self):
         # Tests race condition handling in the 3rd to 5th line of URRS._run_schedulable
         urrs = UserRoundRobinScheduler()
@@ -142,5 +296,255 @@ class UnitTestUrrs(unittest.TestCase):
         self.assertFalse(tbc.value)
 
 
+class UnitTestUrrsWorkerPool(unittest.TestCase):
+    def setUp(self) -> None:
+        Scheduler._instance = None
+
+    def tearDown(self) -> None:
+        Scheduler.get_instance().hard_shutdown()
+        Scheduler._instance = None
+
+    def test_pooled_exec(self):
+        urrs = UserRoundRobinScheduler(True)
+        results = manager.list()
+        done = multiprocessing.Semaphore(0)
+
+        def run_after(status):
+            results.append(status)
+            done.release()
+        for _ in range(3):
+            urrs.schedule(PoolTestSched(run_after=run_after))
+        for _ in range(3):
+            self.assertTrue(done.acquire(timeout=timeout))
+        for status in results:
+            self.assertIsNotNone(status)
+            self.assertNotEqual(0, status)
+
+    def test_pooled_abort(self):
+        urrs = UserRoundRobinScheduler(True, 1)
+        aborted = multiprocessing.Event()
+        urrs.schedule(PoolTestSched(1, 1, 0, 60,
+                                    lambda s: aborted.set() if s is None else None))
+        time.sleep(1)
+        urrs.abort_by_task(1)
+        self.assertTrue(aborted.wait(timeout))
+        finished = multiprocessing.Event()
+        urrs.schedule(PoolTestSched(1, 2, 0, 0,
+                                    lambda s: finished.set() if s else None))
+        self.assertTrue(finished.wait(timeout))
+
+    def test_pooled_worker_threads(self):
+        urrs = UserRoundRobinScheduler(True, worker_threads=3)
+        finished = multiprocessing.Event()
+        urrs.schedule(ThreadLimitTestSched(
+            run_after=lambda s: finished.set() if s == 3 else None))
+        self.assertTrue(finished.wait(timeout))
+
+    def test_pooled_timeout(self):
+        urrs = UserRoundRobinScheduler(True, worker_count=1)
+        results = manager.dict()
+        done = multiprocessing.Semaphore(0)
+
+        def run_after(key):
+            def store_result(status):
+                results[key] = status
+                done.release()
+            return store_result
+        # the order in which both run does not matter
+        urrs.schedule(TimeoutTestSched(2, sleep=60, run_after=run_after("timeout")))
+        urrs.schedule(PoolTestSched(run_after=run_after("pool")))
+        for _ in range(2):
+            self.assertTrue(done.acquire(timeout=timeout))
+        self.assertEqual(7, results["timeout"])
+        # the other Schedulable still ran, in a (possibly replaced) worker process
+        self.assertNotIn(results["pool"], (None, 0, 7))
+
+    def test_zygote_exec(self):
+        urrs = UserRoundRobinScheduler(True, 2, True, ["colorsys"])
+        finished = multiprocessing.Semaphore(0)
+        for _ in range(3):
+            urrs.schedule(PoolTestSched(
+                run_after=lambda s: finished.release() if s else None))
+        for _ in range(3):
+            self.assertTrue(finished.acquire(timeout=timeout))
+
+    def test_pooled_graceful_shutdown(self):
+        urrs = UserRoundRobinScheduler(True)
+        finished = multiprocessing.Event()
+        shut_down = multiprocessing.Event()
+        urrs.schedule(PoolTestSched(sleep=1,
+                                    run_after=lambda s: finished.set() if s else None))
+        time.sleep(0.5)
+        urrs.graceful_shutdown(lambda: shut_down.set())
+        self.assertTrue(finished.wait(timeout))
+        self.assertTrue(shut_down.wait(timeout))
+
+    def test_memory_limit(self):
+        urrs = ThreeWorkerUrrs(memory_limit=100)
+        started = [multiprocessing.Event() for _ in range(3)]
+        wait_for_main = multiprocessing.Lock()
+        with wait_for_main:
+            urrs.schedule(MemoryTestSched(60, 0, -1, 0, set_before=started[0],
+                                          wait_for=wait_for_main))
+            self.assertTrue(started[0].wait(timeout))
+            # does not fit next to the first one, but does not block other users
+            urrs.schedule(MemoryTestSched(60, 1, -1, 0, set_before=started[1]))
+            urrs.schedule(MemoryTestSched(40, 2, -1, 0, set_before=started[2],
+                                          wait_for=wait_for_main))
+            self.assertTrue(started[2].wait(timeout))
+            self.assertFalse(started[1].wait(0.5))
+        self.assertTrue(started[1].wait(timeout))
+
+    def test_memory_limit_exceeded(self):
+        urrs = UserRoundRobinScheduler(memory_limit=100)
+        finished = multiprocessing.Event()
+        # runs on its own even though it is estimated to exceed the limit
+        urrs.schedule(MemoryTestSched(200, set_last=finished))
+        self.assertTrue(finished.wait(timeout))
+
+
+class UnitTestUrrsEventLoop(unittest.TestCase):
+    def setUp(self) -> None:
+        Scheduler._instance = None
+
+    def tearDown(self) -> None:
+        Scheduler.get_instance().hard_shutdown()
+        Scheduler._instance = None
+
+    def test_event_loop_exec(self):
+        urrs = UserRoundRobinScheduler(worker_count=64, event_loop=True)
+        # a single thread supervises all worker processes
+        self.assertEqual(1, len(urrs._UserRoundRobinScheduler__threads))
+        done = multiprocessing.Semaphore(0)
+        for uid in range(200):
+            urrs.schedule(PoolTestSched(uid % 5, sleep=0.1,
+                                        run_after=lambda s: done.release() if s
+                                        else None))
+        for _ in range(200):
+            self.assertTrue(done.acquire(timeout=timeout))
+
+    def test_event_loop_abort_by_task(self):
+        urrs = UserRoundRobinScheduler(event_loop=True)
+        ts = multiprocessing.Event()
+        tbc = manager.Value('b', False)
+        wait_for_sub = multiprocessing.Event()
+        wait_for_main = multiprocessing.Lock()
+        with wait_for_main:
+            urrs.schedule(TestSched(-1, 0, 0, None, ts, wait_for_sub, wait_for_main))
+            urrs.schedule(TestSched(-1, 1, 0, tbc, None, wait_for_sub, wait_for_main))
+            wait_for_sub.wait(timeout)
+            urrs.abort_by_task(1)
+        self.assertTrue(ts.wait(timeout))
+        self.assertFalse(tbc.value)
+
+    def test_event_loop_abort_while_exec(self):
+        urrs = UserRoundRobinScheduler(event_loop=True)
+        aborted = multiprocessing.Event()
+        urrs.schedule(PoolTestSched(1, 1, 0, 60,
+                                    lambda s: aborted.set() if s is None else None))
+        time.sleep(0.5)
+        urrs.abort_by_task(1)
+        self.assertTrue(aborted.wait(timeout))
+
+    def test_event_loop_priority(self):
+        urrs = UserRoundRobinScheduler(worker_count=1, event_loop=True)
+        finished = multiprocessing.Event()
+        wait_for_main = multiprocessing.Lock()
+        with wait_for_main:
+            urrs.schedule(TestSched(wait_for=wait_for_main))
+            # runs even though the only slot is occupied
+            urrs.schedule(TestSched(prio=100, set_last=finished))
+            self.assertTrue(finished.wait(timeout))
+
+    def test_event_loop_timeout(self):
+        urrs = UserRoundRobinScheduler(worker_count=1, event_loop=True)
+        results = manager.list()
+        done = multiprocessing.Semaphore(0)
+
+        def run_after(status):
+            results.append(status)
+            done.release()
+        urrs.schedule(TimeoutTestSched(0.5, sleep=60, run_after=run_after))
+        urrs.schedule(TimeoutTestSched(0, sleep=60, run_after=run_after))
+        urrs.schedule(PoolTestSched(run_after=run_after))
+        for _ in range(3):
+            self.assertTrue(done.acquire(timeout=timeout))
+        self.assertEqual([7, 7], list(results[:2]))
+        self.assertNotIn(results[2], (None, 0))
+
+    def test_event_loop_graceful_shutdown(self):
+        urrs = UserRoundRobinScheduler(event_loop=True)
+        finished = multiprocessing.Event()
+        shut_down = multiprocessing.Event()
+        urrs.schedule(PoolTestSched(sleep=1,
+                                    run_after=lambda s: finished.set() if s else None))
+        time.sleep(0.5)
+        urrs.graceful_shutdown(lambda: shut_down.set())
+        self.assertTrue(finished.wait(timeout))
+        self.assertTrue(shut_down.wait(timeout))
+
+
+class UnitTestUrrsRemoteWorkers(unittest.TestCase):
+    def setUp(self) -> None:
+        Scheduler._instance = None
+        self._dir = tempfile.TemporaryDirectory()
+        # runs remote compatible Schedulables on the agents only
+        self._urrs = UrrsWoWorkers(remote_worker_address=("127.0.0.1", 0),
+                                   remote_worker_authkey=b"urrs test")
+        self._agent = WorkerAgent(self._urrs.remote_worker_address, b"urrs test",
+                                  self._dir.name, 2)
+        self._thread = threading.Thread(target=self._agent.serve_forever)
+        self._thread.start()
+
+    def tearDown(self) -> None:
+        Scheduler.get_instance().hard_shutdown()
+        Scheduler._instance = None
+        self._agent.stop()
+        self._thread.join(timeout)
+        self._dir.cleanup()
+
+    def test_remote_exec(self):
+        results = manager.list()
+        done = multiprocessing.Semaphore(0)
+
+        def run_after(status):
+            results.append(status)
+            done.release()
+        for uid in range(3):
+            self._urrs.schedule(RemoteTestSched(uid, run_after=run_after))
+        local = TestSched(5)
+        self._urrs.schedule(local)
+        for _ in range(3):
+            self.assertTrue(done.acquire(timeout=timeout))
+        self.assertEqual([2, 2, 2], list(results))
+        # the agents do not run Schedulables that are not remote compatible
+        self.assertIs(local, self._urrs.next_sched())
+
+    def test_fallback(self):
+        finished = multiprocessing.Event()
+        self._urrs.schedule(RemoteTestSched(
+            disconnect=True, run_after=lambda s: finished.set() if s == 3 else None))
+        self.assertTrue(finished.wait(timeout))
+
+    def test_abort(self):
+        aborted = multiprocessing.Event()
+        started = multiprocessing.Event()
+        self._urrs.schedule(RemoteTestSched(
+            1, 1, sleep=60, run_before=started.set,
+            run_after=lambda s: aborted.set() if s is None else None))
+        self.assertTrue(started.wait(timeout))
+        time.sleep(0.5)
+        self._urrs.abort_by_task(1)
+        self.assertTrue(aborted.wait(timeout))
+
+    def test_timeout(self):
+        finished = multiprocessing.Event()
+        # neither run on the agent, nor locally after the agent was disconnected
+        self._urrs.schedule(RemoteTestSched(
+            1, 1, sleep=60, time_limit=0.5,
+            run_after=lambda s: finished.set() if s == 7 else None))
+        self.assertTrue(finished.wait(timeout))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+from multiprocessing.shared_memory import SharedMemory
+
+from backend.task.execution.core.DatasetShmCache import CachedDataset, \
+    DatasetShmCache
+
+
+class UnitTestDatasetShmCache(unittest.TestCase):
+    def setUp(self) -> None:
+        DatasetShmCache.set_memory_limit(0)
+        entry = DatasetShmCache.acquire(None, 2, 3)
+        DatasetShmCache.release(entry.dataset_shm.name)
+        self._size: int = entry.size
+
+    def tearDown(self) -> None:
+        DatasetShmCache.set_memory_limit(0)
+        # other tests may leave datasets of their own
+        for key in "abcde":
+            self.assertNotIn(key, DatasetShmCache._by_key)
+        self.assertEqual(0, DatasetShmCache._idle_size)
+
+    def __assert_unlinked(self, entry: CachedDataset) -> None:
+        self.assertRaises(FileNotFoundError, SharedMemory, entry.dataset_shm.name)
+        self.assertRaises(FileNotFoundError, SharedMemory, entry.rownrs_shm.name)
+
+    def test_share(self):
+        entry = DatasetShmCache.acquire("a", 2, 3)
+        self.assertFalse(entry.filled)
+        self.assertIs(entry, DatasetShmCache.acquire("a", 2, 3))
+        unshared = DatasetShmCache.acquire(None, 2, 3)
+        self.assertIsNot(entry, unshared)
+        DatasetShmCache.release(unshared.dataset_shm.name)
+        self.assertFalse(DatasetShmCache.is_filled("a"))
+        DatasetShmCache.mark_filled(entry.dataset_shm.name)
+        self.assertTrue(DatasetShmCache.is_filled("a"))
+        self.assertFalse(DatasetShmCache.is_filled("b"))
+        self.assertFalse(DatasetShmCache.is_filled(None))
+        self.assertTrue(DatasetShmCache.acquire("a", 2, 3).filled)
+        for _ in range(3):
+            DatasetShmCache.release(entry.dataset_shm.name)
+        # not kept without a memory limit
+        self.__assert_unlinked(entry)
+        self.assertFalse(DatasetShmCache.is_filled("a"))
+
+    def test_unfilled_not_kept(self):
+        DatasetShmCache.set_memory_limit(10 * self._size)
+        entry = DatasetShmCache.acquire("a", 2, 3)
+        DatasetShmCache.release(entry.dataset_shm.name)
+        self.__assert_unlinked(entry)
+        other = DatasetShmCache.acquire("a", 2, 3)
+        self.assertIsNot(entry, other)
+        DatasetShmCache.release(other.dataset_shm.name)
+
+    def test_lru_eviction(self):
+        DatasetShmCache.set_memory_limit(2 * self._size)
+        entries = dict()
+        for key in "abc":
+            entries[key] = DatasetShmCache.acquire(key, 2, 3)
+            DatasetShmCache.mark_filled(entries[key].dataset_shm.name)
+        for key in "abc":
+            DatasetShmCache.release(entries[key].dataset_shm.name)
+        # a was used least recently
+        self.__assert_unlinked(entries["a"])
+        self.assertEqual(2 * self._size, DatasetShmCache._idle_size)
+
+        # used entries are not evicted
+        self.assertIs(entries["b"], DatasetShmCache.acquire("b", 2, 3))
+        for key in "de":
+            entries[key] = DatasetShmCache.acquire(key, 2, 3)
+            DatasetShmCache.mark_filled(entries[key].dataset_shm.name)
+            DatasetShmCache.release(entries[key].dataset_shm.name)
+        self.__assert_unlinked(entries["c"])
+        self.assertTrue(DatasetShmCache.is_filled("b"))
+        DatasetShmCache.release(entries["b"].dataset_shm.name)
+        self.__assert_unlinked(entries["d"])
+        self.assertEqual(["e", "b"], [DatasetShmCache._entries[name].key
+                                      for name in DatasetShmCache._idle])
+
+        DatasetShmCache.set_memory_limit(self._size)
+        self.__assert_unlinked(entries["e"])
+        self.assertTrue(DatasetShmCache.is_filled("b"))
+        DatasetShmCache.clear()
+        self.__assert_unlinked(entries["b"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,21 +1,32 @@
 import os.path
 import shutil
+import tempfile
+import threading
+import time
 import unittest
-from unittest.mock import Mock
+from typing import Optional
+from multiprocessing.shared_memory import SharedMemory
+from unittest.mock import Mock, patch
 
 import numpy as np
 
 from backend.DataIO import DataIO
+from backend.metric.MetricAggregator import MetricAggregator
+from backend.scheduler.DebugScheduler import DebugScheduler
 from backend.scheduler.Scheduler import Scheduler
 from backend.task.TaskHelper import TaskHelper
 from backend.task.TaskState import TaskState
 from backend.task.execution.ParameterizedAlgorithm import ParameterizedAlgorithm
+from backend.task.execution.ResultStore import ResultStore
+from backend.task.execution.core.DatasetShmCache import DatasetShmCache
 from backend.task.execution.core.Execution import Execution as ex
+from backend.task.execution.core.SharedResultMatrix import SharedResultMatrix
 from backend.task.execution.subspace.RandomizedSubspaceGeneration import \
     RandomizedSubspaceGeneration as rsg
 from backend.task.execution.subspace.Subspace import Subspace
 from backend.task.execution.subspace.UniformSubspaceDistribution import \
     UniformSubspaceDistribution as usd
+from test.DebugScheduler2 import DebugScheduler2
 
 
 class UnitTestExecution(unittest.TestCase):
@@ -208,6 +219,9 @@ class UnitTestExecution(unittest.TestCase):
 
     def test_on_execution_element_finished_finished_elements_logic(self):
         self._ex._Execution__schedule_result_zipping = Mock(return_value=None)
+        # runs the MetricComputation right away
+        Scheduler._instance = None
+        DebugScheduler()
 
         self.assertFalse(self._ex._metric_finished)
 
@@ -229,6 +243,32 @@ class UnitTestExecution(unittest.TestCase):
         # (but here we are applying it)
         self.assertTrue(self._ex._has_failed_element)
 
+    def test_metric_computation(self):
+        Scheduler._instance = None
+        scheduler = DebugScheduler2()
+        self._ex._Execution__schedule_result_zipping = Mock(return_value=None)
+        progress: list[tuple[TaskState, float]] = list()
+        self._ex._task_progress_callback = lambda t, state, p: progress.append((state, p))
+
+        # the metrics are computed by a MetricComputation scheduled afterwards
+        for _ in range(self._ex._total_execution_element_count):
+            self._ex._Execution__on_execution_element_finished(False)
+        self.assertEqual(1, scheduler.called_scheduler_amount)
+        self.assertFalse(self._ex._metric_finished)
+        self._ex._Execution__schedule_result_zipping.assert_not_called()
+
+        # a failed MetricComputation is an error of the Execution, but it is zipped
+        self._ex._Execution__on_metric_computation_finished(1)
+        self.assertTrue(self._ex._metric_finished)
+        self.assertEqual((TaskState.RUNNING_WITH_ERROR, 0.99), progress[-1])
+        self._ex._Execution__schedule_result_zipping.assert_called_once()
+
+    def test_metric_computation_aborted(self):
+        self._ex._Execution__schedule_result_zipping = Mock(return_value=None)
+        self._ex._Execution__on_metric_computation_finished(None)
+        self.assertFalse(self._ex._metric_finished)
+        self._ex._Execution__schedule_result_zipping.assert_not_called()
+
     def test_schedule_already_finished(self):
         Scheduler._instance = None
         Scheduler.default_scheduler = None
@@ -255,6 +295,261 @@ class UnitTestExecution(unittest.TestCase):
                    self.__metric_callback,
                    self._datapoint_count, self._final_zip_path, wrong_priority)
 
+    def test_memory_estimate(self):
+        # the dataset does not exist
+        self.assertEqual(0, self._ex.memory_estimate)
+        DataIO.write_csv(self._dataset_path, np.asarray([["1.5", "2.5"]]))
+        try:
+            self.assertEqual(2 * os.path.getsize(self._dataset_path),
+                             self._ex.memory_estimate)
+        finally:
+            os.remove(self._dataset_path)
+
+    def test_getstate(self):
+        # the lock can not be pickled, a copy in another process creates its own
+        state = self._ex.__getstate__()
+        self.assertNotIn("_execution_element_finished_lock", state)
+        copy = ex.__new__(ex)
+        copy.__setstate__(state)
+        self.assertEqual(self._ex.task_id, copy.task_id)
+        self.assertIsNot(self._ex._execution_element_finished_lock,
+                         copy._execution_element_finished_lock)
+        self.assertTrue(copy._execution_element_finished_lock.acquire(False))
+
+
+class UnitTestExecutionDatasetCache(unittest.TestCase):
+    def setUp(self) -> None:
+        Scheduler._instance = None
+        DebugScheduler2()
+        self._dir = tempfile.TemporaryDirectory()
+        self._dataset_path = os.path.join(self._dir.name, "dataset.csv")
+        with open(self._dataset_path, "w") as f:
+            f.write(",0,1,2\n0,1.5,2,3\n3,4,5,6.5\n")
+        DatasetShmCache.set_memory_limit(1 << 20)
+
+    def tearDown(self) -> None:
+        DatasetShmCache.set_memory_limit(0)
+        self._dir.cleanup()
+        Scheduler._instance = None
+
+    def __create_execution(self, task_id: int, datapoint_count: Optional[int] = 2,
+                           shared_result_limit: int = 0,
+                           metric_aggregators: Optional[list[MetricAggregator]] = None) \
+            -> ex:
+        return ex(1, task_id, lambda t, s, p: None, self._dataset_path,
+                  os.path.join(self._dir.name, f"execution{task_id}"),
+                  rsg(usd(1, 2), 3, 2, 0),
+                  [ParameterizedAlgorithm("path", {}, "display_name")],
+                  lambda e: None, datapoint_count,
+                  shared_result_limit=shared_result_limit,
+                  metric_aggregators=metric_aggregators)
+
+    def test_share_dataset(self):
+        first = self.__create_execution(1)
+        first.run_before_on_main()
+        self.assertFalse(first._execution_shms.dataset_loaded)
+        first.do_work()
+        first.run_later_on_main(0)
+        self.assertTrue(first._execution_shms.dataset_loaded)
+
+        # the second execution neither needs memory nor loads the dataset again
+        second = self.__create_execution(2)
+        self.assertEqual(0, second.memory_estimate)
+        second.run_before_on_main()
+        self.assertTrue(second._execution_shms.dataset_loaded)
+        self.assertEqual(first._execution_shms.shared_memory_name,
+                         second._execution_shms.shared_memory_name)
+        with patch.object(DataIO, "read_annotated") as read_annotated:
+            second.do_work()
+        read_annotated.assert_not_called()
+        second.run_later_on_main(0)
+        np.testing.assert_array_equal([[1.5, 2, 3], [4, 5, 6.5]],
+                                      second._execution_shms.dataset_on_main)
+        np.testing.assert_array_equal([0, 3], second._row_numbers)
+
+        # the dataset is kept after both executions finished
+        first._execution_shms.unload_dataset()
+        second._execution_shms.unload_dataset()
+        third = self.__create_execution(3)
+        third.run_before_on_main()
+        self.assertTrue(third._execution_shms.dataset_loaded)
+        third._execution_shms.unload_dataset()
+
+        # but not after the dataset changed
+        os.utime(self._dataset_path, ns=(0, 0))
+        self.assertNotEqual(0, third.memory_estimate)
+
+    def test_load_binary_dataset(self):
+        # the binary copy is used instead of the csv-file, so it differs here
+        dataset = DataIO.read_annotated(self._dataset_path, True)
+        dataset.data = dataset.data * 2
+        DataIO.write_binary(DataIO.get_binary_path(self._dataset_path), dataset)
+        execution = self.__create_execution(1, None)
+        with patch.object(DataIO, "read_annotated") as read_annotated:
+            execution.run_before_on_main()
+            execution.do_work()
+        read_annotated.assert_not_called()
+        execution.run_later_on_main(0)
+        np.testing.assert_array_equal([[3, 4, 6], [8, 10, 13]],
+                                      execution._execution_shms.dataset_on_main)
+        np.testing.assert_array_equal([0, 3], execution._row_numbers)
+        execution._execution_shms.unload_dataset(True)
+
+    def test_result_stores(self):
+        execution = self.__create_execution(1)
+        execution.run_before_on_main()
+        execution.do_work()
+        execution.run_later_on_main(0)
+        stores = [ResultStore(path) for path in execution.algorithm_directory_paths]
+        self.assertTrue(all(store.exists for store in stores))
+        self.assertEqual([s.get_subspace_identifier() for s in execution.subspaces],
+                         stores[0].get_subspace_identifiers())
+        np.testing.assert_array_equal([0, 3], np.load(
+            ResultStore.get_row_numbers_path(execution.result_path)))
+        self.assertEqual(list(range(len(execution.subspaces))),
+                         [execution_subspace._subspace_index for execution_subspace
+                          in execution._execution_subspaces])
+        execution._execution_shms.unload_dataset(True)
+
+    def test_shared_results(self):
+        execution = self.__create_execution(1, shared_result_limit=1 << 20)
+        execution.run_before_on_main()
+        execution.do_work()
+        execution.run_later_on_main(0)
+        shared_results = execution._shared_results
+        self.assertIs(shared_results, execution._execution_subspaces[1]
+                      ._shared_results)
+        shared_results.write(0, 1, np.array([0.5, 2]))
+        store = ResultStore(execution.algorithm_directory_paths[0])
+
+        # the results are stored once all ExecutionElements finished
+        execution._Execution__schedule_result_zipping = Mock(return_value=None)
+        for _ in range(execution._total_execution_element_count - 1):
+            execution._Execution__on_execution_element_finished(False)
+        self.assertFalse(store.is_finished(1))
+        execution._Execution__on_execution_element_finished(False)
+        self.assertFalse(store.is_finished(0))
+        self.assertTrue(store.is_finished(1))
+        self.assertIsNone(execution._shared_results)
+        self.assertRaises(FileNotFoundError, SharedMemory, shared_results.name)
+
+    def test_shared_results_exceeding_limit(self):
+        execution = self.__create_execution(1, shared_result_limit=16)
+        execution.run_before_on_main()
+        self.assertIsNone(execution._shared_results)
+        execution._execution_shms.unload_dataset(True)
+
+    def test_shared_results_limit_of_all_executions(self):
+        size = SharedResultMatrix.get_size(1, 3, 2)
+        limit = SharedResultMatrix.get_total_size() + size
+        first = self.__create_execution(1, shared_result_limit=limit)
+        first.run_before_on_main()
+        self.assertIsNotNone(first._shared_results)
+        # the matrix of the first execution is kept until all its results are stored
+        second = self.__create_execution(2, shared_result_limit=limit)
+        second.run_before_on_main()
+        self.assertIsNone(second._shared_results)
+
+        first._Execution__unload_shared_results()
+        third = self.__create_execution(3, shared_result_limit=limit)
+        third.run_before_on_main()
+        self.assertIsNotNone(third._shared_results)
+        third._Execution__unload_shared_results()
+        for execution in [first, second, third]:
+            execution._execution_shms.unload_dataset(True)
+
+    def test_schedule_result_zipping(self):
+        execution = ex(1, 1, lambda t, s, p: None, self._dataset_path,
+                       os.path.join(self._dir.name, "execution1"),
+                       rsg(usd(1, 2), 3, 2, 0),
+                       [ParameterizedAlgorithm("path", {}, "display_name")],
+                       lambda e: None, 2, zip_compression_level=0, zip_threads=3)
+        scheduler = Mock()
+        with patch.object(Scheduler, "get_instance", return_value=scheduler):
+            execution._Execution__schedule_result_zipping()
+        result_zipper = scheduler.schedule.call_args.args[0]
+        self.assertEqual(0, result_zipper._compression_level)
+        self.assertEqual(3, result_zipper._threads)
+
+    def test_metric_aggregators(self):
+        metric_aggregator = Mock(spec=MetricAggregator)
+        execution = self.__create_execution(1, shared_result_limit=1 << 20,
+                                            metric_aggregators=[metric_aggregator])
+        self.assertEqual([metric_aggregator], execution.metric_aggregators)
+        execution.run_before_on_main()
+        execution.do_work()
+        execution.run_later_on_main(0)
+        metric_aggregator.start.assert_called_once_with([0, 3])
+        self.assertIsNotNone(execution._execution_subspaces[0]._on_result_callback)
+
+        # the results are added as their ExecutionElements finish,
+        # whether they are in the shared memory or in the ResultStore already
+        execution._shared_results.write(0, 1, np.array([0.5, 2]))
+        execution._Execution__on_execution_element_result(0, 1)
+        ResultStore(execution.algorithm_directory_paths[0]).write(
+            0, np.array([1.5, 3]))
+        execution._Execution__on_execution_element_result(0, 0)
+        results = [call.args for call in metric_aggregator.add_result.call_args_list]
+        self.assertEqual([execution.subspaces[1].get_subspace_identifier(),
+                          execution.subspaces[0].get_subspace_identifier()],
+                         [identifier for identifier, _ in results])
+        np.testing.assert_array_equal([0.5, 2], results[0][1])
+        np.testing.assert_array_equal([1.5, 3], results[1][1])
+
+        execution._execution_shms.unload_dataset(True)
+        execution._Execution__on_execution_element_finished(False, True)
+
+    def test_metric_aggregators_concurrently(self):
+        running: list[str] = []
+        added: list[str] = []
+
+        class SlowAggregator(MetricAggregator):
+            """Records results added while another one is added"""
+            def start(self, indices_mapping: list[int]) -> None:
+                pass
+
+            def add_result(self, subspace_identifier: str, scores: np.ndarray) -> None:
+                running.append(subspace_identifier)
+                time.sleep(0.001)
+                added.append(subspace_identifier if len(running) == 1 else "")
+                running.remove(subspace_identifier)
+
+            def write_result(self, metric_result_path: str) -> None:
+                pass
+
+        execution = self.__create_execution(1, shared_result_limit=1 << 20,
+                                            metric_aggregators=[SlowAggregator()])
+        execution.run_before_on_main()
+        execution.do_work()
+        execution.run_later_on_main(0)
+        execution._shared_results.write(0, 1, np.array([0.5, 2]))
+
+        # the ExecutionElements finish on the threads of the scheduler
+        threads = [threading.Thread(target=lambda: [
+            execution._Execution__on_execution_element_result(0, 1)
+            for _ in range(25)]) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(100 * [execution.subspaces[1].get_subspace_identifier()],
+                         added)
+
+        execution._execution_shms.unload_dataset(True)
+        execution._Execution__on_execution_element_finished(False, True)
+
+    def test_load_broken_binary_dataset(self):
+        with open(DataIO.get_binary_path(self._dataset_path), "wb") as f:
+            f.write(b"broken")
+        execution = self.__create_execution(1, None)
+        execution.run_before_on_main()
+        with self.assertLogs(level="WARNING"):
+            execution.do_work()
+        execution.run_later_on_main(0)
+        np.testing.assert_array_equal([[1.5, 2, 3], [4, 5, 6.5]],
+                                      execution._execution_shms.dataset_on_main)
+        execution._execution_shms.unload_dataset(True)
+
 
 if __name__ == '__main__':
     unittest.main()
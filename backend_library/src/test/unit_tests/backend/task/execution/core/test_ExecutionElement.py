@@ -1,13 +1,21 @@
 import os
+import queue
+import tempfile
+import threading
+import time
 import unittest
 import numpy as np
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from backend.task.TaskHelper import TaskHelper
 from backend.task.execution.core.ExecutionElement import ExecutionElement as ee
 from backend.task.execution.subspace.Subspace import Subspace
 from backend.task.execution.ParameterizedAlgorithm import ParameterizedAlgorithm
+from backend.task.execution.ResultStore import ResultStore
+from backend.task.execution.core.SharedResultMatrix import SharedResultMatrix
 from backend.DataIO import DataIO
+from backend.scheduler.RemoteWorker import RemoteWorkerServer
+from backend.scheduler.WorkerAgent import WorkerAgent
 from multiprocessing.shared_memory import SharedMemory
 
 
@@ -86,6 +94,8 @@ class UnitTestExecutionElement(unittest.TestCase):
         self.assertEqual(self._ee.user_id, self._user_id)
         self.assertEqual(self._ee.task_id, self._task_id)
         self.assertEqual(self._ee.priority, self._priority)
+        # one datapoint with three float64 values, times the algorithm memory factor
+        self.assertEqual(4 * 3 * 8, self._ee.memory_estimate)
 
     def test_finished_result_exists(self):
         self.assertFalse(self._ee.finished_result_exists())
@@ -180,6 +190,242 @@ class UnitTestExecutionElement(unittest.TestCase):
                    self.__execution_element_is_finished1, 1, self._row_numbers,
                    wrong_priority)
 
+    def test_timeout(self):
+        self.assertIsNone(self._ee.timeout)
+        timed: ee = ee(self._user_id, self._task_id, self._subspace, self._algorithm,
+                       self._result_path, self._subspace_dtype,
+                       self._subspace_shared_memory_name,
+                       self.__execution_element_is_finished1, self._datapoint_count,
+                       self._row_numbers, timeout=60)
+        self.assertEqual(60, timed.timeout)
+
+        # the deadline of the execution limits the timeout of the algorithm
+        limited: ee = ee(self._user_id, self._task_id, self._subspace,
+                         self._algorithm, self._result_path, self._subspace_dtype,
+                         self._subspace_shared_memory_name,
+                         self.__execution_element_is_finished1,
+                         self._datapoint_count, self._row_numbers, timeout=60,
+                         deadline=time.time() + 10)
+        self.assertLessEqual(limited.timeout, 10)
+        self.assertGreater(limited.timeout, 0)
+
+    def test_on_timeout(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            result_path: str = os.path.join(tmp_dir, "result.csv")
+            timed: ee = ee(self._user_id, self._task_id, self._subspace,
+                           self._algorithm, result_path, self._subspace_dtype,
+                           self._subspace_shared_memory_name,
+                           self.__execution_element_is_finished1,
+                           self._datapoint_count, self._row_numbers, timeout=1.5)
+            with self.assertLogs(level="WARNING"):
+                self.assertEqual(-1, timed.on_timeout())
+            np.testing.assert_array_equal(
+                DataIO.read_uncleaned_csv(
+                    TaskHelper.convert_to_error_csv_path(result_path), None),
+                np.asarray([["The algorithm exceeded its time limit of 1.5 seconds"]]))
+
+    def test_on_timeout_result_exists(self):
+        # the algorithm finished just before its worker was killed
+        DataIO.write_csv(self._result_path, np.asarray([["result"]]))
+        self.assertEqual(0, self._ee.on_timeout())
+
+
+class UnitTestExecutionElementColumnMajor(unittest.TestCase):
+    _dtype: np.dtype = np.dtype('f4')
+
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        self._dataset = np.asfortranarray(
+            np.arange(12, dtype=self._dtype).reshape((3, 4)))
+        self._shm = SharedMemory(create=True, size=self._dataset.nbytes)
+        np.ndarray(self._dataset.shape, self._dtype, self._shm.buf,
+                   order="F")[:] = self._dataset
+        # a view of the second and third column of the dataset
+        self._ee = ee(1, 1, Subspace(np.asarray([False, True, True, False])),
+                      ParameterizedAlgorithm("algorithm_path", {}, "display_name"),
+                      os.path.join(self._dir.name, "result.csv"), self._dtype,
+                      self._shm.name, lambda error, aborted=False: None, 3,
+                      np.array([0, 1, 2]), ss_shm_offset=3 * self._dtype.itemsize,
+                      column_major=True)
+
+    def tearDown(self) -> None:
+        self._shm.close()
+        self._shm.unlink()
+        self._dir.cleanup()
+
+    def test_run_algorithm_on_view(self):
+        def compute_scores(path: str, hyper_parameter: dict, data: np.ndarray):
+            np.testing.assert_array_equal(self._dataset[:, 1:3], data)
+            self.assertTrue(data.flags.f_contiguous)
+            self.assertFalse(data.flags.writeable)
+            return np.zeros(3)
+
+        with patch("backend.task.execution.core.AlgorithmJob.AlgorithmJob"
+                   ".compute_scores", compute_scores):
+            self.assertEqual(0, self._ee.do_work())
+        self.assertTrue(self._ee.finished_result_exists())
+
+    def test_run_algorithm_failed_closes_shm(self):
+        opened: list[SharedMemory] = []
+
+        def open_shm(name: str) -> SharedMemory:
+            opened.append(SharedMemory(name))
+            return opened[-1]
+
+        def compute_scores(path: str, hyper_parameter: dict, data: np.ndarray):
+            raise ValueError("the algorithm failed")
+
+        with patch("backend.task.execution.core.ExecutionElement.SharedMemory",
+                   open_shm), \
+                patch("backend.task.execution.core.AlgorithmJob.AlgorithmJob"
+                      ".compute_scores", compute_scores):
+            self.assertEqual(-1, self._ee.do_work())
+        self.assertEqual(1, len(opened))
+        # the mapping of a closed SharedMemory is released
+        self.assertIsNone(opened[0].buf)
+
+    def test_read_subspace(self):
+        # remote agents receive row-major data
+        self.assertEqual(np.ascontiguousarray(self._dataset[:, 1:3]).tobytes(),
+                         self._ee._ExecutionElement__read_subspace())
+
+
+class UnitTestExecutionElementResultStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        self._shm = SharedMemory(create=True, size=3 * 4)
+        self._store = ResultStore(self._dir.name)
+        self._store.create(["AQ", "Ag"], 3)
+        self._result_path = os.path.join(self._dir.name, "Ag.csv")
+        self._ee = ee(1, 1, Subspace(np.asarray([True])),
+                      ParameterizedAlgorithm("algorithm_path", {}, "display_name"),
+                      self._result_path, np.dtype('f4'), self._shm.name,
+                      lambda error, aborted=False: None, 3, np.array([0, 1, 2]),
+                      result_store=self._store, subspace_index=1)
+
+    def tearDown(self) -> None:
+        self._shm.close()
+        self._shm.unlink()
+        self._dir.cleanup()
+
+    def test_do_work(self):
+        self.assertFalse(self._ee.finished_result_exists())
+        with patch("backend.task.execution.core.AlgorithmJob.AlgorithmJob"
+                   ".compute_scores", return_value=np.array([0.5, 1, 1.5])):
+            self.assertEqual(0, self._ee.do_work())
+        self.assertTrue(self._ee.finished_result_exists())
+        # the result is written to the store instead of a csv-file
+        self.assertFalse(os.path.isfile(self._result_path))
+        self.assertEqual(["Ag"], [i for i, _ in self._store.get_finished_results()])
+
+    def test_do_work_wrong_result_size(self):
+        with patch("backend.task.execution.core.AlgorithmJob.AlgorithmJob"
+                   ".compute_scores", return_value=np.array([0.5, 1])):
+            self.assertEqual(-1, self._ee.do_work())
+        self.assertFalse(self._ee.finished_result_exists())
+        self.assertTrue(os.path.isfile(
+            TaskHelper.convert_to_error_csv_path(self._result_path)))
+
+
+class UnitTestExecutionElementSharedResults(unittest.TestCase):
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        self._shm = SharedMemory(create=True, size=3 * 4)
+        self._store = ResultStore(self._dir.name)
+        self._store.create(["AQ", "Ag"], 3)
+        self._shared_results = SharedResultMatrix(2, 2, 3)
+        self._shared_results.create()
+        self._ee = ee(1, 1, Subspace(np.asarray([True])),
+                      ParameterizedAlgorithm("algorithm_path", {}, "display_name"),
+                      os.path.join(self._dir.name, "Ag.csv"), np.dtype('f4'),
+                      self._shm.name, lambda error, aborted=False: None, 3,
+                      np.array([0, 1, 2]), result_store=self._store,
+                      subspace_index=1, shared_results=self._shared_results,
+                      algorithm_index=1)
+
+    def tearDown(self) -> None:
+        self._shared_results.unlink()
+        self._shm.close()
+        self._shm.unlink()
+        self._dir.cleanup()
+
+    def test_do_work(self):
+        self.assertFalse(self._ee.finished_result_exists())
+        with patch("backend.task.execution.core.AlgorithmJob.AlgorithmJob"
+                   ".compute_scores", return_value=np.array([0.5, 1, 1.5])):
+            self.assertEqual(0, self._ee.do_work())
+        self.assertTrue(self._ee.finished_result_exists())
+        # the result is only written to the shared memory
+        self.assertFalse(self._store.is_finished(1))
+        indices, scores = self._shared_results.get_finished_results(1)
+        np.testing.assert_array_equal([1], indices)
+        np.testing.assert_array_equal([[0.5, 1, 1.5]], scores)
+
+    def test_finished_result_exists_in_store(self):
+        self._store.write(1, np.zeros(3))
+        self.assertTrue(self._ee.finished_result_exists())
+
+
+class UnitTestExecutionElementRemote(unittest.TestCase):
+    _result_path: str = "./test/unit_tests/backend/task/" \
+                        "execution/core/execution_element_remote_test_result.csv"
+    _algorithm: ParameterizedAlgorithm = ParameterizedAlgorithm(
+        "../resources/test/algorithms/DebugAlgorithm.py", {"algorithm_result": 2},
+        "display_name")
+    _subspace_dtype: np.dtype = np.dtype('f4')
+
+    def setUp(self) -> None:
+        self._workers = queue.Queue()
+        self._server = RemoteWorkerServer(("127.0.0.1", 0), b"ee test",
+                                          self._workers.put)
+        self._dir = tempfile.TemporaryDirectory()
+        self._agent = WorkerAgent(self._server.address, b"ee test", self._dir.name)
+        self._thread = threading.Thread(target=self._agent.serve_forever)
+        self._thread.start()
+        self._worker = self._workers.get(timeout=10)
+
+        data = np.arange(6, dtype=self._subspace_dtype).reshape((3, 2))
+        self._shm = SharedMemory(create=True, size=data.nbytes)
+        np.ndarray(data.shape, self._subspace_dtype, self._shm.buf)[:] = data
+        self._ee = ee(1, 1, Subspace(np.asarray([True, False, True])),
+                      self._algorithm, self._result_path, self._subspace_dtype,
+                      self._shm.name, lambda error, aborted=False: None, 3,
+                      np.array([0, 1, 2]))
+
+    def tearDown(self) -> None:
+        self._worker.stop()
+        self._server.stop()
+        self._agent.stop()
+        self._thread.join(10)
+        self._dir.cleanup()
+        self._shm.close()
+        self._shm.unlink()
+        for path in (self._result_path,
+                     TaskHelper.convert_to_error_csv_path(self._result_path)):
+            if os.path.isfile(path):
+                os.remove(path)
+
+    def test_do_remote_work(self):
+        self.assertTrue(self._ee.remote_compatible)
+        self.assertEqual(0, self._ee.do_remote_work(self._worker))
+        np.testing.assert_array_equal(
+            DataIO.read_uncleaned_csv(self._result_path, None),
+            np.asarray([[0, 2.0], [1, 2.0], [2, 2.0]]))
+
+    def test_do_remote_work_failed(self):
+        self._ee._algorithm = ParameterizedAlgorithm(
+            "../resources/test/algorithms/DebugAlgorithm.py",
+            {"algorithm_result": "no number"}, "display_name")
+        self.assertEqual(-1, self._ee.do_remote_work(self._worker))
+        self.assertTrue(os.path.isfile(
+            TaskHelper.convert_to_error_csv_path(self._result_path)))
+
+    def test_do_remote_work_disconnected(self):
+        self._agent.stop()
+        self._thread.join(10)
+        self.assertRaises(ConnectionError, self._ee.do_remote_work, self._worker)
+        self.assertFalse(os.path.isfile(self._result_path))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,6 +1,7 @@
 import os
 import shutil
 import unittest
+from multiprocessing.shared_memory import SharedMemory
 from unittest.mock import Mock
 
 import numpy as np
@@ -119,6 +120,8 @@ class UnitTestExecutionSubspace(unittest.TestCase):
         self.assertEqual(self._user_id, self._es.user_id)
         self.assertEqual(self._task_id, self._es.task_id)
         self.assertEqual(self._priority, self._es.priority)
+        # one datapoint with four float32 values in the subspace
+        self.assertEqual(4 * 4, self._es.memory_estimate)
 
     def test_generate_execution_elements(self):
         # The method will be called on creation of ExecutionSubspace (in constructor
@@ -178,6 +181,103 @@ class UnitTestExecutionSubspace(unittest.TestCase):
         self.assertEqual(self._es._finished_execution_element_count,
                          self._es._total_execution_element_count)
 
+    def test_on_result_callback(self):
+        results: list[tuple[int, int]] = list()
+        es = ExecutionSubspace(self._user_id, self._task_id, self._algorithms,
+                               self._subspace, self._result_path, self._ds,
+                               self.__on_execution_element_finished1,
+                               self._ds_shm_name, self._row_numbers,
+                               subspace_index=2,
+                               on_result_callback=lambda a, s: results.append((a, s)))
+        es.run_later_on_main(0)
+        es._ExecutionSubspace__unload_subspace_shared_memory = Mock(return_value=None)
+        # only ExecutionElements that finished successfully have a result
+        for element, statuscode in zip(es._execution_elements, [0, -1, None, 0]):
+            element.run_later_on_main(statuscode)
+        self.assertEqual([(0, 2), (3, 2)], results)
+        self.assertEqual(4, self._execution_elements_finished1)
+
+    def test_column_major(self):
+        self.__clear_old_execution_file_structure()
+        ds = np.asfortranarray(np.zeros((3, 5), dtype=np.dtype('f4')))
+        es = ExecutionSubspace(self._user_id, self._task_id, self._algorithms[:1],
+                               Subspace(np.asarray([False, True, True, False, False])),
+                               self._result_path, ds,
+                               self.__on_execution_element_finished1,
+                               self._ds_shm_name, self._row_numbers,
+                               column_major=True)
+        # the subspace of adjacent dimensions is used directly from the dataset
+        self.assertEqual(0, es.memory_estimate)
+        es.run_before_on_main()
+        self.assertIsNone(es._subspace_shared_memory_name)
+        es.do_work()
+        es.run_later_on_main(0)
+        element: ExecutionElement = es._execution_elements[0]
+        self.assertEqual(self._ds_shm_name, element._ss_shm_name)
+        # after the first column of three float32 values
+        self.assertEqual(3 * 4, element._ss_shm_offset)
+        self.assertTrue(element._column_major)
+        es._ExecutionSubspace__execution_element_is_finished(False)
+        self.assertEqual(1, self._execution_elements_finished1)
+
+        # other subspaces are copied into a column-major subspace shm
+        es = ExecutionSubspace(self._user_id, self._task_id, self._algorithms[:1],
+                               self._subspace, self._result_path, ds,
+                               self.__on_execution_element_finished1,
+                               self._ds_shm_name, self._row_numbers,
+                               column_major=True)
+        self.assertEqual(3 * 4 * 4, es.memory_estimate)
+        es.run_before_on_main()
+        try:
+            es.run_later_on_main(0)
+            element = es._execution_elements[0]
+            self.assertEqual(es._subspace_shared_memory_name, element._ss_shm_name)
+            self.assertIsNone(element._ss_shm_offset)
+            self.assertTrue(element._column_major)
+        finally:
+            es._ExecutionSubspace__unload_subspace_shared_memory()
+
+    def test_share_subspace_shared_memory(self):
+        self.__clear_old_execution_file_structure()
+        ds = np.arange(10, dtype=np.dtype('f4')).reshape((2, 5))
+        ds_shm = SharedMemory(None, True, ds.nbytes)
+        np.ndarray(ds.shape, ds.dtype, ds_shm.buf)[:] = ds
+        subspaces = [ExecutionSubspace(self._user_id, task_id, self._algorithms[:1],
+                                       self._subspace, self._result_path, ds,
+                                       self.__on_execution_element_finished1,
+                                       ds_shm.name, self._row_numbers,
+                                       dataset_key="dataset")
+                     for task_id in range(3)]
+        try:
+            first, second, third = subspaces
+            first.run_before_on_main()
+            # the shared memory of the subspace is only allocated once
+            self.assertEqual(0, second.memory_estimate)
+            second.run_before_on_main()
+            self.assertEqual(first._subspace_shared_memory_name,
+                             second._subspace_shared_memory_name)
+            first.do_work()
+            first.run_later_on_main(0)
+            # the subspace is only loaded again if it was not loaded before
+            self.assertFalse(second._subspace_loaded)
+            third.run_before_on_main()
+            self.assertTrue(third._subspace_loaded)
+            third.do_work()
+            np.testing.assert_array_equal(
+                ds[:, self._subspace.mask],
+                np.ndarray((2, 4), ds.dtype,
+                           third._subspace_shared_memory_on_main.buf))
+
+            name = first._subspace_shared_memory_name
+            first._ExecutionSubspace__execution_element_is_finished(False)
+            second.run_later_on_main(None)
+            SharedMemory(name).close()
+            third.run_later_on_main(None)
+            self.assertRaises(FileNotFoundError, SharedMemory, name)
+        finally:
+            ds_shm.close()
+            ds_shm.unlink()
+
     def __clear_old_execution_file_structure(self):
 
         if os.path.isdir(self._result_path):
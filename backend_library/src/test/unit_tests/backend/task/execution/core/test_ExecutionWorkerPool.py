@@ -0,0 +1,102 @@
+import os
+import pickle
+import tempfile
+import unittest
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from backend.DataIO import DataIO
+from backend.scheduler.PooledWorker import PooledWorker
+from backend.task.execution.AlgorithmLoader import AlgorithmLoader
+from backend.task.execution.ParameterizedAlgorithm import ParameterizedAlgorithm
+from backend.task.execution.core.ExecutionElement import ExecutionElement
+from backend.task.execution.core.ExecutionSubspace import ExecutionSubspace
+from backend.task.execution.subspace.Subspace import Subspace
+
+
+class UnitTestExecutionWorkerPool(unittest.TestCase):
+    """Runs ExecutionSubspaces and ExecutionElements in a long-lived worker process,
+    which only receives their pickled state"""
+    _algorithm_dir: str = "../resources/test/algorithms"
+    _subspace: Subspace = Subspace(np.asarray([True, False, True]))
+    _row_numbers: np.ndarray = np.asarray([3, 5, 8, 13], dtype=np.int32)
+
+    def setUp(self) -> None:
+        AlgorithmLoader.set_algorithm_root_dir("../resources/test")
+        AlgorithmLoader.set_worker_pool_algorithm_dirs([self._algorithm_dir])
+        self._worker = PooledWorker()
+        self._result_dir = tempfile.TemporaryDirectory()
+
+        self._ds_shm = SharedMemory(None, True, 4 * 3 * 4)
+        self._ds = np.ndarray((4, 3), np.dtype("f4"), self._ds_shm.buf)
+        self._ds[:] = np.arange(12).reshape((4, 3))
+        self._rownrs_shm = SharedMemory(None, True, 4 * 4)
+        np.ndarray([4], np.int32, self._rownrs_shm.buf)[:] = self._row_numbers
+
+        self._algorithm = ParameterizedAlgorithm(
+            os.path.join(self._algorithm_dir, "DebugAlgorithm.py"),
+            {"algorithm_result": 42}, "debug")
+        self._algorithm.directory_name_in_execution = "debug"
+        self._finished: list[tuple[bool, bool]] = list()
+        self._es = ExecutionSubspace(
+            1, 2, [self._algorithm], self._subspace, self._result_dir.name, self._ds,
+            self.__on_finished, self._ds_shm.name, self._row_numbers,
+            row_numbers_shm_name=self._rownrs_shm.name)
+
+    def tearDown(self) -> None:
+        self._worker.stop()
+        AlgorithmLoader.set_worker_pool_algorithm_dirs([])
+        self._result_dir.cleanup()
+        for shm in [self._ds_shm, self._rownrs_shm]:
+            shm.close()
+            shm.unlink()
+
+    def __on_finished(self, error: bool, aborted: bool) -> None:
+        self._finished.append((error, aborted))
+
+    def test_execution_subspace(self):
+        self.assertTrue(self._es.worker_pool_compatible)
+        self._es.run_before_on_main()
+        # the dataset and row numbers are only available through the shared memory
+        unpickled = pickle.loads(PooledWorker.serialize(self._es))
+        self.assertEqual((4, 0), unpickled._ds_on_main.shape)
+        self.assertIsNone(unpickled._row_numbers)
+        self.assertTrue(self._worker.submit(self._es))
+        self.assertEqual(0, self._worker.wait_for_result())
+        ss_arr = np.ndarray((4, 2), np.dtype("f4"),
+                            self._es._subspace_shared_memory_on_main.buf)
+        np.testing.assert_array_equal(self._ds[:, [0, 2]], ss_arr)
+        self._es.run_later_on_main(None)
+        self.assertEqual([(False, True)], self._finished)
+
+    def test_execution_element(self):
+        self._es.run_before_on_main()
+        self.assertTrue(self._worker.submit(self._es))
+        self.assertEqual(0, self._worker.wait_for_result())
+        result_path = os.path.join(self._result_dir.name, "AQA.csv")
+        ee = ExecutionElement(1, 2, self._subspace, self._algorithm, result_path,
+                              np.dtype("f4"), self._es._subspace_shared_memory_name,
+                              self.__on_finished, 4, self._row_numbers,
+                              row_numbers_shm_name=self._rownrs_shm.name)
+        self.assertTrue(ee.worker_pool_compatible)
+        self.assertIsNone(pickle.loads(PooledWorker.serialize(ee))._row_numbers)
+        self.assertTrue(self._worker.submit(ee))
+        self.assertEqual(0, self._worker.wait_for_result())
+        result = DataIO.read_uncleaned_csv(result_path, None)
+        np.testing.assert_array_equal(self._row_numbers, result[:, 0].astype(int))
+        np.testing.assert_array_equal(np.repeat(42, 4), result[:, 1].astype(int))
+        ee.run_later_on_main(0)
+        self.assertEqual([(False, False)], self._finished)
+        self._es.run_later_on_main(None)
+
+    def test_untrusted_algorithm(self):
+        AlgorithmLoader.set_worker_pool_algorithm_dirs([])
+        ee = ExecutionElement(1, 2, self._subspace, self._algorithm, "result.csv",
+                              np.dtype("f4"), "shm", self.__on_finished, 4,
+                              self._row_numbers)
+        self.assertFalse(ee.worker_pool_compatible)
+
+
+if __name__ == '__main__':
+    unittest.main()
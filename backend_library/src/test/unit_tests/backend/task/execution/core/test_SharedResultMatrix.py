@@ -0,0 +1,70 @@
+import pickle
+import unittest
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from backend.task.execution.core.SharedResultMatrix import SharedResultMatrix
+
+
+class UnitTestSharedResultMatrix(unittest.TestCase):
+    def setUp(self) -> None:
+        self._matrix = SharedResultMatrix(2, 3, 4)
+        self._matrix.create()
+
+    def tearDown(self) -> None:
+        self._matrix.unlink()
+
+    def test_write_and_read(self):
+        self.assertEqual(2 * 3 * (4 * 8 + 1), SharedResultMatrix.get_size(2, 3, 4))
+        self.assertFalse(self._matrix.is_finished(1, 2))
+        indices, scores = self._matrix.get_finished_results(1)
+        self.assertEqual(0, indices.size)
+        self.assertEqual((0, 4), scores.shape)
+
+        # the matrix is written to on other processes, where it is pickled
+        unpickled = pickle.loads(pickle.dumps(self._matrix))
+        unpickled.write(1, 2, np.array([0.5, 1, 2, 0.25]))
+        unpickled.write(1, 0, np.array([4, 3, 2, 1], np.float32))
+        self.assertTrue(self._matrix.is_finished(1, 2))
+        self.assertFalse(self._matrix.is_finished(0, 2))
+
+        indices, scores = self._matrix.get_finished_results(1)
+        np.testing.assert_array_equal([0, 2], indices)
+        np.testing.assert_array_equal([[4, 3, 2, 1], [0.5, 1, 2, 0.25]], scores)
+        self.assertEqual(0, self._matrix.get_finished_results(0)[0].size)
+
+        # a score has to be written for each datapoint
+        with self.assertRaises(ValueError):
+            unpickled.write(0, 1, np.zeros(3))
+        self.assertFalse(self._matrix.is_finished(0, 1))
+
+    def test_unlink(self):
+        name = self._matrix.name
+        self._matrix.unlink()
+        self.assertRaises(FileNotFoundError, SharedMemory, name)
+        # unlinking twice is allowed
+        self._matrix.unlink()
+
+    def test_memory_limit(self):
+        size = SharedResultMatrix.get_size(2, 3, 4)
+        total_size = SharedResultMatrix.get_total_size()
+        # the limit applies to all matrices together
+        second = SharedResultMatrix(2, 3, 4)
+        self.assertFalse(second.create(total_size + size - 1))
+        self.assertIsNone(second.name)
+        self.assertTrue(second.create(total_size + size))
+        self.assertEqual(total_size + size, SharedResultMatrix.get_total_size())
+        self.assertFalse(SharedResultMatrix(1, 1, 1).create(total_size + size))
+
+        # unlinking a matrix frees its memory
+        self._matrix.unlink()
+        self.assertEqual(total_size, SharedResultMatrix.get_total_size())
+        third = SharedResultMatrix(1, 1, 1)
+        self.assertTrue(third.create(total_size + size))
+        second.unlink()
+        third.unlink()
+
+
+if __name__ == '__main__':
+    unittest.main()
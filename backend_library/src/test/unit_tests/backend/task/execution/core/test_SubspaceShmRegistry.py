@@ -0,0 +1,61 @@
+import unittest
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from backend.task.execution.core.SubspaceShmRegistry import SubspaceShmRegistry
+from backend.task.execution.subspace.Subspace import Subspace
+
+
+class UnitTestSubspaceShmRegistry(unittest.TestCase):
+    _subspace: Subspace = Subspace(np.asarray([True, False, True]))
+    _other_subspace: Subspace = Subspace(np.asarray([True, True, False]))
+
+    def tearDown(self) -> None:
+        self.assertEqual(dict(), SubspaceShmRegistry._segments)
+        self.assertEqual(dict(), SubspaceShmRegistry._shared)
+
+    def test_share(self):
+        shm, filled = SubspaceShmRegistry.acquire("dataset", self._subspace, 16)
+        self.assertFalse(filled)
+        self.assertTrue(SubspaceShmRegistry.is_shared("dataset", self._subspace))
+        self.assertFalse(SubspaceShmRegistry.is_shared("other", self._subspace))
+        self.assertFalse(SubspaceShmRegistry.is_shared("dataset",
+                                                       self._other_subspace))
+
+        shared, filled = SubspaceShmRegistry.acquire("dataset", self._subspace, 16)
+        self.assertIs(shm, shared)
+        self.assertFalse(filled)
+        SubspaceShmRegistry.mark_filled(shm.name)
+        shared, filled = SubspaceShmRegistry.acquire("dataset", self._subspace, 16)
+        self.assertTrue(filled)
+
+        # other datasets and subspaces get segments of their own
+        other, _ = SubspaceShmRegistry.acquire("other", self._subspace, 16)
+        self.assertNotEqual(shm.name, other.name)
+        SubspaceShmRegistry.release(other.name)
+        other, _ = SubspaceShmRegistry.acquire("dataset", self._other_subspace, 16)
+        self.assertNotEqual(shm.name, other.name)
+        SubspaceShmRegistry.release(other.name)
+
+        # the segment is unlinked when the last user releases it
+        for _ in range(2):
+            SubspaceShmRegistry.release(shm.name)
+            SharedMemory(shm.name).close()
+        SubspaceShmRegistry.release(shm.name)
+        self.assertRaises(FileNotFoundError, SharedMemory, shm.name)
+        self.assertFalse(SubspaceShmRegistry.is_shared("dataset", self._subspace))
+
+    def test_not_shared(self):
+        shm, _ = SubspaceShmRegistry.acquire(None, self._subspace, 16)
+        other, filled = SubspaceShmRegistry.acquire(None, self._subspace, 16)
+        self.assertNotEqual(shm.name, other.name)
+        self.assertFalse(filled)
+        self.assertFalse(SubspaceShmRegistry.is_shared(None, self._subspace))
+        SubspaceShmRegistry.release(shm.name)
+        SubspaceShmRegistry.release(other.name)
+        self.assertRaises(FileNotFoundError, SharedMemory, shm.name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -46,6 +46,32 @@ class UnitTestSubspace(unittest.TestCase):
                 shm.unlink()
                 shm.close()
 
+    def test_column_runs(self):
+        ss = Subspace(np.array([True, True, False, True, False, True, True, True]))
+        self.assertEqual([(0, 2), (3, 4), (5, 8)], ss.get_column_runs())
+        self.assertIsNone(ss.get_column_range())
+        ss = Subspace(np.array([False, True, True, True, False]))
+        self.assertEqual([(1, 4)], ss.get_column_runs())
+        self.assertEqual((1, 4), ss.get_column_range())
+        self.assertEqual((0, 1), Subspace(np.array([True])).get_column_range())
+
+    def test_subspace_arrays_column_major(self):
+        ds_arr = np.asfortranarray(np.arange(24, dtype=np.dtype('f4')).reshape((4, 6)))
+        mask = np.array([True, True, False, True, False, True])
+        ss = Subspace(mask)
+        shm = SharedMemory(None, True, ss.get_size_of_subspace_buffer(ds_arr))
+        try:
+            ss_arr = ss.make_subspace_array(ds_arr, shm)
+            self.assertTrue(ss_arr.flags.f_contiguous)
+            np.testing.assert_array_equal(ds_arr[:, mask], ss_arr)
+            # the columns are stored one after another in the shm
+            np.testing.assert_array_equal(
+                ds_arr[:, mask].flatten(order="F"),
+                np.ndarray([16], ds_arr.dtype, shm.buf))
+        finally:
+            shm.unlink()
+            shm.close()
+
 
 if __name__ == '__main__':
     unittest.main()
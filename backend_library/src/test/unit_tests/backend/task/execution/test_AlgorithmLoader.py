@@ -26,6 +26,15 @@ class UnitTestAlgorithmLoader(unittest.TestCase):
         for file in self.wrongAlgoFiles:
             self.assertIsNotNone(AL.is_algorithm_valid(algo_dir + file))
 
+    def test_worker_pool_algorithm_dirs(self):
+        AL.set_worker_pool_algorithm_dirs([])
+        self.assertFalse(AL.may_run_in_worker_pool(algo_dir + "DebugAlgorithm.py"))
+        AL.set_worker_pool_algorithm_dirs(["../resources/test/algorithms/../algorithms"])
+        self.assertTrue(AL.may_run_in_worker_pool(algo_dir + "DebugAlgorithm.py"))
+        self.assertFalse(AL.may_run_in_worker_pool(
+            "../resources/test/datasets/canada_climate_uncleaned.csv"))
+        AL.set_worker_pool_algorithm_dirs([])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+from typing import Optional
+
+from backend.task.execution.MetricComputation import MetricComputation
+
+
+class UnitTestMetricComputation(unittest.TestCase):
+    def setUp(self) -> None:
+        self._computed: int = 0
+        self._statuscodes: list[Optional[int]] = list()
+        self._metric_computation = MetricComputation(
+            3, 4, self.__compute_metrics, self._statuscodes.append)
+
+    def __compute_metrics(self) -> None:
+        self._computed += 1
+
+    def test_properties(self):
+        self.assertEqual(3, self._metric_computation.user_id)
+        self.assertEqual(4, self._metric_computation.task_id)
+        self.assertEqual(50, self._metric_computation.priority)
+        with self.assertRaises(AssertionError):
+            MetricComputation(-2, 4, self.__compute_metrics, self._statuscodes.append)
+
+    def test_do_work(self):
+        self.assertEqual(0, self._metric_computation.do_work())
+        self.assertEqual(1, self._computed)
+        self.assertEqual([], self._statuscodes)
+        self._metric_computation.run_later_on_main(0)
+        self._metric_computation.run_later_on_main(None)
+        self.assertEqual([0, None], self._statuscodes)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from backend.DataIO import DataIO
+from backend.task.execution.ResultStore import ResultStore
+
+
+class UnitTestResultStore(unittest.TestCase):
+    _identifiers: list[str] = ["AQ", "Ag", "Aw"]
+
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        self._store = ResultStore(self._dir.name)
+
+    def tearDown(self) -> None:
+        self._dir.cleanup()
+
+    def test_write_and_read(self):
+        self.assertFalse(self._store.exists)
+        self.assertFalse(self._store.is_finished(0))
+        self._store.create(self._identifiers, 4)
+        self.assertTrue(self._store.exists)
+        self.assertEqual(self._identifiers, self._store.get_subspace_identifiers())
+
+        self._store.write(2, np.array([0.5, 1, 2, 0.25]))
+        self._store.write(0, np.array([4, 3, 2, 1], np.float32))
+        self.assertEqual([True, False, True],
+                         [self._store.is_finished(i) for i in range(3)])
+        results = list(self._store.get_finished_results())
+        self.assertEqual(["AQ", "Aw"], [identifier for identifier, _ in results])
+        np.testing.assert_array_equal([4, 3, 2, 1], results[0][1])
+        np.testing.assert_array_equal([0.5, 1, 2, 0.25], results[1][1])
+
+        # a score has to be written for each datapoint
+        with self.assertRaises(ValueError):
+            self._store.write(1, np.zeros(3))
+        self.assertFalse(self._store.is_finished(1))
+
+    def test_write_many(self):
+        self._store.create(self._identifiers, 2)
+        self._store.write_many(np.array([2, 0]), np.array([[1, 2], [3, 4]]))
+        self.assertEqual([True, False, True],
+                         [self._store.is_finished(i) for i in range(3)])
+        np.testing.assert_array_equal(
+            [[3, 4], [1, 2]],
+            [scores for _, scores in self._store.get_finished_results()])
+        with self.assertRaises(ValueError):
+            self._store.write_many(np.array([1]), np.zeros((1, 3)))
+        self.assertFalse(self._store.is_finished(1))
+
+    def test_create_keeps_results(self):
+        self._store.create(self._identifiers, 4)
+        self._store.write(1, np.ones(4))
+        self._store.create(self._identifiers, 4)
+        self.assertTrue(self._store.is_finished(1))
+
+        # but not the results of other subspaces or datasets
+        self._store.create(self._identifiers, 5)
+        self.assertFalse(self._store.is_finished(1))
+        self._store.write(1, np.ones(5))
+        self._store.create(["Ag", "AQ", "Aw"], 5)
+        self.assertFalse(self._store.is_finished(1))
+
+    def test_import_and_export_csv(self):
+        # results stored as csv-files before are moved into the store
+        path = os.path.join(self._dir.name, "Ag.csv")
+        DataIO.write_csv(path, np.array([[0, 0.125], [2, 0.5], [7, 2]], object))
+        self._store.create(self._identifiers, 3)
+        self.assertFalse(os.path.isfile(path))
+        self.assertEqual([False, True, False],
+                         [self._store.is_finished(i) for i in range(3)])
+
+        self._store.write(0, np.array([1.5, 2.5, 3.5]))
+        self._store.export_csv(np.array([0, 2, 7], np.int32))
+        np.testing.assert_array_equal(
+            [[0, 1.5], [2, 2.5], [7, 3.5]],
+            DataIO.read_uncleaned_csv(os.path.join(self._dir.name, "AQ.csv"), None))
+        np.testing.assert_array_equal([[0, 0.125], [2, 0.5], [7, 2]],
+                                      DataIO.read_uncleaned_csv(path, None))
+        self.assertFalse(os.path.isfile(os.path.join(self._dir.name, "Aw.csv")))
+
+        self._store.delete()
+        self.assertFalse(self._store.exists)
+        self.assertEqual(["AQ.csv", "Ag.csv"], sorted(os.listdir(self._dir.name)))
+
+    def test_row_numbers(self):
+        ResultStore.write_row_numbers(self._dir.name, np.array([3, 1, 2]))
+        path = ResultStore.get_row_numbers_path(self._dir.name)
+        self.assertEqual([ResultStore.row_numbers_file_name],
+                         os.listdir(self._dir.name))
+        np.testing.assert_array_equal([3, 1, 2], np.load(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,7 +4,10 @@ import unittest
 import zipfile
 from typing import List, Callable
 
+import numpy as np
+
 from backend.task.execution import ResultZipper
+from backend.task.execution.ResultStore import ResultStore
 from backend.task import TaskState
 
 
@@ -192,6 +195,61 @@ class UnitTestResultZipper(unittest.TestCase):
             if not f_final_exist:
                 self.assertFalse(os.path.isfile(zip_path_final))
 
+    def test_export_result_stores(self):
+        dir_path = os.path.join(UnitTestResultZipper._test_dir_path, "execution")
+        zip_path = os.path.join(UnitTestResultZipper._test_dir_path, "execution.zip")
+        stores = [ResultStore(os.path.join(dir_path, name)) for name in ["a", "b"]]
+        for store in stores:
+            os.makedirs(store.directory)
+            store.create(["AQ", "Ag"], 2)
+        stores[0].write(1, np.array([0.5, 1]))
+        ResultStore.write_row_numbers(dir_path, np.array([4, 2]))
+
+        ResultZipper.ResultZipper(1, 2, False, UnitTestResultZipper._test_callback,
+                                  dir_path, zip_path + ".running", zip_path,
+                                  stores).do_work()
+
+        # only the results are zipped, as csv-files
+        with zipfile.ZipFile(zip_path) as zip_file:
+            self.assertEqual(["execution/a/Ag.csv"], zip_file.namelist())
+            self.assertEqual(b"4,0.5\n2,1.0\n", zip_file.read("execution/a/Ag.csv"))
+
+    def test_compression(self):
+        dir_path = os.path.join(UnitTestResultZipper._test_dir_path, "execution")
+        zip_path = os.path.join(UnitTestResultZipper._test_dir_path, "execution.zip")
+        for compression_level, threads in [(0, 1), (0, 4), (9, 1), (6, 4)]:
+            store = ResultStore(os.path.join(dir_path, "a"))
+            os.makedirs(store.directory)
+            store.create(["AQ", "Ag", "Aw"], 3)
+            for index in range(3):
+                store.write(index, np.array([0.5, index, 2]))
+            ResultStore.write_row_numbers(dir_path, np.array([1, 2, 3]))
+            with open(os.path.join(dir_path, "details.json"), "w") as f:
+                f.write("{}")
+
+            ResultZipper.ResultZipper(1, 2, False,
+                                      UnitTestResultZipper._test_callback,
+                                      dir_path, zip_path + ".running", zip_path,
+                                      [store], compression_level, threads).do_work()
+
+            self.assertFalse(os.path.isdir(dir_path))
+            with zipfile.ZipFile(zip_path) as zip_file:
+                self.assertEqual(["execution/a/AQ.csv", "execution/a/Ag.csv",
+                                  "execution/a/Aw.csv", "execution/details.json"],
+                                 sorted(zip_file.namelist()))
+                self.assertEqual(b"1,0.5\n2,2.0\n3,2.0\n",
+                                 zip_file.read("execution/a/Aw.csv"))
+                self.assertEqual(b"{}", zip_file.read("execution/details.json"))
+                expected_type = zipfile.ZIP_STORED if compression_level == 0 \
+                    else zipfile.ZIP_DEFLATED
+                self.assertEqual({expected_type},
+                                 {info.compress_type for info in zip_file.infolist()})
+
+        with self.assertRaises(AssertionError):
+            ResultZipper.ResultZipper(1, 2, False, UnitTestResultZipper._test_callback,
+                                      UnitTestResultZipper._test_dir_path,
+                                      zip_path + ".running", zip_path, threads=0)
+
     # ---- non-static helper methods ----
     def _test_with_good_args(
             self,
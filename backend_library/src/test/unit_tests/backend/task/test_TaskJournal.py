@@ -0,0 +1,78 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from backend.task.Task import Task
+from backend.task.TaskJournal import TaskJournal
+from backend.task.TaskState import TaskState
+
+
+def _ignore_progress(task_id: int, state: TaskState, progress: float) -> None:
+    pass
+
+
+class JournalTestTask(Task):
+    def __init__(self, task_id: int, data: str = ""):
+        super().__init__(0, task_id, _ignore_progress)
+        self.data: str = data
+
+    def schedule(self) -> None:
+        pass
+
+
+class OtherJournalTestTask(JournalTestTask):
+    pass
+
+
+class UnitTestTaskJournal(unittest.TestCase):
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._dir.name, "journal.sqlite3")
+        self._journal = TaskJournal(self._path)
+
+    def tearDown(self) -> None:
+        self._dir.cleanup()
+
+    def test_record_and_load(self):
+        self.assertEqual([], self._journal.load())
+        self._journal.record(JournalTestTask(2, "a"))
+        self._journal.record(OtherJournalTestTask(2, "b"))
+        self._journal.record(JournalTestTask(1, "c"))
+
+        # a new journal on the same file sees the same tasks, in the recorded order
+        tasks = TaskJournal(self._path).load()
+        self.assertEqual([JournalTestTask, OtherJournalTestTask, JournalTestTask],
+                         [type(t) for t in tasks])
+        self.assertEqual(["a", "b", "c"], [t.data for t in tasks])
+        self.assertEqual({1, 2}, self._journal.get_task_ids(JournalTestTask))
+        self.assertEqual({2}, self._journal.get_task_ids(OtherJournalTestTask))
+
+    def test_record_replaces(self):
+        self._journal.record(JournalTestTask(1, "a"))
+        self._journal.record(JournalTestTask(2, "b"))
+        self._journal.record(JournalTestTask(1, "c"))
+        self.assertEqual(["b", "c"], [t.data for t in self._journal.load()])
+
+    def test_remove(self):
+        self._journal.record(JournalTestTask(1))
+        self._journal.record(OtherJournalTestTask(1))
+        self._journal.remove(JournalTestTask, 1)
+        # removing a task that is not journaled does nothing
+        self._journal.remove(JournalTestTask, 1)
+        self.assertEqual(set(), self._journal.get_task_ids(JournalTestTask))
+        self.assertEqual([OtherJournalTestTask],
+                         [type(t) for t in self._journal.load()])
+
+    def test_load_removes_broken_tasks(self):
+        self._journal.record(JournalTestTask(1, "a"))
+        with sqlite3.connect(self._path) as connection:
+            connection.execute("INSERT INTO tasks VALUES ('test.Missing', 2, ?)",
+                               (b"no pickle",))
+        with self.assertLogs(level="WARNING"):
+            self.assertEqual(["a"], [t.data for t in self._journal.load()])
+        self.assertEqual(["a"], [t.data for t in self._journal.load()])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+import zipfile
+
+import numpy as np
+
+from backend.task.ZipWriter import ZipWriter
+
+
+class UnitTestZipWriter(unittest.TestCase):
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        self._content: dict[str, bytes] = dict()
+        rng = np.random.default_rng(2)
+        for name in ["a/1.csv", "a/2.csv", "b/3.csv", "4.csv", "empty.csv"]:
+            path = os.path.join(self._dir.name, "result", name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            size = 0 if name == "empty.csv" else 50000
+            content = "\n".join(str(x) for x in rng.random(size)).encode()
+            with open(path, "wb") as f:
+                f.write(content)
+            self._content[os.path.join("result", name)] = content
+
+    def tearDown(self) -> None:
+        self._dir.cleanup()
+
+    def test_write_dir(self):
+        for compression_level, threads in [(-1, 1), (-1, 3), (9, 8), (0, 3), (1, 2)]:
+            path = os.path.join(self._dir.name, f"{compression_level}_{threads}.zip")
+            with ZipWriter(path, compression_level, threads) as zip_writer:
+                zip_writer.write_dir(os.path.join(self._dir.name, "result"),
+                                     frozenset([os.path.join(self._dir.name,
+                                                             "result", "4.csv")]))
+                zip_writer.write_bytes(b"streamed", "result/b/5.csv")
+
+            with zipfile.ZipFile(path) as zip_file:
+                self.assertIsNone(zip_file.testzip())
+                self.assertEqual(["result/a/1.csv", "result/a/2.csv", "result/b/3.csv",
+                                  "result/b/5.csv", "result/empty.csv"],
+                                 sorted(zip_file.namelist()))
+                for name, content in self._content.items():
+                    if name != "result/4.csv":
+                        self.assertEqual(content, zip_file.read(name))
+                self.assertEqual(b"streamed", zip_file.read("result/b/5.csv"))
+                expected_type = zipfile.ZIP_STORED if compression_level == 0 \
+                    else zipfile.ZIP_DEFLATED
+                for info in zip_file.infolist():
+                    self.assertEqual(expected_type, info.compress_type)
+
+    def test_abort(self):
+        path = os.path.join(self._dir.name, "aborted.zip")
+        with self.assertRaises(ValueError):
+            with ZipWriter(path, threads=2) as zip_writer:
+                zip_writer.write_bytes(b"written", "written.csv")
+                raise ValueError()
+        # the zip-file is closed and may be overwritten
+        self.assertTrue(os.path.isfile(path))
+        os.remove(path)
+
+    def test_bad_params(self):
+        path = os.path.join(self._dir.name, "result.zip")
+        for compression_level, threads in [(10, 1), (-2, 1), (1, 0)]:
+            with self.assertRaises(AssertionError):
+                ZipWriter(path, compression_level, threads)
+        self.assertFalse(os.path.isfile(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -192,6 +192,38 @@ class UnitTestDataIO(unittest.TestCase):
 
         self.assertFalse(os.path.isfile(test_file_path_temp))
 
+    def test_binary_io(self):
+        path: str = os.path.join(UnitTestDataIO._test_dir_path, "dataset.csv")
+        binary_path: str = DataIO.get_binary_path(path)
+        dataset = AnnotatedDataset(np.array([[1.5, 2, 3], [4, 5, 6], [7, 8, 9]]),
+                                   np.array(["a", "b", "c"]), np.array([0, 2, 5]))
+        DataIO.write_binary(binary_path, dataset)
+        self.assertFalse(os.path.isfile(binary_path + ".running"))
+        self.assertEqual((3, 3), DataIO.read_binary_shape(binary_path))
+
+        # into row-major and column-major arrays
+        for order in ["C", "F"]:
+            data = np.zeros((3, 3), np.float32, order=order)
+            row_numbers = np.zeros(3, np.int32)
+            DataIO.read_binary_into(binary_path, data, row_numbers)
+            self.assertTrue(np.array_equal(dataset.data, data))
+            self.assertTrue(np.array_equal(dataset.row_mapping, row_numbers))
+
+        # into arrays of the wrong shape
+        with self.assertRaises(ValueError):
+            DataIO.read_binary_into(binary_path, np.zeros((3, 2), np.float32),
+                                    np.zeros(3, np.int32))
+
+    def test_binary_truncated(self):
+        binary_path: str = os.path.join(UnitTestDataIO._test_dir_path, "dataset.npy")
+        DataIO.write_binary(binary_path, AnnotatedDataset(
+            np.ones((4, 4)), np.array(["a", "b", "c", "d"]), np.arange(4)))
+        with open(binary_path, "r+b") as file:
+            file.truncate(150)
+        with self.assertRaises(ValueError):
+            DataIO.read_binary_into(binary_path, np.zeros((4, 4), np.float32),
+                                    np.zeros(4, np.int32))
+
     # ---- static helper methods ----
 
     @staticmethod
@@ -0,0 +1,38 @@
+import contextlib
+import io
+import tempfile
+import unittest
+
+from test.benchmarks import MetricBenchmark
+from test.benchmarks.MetricBenchmark import create_results, run_legacy, run_vectorized
+
+
+class UnitTestMetricBenchmark(unittest.TestCase):
+    def test_implementations_agree(self):
+        with tempfile.TemporaryDirectory() as directory:
+            algorithm_directories = create_results(directory, 2, 3, 250, 1)
+            legacy = run_legacy(algorithm_directories)
+            vectorized = run_vectorized(algorithm_directories, 250, directory)
+        self.assertEqual(250, len(vectorized.data_point_outlier_count))
+        self.assertEqual(["subspace0", "subspace1", "subspace2"],
+                         sorted(vectorized.subspace_outlier_amount))
+        self.assertEqual(legacy.data_point_outlier_count,
+                         vectorized.data_point_outlier_count)
+        self.assertEqual(legacy.subspace_outlier_amount,
+                         vectorized.subspace_outlier_amount)
+
+    def test_main(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            MetricBenchmark.main(["--subspaces", "2", "--datapoints", "100"])
+        lines = output.getvalue().splitlines()
+        self.assertEqual(3, len(lines))
+        self.assertIn("speedup", lines[0])
+        self.assertIn("legacy", lines[1])
+        self.assertIn("vectorized", lines[2])
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            MetricBenchmark.main(["--datapoints", "0"])
+
+
+if __name__ == '__main__':
+    unittest.main()
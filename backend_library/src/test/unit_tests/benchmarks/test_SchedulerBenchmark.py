@@ -0,0 +1,125 @@
+import contextlib
+import io
+import math
+import random
+import unittest
+
+from backend.scheduler.FairShareScheduler import FairShareScheduler
+from backend.scheduler.Scheduler import Scheduler
+from backend.scheduler.UserRoundRobinScheduler import UserRoundRobinScheduler
+from test.benchmarks import SchedulerBenchmark
+from test.benchmarks.SchedulerBenchmark import Distribution, Workload, jain_index, \
+    percentile, run_live, simulate
+
+
+class UnitTestSchedulerBenchmark(unittest.TestCase):
+    def setUp(self) -> None:
+        Scheduler._instance = None
+
+    def tearDown(self) -> None:
+        Scheduler._instance = None
+
+    def test_distribution(self):
+        rng = random.Random(0)
+        self.assertEqual(5.0, Distribution("const:5").sample(rng))
+        for _ in range(100):
+            self.assertTrue(1 <= Distribution("uniform:1:3").sample(rng) <= 3)
+            self.assertGreaterEqual(Distribution("exp:2").sample(rng), 0)
+            self.assertGreater(Distribution("lognormal:-1:0.5").sample(rng), 0)
+        self.assertEqual("exp:2", str(Distribution("exp:2")))
+        for spec in ["const", "const:a", "uniform:1", "normal:1:2", "exp:-1"]:
+            with self.assertRaises(ValueError):
+                Distribution(spec)
+
+    def test_jain_index(self):
+        self.assertEqual(1.0, jain_index([2, 2, 2, 2]))
+        self.assertEqual(0.25, jain_index([0, 0, 3, 0]))
+        self.assertAlmostEqual(0.9, jain_index([1, 2]))
+        self.assertTrue(math.isnan(jain_index([])))
+
+    def test_percentile(self):
+        values = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+        self.assertEqual(5, percentile(values, 0.5))
+        self.assertEqual(9, percentile(values, 0.9))
+        self.assertEqual(10, percentile(values, 0.99))
+        self.assertEqual(1, percentile(values, 0))
+        self.assertTrue(math.isnan(percentile([], 0.5)))
+
+    def test_simulate(self):
+        workload = Workload(users=2, tasks_per_user=1, task_size=4,
+                            run_time=Distribution("const:10"), priorities=[5])
+        for policy in [UserRoundRobinScheduler, FairShareScheduler]:
+            result = simulate(policy, workload, 2)
+            self.assertEqual(policy.__name__, result.policy)
+            self.assertEqual((8, 0, 0), (result.completed, result.aborted,
+                                         result.dropped))
+            # both users alternate on the two workers
+            self.assertEqual(40.0, result.makespan)
+            self.assertEqual(0.2, result.throughput)
+            self.assertEqual(1.0, result.fairness)
+            self.assertEqual({"p50": 10.0, "p90": 30.0, "p99": 30.0, "max": 30.0},
+                             result.waits)
+        self.assertIsNone(Scheduler._instance)
+
+    def test_simulate_memory_limit(self):
+        workload = Workload(users=1, tasks_per_user=1, task_size=4,
+                            run_time=Distribution("const:10"),
+                            memory=Distribution("const:60"), priorities=[5])
+        # only one Schedulable fits into the memory at once
+        self.assertEqual(40.0, simulate(UserRoundRobinScheduler, workload, 4,
+                                        memory_limit=100).makespan)
+        self.assertEqual(10.0, simulate(UserRoundRobinScheduler, workload, 4,
+                                        memory_limit=240).makespan)
+
+    def test_simulate_abort_and_shutdown(self):
+        workload = Workload(users=4, tasks_per_user=2, task_size=5,
+                            run_time=Distribution("exp:10"), abort_fraction=1.0)
+        result = simulate(UserRoundRobinScheduler, workload, 2)
+        # every task is aborted at some time, possibly after it completed
+        self.assertEqual(40, result.completed + result.aborted + result.dropped)
+        self.assertGreater(result.aborted, 0)
+        self.assertLess(result.completed, 40)
+
+        workload = Workload(users=4, tasks_per_user=2, task_size=5,
+                            run_time=Distribution("const:10"), shutdown_at=25)
+        result = simulate(UserRoundRobinScheduler, workload, 2)
+        # the Schedulables running at the shutdown finish, no other is started
+        self.assertEqual(6, result.completed)
+        self.assertEqual(34, result.dropped)
+        self.assertEqual(30.0, result.makespan)
+
+    def test_run_live(self):
+        workload = Workload(users=2, tasks_per_user=1, task_size=3,
+                            run_time=Distribution("const:10"), priorities=[5])
+        result = run_live(UserRoundRobinScheduler, workload, 2, time_scale=0.001)
+        self.assertEqual((6, 0, 0), (result.completed, result.aborted,
+                                     result.dropped))
+        self.assertGreaterEqual(result.makespan, 30.0)
+        self.assertIsNone(Scheduler._instance)
+
+    def test_get_policy(self):
+        self.assertIs(FairShareScheduler,
+                      SchedulerBenchmark.get_policy("fair_share"))
+        self.assertIs(FairShareScheduler, SchedulerBenchmark.get_policy(
+            "backend.scheduler.FairShareScheduler:FairShareScheduler"))
+        for name in ["lottery", "backend.missing:Scheduler",
+                     "backend.scheduler.Scheduler:Scheduler"]:
+            with self.assertRaises(ValueError):
+                SchedulerBenchmark.get_policy(name)
+
+    def test_main(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            SchedulerBenchmark.main(["--users", "3", "--tasks-per-user", "2",
+                                     "--priority-aging", "0.1"])
+        lines = output.getvalue().splitlines()
+        self.assertEqual(3, len(lines))
+        self.assertIn("fairness", lines[0])
+        self.assertIn("UserRoundRobinScheduler", lines[1])
+        self.assertIn("FairShareScheduler", lines[2])
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            SchedulerBenchmark.main(["--policies", "lottery"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,6 +7,9 @@ python3.9 manage.py createsuperuser --no-input
 python3.9 manage.py pyodtodb
 python3.9 manage.py markcrashed
 
+# Launch the scheduler daemon shared by all gunicorn workers
+python3.9 manage.py runscheduler &
+
 # Launch memcached for worker syncronization
 memcached -d -u root
 
@@ -34,4 +34,5 @@ class UserAdmin(DjangoUserAdmin):
                 ),
             },
         ),
+        (_("Scheduling"), {"fields": ("scheduler_weight",)}),
     )
@@ -0,0 +1,24 @@
+# Generated by Django 4.0.7 on 2026-10-18 06:30
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0002_alter_user_groups_alter_user_user_permissions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="scheduler_weight",
+            field=models.FloatField(
+                default=1.0,
+                help_text="Share of the computing time this user receives relative "
+                "to other users, when the fair share scheduling policy is used",
+                validators=[django.core.validators.MinValueValidator(0.01)],
+            ),
+        ),
+    ]
@@ -1,7 +1,16 @@
 from django.contrib.auth.models import AbstractUser
+from django.core.validators import MinValueValidator
+from django.db import models
 
 
 class User(AbstractUser):
     """
     Custom database model of a User.
     """
+
+    scheduler_weight = models.FloatField(
+        default=1.0,
+        validators=(MinValueValidator(0.01),),
+        help_text="Share of the computing time this user receives relative "
+        "to other users, when the fair share scheduling policy is used",
+    )
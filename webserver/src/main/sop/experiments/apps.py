@@ -8,8 +8,8 @@ from django.apps import AppConfig
 from django.conf import settings
 
 from backend.scheduler.Scheduler import Scheduler
-from backend.scheduler.UserRoundRobinScheduler import UserRoundRobinScheduler
 from backend.task.execution.AlgorithmLoader import AlgorithmLoader
+from backend.task.execution.core.DatasetShmCache import DatasetShmCache
 
 
 def hard_shutdown(signum: int, frame: types.FrameType):
@@ -22,6 +22,10 @@ class ExperimentsConfig(AppConfig):
 
     def ready(self) -> None:
         from experiments import signals  # noqa
+        from experiments.services.scheduler import (
+            create_local_scheduler,
+            create_scheduler_client,
+        )
 
         # logging
         loglevel = logging.getLevelName(os.environ.get("SOP_LOG_LEVEL", "INFO"))
@@ -29,7 +33,16 @@ class ExperimentsConfig(AppConfig):
 
         # backend initializations
         AlgorithmLoader.set_algorithm_root_dir(str(settings.ALGORITHM_ROOT_DIR))
-        Scheduler.default_scheduler = UserRoundRobinScheduler
+        AlgorithmLoader.set_worker_pool_algorithm_dirs(
+            list(map(str, settings.SCHEDULER_WORKER_POOL_ALGORITHM_DIRS))
+        )
+        DatasetShmCache.set_memory_limit(settings.EXECUTION_DATASET_CACHE_SIZE)
+        # with a scheduler daemon, all processes of the webserver share its scheduler
+        Scheduler.default_scheduler = (
+            create_local_scheduler
+            if settings.SCHEDULER_SOCKET_PATH is None
+            else create_scheduler_client
+        )
 
         # signal handler or shutting down the scheduler and all running processes
         signal.signal(signal.SIGTERM, hard_shutdown)
@@ -2,7 +2,9 @@ import os
 
 from backend.DatasetInfo import DatasetInfo
 from backend.task import TaskState
+from backend.task.cleaning.DatasetCleaning import DatasetCleaning
 from experiments.models.dataset import Dataset, CleaningState
+from experiments.services.scheduler import forget_task
 
 
 def cleaning_callback(
@@ -17,6 +19,9 @@ def cleaning_callback(
     @return: None
     """
 
+    if task_state.is_finished():
+        forget_task(DatasetCleaning, task_id)
+
     dataset: Dataset = Dataset.objects.get(pk=task_id)
     dataset.cleaning_progress = progress
 
@@ -1,8 +1,10 @@
 import os
 from pathlib import Path
+from typing import Optional, TypeVar
 
 from django.utils import timezone
 
+from backend.metric.MetricAggregator import MetricAggregator
 from backend.metric.MetricDataPointsAreOutliers import MetricDataPointsAreOutliers
 from backend.metric.MetricSubspaceOutlierAmount import MetricSubspaceOutlierAmount
 from backend.task import TaskState
@@ -13,6 +15,12 @@ from experiments.models.execution import (
     ExecutionStatus,
     get_result_path,
 )
+from experiments.services.scheduler import forget_task
+
+M = TypeVar("M", bound=MetricAggregator)
+
+METRIC_DIRECTORY_NAME = "metrics"
+"""The name of the directory of the metrics in the result of an execution"""
 
 
 def execution_callback(
@@ -29,6 +37,9 @@ def execution_callback(
     @return: None
     """
 
+    if task_state.is_finished():
+        forget_task(BackendExecution, task_id)
+
     if not Execution.objects.filter(pk=task_id).exists():
         return
 
@@ -56,9 +67,35 @@ def execution_callback(
     execution.save()
 
 
+def create_metric_aggregators() -> list[MetricAggregator]:
+    """
+    Creates the metrics a backend execution computes while its results come in,
+    which are written by the metric callback.
+    @return: The metrics to register at the backend execution.
+    """
+    return [MetricDataPointsAreOutliers(), MetricSubspaceOutlierAmount()]
+
+
+def get_metric_aggregator(be: BackendExecution, metric_type: type[M]) -> Optional[M]:
+    """
+    @param be: The backend execution the metric is registered at.
+    @param metric_type: The type of the metric.
+    @return: The metric of the given type registered at the backend execution, None if
+    there is none (e.g. as the execution was scheduled before metrics were registered).
+    """
+    for metric_aggregator in be.metric_aggregators:
+        if isinstance(metric_aggregator, metric_type):
+            return metric_aggregator
+    return None
+
+
 def generate_datapoints_metric(metric_dir: Path, be: BackendExecution):
     assert os.path.isdir(metric_dir)
     metric_result_path = metric_dir / "datapoints_metric.csv"
+    metric_aggregator = get_metric_aggregator(be, MetricDataPointsAreOutliers)
+    if metric_aggregator is not None:
+        metric_aggregator.write_result(str(metric_result_path))
+        return
     metric = MetricDataPointsAreOutliers(indices_mapping=be.dataset_indices)
     metric.compute_metric(
         metric_result_path=str(metric_result_path),
@@ -69,6 +106,10 @@ def generate_datapoints_metric(metric_dir: Path, be: BackendExecution):
 def generate_subspace_outlier_metric(metric_dir: Path, be: BackendExecution):
     assert os.path.isdir(metric_dir)
     metric_result_path = metric_dir / "subspace_outliers.csv"
+    metric_aggregator = get_metric_aggregator(be, MetricSubspaceOutlierAmount)
+    if metric_aggregator is not None:
+        metric_aggregator.write_result(str(metric_result_path))
+        return
     metric = MetricSubspaceOutlierAmount()
     metric.compute_metric(
         metric_result_path=str(metric_result_path),
@@ -89,9 +130,10 @@ def metric_callback(be: BackendExecution) -> None:
         return
 
     execution = Execution.objects.get(pk=execution_pk)
-    metric_dir = Path(get_result_path(execution)) / "metrics"
+    metric_dir = Path(get_result_path(execution)) / METRIC_DIRECTORY_NAME
     assert os.path.isdir(metric_dir.parent)
-    os.makedirs(metric_dir)
+    # the metrics may have been computed partially before the scheduler restarted
+    os.makedirs(metric_dir, exist_ok=True)
 
     generate_datapoints_metric(metric_dir, be)
     generate_subspace_outlier_metric(metric_dir, be)
@@ -77,6 +77,8 @@ class ExecutionCreateForm(forms.ModelForm[Execution]):
             "subspaces_max",
             "subspace_amount",
             "subspace_generation_seed",
+            "algorithm_timeout",
+            "timeout",
         )
         widgets = {
             "subspaces_min": forms.NumberInput(attrs={
@@ -87,5 +89,11 @@ class ExecutionCreateForm(forms.ModelForm[Execution]):
                 "placeholder": "amount", "class": "form-control"}),
             "subspace_generation_seed": forms.NumberInput(
                 attrs={"placeholder": "random", "class": "form-control"}
-            )
+            ),
+            "algorithm_timeout": forms.NumberInput(
+                attrs={"placeholder": "default", "class": "form-control"}
+            ),
+            "timeout": forms.NumberInput(
+                attrs={"placeholder": "default", "class": "form-control"}
+            ),
         }
@@ -2,15 +2,23 @@ from typing import Any, Optional
 
 from django.core.management.base import BaseCommand
 
+from backend.task.execution.core.Execution import Execution as BackendExecution
 from experiments.models.managers import ExecutionManager
+from experiments.services.scheduler import get_task_journal
 
 
 class Command(BaseCommand):
-    help = "Marks all running executions as crashed"
+    help = (
+        "Marks all running executions as crashed, "
+        "except for the ones the scheduler daemon resumes"
+    )
 
     def handle(self, *args: Any, **options: Any) -> Optional[str]:
         self.stdout.write("Marking running executions as crashed...", ending="")
         self.stdout.flush()
-        ExecutionManager.mark_running_executions_as_crashed()
+        journal = get_task_journal()
+        ExecutionManager.mark_running_executions_as_crashed(
+            set() if journal is None else journal.get_task_ids(BackendExecution)
+        )
         self.stdout.write(self.style.SUCCESS(" OK"))
         return None
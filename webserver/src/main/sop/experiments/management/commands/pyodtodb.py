@@ -109,6 +109,19 @@ _PYOD_ALGORITHMS = [
 ]
 
 
+def get_pyod_module_names(include_neural_networks: bool = False) -> list[str]:
+    """Returns the names of the pyod library modules of the algorithms added by this
+    command, importing them imports the dependencies of these algorithms.
+    Neural network algorithms are left out by default, as they import frameworks
+    like torch or tensorflow, which start threads on import"""
+    return [
+        "pyod.models." + os.path.splitext(algo.file_name)[0]
+        for algo in _PYOD_ALGORITHMS
+        if include_neural_networks
+        or algo.group != Algorithm.AlgorithmGroup.NEURAL_NETWORKS
+    ]
+
+
 def _rename_algorithm_file_if_needed(
     pyod_algo: _PyodAlgorithm, pyod_models_root: Path
 ) -> None:
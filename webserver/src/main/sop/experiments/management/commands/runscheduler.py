@@ -0,0 +1,48 @@
+import signal
+import types
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.scheduler.SchedulerDaemon import SchedulerDaemon
+from experiments.services.scheduler import (
+    create_local_scheduler,
+    get_scheduler_authkey,
+    resume_journaled_tasks,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs the scheduler daemon that all webserver processes submit their tasks to"
+    )
+
+    def handle(self, *args: Any, **options: Any) -> Optional[str]:
+        if settings.SCHEDULER_SOCKET_PATH is None:
+            raise CommandError("SCHEDULER_SOCKET_PATH is not set")
+        scheduler = create_local_scheduler()
+        try:
+            daemon = SchedulerDaemon(
+                scheduler, str(settings.SCHEDULER_SOCKET_PATH), get_scheduler_authkey()
+            )
+        except RuntimeError as e:
+            scheduler.hard_shutdown()
+            raise CommandError(str(e))
+
+        def stop(signum: int, frame: types.FrameType) -> None:
+            daemon.stop()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        self.stdout.write(f"Resumed {resume_journaled_tasks()} interrupted tasks")
+        self.stdout.write(
+            self.style.SUCCESS(f"Scheduler daemon listening on {daemon.address}")
+        )
+        self.stdout.flush()
+        try:
+            daemon.serve_forever()
+        finally:
+            scheduler.hard_shutdown()
+        self.stdout.write("Scheduler daemon stopped")
+        return None
@@ -0,0 +1,73 @@
+import os
+import signal
+import tempfile
+import types
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from backend.scheduler.WorkerAgent import WorkerAgent
+from backend.scheduler.WorkerLimits import WorkerLimits
+from experiments.services.scheduler import get_scheduler_authkey
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs a worker agent that executes the algorithms of experiments on this host "
+        "for the scheduler daemon listening on the given address"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "address",
+            help="The host and port of the scheduler, e.g. scheduler.local:7711",
+        )
+        parser.add_argument(
+            "--slots",
+            type=int,
+            default=WorkerLimits.get_cpu_count(),
+            help="The number of algorithms to run at once (default: the CPU count)",
+        )
+        parser.add_argument(
+            "--cache-size",
+            type=int,
+            default=1 << 30,
+            help="The bytes of datasets and algorithms kept for later executions",
+        )
+        parser.add_argument(
+            "--work-dir",
+            default=os.path.join(tempfile.gettempdir(), "sop_worker_agent"),
+            help="The directory the received algorithms are stored in",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> Optional[str]:
+        host, _, port = options["address"].rpartition(":")
+        if not host or not port.isdigit():
+            raise CommandError(f"{options['address']} is not of the form host:port")
+        if options["slots"] < 1:
+            raise CommandError("--slots has to be positive")
+        agent = WorkerAgent(
+            (host, int(port)),
+            get_scheduler_authkey(),
+            options["work_dir"],
+            options["slots"],
+            options["cache_size"],
+            WorkerLimits(settings.SCHEDULER_WORKER_THREADS),
+        )
+
+        def stop(signum: int, frame: types.FrameType) -> None:
+            agent.stop()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Worker agent running {options['slots']} slots "
+                f"for the scheduler on {options['address']}"
+            )
+        )
+        self.stdout.flush()
+        agent.serve_forever()
+        self.stdout.write("Worker agent stopped")
+        return None
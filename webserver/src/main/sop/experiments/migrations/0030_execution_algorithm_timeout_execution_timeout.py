@@ -0,0 +1,36 @@
+# Generated by Django 4.0.7 on 2026-10-18 09:12
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("experiments", "0029_alter_algorithm_path_alter_dataset_path_cleaned_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="execution",
+            name="algorithm_timeout",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text="Seconds each algorithm may run on a subspace before it is "
+                "stopped, empty for the default",
+                null=True,
+                validators=[django.core.validators.MinValueValidator(1)],
+            ),
+        ),
+        migrations.AddField(
+            model_name="execution",
+            name="timeout",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text="Seconds the whole execution may run before its remaining "
+                "algorithms are stopped, empty for the default",
+                null=True,
+                validators=[django.core.validators.MinValueValidator(1)],
+            ),
+        ),
+    ]
@@ -4,6 +4,7 @@ from enum import Enum, auto
 from typing import Any
 
 from django.conf import settings
+from django.core.validators import MinValueValidator
 from django.db import models
 
 from experiments.models.experiment import Experiment
@@ -78,6 +79,20 @@ class Execution(models.Model):
     subspace_generation_seed = models.PositiveBigIntegerField(blank=True)
     algorithm_parameters = models.JSONField()
     result_path = models.FileField(max_length=255)
+    algorithm_timeout = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        validators=(MinValueValidator(1),),
+        help_text="Seconds each algorithm may run on a subspace before it is "
+        "stopped, empty for the default",
+    )
+    timeout = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        validators=(MinValueValidator(1),),
+        help_text="Seconds the whole execution may run before its remaining "
+        "algorithms are stopped, empty for the default",
+    )
     objects: ExecutionManager = ExecutionManager.from_queryset(
         ExecutionQuerySet
     )()  # type: ignore
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
 from typing import TYPE_CHECKING
 
 from django.db import models
@@ -101,11 +102,16 @@ class ExecutionManager(models.Manager["Execution"]):
     """
 
     @staticmethod
-    def mark_running_executions_as_crashed():
+    def mark_running_executions_as_crashed(keep_running: Iterable[int] = ()):
+        """
+        Marks the running executions as crashed, e.g. after the server restarted.
+        @param keep_running: The primary keys of the running executions that are not
+        marked, as they are scheduled again.
+        """
         # must be done this way to avoid circular import issues
         from experiments.models.execution import Execution, ExecutionStatus  # noqa F811
 
-        for execution in Execution.objects.all():
+        for execution in Execution.objects.exclude(pk__in=keep_running):
             if execution.is_running:
                 execution.status = ExecutionStatus.CRASHED.name
                 execution.save()
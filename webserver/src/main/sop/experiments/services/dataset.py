@@ -1,14 +1,18 @@
 import os
 import uuid
+from typing import Optional
 
 from django.conf import settings
 from django.core.files.uploadedfile import UploadedFile
 from django.db.models.fields.files import FieldFile
-from django.http import HttpResponse
+from django.http import HttpRequest
+from django.http.response import HttpResponseBase
 
 from backend.task.cleaning.DatasetCleaning import DatasetCleaning
 from experiments.callback import DatasetCallbacks
 from experiments.models import Dataset
+from experiments.services.download import get_file_download_response
+from experiments.services.scheduler import schedule_task
 
 
 def save_dataset(file: UploadedFile) -> str:
@@ -68,18 +72,19 @@ def schedule_backend(dataset: Dataset) -> None:
     )
 
     # start the cleaning
-    dataset_cleaning.schedule()
+    schedule_task(dataset_cleaning)
 
 
-def get_download_response(file: FieldFile, download_name: str) -> HttpResponse:
+def get_download_response(
+    file: FieldFile, download_name: str, request: Optional[HttpRequest] = None
+) -> HttpResponseBase:
     """
-    Generates a HttpResponse for a download with the content of a given FieldFile with a
-    given name for the downloaded file.
+    Generates a response for a download with the content of a given FieldFile with a
+    given name for the downloaded file, which streams the file (see
+    get_file_download_response).
     @param file: The file which should be downloaded.
     @param download_name: The default name of the downloaded file.
-    @return: A HttpResponse with the download.
+    @param request: The HttpRequest of the download, None to send the whole file.
+    @return: A response with the download.
     """
-    response = HttpResponse(file.read())
-    response["Content-Type"] = "text/plain"
-    response["Content-Disposition"] = f"attachment; filename={download_name}"
-    return response
+    return get_file_download_response(file.path, download_name, request)
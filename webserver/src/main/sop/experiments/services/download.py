@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import os
+import re
+import zipfile
+from collections.abc import Callable, Iterable, Iterator
+from typing import IO, Optional
+
+from django.conf import settings
+from django.http import (
+    FileResponse,
+    HttpRequest,
+    HttpResponse,
+    StreamingHttpResponse,
+)
+from django.http.response import HttpResponseBase
+
+DOWNLOAD_CHUNK_SIZE = 1 << 16
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+ZipMember = tuple[str, int, Callable[[], IO[bytes]]]
+"""The name of a member of a zip-file, its size and a function opening its content"""
+
+
+def get_file_download_response(
+    path: str,
+    download_name: str,
+    request: Optional[HttpRequest] = None,
+    content_type: str = "text/plain",
+) -> HttpResponseBase:
+    """
+    Generates a response for a download of the file at the given path, which streams
+    the file instead of reading it into memory. If DOWNLOAD_SENDFILE_HEADER is set, the
+    web server in front of django sends the file instead. Otherwise, a single byte
+    range of the file can be requested with the Range header of the request.
+    @param path: The absolute path of the file which should be downloaded.
+    @param download_name: The default name of the downloaded file.
+    @param request: The HttpRequest of the download, None to send the whole file.
+    @param content_type: The content type of the download.
+    @return: A response with the download.
+    """
+    response: HttpResponseBase
+    if settings.DOWNLOAD_SENDFILE_HEADER is not None:
+        response = HttpResponse()
+        response[settings.DOWNLOAD_SENDFILE_HEADER] = get_sendfile_location(path)
+    else:
+        size = os.path.getsize(path)
+        byte_range = None
+        if request is not None:
+            byte_range = parse_range(request.META.get("HTTP_RANGE"), size)
+        if byte_range is None:
+            response = FileResponse(open(path, "rb"))
+            response.block_size = DOWNLOAD_CHUNK_SIZE
+        elif byte_range[0] > byte_range[1]:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                read_file_range(path, start, end), status=206
+            )
+            response["Content-Range"] = f"bytes {start}-{end}/{size}"
+            response["Content-Length"] = str(end - start + 1)
+        response["Accept-Ranges"] = "bytes"
+    response["Content-Type"] = content_type
+    response["Content-Disposition"] = f"attachment; filename={download_name}"
+    return response
+
+
+def get_sendfile_location(path: str) -> str:
+    """
+    Converts the path of a downloaded file to the value of the DOWNLOAD_SENDFILE_HEADER.
+    @param path: The absolute path of the downloaded file.
+    @return: The path itself for X-Sendfile, or the internal location of the file
+    (DOWNLOAD_ACCEL_REDIRECT_LOCATION followed by its path in the MEDIA_ROOT)
+    for X-Accel-Redirect.
+    """
+    if settings.DOWNLOAD_SENDFILE_HEADER != "X-Accel-Redirect":
+        return path
+    relative_path = os.path.relpath(path, settings.MEDIA_ROOT).replace(os.sep, "/")
+    return settings.DOWNLOAD_ACCEL_REDIRECT_LOCATION.rstrip("/") + "/" + relative_path
+
+
+def parse_range(range_header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """
+    Parses the Range header of a request of a single byte range.
+    @param range_header: The value of the Range header, None if it is missing.
+    @param size: The size of the requested file in bytes.
+    @return: The first and the last byte of the range, (size, size - 1) if it is not
+    satisfiable. None if the whole file should be sent, as there is no header or it
+    requests several ranges (or is invalid).
+    """
+    match = None if range_header is None else _RANGE_PATTERN.match(range_header)
+    if match is None or match.group(1) == match.group(2) == "":
+        return None
+    first, last = match.group(1), match.group(2)
+    if first == "":
+        # the last bytes of the file
+        if int(last) == 0:
+            return size, size - 1
+        return max(size - int(last), 0), size - 1
+    start = int(first)
+    if last != "" and int(last) < start:
+        return None
+    if start >= size:
+        return size, size - 1
+    return start, size - 1 if last == "" else min(int(last), size - 1)
+
+
+def read_file_range(path: str, start: int, end: int) -> Iterator[bytes]:
+    """
+    @return: The bytes from start to end (inclusive) of the file at the given path,
+    in chunks.
+    """
+    with open(path, "rb") as file:
+        file.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = file.read(min(remaining, DOWNLOAD_CHUNK_SIZE))
+            if not chunk:
+                return
+            remaining -= len(chunk)
+            yield chunk
+
+
+def get_zip_download_response(
+    members: Iterable[ZipMember], download_name: str, compression_level: int = 0
+) -> StreamingHttpResponse:
+    """
+    Generates a response for a download of a zip-file, which is generated while it is
+    sent, without storing it in memory or on the disk.
+    @param members: The members of the zip-file.
+    @param download_name: The default name of the downloaded file.
+    @param compression_level: The DEFLATE level of the members from 1 to 9 or -1,
+    0 to store them uncompressed.
+    @return: A response with the download.
+    """
+    response = StreamingHttpResponse(stream_zip(members, compression_level))
+    response["Content-Type"] = "application/zip"
+    response["Content-Disposition"] = f"attachment; filename={download_name}"
+    return response
+
+
+class _ZipStream:
+    """
+    The file of a zip-file which is streamed, that collects the bytes written to it
+    until they are sent. As it can not seek, zipfile writes the sizes of the members
+    after their content.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = list()
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def pop(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(
+    members: Iterable[ZipMember], compression_level: int = 0
+) -> Iterator[bytes]:
+    """
+    Generates a zip-file in chunks, reading the content of each member in chunks.
+    @param members: The members of the zip-file.
+    @param compression_level: The DEFLATE level of the members from 1 to 9 or -1,
+    0 to store them uncompressed.
+    @return: The bytes of the zip-file.
+    """
+    stream = _ZipStream()
+    compression = zipfile.ZIP_STORED if compression_level == 0 else zipfile.ZIP_DEFLATED
+    with zipfile.ZipFile(
+        stream,  # type: ignore
+        "w",
+        compression=compression,
+        allowZip64=True,
+        compresslevel=None if compression_level == 0 else compression_level,
+    ) as zip_file:
+        for name, size, open_member in members:
+            # like zipfile does for members of a known size
+            zip64 = size * 1.05 > zipfile.ZIP64_LIMIT
+            with open_member() as source, zip_file.open(
+                name, "w", force_zip64=zip64
+            ) as target:
+                while chunk := source.read(DOWNLOAD_CHUNK_SIZE):
+                    target.write(chunk)
+                    if data := stream.pop():
+                        yield data
+    # the remaining content and the central directory
+    yield stream.pop()
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
-from typing import Optional, Any
+import json
+import zipfile
+from collections.abc import Iterator
+from functools import partial
+from typing import Optional
 
 from django.conf import settings
 from django.db.models import QuerySet
-from django.http import HttpRequest, HttpResponse
+from django.http import HttpRequest
+from django.http.response import HttpResponseBase, StreamingHttpResponse
 
 from backend.task.execution.ParameterizedAlgorithm import ParameterizedAlgorithm
 from backend.task.execution.core.Execution import Execution as BackendExecution
@@ -18,6 +23,12 @@ from experiments.callback import ExecutionCallbacks
 from experiments.models import Experiment, Execution
 from experiments.models.algorithm import HyperparameterTypes, Algorithm
 from experiments.models.execution import get_result_path
+from experiments.services.download import (
+    ZipMember,
+    get_file_download_response,
+    get_zip_download_response,
+)
+from experiments.services.scheduler import schedule_task
 
 
 def get_params_out_of_form(
@@ -68,23 +79,81 @@ def get_params_out_of_form(
         return True, dikt
 
 
-def get_download_http_response(data: Any, file_name: str) -> HttpResponse:
-    response = HttpResponse(data)
-    response["Content-Type"] = "text/plain"
-    response["Content-Disposition"] = f"attachment; filename={file_name}"
-    return response
+def get_execution_result(
+    execution: Execution, request: Optional[HttpRequest] = None
+) -> HttpResponseBase:
+    """
+    Generates a response for a download with the content of the result file of the
+    given execution, which streams the file (see get_file_download_response).
+    @param execution: The execution of which the result file shall be downloaded.
+    @param request: The HttpRequest of the download, None to send the whole file.
+    @return: A response with the download.
+    """
+    return get_file_download_response(
+        execution.result_path.path, "result.zip", request, "application/zip"
+    )
 
 
-def get_execution_result(execution: Execution) -> HttpResponse:
+def get_execution_algorithm_result(
+    execution: Execution, algorithm_directory: str
+) -> Optional[StreamingHttpResponse]:
     """
-    Generates a HttpResponse for a download with the content of the result file of the
-    given execution.
-    @param execution: The execution of which the result file shall be downloaded.
-    @return: A HttpResponse with the download.
+    Generates a response for a download of the results of one algorithm of the given
+    execution, with the files at the top of the result (e.g. its details) and its
+    metrics. The zip-file of the download is generated from the result file while it
+    is sent, compressed with the EXECUTION_ZIP_COMPRESSION_LEVEL.
+    @param execution: The execution of which the results shall be downloaded.
+    @param algorithm_directory: The name of the directory of the algorithm in the
+    result file.
+    @return: A StreamingHttpResponse with the download, or None if the directory is
+    not the one of an algorithm of the execution (according to its details).
+    """
+    path = execution.result_path.path
+    with zipfile.ZipFile(path) as zip_file:
+        infos = [info for info in zip_file.infolist() if not info.is_dir()]
+        details = [
+            info
+            for info in infos
+            if info.filename.count("/") == 1
+            and info.filename.endswith("/details.json")
+        ]
+        if len(details) != 1:
+            return None
+        try:
+            algorithms = json.loads(zip_file.read(details[0]))["algorithms"]
+            algorithm_directories = {
+                algorithm["directory_name"] for algorithm in algorithms
+            }
+        except (ValueError, KeyError, TypeError):
+            return None
+    if algorithm_directory not in algorithm_directories:
+        return None
+    included_directories = (
+        algorithm_directory,
+        ExecutionCallbacks.METRIC_DIRECTORY_NAME,
+    )
+    infos = [
+        info
+        for info in infos
+        if info.filename.count("/") == 1
+        or info.filename.split("/")[1] in included_directories
+    ]
+    return get_zip_download_response(
+        iter_zip_members(path, infos),
+        f"result_{algorithm_directory}.zip",
+        settings.EXECUTION_ZIP_COMPRESSION_LEVEL,
+    )
+
+
+def iter_zip_members(path: str, infos: list[zipfile.ZipInfo]) -> Iterator[ZipMember]:
+    """
+    @param path: The path of a zip-file.
+    @param infos: The members of the zip-file to read.
+    @return: The members, to be read while the zip-file is open.
     """
-    file_name = "result.zip"
-    with execution.result_path as file:
-        return get_download_http_response(file.read(), file_name)
+    with zipfile.ZipFile(path) as zip_file:
+        for info in infos:
+            yield info.filename, info.file_size, partial(zip_file.open, info)
 
 
 def schedule_backend(execution: Execution) -> Optional[dict[str, list[str]]]:
@@ -143,7 +212,16 @@ def schedule_backend(execution: Execution) -> Optional[dict[str, list[str]]]:
         subspace_generation=subspace_generation_description,
         algorithms=parameterized_algorithms,
         metric_callback=ExecutionCallbacks.metric_callback,
+        algorithm_timeout=execution.algorithm_timeout
+        or settings.EXECUTION_ALGORITHM_TIMEOUT,
+        timeout=execution.timeout or settings.EXECUTION_TIMEOUT,
+        column_major=settings.EXECUTION_COLUMN_MAJOR,
+        export_csv=settings.EXECUTION_EXPORT_CSV,
+        shared_result_limit=settings.EXECUTION_SHARED_RESULT_LIMIT,
+        metric_aggregators=ExecutionCallbacks.create_metric_aggregators(),
+        zip_compression_level=settings.EXECUTION_ZIP_COMPRESSION_LEVEL,
+        zip_threads=settings.EXECUTION_ZIP_THREADS,
     )
 
-    backend_execution.schedule()
+    schedule_task(backend_execution)
     return None
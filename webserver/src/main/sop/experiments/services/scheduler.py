@@ -0,0 +1,157 @@
+import functools
+import hashlib
+from logging import warning
+from typing import Optional
+
+from django.conf import settings
+
+from authentication.models import User
+from backend.scheduler.FairShareScheduler import FairShareScheduler
+from backend.scheduler.MemoryBudget import MemoryBudget
+from backend.scheduler.Scheduler import Scheduler
+from backend.scheduler.SchedulerClient import SchedulerClient
+from backend.scheduler.UserRoundRobinScheduler import UserRoundRobinScheduler
+from backend.task.Task import Task
+from backend.task.TaskJournal import TaskJournal
+from backend.task.cleaning.DatasetCleaning import DatasetCleaning
+from backend.task.execution.core.Execution import Execution as BackendExecution
+from experiments.management.commands.pyodtodb import get_pyod_module_names
+from experiments.models import Dataset, Execution
+from experiments.models.execution import ExecutionStatus
+
+
+def get_scheduler_authkey() -> bytes:
+    """
+    Derives the key the scheduler daemon and its clients authenticate each other with.
+    @return: The key as bytes.
+    """
+    return hashlib.sha256(b"scheduler:" + settings.SECRET_KEY.encode()).digest()
+
+
+def get_user_scheduler_weight(user_id: int) -> float:
+    """
+    Gets the weight of a user for the fair share scheduling policy.
+    @param user_id: The ID of the user.
+    @return: The weight of the user, 1 if the user does not exist (anymore).
+    """
+    weight = (
+        User.objects.filter(pk=user_id)
+        .values_list("scheduler_weight", flat=True)
+        .first()
+    )
+    return 1.0 if weight is None else weight
+
+
+def create_local_scheduler() -> Scheduler:
+    """
+    Creates the scheduler that runs tasks in this process and its child processes,
+    using the policy selected by SCHEDULER_POLICY.
+    @return: The created scheduler.
+    """
+    if settings.SCHEDULER_POLICY == "fair_share":
+        scheduler_class = functools.partial(
+            FairShareScheduler,
+            weight_provider=get_user_scheduler_weight,
+            usage_half_life=settings.SCHEDULER_FAIR_SHARE_HALF_LIFE,
+        )
+    elif settings.SCHEDULER_POLICY == "round_robin":
+        scheduler_class = UserRoundRobinScheduler
+    else:
+        raise ValueError(f"unknown scheduler policy {settings.SCHEDULER_POLICY}")
+    return scheduler_class(
+        use_worker_pool=settings.SCHEDULER_USE_WORKER_POOL,
+        worker_max_tasks=settings.SCHEDULER_WORKER_MAX_TASKS,
+        use_zygote=settings.SCHEDULER_USE_ZYGOTE,
+        zygote_preload_modules=settings.SCHEDULER_ZYGOTE_PRELOAD_MODULES
+        + get_pyod_module_names(settings.SCHEDULER_ZYGOTE_PRELOAD_NEURAL_NETWORKS),
+        memory_limit=settings.SCHEDULER_MEMORY_LIMIT
+        or MemoryBudget.get_memory_limit(settings.SCHEDULER_MEMORY_LIMIT_FRACTION),
+        worker_count=settings.SCHEDULER_WORKER_COUNT,
+        worker_threads=settings.SCHEDULER_WORKER_THREADS,
+        pin_workers=settings.SCHEDULER_PIN_WORKERS,
+        remote_worker_address=settings.SCHEDULER_REMOTE_WORKER_ADDRESS,
+        remote_worker_authkey=get_scheduler_authkey(),
+        event_loop=settings.SCHEDULER_EVENT_LOOP,
+        priority_aging=settings.SCHEDULER_PRIORITY_AGING,
+    )
+
+
+def create_scheduler_client() -> Scheduler:
+    """
+    Creates a scheduler that forwards all tasks to the scheduler daemon
+    started by the runscheduler command.
+    @return: The created scheduler.
+    """
+    return SchedulerClient(str(settings.SCHEDULER_SOCKET_PATH), get_scheduler_authkey())
+
+
+def get_task_journal() -> Optional[TaskJournal]:
+    """
+    Gets the journal of the tasks that did not finish yet, which the scheduler daemon
+    schedules again when it starts.
+    @return: The journal, None if tasks are not journaled as there is no scheduler
+    daemon or SCHEDULER_JOURNAL_PATH is not set.
+    """
+    if settings.SCHEDULER_SOCKET_PATH is None:
+        return None
+    if settings.SCHEDULER_JOURNAL_PATH is None:
+        return None
+    return TaskJournal(str(settings.SCHEDULER_JOURNAL_PATH))
+
+
+def schedule_task(task: Task) -> None:
+    """
+    Schedules a backend task, journaling it first if tasks are journaled.
+    @param task: The task to schedule.
+    @return: None
+    """
+    journal = get_task_journal()
+    if journal is not None:
+        journal.record(task)
+    task.schedule()
+
+
+def forget_task(task_type: type[Task], task_id: int) -> None:
+    """
+    Removes a task from the journal, as it finished or was aborted.
+    @param task_type: The type of the backend task.
+    @param task_id: The ID of the backend task.
+    @return: None
+    """
+    journal = get_task_journal()
+    if journal is not None:
+        journal.remove(task_type, task_id)
+
+
+def resume_journaled_tasks() -> int:
+    """
+    Schedules the journaled tasks again, to be called when the scheduler daemon starts.
+    The tasks of deleted executions and datasets are removed from the journal instead,
+    executions whose tasks can not be resumed are marked as crashed.
+    @return: The number of resumed tasks.
+    """
+    journal = get_task_journal()
+    if journal is None:
+        return 0
+    models = {BackendExecution: Execution, DatasetCleaning: Dataset}
+    lost_executions = journal.get_task_ids(BackendExecution)
+    resumed = 0
+    for task in journal.load():
+        model = next(m for t, m in models.items() if isinstance(task, t))
+        if not model.objects.filter(pk=task.task_id).exists():
+            journal.remove(type(task), task.task_id)
+            continue
+        try:
+            task.schedule()
+        except Exception as e:
+            warning(f"could not resume {type(task).__name__} {task.task_id}: {e!r}")
+            journal.remove(type(task), task.task_id)
+            continue
+        if model is Execution:
+            lost_executions.discard(task.task_id)
+        resumed += 1
+    for execution in Execution.objects.filter(pk__in=lost_executions):
+        if execution.is_running:
+            execution.status = ExecutionStatus.CRASHED.name
+            execution.save()
+    return resumed
@@ -6,9 +6,13 @@ from typing import Any
 from django.db.models.signals import post_delete
 from django.dispatch import receiver
 
+from backend.DataIO import DataIO
 from backend.scheduler.Scheduler import Scheduler
+from backend.task.cleaning.DatasetCleaning import DatasetCleaning
+from backend.task.execution.core.Execution import Execution as BackendExecution
 from experiments.models import Algorithm, Dataset, Execution
 from experiments.models.execution import get_result_path
+from experiments.services.scheduler import forget_task
 
 
 def _delete_file(path_name: str) -> None:
@@ -40,9 +44,11 @@ def delete_algorithm_file(
 def delete_dataset_file(
         sender: Dataset, instance: Dataset, *args: Any, **kwargs: Any
 ) -> None:
+    forget_task(DatasetCleaning, instance.pk)
     if instance.path_original:
         _delete_file(instance.path_original.path)
     if instance.path_cleaned:
+        _delete_file(DataIO.get_binary_path(instance.path_cleaned.path))
         _delete_file(instance.path_cleaned.path)
 
 
@@ -52,6 +58,7 @@ def delete_result_file(
 ) -> None:
     if instance.is_running and instance.pk is not None:
         Scheduler.get_instance().abort_by_task(task_id=instance.pk)
+        forget_task(BackendExecution, instance.pk)
         working_directory = get_result_path(instance)
         if os.path.isdir(working_directory):
             shutil.rmtree(working_directory)
@@ -21,6 +21,7 @@ from experiments.views.execution import (
     ExecutionDeleteView,
     ExecutionDuplicateView,
     download_execution_result,
+    download_execution_algorithm_result,
     get_execution_progress,
     restart_execution,
 )
@@ -32,6 +33,7 @@ from experiments.views.experiment import (
     ExperimentDuplicateView,
     download_all_execution_results,
 )
+from experiments.views.metrics import metrics
 from experiments.views.request_scheduler_dump import request_scheduler_dump
 from experiments.views.uploadhandler import upload_progress
 
@@ -153,6 +155,12 @@ urlpatterns = [
         download_execution_result,
         name="execution_download_result",
     ),
+    path(
+        "experiment/<int:experiment_pk>/execution/<int:pk>/download_results/"
+        "<str:algorithm>/",
+        download_execution_algorithm_result,
+        name="execution_download_algorithm_result",
+    ),
     path(
         "experiment/<int:experiment_pk>/execution/<int:pk>/restart/",
         restart_execution,
@@ -162,5 +170,7 @@ urlpatterns = [
     # upload progress
     path("upload_progress/", upload_progress, name="upload-progress"),
     # Request scheduler dump
-    path("request_sched_dump/", request_scheduler_dump, name="request_scheduler_dump")
+    path("request_sched_dump/", request_scheduler_dump, name="request_scheduler_dump"),
+    # Metrics of the scheduler
+    path("metrics/", metrics, name="metrics"),
 ]
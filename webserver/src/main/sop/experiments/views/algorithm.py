@@ -6,7 +6,7 @@ from typing import Optional, Any
 from django.contrib import messages
 from django.core.files.uploadedfile import InMemoryUploadedFile
 from django.http import HttpRequest, HttpResponseRedirect
-from django.http.response import HttpResponse
+from django.http.response import HttpResponse, HttpResponseBase
 from django.urls import reverse_lazy
 from django.views.generic import (
     CreateView,
@@ -119,7 +119,7 @@ class AlgorithmEditView(
 
 def download_algorithm(
     request: HttpRequest, pk: int
-) -> Optional[HttpResponse | HttpResponseRedirect]:
+) -> Optional[HttpResponseBase]:
     """
     A function view that will let the user download a algorithm.
     @param request: The HTTPRequest, this will be given by django.
@@ -138,6 +138,7 @@ def download_algorithm(
                 reverse_lazy("admin:experiments_algorithm_changelist")
             )
 
-        with algorithm.path as file:
-            return get_download_response(file, f"{algorithm.display_name}.py")
+        return get_download_response(
+            algorithm.path, f"{algorithm.display_name}.py", request
+        )
     return None
@@ -7,6 +7,7 @@ from typing import Optional, Any
 from django.contrib import messages
 from django.forms.models import ModelForm
 from django.http import HttpResponse, HttpRequest, HttpResponseRedirect
+from django.http.response import HttpResponseBase
 from django.urls import reverse_lazy
 from django.views.generic import ListView, CreateView, UpdateView
 
@@ -149,7 +150,7 @@ class DatasetEditView(
 
 def download_uncleaned_dataset(
     request: HttpRequest, pk: int
-) -> Optional[HttpResponse | HttpResponseRedirect]:
+) -> Optional[HttpResponseBase]:
     """
     A function view to download the uncleaned csv of a dataset.
     @param request: The HTTPRequest, this will be given by django.
@@ -168,14 +169,15 @@ def download_uncleaned_dataset(
                 reverse_lazy("admin:experiments_dataset_changelist")
             )
 
-        with dataset.path_original as file:
-            return get_download_response(file, f"{dataset.display_name}.csv")
+        return get_download_response(
+            dataset.path_original, f"{dataset.display_name}.csv", request
+        )
     return None
 
 
 def download_cleaned_dataset(
     request: HttpRequest, pk: int
-) -> Optional[HttpResponse | HttpResponseRedirect]:
+) -> Optional[HttpResponseBase]:
     """
     A function view to download the cleaned csv of a dataset. This view asserts that the
     dataset is already cleaned. Calling this view with an uncleaned dataset will result
@@ -196,8 +198,9 @@ def download_cleaned_dataset(
                 reverse_lazy("admin:experiments_dataset_changelist")
             )
 
-        with dataset.path_cleaned as file:
-            return get_download_response(file, f"{dataset.display_name}_cleaned.csv")
+        return get_download_response(
+            dataset.path_cleaned, f"{dataset.display_name}_cleaned.csv", request
+        )
     return None
 
 
@@ -10,6 +10,7 @@ from django.http import (
     HttpResponse,
     HttpResponseServerError,
 )
+from django.http.response import HttpResponseBase
 from django.urls import reverse_lazy
 from django.views.generic import CreateView
 
@@ -18,7 +19,11 @@ from experiments.forms.create import ExecutionCreateForm
 from experiments.mixins import SingleObjectPermissionMixin
 from experiments.models import Execution, Experiment, Algorithm
 from experiments.models.execution import ExecutionStatus
-from experiments.services.execution import get_params_out_of_form, get_execution_result
+from experiments.services.execution import (
+    get_params_out_of_form,
+    get_execution_result,
+    get_execution_algorithm_result,
+)
 from experiments.services.execution import schedule_backend
 from experiments.views.generic import PostOnlyDeleteView
 
@@ -215,6 +220,8 @@ class ExecutionDuplicateView(SingleObjectPermissionMixin, ExecutionCreateView):
             form["subspaces_max"] = original.subspaces_max
             form["subspace_amount"] = original.subspace_amount
             form["subspace_generation_seed"] = original.subspace_generation_seed
+            form["algorithm_timeout"] = original.algorithm_timeout
+            form["timeout"] = original.timeout
         return form
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
@@ -237,7 +244,7 @@ class ExecutionDeleteView(
 
 def download_execution_result(
     request: HttpRequest, experiment_pk: int, pk: int
-) -> Optional[HttpResponse | HttpResponseRedirect]:
+) -> Optional[HttpResponseBase]:
     """
     A function view that will download an execution result. This view asserts that the
     execution has results located at the path in the result_path attribute of the
@@ -256,7 +263,37 @@ def download_execution_result(
         execution: Optional[Execution] = Execution.objects.filter(pk=pk).first()
         if execution is None:
             return HttpResponseRedirect(reverse_lazy("experiment_overview"))
-        return get_execution_result(execution)
+        return get_execution_result(execution, request)
+    else:
+        assert request.method in ("POST", "PUT")
+        return None
+
+
+def download_execution_algorithm_result(
+    request: HttpRequest, experiment_pk: int, pk: int, algorithm: str
+) -> Optional[HttpResponseBase]:
+    """
+    A function view that will download the results of one algorithm of an execution,
+    as a zip-file generated while it is sent. This view asserts that the execution
+    has results located at the path in the result_path attribute of the execution.
+
+    @param request: The HTTPRequest, this will be given by django.
+    @param experiment_pk: The primary key of the experiment of the execution.
+    @param pk: The primary key of the execution itself.
+    @param algorithm: The name of the directory of the algorithm in the result.
+    @return: If the request is valid and the given primary keys and algorithm are valid,
+    this returns a StreamingHttpResponse with the download. Otherwise, this returns a
+    redirect to the experiment overview. If this view is accessed with a POST request,
+    it will return None.
+    """
+    if request.method == "GET":
+        execution: Optional[Execution] = Execution.objects.filter(pk=pk).first()
+        response = None
+        if execution is not None:
+            response = get_execution_algorithm_result(execution, algorithm)
+        if response is None:
+            return HttpResponseRedirect(reverse_lazy("experiment_overview"))
+        return response
     else:
         assert request.method in ("POST", "PUT")
         return None
@@ -264,7 +301,7 @@ def download_execution_result(
 
 def download_execution_result_admin(
     request: HttpRequest, pk: int
-) -> Optional[HttpResponse | HttpResponseRedirect]:
+) -> Optional[HttpResponseBase]:
     """
     A function view that will download an execution result. This view asserts that the
     execution has results located at the path in the result_path attribute of the
@@ -284,7 +321,7 @@ def download_execution_result_admin(
             return HttpResponseRedirect(
                 reverse_lazy("admin:experiments_execution_changelist")
             )
-        return get_execution_result(execution)
+        return get_execution_result(execution, request)
     else:
         assert request.method in ("POST", "PUT")
         return None
@@ -1,13 +1,13 @@
 from __future__ import annotations
 
-import io
-import zipfile
+import os
+from functools import partial
 from pathlib import Path
 from typing import Any, Optional
 
 from django.contrib import messages
 from django.db import models
-from django.http import HttpResponse, HttpRequest
+from django.http import HttpResponse, HttpRequest, StreamingHttpResponse
 from django.urls import reverse_lazy
 from django.views.generic import ListView, CreateView, UpdateView
 
@@ -18,7 +18,7 @@ from experiments.mixins import SingleObjectPermissionMixin
 from experiments.models import Experiment, Dataset, Execution
 from experiments.models.algorithm import Algorithm
 from experiments.models.managers import ExperimentQuerySet
-from experiments.services.execution import get_download_http_response
+from experiments.services.download import ZipMember, get_zip_download_response
 from experiments.views.generic import PostOnlyDeleteView
 
 
@@ -162,7 +162,7 @@ class ExperimentDeleteView(
 
 def download_all_execution_results(
     request: HttpRequest, pk: int
-) -> Optional[HttpResponse]:
+) -> Optional[StreamingHttpResponse]:
     if not Experiment.objects.filter(pk=pk).exists():
         return None
 
@@ -172,17 +172,15 @@ def download_all_execution_results(
             experiment=experiment
         )
 
-        # create zip file in memory
-        in_memory_file = io.BytesIO()
-        with zipfile.ZipFile(in_memory_file, "a") as zip_file:
-            # save all results of finished executions in our zip file
-            for execution in executions:
-                if execution.has_result:
-                    with execution.result_path as file:
-                        result_name = Path(file.path).name
-                        zip_file.writestr(result_name, file.read())
-        # zip file is closed, we can send the data of it to the user
-        return get_download_http_response(
-            in_memory_file.getvalue(), f"{experiment.display_name}_results.zip"
+        # the zip file is generated while it is sent, the results are compressed already
+        members: list[ZipMember] = list()
+        for execution in executions:
+            if execution.has_result:
+                path = execution.result_path.path
+                members.append(
+                    (Path(path).name, os.path.getsize(path), partial(open, path, "rb"))
+                )
+        return get_zip_download_response(
+            members, f"{experiment.display_name}_results.zip"
         )
     return None
@@ -0,0 +1,31 @@
+import hmac
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_GET
+
+from backend.scheduler.Scheduler import Scheduler
+
+
+def _is_authorized(request: HttpRequest) -> bool:
+    """Staff members may read the metrics, as may scrapers sending
+    the METRICS_TOKEN setting as bearer token"""
+    if request.user.is_authenticated and request.user.is_staff:
+        return True
+    token = settings.METRICS_TOKEN
+    authorization = request.headers.get("Authorization", "")
+    return bool(token) and hmac.compare_digest(
+        authorization.encode(), f"Bearer {token}".encode()
+    )
+
+
+@require_GET
+def metrics(request: HttpRequest) -> HttpResponse:
+    """Returns the metrics of the scheduler and the tasks it runs
+    in the Prometheus text exposition format"""
+    if not _is_authorized(request):
+        return HttpResponseForbidden()
+    return HttpResponse(
+        Scheduler.get_instance().render_metrics(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
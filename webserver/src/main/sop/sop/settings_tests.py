@@ -12,7 +12,7 @@ https://docs.djangoproject.com/en/4.0/ref/settings/
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
-from typing import Final
+from typing import Final, Optional
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -147,6 +147,103 @@ ALGORITHM_ROOT_DIR: Final = MEDIA_ROOT / "algorithms"
 DATASET_ROOT_DIR: Final = MEDIA_ROOT / "datasets"
 EXPERIMENT_ROOT_DIR: Final = MEDIA_ROOT / "experiments"
 
+# Scheduler
+# Path of the Unix socket of the scheduler daemon started by the runscheduler command,
+# which all webserver processes submit their tasks to (None: each process schedules
+# its tasks itself, so only use a single webserver process then)
+SCHEDULER_SOCKET_PATH = None
+# Path of the sqlite journal of the tasks that did not finish yet, which the scheduler
+# daemon schedules again when it starts, e.g. after a deploy or a crash (None: running
+# executions are marked as crashed instead). Requires SCHEDULER_SOCKET_PATH
+SCHEDULER_JOURNAL_PATH = None
+# Keep a long-lived worker process per scheduler worker thread instead of forking
+# a new process for every execution element / subspace
+SCHEDULER_USE_WORKER_POOL = False
+# Replace long-lived worker processes after this many tasks (None: never)
+SCHEDULER_WORKER_MAX_TASKS = 500
+# Only algorithms in these directories run in the long-lived worker processes,
+# which are shared by tasks of different users. State an algorithm leaves behind
+# (module globals, monkey-patches, thread pool settings) affects later tasks there,
+# so all other (e.g. user provided) algorithms still run in a new process each
+SCHEDULER_WORKER_POOL_ALGORITHM_DIRS = [ALGORITHM_ROOT_DIR / "pyod_algorithms"]
+# Fork the long-lived worker processes from a zygote process that imports the modules
+# below and the pyod library algorithms once for all of them (requires the worker pool,
+# all other processes are still forked from the webserver process)
+SCHEDULER_USE_ZYGOTE = False
+SCHEDULER_ZYGOTE_PRELOAD_MODULES = ["numpy", "pandas", "sklearn", "pyod.models.base"]
+# Also preload the pyod neural network algorithms. This imports torch and tensorflow,
+# which start threads on import that do not survive forking the zygote
+SCHEDULER_ZYGOTE_PRELOAD_NEURAL_NETWORKS = False
+
+# Only start tasks whilst their total estimated memory use stays below this many bytes
+# (None: the fraction below of the memory limit of the container or machine)
+SCHEDULER_MEMORY_LIMIT = None
+SCHEDULER_MEMORY_LIMIT_FRACTION = 0.8
+
+# "round_robin": users take turns starting one task each
+# "fair_share": the user with the least computing time relative to their weight
+# (editable in the admin panel) is next, where past computing time counts half after
+# SCHEDULER_FAIR_SHARE_HALF_LIFE seconds
+SCHEDULER_POLICY = "round_robin"
+SCHEDULER_FAIR_SHARE_HALF_LIFE = 3600.0
+
+# Number of tasks running at once (None: the number of CPUs available to the container)
+SCHEDULER_WORKER_COUNT = None
+# Threads numpy, scikit-learn and torch may use within each task (None: no limit,
+# so that every task starts as many threads as there are CPUs)
+SCHEDULER_WORKER_THREADS = 1
+# Restrict the tasks of each scheduler worker thread to their own CPU
+SCHEDULER_PIN_WORKERS = False
+# Host and port the scheduler accepts worker agents on (see the runworkeragent command),
+# which run executions on other hosts. None to run all tasks on this host only
+SCHEDULER_REMOTE_WORKER_ADDRESS = None
+# Supervise all worker processes of this host with a single event loop thread instead
+# of a thread for each of them, which scales to hundreds of workers.
+# Does not use the worker pool
+SCHEDULER_EVENT_LOOP = False
+# Priority a waiting task gains per second it waits, so that the zipping and metrics of
+# finished executions are not starved by new work of the same user (priorities range
+# from 0 for executions to 50 for zipping). 0 to strictly prefer higher priorities
+SCHEDULER_PRIORITY_AGING = 0.0
+# Seconds an algorithm may run on a subspace, and an execution may run in total,
+# before they are stopped and reported as failed. Executions may override both.
+# None for no limit
+EXECUTION_ALGORITHM_TIMEOUT = None
+EXECUTION_TIMEOUT = None
+# Store the datasets of executions column by column in shared memory, so that subspaces
+# are extracted by copying whole columns, and subspaces of adjacent dimensions are not
+# copied at all. Helps with wide datasets
+EXECUTION_COLUMN_MAJOR = False
+# Bytes of shared memory kept for the cleaned datasets of finished executions, so that
+# later executions on the same datasets neither parse nor copy them again. The least
+# recently used datasets are evicted first. Running executions always share datasets
+EXECUTION_DATASET_CACHE_SIZE = 0
+# Zip a csv-file for each result of an algorithm on a subspace, as downloads did before.
+# Otherwise, the zip contains the results of each algorithm as a single matrix in the
+# .npy format, with a row for each subspace and a column for each datapoint
+EXECUTION_EXPORT_CSV = True
+# Bytes of shared memory all running executions together may allocate for the results
+# of their algorithms, which are then written to the disk at once when all of them
+# finished. Executions finding no room left write each result on its own. 0 to never
+# allocate it
+EXECUTION_SHARED_RESULT_LIMIT = 0
+# Level of compression of the zipped results of executions from 1 to 9, -1 for the
+# standard of zlib. 0 stores them uncompressed, which is fastest but makes the
+# downloads larger. The files are compressed on EXECUTION_ZIP_THREADS threads
+EXECUTION_ZIP_COMPRESSION_LEVEL = -1
+EXECUTION_ZIP_THREADS = 1
+
+# Header with which the web server in front of django sends downloaded files itself,
+# "X-Sendfile" (e.g. Apache with mod_xsendfile) or "X-Accel-Redirect" (nginx). The
+# latter requests the files at the internal location DOWNLOAD_ACCEL_REDIRECT_LOCATION
+# followed by their path in the MEDIA_ROOT. None to stream the files from django
+DOWNLOAD_SENDFILE_HEADER: Optional[str] = None
+DOWNLOAD_ACCEL_REDIRECT_LOCATION = "/protected-media/"
+
+# Bearer token that allows reading the metrics without being logged in as staff,
+# e.g. for a Prometheus scraper. None to only allow staff members
+METRICS_TOKEN = None
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.0/ref/settings/#default-auto-field
 
@@ -58,6 +58,15 @@ def _clear_media_root():
     assert len(os.listdir(settings.MEDIA_ROOT)) == 0
 
 
+def write_media_file(name: str, content: bytes) -> str:
+    """Writes a file into the MEDIA_ROOT, e.g. to be downloaded, and returns its path"""
+    path = os.path.join(settings.MEDIA_ROOT, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(content)
+    return path
+
+
 class MediaMixin(MixinBase):
     @classmethod
     def setUpClass(cls):
@@ -2,7 +2,7 @@ from unittest.mock import MagicMock, patch
 
 import django.test
 from django.contrib.admin.sites import AdminSite
-from django.http import HttpResponse, HttpResponseRedirect
+from django.http import FileResponse, HttpResponseRedirect
 from django.urls import reverse, reverse_lazy
 
 from authentication.models import User
@@ -12,7 +12,7 @@ from experiments.models.dataset import Dataset
 from experiments.models.execution import Execution, ExecutionStatus
 from experiments.models.experiment import Experiment
 from experiments.views.execution import download_execution_result_admin
-from tests.generic import AdminLoggedInMixin
+from tests.generic import AdminLoggedInMixin, MediaMixin, write_media_file
 
 
 class MockRequest:
@@ -22,7 +22,7 @@ class MockRequest:
 request = MockRequest()
 
 
-class ExecutionAdminTests(AdminLoggedInMixin, django.test.TestCase):
+class ExecutionAdminTests(AdminLoggedInMixin, MediaMixin, django.test.TestCase):
     @classmethod
     def setUpTestData(cls) -> None:
         super().setUpTestData()
@@ -100,16 +100,18 @@ class ExecutionAdminTests(AdminLoggedInMixin, django.test.TestCase):
         content = "Line 1\nLine 2\nLast Line"
         new_request = MagicMock()
         new_request.method = "GET"
+        new_request.META = {}
         objects_mock = MagicMock()
-        objects_mock.filter.return_value.first.return_value.result_path.__enter__.return_value.read.return_value = (
-            content
-        )
+        execution = objects_mock.filter.return_value.first.return_value
+        execution.result_path.path = write_media_file("file", bytes(content, "utf-8"))
         with patch.object(Execution, "objects", objects_mock):
             response = download_execution_result_admin(new_request, 1)
             self.assertIsNotNone(response)
-            assert isinstance(response, HttpResponse)
+            assert isinstance(response, FileResponse)
             self.assertEqual(response.status_code, 200)
-            self.assertEqual(response.content, bytes(content, "utf-8"))
+            self.assertEqual(
+                b"".join(response.streaming_content), bytes(content, "utf-8")
+            )
             self.assertEqual(
                 response["Content-Disposition"], "attachment; filename=result.zip"
             )
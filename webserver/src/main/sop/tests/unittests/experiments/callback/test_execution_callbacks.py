@@ -3,7 +3,10 @@ from unittest import mock
 
 import django.test
 
+from backend.metric.MetricDataPointsAreOutliers import MetricDataPointsAreOutliers
+from backend.metric.MetricSubspaceOutlierAmount import MetricSubspaceOutlierAmount
 from backend.task.TaskState import TaskState
+from backend.task.execution.core.Execution import Execution as BackendExecution
 from experiments.callback.ExecutionCallbacks import execution_callback, metric_callback
 from experiments.models.execution import (
     get_zip_result_path,
@@ -76,6 +79,13 @@ class TestExecutionTaskProgressCallback(MediaMixin, django.test.TestCase):
         self.assertEqual(self.execution.status, ExecutionStatus.RUNNING_WITH_ERROR.name)
         self.assertEqual(self.execution.progress, 0.69)
 
+    @mock.patch("experiments.callback.ExecutionCallbacks.forget_task")
+    def test_callback_forgets_finished_task(self, forget_task_mock):
+        call_execution_progress_callback(self.execution, TaskState.RUNNING, 0.5)
+        self.assertFalse(forget_task_mock.called)
+        call_execution_progress_callback(self.execution, TaskState.FINISHED, 1.0)
+        forget_task_mock.assert_called_once_with(BackendExecution, self.execution.pk)
+
     def test_callback_invalid_pk(self):
         # We should only need the objects mock since the function should exit
         # immediately if the given task_id is not matching an execution
@@ -123,6 +133,42 @@ class TestMetricCallback(MediaMixin, django.test.TestCase):
         self.assertTrue(subspace_metric_mock.called)
         self.assertTrue(datapoint_metric_mock.called)
 
+    @mock.patch(
+        "backend.metric.MetricDataPointsAreOutliers.MetricDataPointsAreOutliers.compute_metric"
+    )
+    @mock.patch(
+        "backend.metric.MetricSubspaceOutlierAmount.MetricSubspaceOutlierAmount.compute_metric"
+    )
+    def test_metric_callback_with_aggregators(
+        self, subspace_metric_mock, datapoint_metric_mock
+    ):
+        execution = mock.MagicMock()
+        execution.pk = 3
+        execution.experiment.pk = 12
+        execution.experiment.user.pk = 98
+        datapoint_aggregator = mock.MagicMock(spec=MetricDataPointsAreOutliers)
+        subspace_aggregator = mock.MagicMock(spec=MetricSubspaceOutlierAmount)
+        self.be.metric_aggregators = [subspace_aggregator, datapoint_aggregator]
+
+        objects_mock = mock.MagicMock()
+        objects_mock.filter.return_value.exists.return_value = True
+        objects_mock.get.return_value = execution
+        os.makedirs(get_result_path(execution))
+
+        with mock.patch.object(Execution, "objects", objects_mock):
+            metric_callback(self.be)
+
+        # the metrics computed while the execution ran are written instead
+        metric_dir = os.path.join(get_result_path(execution), "metrics")
+        datapoint_aggregator.write_result.assert_called_once_with(
+            os.path.join(metric_dir, "datapoints_metric.csv")
+        )
+        subspace_aggregator.write_result.assert_called_once_with(
+            os.path.join(metric_dir, "subspace_outliers.csv")
+        )
+        self.assertFalse(datapoint_metric_mock.called)
+        self.assertFalse(subspace_metric_mock.called)
+
     def test_metric_callback_invalid_pk(self):
         # We use an extra mock for the get method of Execution.objects to validate that
         # the callback function returned before fetching an execution if there is no
@@ -1,6 +1,14 @@
+import os
+import sqlite3
+import tempfile
+from contextlib import closing
+
 import django.test
+from django.test import override_settings
 
 from authentication.models import User
+from backend.task.TaskJournal import TaskJournal
+from backend.task.execution.core.Execution import Execution as BackendExecution
 from experiments.models import Execution, Dataset, Experiment
 from experiments.models.execution import ExecutionStatus
 from experiments.management.commands.markcrashed import Command
@@ -78,3 +86,27 @@ class MarkCrashedTests(django.test.TestCase):
         self.assertEqual(ExecutionStatus.FINISHED.name, self.exe4.status)
         self.exe5.refresh_from_db()
         self.assertEqual(ExecutionStatus.FINISHED_WITH_ERROR.name, self.exe5.status)
+
+    def test_keep_journaled_executions_running(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "journal.sqlite3")
+            TaskJournal(path)
+            # markcrashed only reads the IDs of the journaled tasks
+            with closing(sqlite3.connect(path)) as connection, connection:
+                connection.execute(
+                    "INSERT INTO tasks VALUES (?, ?, ?)",
+                    (
+                        f"{BackendExecution.__module__}.{BackendExecution.__qualname__}",
+                        self.exe1.pk,
+                        b"",
+                    ),
+                )
+            with override_settings(
+                SCHEDULER_SOCKET_PATH=os.path.join(directory, "scheduler.sock"),
+                SCHEDULER_JOURNAL_PATH=path,
+            ):
+                Command().handle()
+        self.exe1.refresh_from_db()
+        self.assertEqual(ExecutionStatus.RUNNING.name, self.exe1.status)
+        self.exe2.refresh_from_db()
+        self.assertEqual(ExecutionStatus.CRASHED.name, self.exe2.status)
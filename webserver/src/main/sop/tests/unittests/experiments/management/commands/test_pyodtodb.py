@@ -2,7 +2,11 @@ from unittest.mock import MagicMock
 
 import django.test
 
-from experiments.management.commands.pyodtodb import Command, _PYOD_ALGORITHMS
+from experiments.management.commands.pyodtodb import (
+    Command,
+    _PYOD_ALGORITHMS,
+    get_pyod_module_names,
+)
 from experiments.models import Algorithm
 from tests.generic import MediaMixin
 
@@ -36,3 +40,11 @@ class PyodToDBTests(MediaMixin, django.test.TestCase):
         algorithm_queryset_third = list(Algorithm.objects.all())
         self.assertListEqual(algorithm_queryset, algorithm_queryset_second)
         self.assertListEqual(algorithm_queryset, algorithm_queryset_third)
+
+    def test_get_pyod_module_names(self) -> None:
+        module_names = get_pyod_module_names()
+        self.assertIn("pyod.models.knn", module_names)
+        self.assertIn("pyod.models.auto_encoder_torch", get_pyod_module_names(True))
+        for module_name in ["pyod.models.auto_encoder_torch", "pyod.models.anogan"]:
+            self.assertNotIn(module_name, module_names)
+        self.assertEqual(len(get_pyod_module_names(True)), len(_PYOD_ALGORITHMS))
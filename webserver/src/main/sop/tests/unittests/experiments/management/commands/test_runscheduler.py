@@ -0,0 +1,73 @@
+import io
+import os
+import signal
+import tempfile
+import threading
+import time
+from multiprocessing.connection import Client
+
+import django.test
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+
+from backend.scheduler.DebugScheduler import DebugScheduler
+from backend.scheduler.Scheduler import Scheduler
+from backend.scheduler.SchedulerClient import SchedulerClient
+from backend.scheduler.SchedulerDaemon import SchedulerDaemon
+from backend.scheduler.UserRoundRobinScheduler import UserRoundRobinScheduler
+from experiments.services.scheduler import (
+    create_scheduler_client,
+    get_scheduler_authkey,
+)
+
+
+class RunSchedulerTests(django.test.SimpleTestCase):
+    def setUp(self) -> None:
+        Scheduler._instance = None
+        self.dir = tempfile.TemporaryDirectory()
+        self.address = os.path.join(self.dir.name, "scheduler.sock")
+        self.handlers = [signal.getsignal(s) for s in (signal.SIGTERM, signal.SIGINT)]
+
+    def tearDown(self) -> None:
+        signal.signal(signal.SIGTERM, self.handlers[0])
+        signal.signal(signal.SIGINT, self.handlers[1])
+        Scheduler._instance = None
+        self.dir.cleanup()
+
+    def test_socket_not_set(self):
+        with override_settings(SCHEDULER_SOCKET_PATH=None):
+            self.assertRaises(CommandError, call_command, "runscheduler")
+
+    def test_already_running(self):
+        daemon = SchedulerDaemon(DebugScheduler(), self.address, b"")
+        Scheduler._instance = None
+        with override_settings(SCHEDULER_SOCKET_PATH=self.address):
+            self.assertRaises(CommandError, call_command, "runscheduler")
+        daemon.stop()
+
+    def test_serve(self):
+        replies = []
+
+        def request_and_stop() -> None:
+            try:
+                # the daemon only listens once the command started
+                while not os.path.exists(self.address):
+                    time.sleep(0.05)
+                with Client(self.address, authkey=get_scheduler_authkey()) as c:
+                    c.send(("is_shutting_down",))
+                    replies.append(c.recv())
+            finally:
+                os.kill(os.getpid(), signal.SIGTERM)
+
+        thread = threading.Thread(target=request_and_stop)
+        thread.start()
+        with override_settings(SCHEDULER_SOCKET_PATH=self.address):
+            call_command("runscheduler", stdout=io.StringIO())
+        thread.join()
+        self.assertEqual([("ok", False)], replies)
+        self.assertIsInstance(Scheduler._instance, UserRoundRobinScheduler)
+        self.assertFalse(os.path.exists(self.address))
+
+    def test_create_scheduler_client(self):
+        with override_settings(SCHEDULER_SOCKET_PATH=self.address):
+            self.assertIsInstance(create_scheduler_client(), SchedulerClient)
@@ -0,0 +1,58 @@
+import io
+import os
+import signal
+import tempfile
+
+import django.test
+from django.core.management import CommandError, call_command
+
+from backend.scheduler.RemoteWorker import RemoteWorker, RemoteWorkerServer
+from experiments.services.scheduler import get_scheduler_authkey
+
+
+class RunWorkerAgentTests(django.test.SimpleTestCase):
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.handlers = [signal.getsignal(s) for s in (signal.SIGTERM, signal.SIGINT)]
+
+    def tearDown(self) -> None:
+        signal.signal(signal.SIGTERM, self.handlers[0])
+        signal.signal(signal.SIGINT, self.handlers[1])
+        self.dir.cleanup()
+
+    def test_invalid_address(self):
+        self.assertRaises(CommandError, call_command, "runworkeragent", "localhost")
+        self.assertRaises(
+            CommandError, call_command, "runworkeragent", "localhost:port"
+        )
+
+    def test_invalid_slots(self):
+        self.assertRaises(
+            CommandError, call_command, "runworkeragent", "localhost:1", slots=0
+        )
+
+    def test_serve(self):
+        workers = []
+
+        def connected_and_stop(worker: RemoteWorker) -> None:
+            workers.append(worker)
+            if len(workers) == 2:
+                os.kill(os.getpid(), signal.SIGTERM)
+
+        server = RemoteWorkerServer(
+            ("127.0.0.1", 0), get_scheduler_authkey(), connected_and_stop
+        )
+        host, port = server.address
+        try:
+            call_command(
+                "runworkeragent",
+                f"{host}:{port}",
+                slots=2,
+                work_dir=self.dir.name,
+                stdout=io.StringIO(),
+            )
+        finally:
+            server.stop()
+        self.assertEqual(2, len(workers))
+        for worker in workers:
+            self.assertFalse(worker.check_connection())
@@ -0,0 +1,155 @@
+import io
+import json
+import os
+import zipfile
+from functools import partial
+from unittest.mock import MagicMock
+
+import django.test
+from django.conf import settings
+from django.http import FileResponse, StreamingHttpResponse
+from django.test import override_settings
+
+from experiments.services.download import (
+    get_file_download_response,
+    parse_range,
+    stream_zip,
+)
+from experiments.services.execution import get_execution_algorithm_result
+from tests.generic import MediaMixin, write_media_file
+
+
+class DownloadServicesTests(MediaMixin, django.test.TestCase):
+    content = bytes(range(256)) * 1000
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.path = write_media_file("experiments/result.zip", self.content)
+
+    def __request(self, range_header: str) -> MagicMock:
+        request = MagicMock()
+        request.META = {"HTTP_RANGE": range_header}
+        return request
+
+    def test_parse_range(self) -> None:
+        self.assertIsNone(parse_range(None, 100))
+        self.assertEqual((0, 99), parse_range("bytes=0-", 100))
+        self.assertEqual((10, 20), parse_range("bytes=10-20", 100))
+        self.assertEqual((90, 99), parse_range("bytes=90-200", 100))
+        self.assertEqual((70, 99), parse_range("bytes=-30", 100))
+        self.assertEqual((0, 99), parse_range("bytes=-300", 100))
+        # not satisfiable
+        self.assertEqual((100, 99), parse_range("bytes=100-", 100))
+        self.assertEqual((100, 99), parse_range("bytes=-0", 100))
+        self.assertEqual((0, -1), parse_range("bytes=0-", 0))
+        # the whole file is sent
+        for header in ["bytes=20-10", "bytes=-", "bytes=0-1,5-6", "items=0-1", ""]:
+            self.assertIsNone(parse_range(header, 100))
+
+    def test_file_download(self) -> None:
+        response = get_file_download_response(self.path, "result.zip")
+        self.assertIsInstance(response, FileResponse)
+        self.assertEqual(200, response.status_code)
+        self.assertEqual("bytes", response["Accept-Ranges"])
+        self.assertEqual(str(len(self.content)), response["Content-Length"])
+        self.assertEqual(self.content, b"".join(response.streaming_content))
+
+    def test_file_download_range(self) -> None:
+        response = get_file_download_response(
+            self.path, "result.zip", self.__request("bytes=1000-99999")
+        )
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertEqual(206, response.status_code)
+        self.assertEqual(
+            f"bytes 1000-99999/{len(self.content)}", response["Content-Range"]
+        )
+        self.assertEqual("99000", response["Content-Length"])
+        self.assertEqual(
+            self.content[1000:100000], b"".join(response.streaming_content)
+        )
+
+        response = get_file_download_response(
+            self.path, "result.zip", self.__request(f"bytes={len(self.content)}-")
+        )
+        self.assertEqual(416, response.status_code)
+        self.assertEqual(f"bytes */{len(self.content)}", response["Content-Range"])
+
+    @override_settings(DOWNLOAD_SENDFILE_HEADER="X-Sendfile")
+    def test_file_download_sendfile(self) -> None:
+        response = get_file_download_response(self.path, "result.zip")
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(self.path, response["X-Sendfile"])
+        self.assertEqual(b"", response.content)
+        self.assertEqual(
+            "attachment; filename=result.zip", response["Content-Disposition"]
+        )
+
+    @override_settings(
+        DOWNLOAD_SENDFILE_HEADER="X-Accel-Redirect",
+        DOWNLOAD_ACCEL_REDIRECT_LOCATION="/internal/",
+    )
+    def test_file_download_accel_redirect(self) -> None:
+        response = get_file_download_response(self.path, "result.zip")
+        self.assertEqual(
+            "/internal/experiments/result.zip", response["X-Accel-Redirect"]
+        )
+        self.assertEqual(b"", response.content)
+
+    def test_stream_zip(self) -> None:
+        other_path = write_media_file("other.csv", b"1,2\n")
+        members = [
+            ("result.zip", len(self.content), partial(open, self.path, "rb")),
+            ("dir/other.csv", 4, partial(open, other_path, "rb")),
+        ]
+        for compression_level in [0, 6]:
+            chunks = list(stream_zip(members, compression_level))
+            self.assertGreater(len(chunks), 2)
+            with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zip_file:
+                self.assertIsNone(zip_file.testzip())
+                self.assertEqual(["result.zip", "dir/other.csv"], zip_file.namelist())
+                self.assertEqual(self.content, zip_file.read("result.zip"))
+                self.assertEqual(b"1,2\n", zip_file.read("dir/other.csv"))
+
+    @override_settings(EXECUTION_ZIP_COMPRESSION_LEVEL=0)
+    def test_execution_algorithm_result(self) -> None:
+        path = os.path.join(settings.MEDIA_ROOT, "execution_1.zip")
+        details = {
+            "algorithms": [
+                {"directory_name": "lof"},
+                {"directory_name": "lof (1)"},
+            ]
+        }
+        members = {
+            "execution_1/details.json": json.dumps(details).encode(),
+            "execution_1/lof/AQ.csv": b"0,0.5\n",
+            "execution_1/lof/Ag.csv": b"0,0.7\n",
+            "execution_1/lof (1)/AQ.csv": b"0,0.1\n",
+            "execution_1/metrics/datapoint_metric.csv": b"0,1\n",
+        }
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            for name, content in members.items():
+                zip_file.writestr(name, content)
+        execution = MagicMock()
+        execution.result_path.path = path
+
+        response = get_execution_algorithm_result(execution, "lof")
+        assert response is not None
+        self.assertEqual(
+            "attachment; filename=result_lof.zip", response["Content-Disposition"]
+        )
+        content = b"".join(response.streaming_content)
+        with zipfile.ZipFile(io.BytesIO(content)) as zip_file:
+            self.assertEqual(
+                [
+                    "execution_1/details.json",
+                    "execution_1/lof/AQ.csv",
+                    "execution_1/lof/Ag.csv",
+                    "execution_1/metrics/datapoint_metric.csv",
+                ],
+                zip_file.namelist(),
+            )
+            self.assertEqual(b"0,0.7\n", zip_file.read("execution_1/lof/Ag.csv"))
+
+        # only the directories of the algorithms of the execution can be downloaded
+        for directory in ["knn", "metrics", "details.json", ""]:
+            self.assertIsNone(get_execution_algorithm_result(execution, directory))
@@ -2,7 +2,10 @@ import unittest
 from unittest.mock import MagicMock, patch
 
 import django.test
+from django.test import override_settings
 
+from backend.metric.MetricDataPointsAreOutliers import MetricDataPointsAreOutliers
+from backend.metric.MetricSubspaceOutlierAmount import MetricSubspaceOutlierAmount
 from backend.task.execution.core.Execution import Execution as BackendExecution
 from experiments.services.execution import get_params_out_of_form, schedule_backend
 
@@ -90,6 +93,64 @@ class ExecutionServiceTests(django.test.TestCase):
         self.assertIsNotNone(return_dict.get("8_param1"))
 
     def test_schedule_backend(self) -> None:
+        execution = self.__create_execution()
+        with patch.object(BackendExecution, "schedule", lambda s: None):
+            errors = schedule_backend(execution)
+            self.assertIsNone(errors)
+
+    @override_settings(EXECUTION_ALGORITHM_TIMEOUT=600, EXECUTION_TIMEOUT=3600)
+    def test_schedule_backend_timeouts(self) -> None:
+        scheduled: list[BackendExecution] = []
+        execution = self.__create_execution()
+        with patch.object(BackendExecution, "schedule", lambda s: scheduled.append(s)):
+            self.assertIsNone(schedule_backend(execution))
+            # the settings apply unless the execution overrides them
+            execution.algorithm_timeout = 30
+            self.assertIsNone(schedule_backend(execution))
+        self.assertEqual(600, scheduled[0]._algorithm_timeout)
+        self.assertEqual(3600, scheduled[0]._timeout)
+        self.assertEqual(30, scheduled[1]._algorithm_timeout)
+        self.assertEqual(3600, scheduled[1]._timeout)
+
+    @override_settings(EXECUTION_COLUMN_MAJOR=True)
+    def test_schedule_backend_column_major(self) -> None:
+        scheduled: list[BackendExecution] = []
+        with patch.object(BackendExecution, "schedule", lambda s: scheduled.append(s)):
+            self.assertIsNone(schedule_backend(self.__create_execution()))
+        self.assertTrue(scheduled[0]._execution_shms.column_major)
+
+    @override_settings(EXECUTION_EXPORT_CSV=False)
+    def test_schedule_backend_without_csv_export(self) -> None:
+        scheduled: list[BackendExecution] = []
+        with patch.object(BackendExecution, "schedule", lambda s: scheduled.append(s)):
+            self.assertIsNone(schedule_backend(self.__create_execution()))
+        self.assertFalse(scheduled[0]._export_csv)
+
+    @override_settings(EXECUTION_SHARED_RESULT_LIMIT=1 << 20)
+    def test_schedule_backend_shared_result_limit(self) -> None:
+        scheduled: list[BackendExecution] = []
+        with patch.object(BackendExecution, "schedule", lambda s: scheduled.append(s)):
+            self.assertIsNone(schedule_backend(self.__create_execution()))
+        self.assertEqual(1 << 20, scheduled[0]._shared_result_limit)
+
+    @override_settings(EXECUTION_ZIP_COMPRESSION_LEVEL=0, EXECUTION_ZIP_THREADS=3)
+    def test_schedule_backend_zip_settings(self) -> None:
+        scheduled: list[BackendExecution] = []
+        with patch.object(BackendExecution, "schedule", lambda s: scheduled.append(s)):
+            self.assertIsNone(schedule_backend(self.__create_execution()))
+        self.assertEqual(0, scheduled[0]._zip_compression_level)
+        self.assertEqual(3, scheduled[0]._zip_threads)
+
+    def test_schedule_backend_metric_aggregators(self) -> None:
+        scheduled: list[BackendExecution] = []
+        with patch.object(BackendExecution, "schedule", lambda s: scheduled.append(s)):
+            self.assertIsNone(schedule_backend(self.__create_execution()))
+        self.assertEqual(
+            [MetricDataPointsAreOutliers, MetricSubspaceOutlierAmount],
+            [type(metric) for metric in scheduled[0].metric_aggregators],
+        )
+
+    def __create_execution(self) -> MagicMock:
         algo1 = MagicMock()
         algo1.path.path = "algorithm/path"
         algo1.display_name = "Algo 1"
@@ -118,10 +179,9 @@ class ExecutionServiceTests(django.test.TestCase):
 
         execution.experiment.user.pk = 3
         execution.experiment.algorithms.all.return_value = [algo1, algo2]
-
-        with patch.object(BackendExecution, "schedule", lambda s: None):
-            errors = schedule_backend(execution)
-            self.assertIsNone(errors)
+        execution.algorithm_timeout = None
+        execution.timeout = None
+        return execution
 
     def test_schedule_backend_not_enough_subspaces(self) -> None:
         execution = MagicMock()
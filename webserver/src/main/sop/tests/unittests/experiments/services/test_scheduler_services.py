@@ -0,0 +1,169 @@
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+from contextlib import closing
+
+import django.test
+from django.test import override_settings
+
+from authentication.models import User
+from backend.scheduler.FairShareScheduler import FairShareScheduler
+from backend.scheduler.Scheduler import Scheduler
+from backend.scheduler.UserRoundRobinScheduler import UserRoundRobinScheduler
+from backend.task.Task import Task
+from backend.task.TaskJournal import TaskJournal
+from backend.task.execution.core.Execution import Execution as BackendExecution
+from experiments.models import Dataset, Execution, Experiment
+from experiments.models.execution import ExecutionStatus
+from experiments.services.scheduler import (
+    create_local_scheduler,
+    forget_task,
+    get_task_journal,
+    get_user_scheduler_weight,
+    resume_journaled_tasks,
+    schedule_task,
+)
+
+
+class SchedulerServicesTests(django.test.TestCase):
+    def setUp(self) -> None:
+        Scheduler._instance = None
+
+    def tearDown(self) -> None:
+        if Scheduler._instance is not None:
+            Scheduler._instance.hard_shutdown()
+        Scheduler._instance = None
+
+    def test_round_robin_policy(self):
+        with override_settings(SCHEDULER_POLICY="round_robin"):
+            scheduler = create_local_scheduler()
+        self.assertIs(type(scheduler), UserRoundRobinScheduler)
+
+    def test_fair_share_policy(self):
+        with override_settings(SCHEDULER_POLICY="fair_share"):
+            self.assertIsInstance(create_local_scheduler(), FairShareScheduler)
+
+    def test_event_loop(self):
+        with override_settings(SCHEDULER_POLICY="fair_share", SCHEDULER_EVENT_LOOP=True):
+            scheduler = create_local_scheduler()
+        # the fair share policy is used by the event loop as well
+        self.assertIsInstance(scheduler, FairShareScheduler)
+        self.assertEqual(1, len(scheduler._UserRoundRobinScheduler__threads))
+
+    def test_priority_aging(self):
+        with override_settings(SCHEDULER_PRIORITY_AGING=0.05):
+            scheduler = create_local_scheduler()
+        self.assertEqual(0.05, scheduler._UserRoundRobinScheduler__priority_aging)
+
+    def test_unknown_policy(self):
+        with override_settings(SCHEDULER_POLICY="lottery"):
+            self.assertRaises(ValueError, create_local_scheduler)
+
+    def test_get_user_scheduler_weight(self):
+        user = User.objects.create(username="user", scheduler_weight=2.5)
+        self.assertEqual(2.5, get_user_scheduler_weight(user.pk))
+        self.assertEqual(1.0, get_user_scheduler_weight(user.pk + 1))
+
+
+class JournalTestExecution(BackendExecution):
+    """A backend execution that only records that it was scheduled"""
+
+    scheduled: list[int] = []
+
+    def __init__(self, task_id: int):
+        Task.__init__(self, 0, task_id, print)
+        self._execution_element_finished_lock = multiprocessing.Lock()
+
+    def schedule(self) -> None:
+        JournalTestExecution.scheduled.append(self.task_id)
+
+
+class SchedulerJournalTests(django.test.TestCase):
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "journal.sqlite3")
+        self.settings = override_settings(
+            SCHEDULER_SOCKET_PATH=os.path.join(self.dir.name, "scheduler.sock"),
+            SCHEDULER_JOURNAL_PATH=self.path,
+        )
+        self.settings.enable()
+        JournalTestExecution.scheduled = []
+
+        user = User.objects.create(username="user")
+        experiment = Experiment.objects.create(
+            user=user,
+            display_name="experiment",
+            dataset=Dataset.objects.create(user=user, display_name="dataset"),
+        )
+        self.executions = [
+            Execution.objects.create(
+                algorithm_parameters="",
+                experiment=experiment,
+                subspace_amount=1,
+                subspaces_min=1,
+                subspaces_max=1,
+                status=ExecutionStatus.RUNNING.name,
+            )
+            for _ in range(4)
+        ]
+
+    def tearDown(self) -> None:
+        self.settings.disable()
+        self.dir.cleanup()
+
+    def test_get_task_journal(self):
+        self.assertIsInstance(get_task_journal(), TaskJournal)
+        self.assertEqual(self.path, get_task_journal().path)
+        with override_settings(SCHEDULER_JOURNAL_PATH=None):
+            self.assertIsNone(get_task_journal())
+        # only the scheduler daemon resumes tasks
+        with override_settings(SCHEDULER_SOCKET_PATH=None):
+            self.assertIsNone(get_task_journal())
+
+    def test_schedule_and_forget_task(self):
+        schedule_task(JournalTestExecution(3))
+        self.assertEqual([3], JournalTestExecution.scheduled)
+        self.assertEqual({3}, get_task_journal().get_task_ids(JournalTestExecution))
+        forget_task(JournalTestExecution, 3)
+        self.assertEqual(set(), get_task_journal().get_task_ids(JournalTestExecution))
+
+    def test_schedule_task_without_journal(self):
+        with override_settings(SCHEDULER_JOURNAL_PATH=None):
+            schedule_task(JournalTestExecution(3))
+        self.assertEqual([3], JournalTestExecution.scheduled)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_resume_journaled_tasks(self):
+        resumed, broken, deleted, not_journaled = self.executions
+        journal = get_task_journal()
+        journal.record(JournalTestExecution(resumed.pk))
+        journal.record(JournalTestExecution(deleted.pk))
+        deleted.delete()
+        # an execution journaled by an incompatible version of the backend
+        with closing(sqlite3.connect(self.path)) as connection, connection:
+            connection.execute(
+                "INSERT INTO tasks VALUES (?, ?, ?)",
+                (
+                    f"{BackendExecution.__module__}.{BackendExecution.__qualname__}",
+                    broken.pk,
+                    b"broken",
+                ),
+            )
+
+        with self.assertLogs(level="WARNING"):
+            self.assertEqual(1, resume_journaled_tasks())
+        self.assertEqual([resumed.pk], JournalTestExecution.scheduled)
+        self.assertEqual({resumed.pk}, journal.get_task_ids(JournalTestExecution))
+        self.assertEqual(set(), journal.get_task_ids(BackendExecution))
+        for execution, status in (
+            (resumed, ExecutionStatus.RUNNING),
+            (broken, ExecutionStatus.CRASHED),
+            (not_journaled, ExecutionStatus.RUNNING),
+        ):
+            execution.refresh_from_db()
+            self.assertEqual(status.name, execution.status)
+
+    def test_resume_without_journal(self):
+        with override_settings(SCHEDULER_JOURNAL_PATH=None):
+            self.assertEqual(0, resume_journaled_tasks())
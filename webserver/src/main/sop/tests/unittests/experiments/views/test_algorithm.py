@@ -6,24 +6,28 @@ from django.urls import reverse_lazy
 
 from experiments.models import Algorithm
 from experiments.views.algorithm import download_algorithm
+from tests.generic import MediaMixin, write_media_file
 
 
-class DatasetViewTests(django.test.TestCase):
+class DatasetViewTests(MediaMixin, django.test.TestCase):
     def test_download_algorithm(self) -> None:
         content = "Line 1\nLine 2\nLast Line"
         algorithm = MagicMock()
         algorithm.display_name = "algorithm_name"
         algorithm.pk = 3
-        algorithm.path.__enter__.return_value.read.return_value = content
+        algorithm.path.path = write_media_file("file", bytes(content, "utf-8"))
         object_mock = MagicMock()
         object_mock.filter.return_value.first.return_value = algorithm
         request = MagicMock()
         request.method = "GET"
+        request.META = {}
         with mock.patch.object(Algorithm, "objects", object_mock):
             response = download_algorithm(request, algorithm.pk)
             self.assertIsNotNone(response)
             assert response is not None
-            self.assertEqual(response.content, bytes(content, "utf-8"))
+            self.assertEqual(
+                b"".join(response.streaming_content), bytes(content, "utf-8")
+            )
             self.assertEqual(
                 response["Content-Disposition"],
                 f"attachment; filename={algorithm.display_name}.py",
@@ -13,38 +13,44 @@ from experiments.views.dataset import (
     download_cleaned_dataset,
     dataset_status_view,
 )
+from tests.generic import MediaMixin, write_media_file
 
 
-class TestDatasetGetDownloadResponse(django.test.TestCase):
+class TestDatasetGetDownloadResponse(MediaMixin, django.test.TestCase):
     def test_get_download_response(self) -> None:
         file = MagicMock()
         content = "Line 1\nLine 2\nLast Line"
-        file.read.return_value = content
+        file.path = write_media_file("file", bytes(content, "utf-8"))
         download_name = "file.txt"
         response = get_download_response(file, download_name)
         self.assertEqual(response["Content-Type"], "text/plain")
         self.assertEqual(
             response["Content-Disposition"], f"attachment; filename={download_name}"
         )
-        self.assertEqual(response.content, bytes(content, "utf-8"))
+        self.assertEqual(
+            b"".join(response.streaming_content), bytes(content, "utf-8")
+        )
 
 
-class TestDatasetUncleanedDownload(django.test.TestCase):
+class TestDatasetUncleanedDownload(MediaMixin, django.test.TestCase):
     def test_download_uncleaned_dataset(self) -> None:
         content = "Line 1\nLine 2\nLast Line"
         dataset = MagicMock()
         dataset.display_name = "dataset_name"
         dataset.pk = 3
-        dataset.path_original.__enter__.return_value.read.return_value = content
+        dataset.path_original.path = write_media_file("file", bytes(content, "utf-8"))
         object_mock = MagicMock()
         object_mock.filter.return_value.first.return_value = dataset
         request = MagicMock()
         request.method = "GET"
+        request.META = {}
         with mock.patch.object(Dataset, "objects", object_mock):
             response = download_uncleaned_dataset(request, dataset.pk)
             self.assertIsNotNone(response)
             assert response is not None
-            self.assertEqual(response.content, bytes(content, "utf-8"))
+            self.assertEqual(
+                b"".join(response.streaming_content), bytes(content, "utf-8")
+            )
             self.assertEqual(
                 response["Content-Disposition"],
                 f"attachment; filename={dataset.display_name}.csv",
@@ -89,7 +95,7 @@ class TestDatasetUncleanedDownload(django.test.TestCase):
             )  # type: ignore
 
 
-class TestDatasetCleanedDownload(django.test.TestCase):
+class TestDatasetCleanedDownload(MediaMixin, django.test.TestCase):
     def test_download_cleaned_dataset_post(self) -> None:
         dataset = MagicMock()
         dataset.display_name = "dataset_name"
@@ -109,16 +115,19 @@ class TestDatasetCleanedDownload(django.test.TestCase):
         dataset.display_name = "dataset_name"
         dataset.is_cleaned = True
         dataset.pk = 3
-        dataset.path_cleaned.__enter__.return_value.read.return_value = content
+        dataset.path_cleaned.path = write_media_file("file", bytes(content, "utf-8"))
         object_mock = MagicMock()
         object_mock.filter.return_value.first.return_value = dataset
         request = MagicMock()
         request.method = "GET"
+        request.META = {}
         with mock.patch.object(Dataset, "objects", object_mock):
             response = download_cleaned_dataset(request, dataset.pk)
             self.assertIsNotNone(response)
             assert response is not None
-            self.assertEqual(response.content, bytes(content, "utf-8"))
+            self.assertEqual(
+                b"".join(response.streaming_content), bytes(content, "utf-8")
+            )
             self.assertEqual(
                 response["Content-Disposition"],
                 f"attachment; filename={dataset.display_name}_cleaned.csv",
@@ -2,33 +2,41 @@ import json
 from unittest.mock import MagicMock, patch
 
 import django.test
-from django.http import HttpResponseRedirect, HttpResponse, HttpResponseServerError
+from django.http import (
+    FileResponse,
+    HttpResponseRedirect,
+    HttpResponseServerError,
+)
 from django.urls import reverse_lazy
 
 from experiments.models import Execution
 from experiments.models.execution import ExecutionStatus
 from experiments.views.execution import (
     download_execution_result,
+    download_execution_algorithm_result,
     get_execution_progress,
     restart_execution,
 )
+from tests.generic import MediaMixin, write_media_file
 
 
-class ExecutionViewTests(django.test.TestCase):
+class ExecutionViewTests(MediaMixin, django.test.TestCase):
     def test_download_execution_result(self) -> None:
         content = "Line 1\nLine 2\nLast Line"
         request = MagicMock()
         request.method = "GET"
+        request.META = {}
         objects_mock = MagicMock()
-        objects_mock.filter.return_value.first.return_value.result_path.__enter__.return_value.read.return_value = (
-            content
-        )
+        execution = objects_mock.filter.return_value.first.return_value
+        execution.result_path.path = write_media_file("file", bytes(content, "utf-8"))
         with patch.object(Execution, "objects", objects_mock):
             response = download_execution_result(request, 0, 1)
             self.assertIsNotNone(response)
-            assert isinstance(response, HttpResponse)
+            assert isinstance(response, FileResponse)
             self.assertEqual(response.status_code, 200)
-            self.assertEqual(response.content, bytes(content, "utf-8"))
+            self.assertEqual(
+                b"".join(response.streaming_content), bytes(content, "utf-8")
+            )
             self.assertEqual(
                 response["Content-Disposition"], "attachment; filename=result.zip"
             )
@@ -57,6 +65,34 @@ class ExecutionViewTests(django.test.TestCase):
             response = download_execution_result(request, 0, 1)
             self.assertIsNone(response)
 
+    def test_download_execution_algorithm_result(self) -> None:
+        request = MagicMock()
+        request.method = "GET"
+        objects_mock = MagicMock()
+        with patch.object(Execution, "objects", objects_mock), patch(
+            "experiments.views.execution.get_execution_algorithm_result"
+        ) as get_result:
+            response = download_execution_algorithm_result(request, 0, 1, "lof")
+            self.assertEqual(get_result.return_value, response)
+            get_result.assert_called_once_with(
+                objects_mock.filter.return_value.first.return_value, "lof"
+            )
+
+            # the result does not contain the algorithm
+            get_result.return_value = None
+            response = download_execution_algorithm_result(request, 0, 1, "lof")
+            assert isinstance(response, HttpResponseRedirect)
+            self.assertEqual(response.url, reverse_lazy("experiment_overview"))
+
+            objects_mock.filter.return_value.first.return_value = None
+            response = download_execution_algorithm_result(request, 0, 1, "lof")
+            assert isinstance(response, HttpResponseRedirect)
+
+            request.method = "POST"
+            self.assertIsNone(
+                download_execution_algorithm_result(request, 0, 1, "lof")
+            )
+
     def test_get_execution_progress(self) -> None:
         request = MagicMock()
         request.GET = {"execution_pk": 3}
@@ -1,18 +1,22 @@
+import io
+import zipfile
 from unittest.mock import MagicMock, patch
 
 import django.test
-from django.http.response import HttpResponse
+from django.http.response import StreamingHttpResponse
 
 from experiments.models import Experiment, Execution
 from experiments.views.experiment import download_all_execution_results
+from tests.generic import MediaMixin, write_media_file
 
 
-class ExperimentDownloadResultsTest(django.test.TestCase):
+class ExperimentDownloadResultsTest(MediaMixin, django.test.TestCase):
     def execution_mock(self, result_text: str, id: int) -> MagicMock:
         mock = MagicMock()
         mock.has_result = True
-        mock.result_path.__enter__.return_value.read.return_value = result_text
-        mock.result_path.__enter__.return_value.path = f"/test/path/to/result_{id}.zip"
+        mock.result_path.path = write_media_file(
+            f"result_{id}.zip", bytes(result_text, "utf-8")
+        )
         return mock
 
     def test_download_all_results(self):
@@ -41,13 +45,21 @@ class ExperimentDownloadResultsTest(django.test.TestCase):
             with patch.object(Execution, "objects", exec_objects_mock):
                 response = download_all_execution_results(request, 3)
                 self.assertIsNotNone(response)
-                self.assertIsInstance(response, HttpResponse)
+                self.assertIsInstance(response, StreamingHttpResponse)
                 self.assertEqual(response.status_code, 200)
-                self.assertNotEqual(
-                    str(response.content).find(content1.replace("\n", "\\n")), -1
-                )
-                self.assertNotEqual(str(response.content).find(content2), -1)
-                self.assertNotEqual(str(response.content).find(content3), -1)
+                # the zip file is generated while it is sent
+                content = b"".join(response.streaming_content)
+                with zipfile.ZipFile(io.BytesIO(content)) as zip_file:
+                    self.assertEqual(
+                        ["result_1.zip", "result_2.zip", "result_3.zip"],
+                        zip_file.namelist(),
+                    )
+                    self.assertEqual(
+                        bytes(content1, "utf-8"), zip_file.read("result_1.zip")
+                    )
+                    self.assertEqual(
+                        bytes(content3, "utf-8"), zip_file.read("result_3.zip")
+                    )
 
                 self.assertEqual(
                     response["Content-Disposition"],
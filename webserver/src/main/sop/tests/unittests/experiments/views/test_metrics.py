@@ -0,0 +1,44 @@
+import django.test
+from django.test import override_settings
+from django.urls import reverse_lazy
+
+from authentication.models import User
+from backend.instrumentation.Instrumentation import Instrumentation
+from backend.scheduler.DebugScheduler import DebugScheduler
+from backend.scheduler.Scheduler import Scheduler
+
+
+class MetricsViewTests(django.test.TestCase):
+    def setUp(self) -> None:
+        Scheduler._instance = None
+        DebugScheduler()
+        Instrumentation.counter("test_metrics_view_total", "A counter").inc()
+
+    def tearDown(self) -> None:
+        Scheduler._instance = None
+
+    def test_staff(self) -> None:
+        self.client.force_login(User.objects.create(username="staff", is_staff=True))
+        response = self.client.get(reverse_lazy("metrics"))
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(
+            response["Content-Type"].startswith("text/plain; version=0.0.4")
+        )
+        self.assertIn(b"\ntest_metrics_view_total ", response.content)
+
+    def test_not_staff(self) -> None:
+        self.assertEqual(403, self.client.get(reverse_lazy("metrics")).status_code)
+        self.client.force_login(User.objects.create(username="user"))
+        self.assertEqual(403, self.client.get(reverse_lazy("metrics")).status_code)
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_token(self) -> None:
+        url = reverse_lazy("metrics")
+        response = self.client.get(url, HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(200, response.status_code)
+        response = self.client.get(url, HTTP_AUTHORIZATION="Bearer wrong")
+        self.assertEqual(403, response.status_code)
+
+    def test_post(self) -> None:
+        self.client.force_login(User.objects.create(username="staff", is_staff=True))
+        self.assertEqual(405, self.client.post(reverse_lazy("metrics")).status_code)
@@ -198,6 +198,19 @@ class ExecutionDuplicateViewTests(LoggedInMixin, MaliciousMixin, django.test.Tes
         self.assertContains(response, "3.14")
         self.assertContains(response, "&quot;was None&quot;")
 
+    def test_execution_duplicate_view_get_timeouts(self) -> None:
+        self.execution.algorithm_timeout = 300
+        self.execution.timeout = 7200
+        self.execution.save()
+        response = self.client.get(
+            reverse_lazy(
+                "execution_duplicate",
+                args=(self.execution.experiment.pk, self.execution.pk),
+            )
+        )
+        self.assertEqual(300, response.context["form"].initial["algorithm_timeout"])
+        self.assertEqual(7200, response.context["form"].initial["timeout"])
+
     def test_execution_duplicate_view_foreign_execution_dup_get(self):
         # Login hacker
         self.client.post(reverse("login"), self.hacker_credentials, follow=True)